@@ -1,4 +1,4 @@
 # from opteryx.compiled import cython_anyop_eq
 
 
-from opteryx.compiled.cross_join import build_rows_indices_and_column
+from opteryx.compiled.cross_join import build_rows_indices
@@ -9,133 +9,47 @@
 import numpy as np
 cimport numpy as cnp
 cimport cython
-from libc.stdint cimport int32_t
-from libc.math cimport INFINITY
-
-cpdef tuple build_rows_indices_and_column(cnp.ndarray column_data):
-    cdef Py_ssize_t row_count = column_data.shape[0]
-    cdef cnp.int32_t[::1] lengths = np.empty(row_count, dtype=np.int32)
-    cdef cnp.int32_t[::1] offsets = np.empty(row_count + 1, dtype=np.int32)
-    cdef Py_ssize_t i
-    cdef Py_ssize_t total_size = 0
-    cdef cnp.dtype element_dtype = None
-
-    # Calculate lengths and total_size
-    for i in range(row_count):
-        if column_data[i] is None:
-            lengths[i] = 0
-        else:
-            lengths[i] = column_data[i].shape[0]
-            if element_dtype is None:
-                element_dtype = column_data[i].dtype
-        total_size += lengths[i]
-    
-    # Early exit if total_size is zero
-    if total_size == 0:
-        return (np.array([], dtype=np.int32), np.array([], dtype=object))
-
-    if element_dtype is None:
-        element_dtype = np.object_
-
-    # Compute offsets for efficient slicing
-    offsets[0] = 0
-    for i in range(row_count):
-        offsets[i + 1] = offsets[i] + lengths[i]
-    cdef cnp.int32_t[::1] indices = np.empty(total_size, dtype=np.int32)
-    cdef cnp.ndarray flat_data = np.empty(total_size, dtype=element_dtype)
-
-    # Fill indices and flat_data
-    for i in range(row_count):
-        start = offsets[i]
-        end = offsets[i + 1]
-        if end > start:
-            indices[start:end] = i
-            flat_data[start:end] = column_data[i]
-
-    return (indices, flat_data)
+from libc.stdint cimport int32_t, int64_t
 
+ctypedef fused offset_t:
+    int32_t
+    int64_t
 
 
-cpdef tuple build_filtered_rows_indices_and_column(cnp.ndarray column_data, set valid_values):
+cpdef cnp.ndarray build_rows_indices(const offset_t[::1] offsets):
     """
-    Build row indices and flattened column data for matching values from a column of array-like elements.
+    Build the row indices for the values of a list column from the list offsets.
+
+    The values of row i of a list array are at offsets[i] to offsets[i + 1] in the
+    values buffer, this works out which row each value came from without visiting
+    the values themselves.
 
     Parameters:
-        column_data: ndarray
-            An array of arrays from which to create row indices and flattened data.
-        valid_values: set
-            A set of values to filter the rows by during the cross join.
+        offsets: memoryview
+            The offsets of the list array, one more than the number of rows. These
+            don't need to start at zero, sliced arrays share the parent's offsets.
 
     Returns:
-        tuple of (ndarray, ndarray)
-            Returns a tuple containing an array of indices and an array of flattened data for rows that match the filter.
+        ndarray
+            The row index for each value, in the order the values are in the buffer.
     """
-    cdef Py_ssize_t row_count = column_data.shape[0]
-    cdef Py_ssize_t allocated_size = row_count * 4  # Initial allocation size
-    cdef Py_ssize_t index = 0
-    cdef Py_ssize_t i, j, len_i
-    cdef object array_i
-    cdef cnp.ndarray flat_data
-    cdef cnp.int32_t[::1] indices
-    cdef cnp.dtype element_dtype = None
-    cdef object value
-
-    # Typed sets for different data types
-    cdef set[int] valid_values_int
-    cdef set[double] valid_values_double
-    cdef set[unicode] valid_values_str
-    cdef set valid_values_typed = None
-
-    # Determine the dtype of the elements
-    for i in range(row_count):
-        array_i = column_data[i]
-        if array_i is not None and array_i.size > 0:
-            element_dtype = array_i.dtype
-            break
-
-    if element_dtype is None:
-        element_dtype = np.object_
+    cdef Py_ssize_t row_count = offsets.shape[0] - 1
+    cdef Py_ssize_t i
+    cdef int64_t j, start, end
+    cdef int64_t base = offsets[0] if row_count >= 0 else 0
 
-    # Initialize indices and flat_data arrays
-    indices = np.empty(allocated_size, dtype=np.int32)
-    flat_data = np.empty(allocated_size, dtype=element_dtype)
+    if row_count <= 0:
+        return np.empty(0, dtype=np.int32)
 
-    # Handle set initialization based on element dtype
-    if np.issubdtype(element_dtype, np.integer):
-        valid_values_typed = set([int(v) for v in valid_values])
-    elif np.issubdtype(element_dtype, np.floating):
-        valid_values_typed = set([float(v) for v in valid_values])
-    elif np.issubdtype(element_dtype, np.str_):
-        valid_values_typed = set([unicode(v) for v in valid_values])
-    else:
-        valid_values_typed = valid_values  # Fallback to generic Python set
+    cdef cnp.ndarray[cnp.int32_t, ndim=1] indices = np.empty(
+        offsets[row_count] - base, dtype=np.int32
+    )
+    cdef int32_t[::1] indices_view = indices
 
-    # Main loop
     for i in range(row_count):
-        array_i = column_data[i]
-        if array_i is None:
-            continue
-        len_i = array_i.shape[0]
-        if len_i == 0:
-            continue
-
-        for j in range(len_i):
-            value = array_i[j]
-            if value in valid_values_typed:
-                if index >= allocated_size:
-                    # Reallocate arrays
-                    allocated_size *= 2
-                    indices = np.resize(indices, allocated_size)
-                    flat_data = np.resize(flat_data, allocated_size)
-                flat_data[index] = value
-                indices[index] = i
-                index += 1
-
-    if index == 0:
-        return (np.array([], dtype=np.int32), np.array([], dtype=element_dtype))
-
-    # Slice arrays to the actual used size
-    indices = indices[:index]
-    flat_data = flat_data[:index]
+        start = offsets[i] - base
+        end = offsets[i + 1] - base
+        for j in range(start, end):
+            indices_view[j] = <int32_t>i
 
-    return (indices, flat_data)
\ No newline at end of file
+    return indices
@@ -1,6 +1,13 @@
+from .hash_table import DistinctSet
 from .hash_table import HashSet
 from .hash_table import HashTable
 from .hash_table import distinct
 from .hash_table import list_distinct
 from .memory_pool import MemoryPool
 from .node import Node
+from .sketches import CountMinSketch
+from .sketches import GroupedCountMinSketch
+from .sketches import GroupedHyperLogLog
+from .sketches import GroupedKLLSketch
+from .sketches import HyperLogLog
+from .sketches import KLLSketch
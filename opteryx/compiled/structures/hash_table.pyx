@@ -12,7 +12,10 @@ from libcpp.unordered_set cimport unordered_set
 from libcpp.vector cimport vector
 from libc.stdint cimport int64_t, int32_t, uint8_t
 from libcpp.pair cimport pair
-from libc.math cimport isnan
+from libcpp.deque cimport deque
+from libcpp.string cimport string
+from libcpp.string_view cimport string_view
+from libc.string cimport memcpy
 
 cimport cython
 cimport numpy as cnp
@@ -59,155 +62,241 @@ cdef class HashSet:
     cdef inline bint contains(self, int64_t value):
         return self.c_set.find(value) != self.c_set.end()
 
-@cython.wraparound(False)
-cdef inline object recast_column(column):
-    cdef column_type = column.type
+cdef class DistinctSet:
+    """
+    The rows seen by a DISTINCT.
 
-    if pyarrow.types.is_struct(column_type) or pyarrow.types.is_list(column_type):
-        return numpy.array([str(a) for a in column], dtype=numpy.str_)
+    Rows are encoded as bytes from their Arrow buffers and the bytes are kept, so rows
+    with matching hashes are compared before they are treated as duplicates. A single
+    fixed-width column is kept as its 64-bit values, which are exact.
+    """
+    cdef unordered_set[int64_t] values
+    cdef unordered_set[string_view] keys
+    cdef deque[string] arena
+    cdef bint seen_null
+    cdef public int64_t nbytes
 
-    # Otherwise, return the column as-is
-    return column
+    def __cinit__(self):
+        self.seen_null = False
+        self.nbytes = 0
 
+    def __len__(self):
+        return self.values.size() + self.keys.size() + self.seen_null
 
+    cdef inline bint insert_value(self, int64_t value):
+        if self.values.insert(value).second:
+            self.nbytes += 8
+            return True
+        return False
 
+    cdef inline bint insert_null(self):
+        if self.seen_null:
+            return False
+        self.seen_null = True
+        return True
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.cdivision(True)
-cpdef tuple distinct(table, HashSet seen_hashes=None, list columns=None):
-    """
-    Perform a distinct operation on the given table using an external HashSet.
-    """
+    cdef inline bint insert_key(self, const char* data, size_t length):
+        if self.keys.find(string_view(data, length)) != self.keys.end():
+            return False
+        # the set holds views of the copies in the arena, a deque doesn't move them
+        self.arena.push_back(string(data, length))
+        self.keys.insert(string_view(self.arena.back().data(), length))
+        self.nbytes += length
+        return True
 
-    cdef:
-        int64_t null_hash = hash(None)
-        Py_ssize_t num_columns, num_rows, i
-        list columns_of_interest
-        list columns_data = []
-        list columns_hashes = []
-        cnp.ndarray[int64_t] combined_hashes
-        HashSet hash_set
-        list keep = []
-        object column_data
-        cnp.ndarray data_array
-        cnp.ndarray[int64_t] hashes
-
-    if seen_hashes is None:
-        seen_hashes = HashSet()
-
-    columns_of_interest = columns if columns is not None else table.column_names
-    num_columns = len(columns_of_interest)
-    num_rows = table.num_rows  # Use PyArrow's num_rows attribute
-
-    # Prepare data and compute hashes for each column
-    for column_name in columns_of_interest:
-        # Get the column from the table
-        column = table.column(column_name)
-        # Recast column if necessary
-        column_data = recast_column(column)
-        # Convert PyArrow array to NumPy array without copying
-        if isinstance(column_data, pyarrow.ChunkedArray):
-            data_array = column_data.combine_chunks().to_numpy(zero_copy_only=False)
-        elif isinstance(column_data, pyarrow.Array):
-            data_array = column_data.to_numpy(zero_copy_only=False)
-        else:
-            data_array = column_data  # Already a NumPy array
-
-        columns_data.append(data_array)
-        hashes = numpy.empty(num_rows, dtype=np.int64)
-
-        # Determine data type and compute hashes accordingly
-        if numpy.issubdtype(data_array.dtype, numpy.integer):
-            compute_int_hashes(data_array, null_hash, hashes)
-        elif numpy.issubdtype(data_array.dtype, numpy.floating):
-            compute_float_hashes(data_array, null_hash, hashes)
-        elif data_array.dtype == numpy.object_:
-            compute_object_hashes(data_array, null_hash, hashes)
-        else:
-            # For other types (e.g., strings), treat as object
-            compute_object_hashes(data_array.astype(np.object_), null_hash, hashes)
 
-        columns_hashes.append(hashes)
+cdef enum ColumnKind:
+    FIXED = 0
+    VARIABLE = 1
 
-    # Combine the hashes per row
-    combined_hashes = columns_hashes[0]
-    for hashes in columns_hashes[1:]:
-        combined_hashes = combined_hashes * 31 + hashes
 
-    # Check for duplicates using the HashSet
-    for i in range(num_rows):
-        if seen_hashes.insert(combined_hashes[i]):
-            keep.append(i)
+cpdef tuple column_values(column):
+    """
+    Get the validity and the values of a column to be encoded. Fixed-width types are
+    their exact 64-bit values, everything else is bytes with offsets.
+    """
+    if isinstance(column, pyarrow.ChunkedArray):
+        column = column.combine_chunks()
+    if pyarrow.types.is_dictionary(column.type):
+        column = column.dictionary_decode()
+
+    column_type = column.type
+    valid = column.is_valid().to_numpy(zero_copy_only=False).view(numpy.uint8)
+
+    if pyarrow.types.is_null(column_type):
+        return FIXED, valid, numpy.zeros(len(column), dtype=numpy.int64)
+    if pyarrow.types.is_boolean(column_type):
+        values = column.fill_null(False).to_numpy(zero_copy_only=False)
+        return FIXED, valid, values.astype(numpy.int64)
+    if pyarrow.types.is_integer(column_type):
+        values = column.fill_null(0).to_numpy()
+        if values.dtype == numpy.uint64:
+            return FIXED, valid, values.view(numpy.int64)
+        return FIXED, valid, values.astype(numpy.int64)
+    if pyarrow.types.is_floating(column_type):
+        values = column.fill_null(0).to_numpy().astype(numpy.float64)
+        # -0.0 equals 0.0, and NaNs may have different payloads
+        values[values == 0] = 0.0
+        values[numpy.isnan(values)] = numpy.nan
+        return FIXED, valid, values.view(numpy.int64)
+    if pyarrow.types.is_temporal(column_type) and column_type.bit_width in (32, 64):
+        integer_type = pyarrow.int64() if column_type.bit_width == 64 else pyarrow.int32()
+        values = column.view(integer_type).fill_null(0).to_numpy()
+        return FIXED, valid, values.astype(numpy.int64)
+
+    if not (
+        pyarrow.types.is_string(column_type)
+        or pyarrow.types.is_large_string(column_type)
+        or pyarrow.types.is_binary(column_type)
+        or pyarrow.types.is_large_binary(column_type)
+    ):
+        # nested and other types are compared on their text
+        column = pyarrow.array(
+            [None if v is None else str(v) for v in column.to_pylist()], type=pyarrow.string()
+        )
+    column = column.cast(pyarrow.large_binary())
+
+    buffers = column.buffers()
+    offsets = numpy.frombuffer(buffers[1], dtype=numpy.int64)[
+        column.offset : column.offset + len(column) + 1
+    ]
+    data = numpy.zeros(1, dtype=numpy.uint8)
+    if buffers[2] is not None and buffers[2].size > 0:
+        data = numpy.frombuffer(buffers[2], dtype=numpy.uint8)
+    return VARIABLE, valid, (offsets, data)
 
-    return keep, seen_hashes
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef void compute_float_hashes(cnp.ndarray[cnp.float64_t] data, int64_t null_hash, cnp.ndarray[int64_t] hashes):
-    cdef Py_ssize_t i, n = data.shape[0]
-    cdef cnp.float64_t value
-    for i in range(n):
-        value = data[i]
-        if isnan(value):
-            hashes[i] = null_hash
+cdef tuple _encode_rows(list columns, Py_ssize_t num_rows):
+    """
+    Write each row's values as bytes, each value is a null flag followed by its 8 bytes,
+    or its length and bytes. Returns the row offsets and the encoded bytes.
+    """
+    cdef:
+        Py_ssize_t i
+        int64_t length
+        int64_t[::1] cursor
+        uint8_t[::1] encoded
+        const uint8_t[::1] valid
+        const int64_t[::1] values
+        const int64_t[::1] offsets
+        const uint8_t[::1] data
+        cnp.ndarray[int64_t] row_lengths = numpy.zeros(num_rows, dtype=numpy.int64)
+        cnp.ndarray[int64_t] row_offsets = numpy.zeros(num_rows + 1, dtype=numpy.int64)
+
+    for kind, valid_array, column_data in columns:
+        if kind == FIXED:
+            row_lengths += 1 + valid_array.astype(numpy.int64) * 8
         else:
-            hashes[i] = hash(value)
-
-@cython.boundscheck(False)
-@cython.wraparound(False)
-cdef void compute_int_hashes(cnp.ndarray[cnp.int64_t] data, int64_t null_hash, cnp.ndarray[int64_t] hashes):
-    cdef Py_ssize_t i, n = data.shape[0]
-    cdef cnp.int64_t value
-    for i in range(n):
-        value = data[i]
-        # Assuming a specific value represents missing data
-        # Adjust this condition based on how missing integers are represented
-        if value == numpy.iinfo(np.int64).min:
-            hashes[i] = null_hash
+            row_lengths += 1 + valid_array.astype(numpy.int64) * (8 + numpy.diff(column_data[0]))
+    numpy.cumsum(row_lengths, out=row_offsets[1:])
+
+    encoded = numpy.empty(max(row_offsets[num_rows], 1), dtype=numpy.uint8)
+    cursor = row_offsets[:num_rows].copy()
+
+    for kind, valid_array, column_data in columns:
+        valid = valid_array
+        if kind == FIXED:
+            values = column_data
+            for i in range(num_rows):
+                encoded[cursor[i]] = valid[i]
+                cursor[i] += 1
+                if valid[i]:
+                    memcpy(&encoded[cursor[i]], &values[i], 8)
+                    cursor[i] += 8
         else:
-            hashes[i] = value  # Hash of int is the int itself in Python 3
+            offsets, data = column_data
+            for i in range(num_rows):
+                encoded[cursor[i]] = valid[i]
+                cursor[i] += 1
+                if valid[i]:
+                    length = offsets[i + 1] - offsets[i]
+                    memcpy(&encoded[cursor[i]], &length, 8)
+                    cursor[i] += 8
+                    if length > 0:
+                        memcpy(&encoded[cursor[i]], &data[offsets[i]], length)
+                        cursor[i] += length
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
-cdef void compute_object_hashes(cnp.ndarray data, int64_t null_hash, cnp.ndarray[int64_t] hashes):
-    cdef Py_ssize_t i, n = data.shape[0]
-    cdef object value
-    for i in range(n):
-        value = data[i]
-        if value is None:
-            hashes[i] = null_hash
-        else:
-            hashes[i] = hash(value)
+    return row_offsets, numpy.asarray(encoded)
 
 
+@cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef tuple list_distinct(cnp.ndarray values, cnp.int32_t[::1] indices, HashSet seen_hashes=None):
+cdef cnp.ndarray _distinct_rows(list columns, Py_ssize_t num_rows, DistinctSet seen):
+    """
+    The indices of the rows which haven't been seen before, in the order they appear.
+    """
     cdef:
         Py_ssize_t i, j = 0
-        Py_ssize_t n = values.shape[0]
-        object v
-        int64_t hash_value
-        int32_t[::1] new_indices = np.empty(n, dtype=np.int32)
-
-        # Determine the dtype of the `values` array
-        cnp.dtype dtype = values.dtype
-
-        cnp.ndarray[::1] values_mv = values
-        cnp.ndarray new_values = np.empty(n, dtype=dtype)
-
-    if seen_hashes is None:
-        seen_hashes = HashSet()
-
-    for i in range(n):
-        v = values_mv[i]
-        hash_value = <int64_t>hash(v)
-        if seen_hashes.insert(hash_value):
-            new_values[j] = v
-            new_indices[j] = indices[i]
+        cnp.ndarray[int64_t] keep = numpy.empty(num_rows, dtype=numpy.int64)
+        int64_t[::1] keep_view = keep
+        const uint8_t[::1] valid
+        const int64_t[::1] values
+        const int64_t[::1] row_offsets
+        const uint8_t[::1] encoded
+        const char* encoded_data
+
+    if len(columns) == 1 and columns[0][0] == FIXED:
+        _, valid_array, column_data = columns[0]
+        valid = valid_array
+        values = column_data
+        for i in range(num_rows):
+            if (seen.insert_value(values[i]) if valid[i] else seen.insert_null()):
+                keep_view[j] = i
+                j += 1
+        return keep[:j]
+
+    row_offsets, encoded = _encode_rows(columns, num_rows)
+    encoded_data = <const char*>&encoded[0]
+    for i in range(num_rows):
+        if seen.insert_key(encoded_data + row_offsets[i], row_offsets[i + 1] - row_offsets[i]):
+            keep_view[j] = i
             j += 1
-    return new_values[:j], new_indices[:j], seen_hashes
+    return keep[:j]
+
+
+cpdef tuple distinct(table, DistinctSet seen=None, list columns=None):
+    """
+    Find the rows of a table which haven't been seen before.
+
+    Parameters:
+        table: pyarrow.Table
+            The morsel to find the distinct rows of.
+        seen: DistinctSet
+            The rows seen in earlier morsels, this is updated.
+        columns: list
+            The columns to compare, all columns if not provided.
+
+    Returns:
+        The indices of the new distinct rows, and the seen rows.
+    """
+    if seen is None:
+        seen = DistinctSet()
+    if columns is None:
+        columns = table.column_names
+    if table.num_rows == 0:
+        return numpy.empty(0, dtype=numpy.int64), seen
+
+    prepared = [column_values(table.column(column)) for column in columns]
+    return _distinct_rows(prepared, table.num_rows, seen), seen
+
+
+cpdef tuple list_distinct(values, cnp.ndarray indices, DistinctSet seen=None):
+    """
+    Remove the repeated values from an unnested list, keeping the row each of the
+    remaining values came from.
+
+    Returns:
+        The distinct values, their row indices, and the seen values.
+    """
+    if seen is None:
+        seen = DistinctSet()
+    if len(values) == 0:
+        return values, indices, seen
 
+    keep = _distinct_rows([column_values(values)], len(values), seen)
+    return values.take(keep), indices[keep], seen
 
 
 @cython.boundscheck(False)
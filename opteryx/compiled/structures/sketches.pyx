@@ -0,0 +1,804 @@
+# distutils: language = c++
+# cython: language_level=3
+# cython: nonecheck=False
+# cython: cdivision=True
+# cython: initializedcheck=False
+# cython: infer_types=True
+# cython: wraparound=False
+# cython: boundscheck=False
+
+"""
+Sketches for the approximate aggregates.
+
+These summarize a column in a bounded amount of memory; they are updated a morsel at a
+time and sketches of the same kind and size can be merged, so parts of a dataset can be
+summarized separately and combined.
+
+- HyperLogLog estimates the number of distinct values
+- KLLSketch estimates quantiles
+- CountMinSketch estimates the most frequent values
+
+The Grouped sketches hold a sketch for each of a number of groups and are updated with
+the group of each value, so all of the groups in a morsel are updated in one pass. Groups
+with few values are held in less space than a full sketch.
+"""
+
+from libc.math cimport isnan
+from libc.math cimport log
+from libc.math cimport pow
+from libc.stdint cimport int64_t
+from libc.stdint cimport uint8_t
+from libc.stdint cimport uint64_t
+from libcpp.algorithm cimport sort
+from libcpp.algorithm cimport unique
+from libcpp.unordered_map cimport unordered_map
+from libcpp.utility cimport pair
+from libcpp.vector cimport vector
+
+cimport numpy as cnp
+
+import numpy
+import pyarrow
+
+from opteryx.compiled.structures.hash_table import column_values
+
+cnp.import_array()
+
+
+cdef extern from *:
+    """
+    #include <stdint.h>
+    #include <string.h>
+
+    static inline uint64_t sketch_mix64(uint64_t h) {
+        /* the finalizer from MurmurHash3, with a seed so zero doesn't hash to zero */
+        h ^= 0x9e3779b97f4a7c15ULL;
+        h ^= h >> 33;
+        h *= 0xff51afd7ed558ccdULL;
+        h ^= h >> 33;
+        h *= 0xc4ceb9fe1a85ec53ULL;
+        h ^= h >> 33;
+        return h;
+    }
+
+    static inline uint64_t sketch_hash_bytes(const uint8_t* data, int64_t length) {
+        uint64_t h = (uint64_t)length;
+        uint64_t word;
+        int64_t i = 0;
+        for (; i + 8 <= length; i += 8) {
+            memcpy(&word, data + i, 8);
+            h = (h ^ sketch_mix64(word)) * 0x9ddfea08eb382d69ULL;
+            h = (h << 29) | (h >> 35);
+        }
+        word = 0;
+        memcpy(&word, data + i, (size_t)(length - i));
+        h ^= sketch_mix64(word ^ ((uint64_t)(length - i) << 56));
+        return sketch_mix64(h);
+    }
+
+    static inline int sketch_leading_zeros(uint64_t x) {
+        return x == 0 ? 64 : __builtin_clzll(x);
+    }
+    """
+    uint64_t sketch_mix64(uint64_t h) nogil
+    uint64_t sketch_hash_bytes(const uint8_t* data, int64_t length) nogil
+    int sketch_leading_zeros(uint64_t x) nogil
+
+
+cpdef tuple hash_values(column):
+    """
+    64-bit hashes of the values of a column, from their Arrow buffers.
+
+    Returns:
+        The hashes and the validity of the values, nulls are not hashed.
+    """
+    cdef:
+        Py_ssize_t i, num_rows
+        const uint8_t[::1] valid
+        const int64_t[::1] values
+        const int64_t[::1] offsets
+        const uint8_t[::1] data
+        const uint8_t* base
+        uint64_t[::1] hashes_view
+
+    kind, valid_array, column_data = column_values(column)
+    num_rows = len(valid_array)
+    hashes = numpy.zeros(num_rows, dtype=numpy.uint64)
+    hashes_view = hashes
+    valid = valid_array
+
+    if kind == 0:
+        values = column_data
+        for i in range(num_rows):
+            if valid[i]:
+                hashes_view[i] = sketch_mix64(<uint64_t>values[i])
+    else:
+        offsets, data = column_data
+        base = &data[0]
+        for i in range(num_rows):
+            if valid[i]:
+                hashes_view[i] = sketch_hash_bytes(base + offsets[i], offsets[i + 1] - offsets[i])
+
+    return hashes, valid_array
+
+
+cdef inline void hll_add(uint8_t* registers, int precision, uint64_t value) noexcept nogil:
+    cdef uint64_t index = value >> (64 - precision)
+    cdef uint64_t remaining = (value << precision) | (<uint64_t>1 << (precision - 1))
+    cdef uint8_t rank = sketch_leading_zeros(remaining) + 1
+    if rank > registers[index]:
+        registers[index] = rank
+
+
+cdef int64_t hll_estimate(const uint8_t* registers, Py_ssize_t size) noexcept nogil:
+    cdef:
+        Py_ssize_t i
+        double m = size
+        double alpha = 0.7213 / (1.0 + 1.079 / m)
+        double total = 0
+        int64_t zeros = 0
+        double estimate
+
+    for i in range(size):
+        total += pow(2.0, -<double>registers[i])
+        if registers[i] == 0:
+            zeros += 1
+
+    estimate = alpha * m * m / total
+    # small cardinalities are better estimated from the empty registers
+    if estimate <= 2.5 * m and zeros > 0:
+        estimate = m * log(m / zeros)
+    return <int64_t>(estimate + 0.5)
+
+
+cdef class HyperLogLog:
+    """
+    Estimates the number of distinct values, with a standard error of about
+    1.04 / sqrt(2 ** precision); the default uses 4KB and is within about 1.6%.
+    """
+
+    cdef vector[uint8_t] registers
+    cdef public int precision
+
+    def __init__(self, int precision=12):
+        if precision < 4 or precision > 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers.assign(1 << precision, 0)
+
+    def update(self, column):
+        cdef Py_ssize_t i
+        cdef const uint64_t[::1] hashes
+        cdef const uint8_t[::1] valid
+
+        hashes, valid = hash_values(column)
+        for i in range(hashes.shape[0]):
+            if valid[i]:
+                hll_add(self.registers.data(), self.precision, hashes[i])
+
+    def merge(self, HyperLogLog other):
+        cdef Py_ssize_t i
+        if other.precision != self.precision:
+            raise ValueError("Only HyperLogLogs with the same precision can be merged")
+        for i in range(self.registers.size()):
+            if other.registers[i] > self.registers[i]:
+                self.registers[i] = other.registers[i]
+
+    def estimate(self) -> int:
+        return hll_estimate(self.registers.data(), self.registers.size())
+
+    def __reduce__(self):
+        registers = bytes(numpy.asarray(<uint8_t[:self.registers.size()]>self.registers.data()))
+        return _restore_hyperloglog, (self.precision, registers)
+
+
+def _restore_hyperloglog(precision, registers):
+    cdef HyperLogLog sketch = HyperLogLog(precision)
+    cdef Py_ssize_t i
+    for i in range(len(registers)):
+        sketch.registers[i] = registers[i]
+    return sketch
+
+
+cdef inline int64_t kll_capacity(int k, Py_ssize_t depth) noexcept nogil:
+    cdef int64_t capacity = <int64_t>(k * pow(2.0 / 3.0, depth))
+    return capacity if capacity > 2 else 2
+
+
+cdef int64_t kll_capacity_total(int k, Py_ssize_t height) noexcept nogil:
+    cdef int64_t total = 0
+    cdef Py_ssize_t level
+    for level in range(height):
+        total += kll_capacity(k, height - level - 1)
+    return total
+
+
+cdef int64_t kll_compress(vector[vector[double]]& levels, int k, uint64_t* random_state):
+    """
+    Compact the lowest full level, returns how many fewer values are held.
+    """
+    cdef Py_ssize_t level, i, items, offset, height = levels.size()
+    cdef double last
+
+    for level in range(height):
+        if <int64_t>levels[level].size() < kll_capacity(k, height - level - 1):
+            continue
+        if level + 1 == height:
+            levels.push_back(vector[double]())
+
+        sort(levels[level].begin(), levels[level].end())
+        items = levels[level].size()
+        # xorshift, we only need a fair bit to pick which values are promoted
+        random_state[0] ^= random_state[0] << 13
+        random_state[0] ^= random_state[0] >> 7
+        random_state[0] ^= random_state[0] << 17
+        offset = random_state[0] & 1
+        # an odd value out stays at this level
+        for i in range(offset, items - (items % 2), 2):
+            levels[level + 1].push_back(levels[level][i])
+        if items % 2:
+            last = levels[level][items - 1]
+            levels[level].clear()
+            levels[level].push_back(last)
+        else:
+            levels[level].clear()
+        return items - (items % 2) - (items - (items % 2)) // 2
+    return 0
+
+
+cdef object kll_quantile(vector[vector[double]]& levels, double quantile):
+    """
+    The value at a quantile of the values in the levels, None if there aren't any.
+    """
+    cdef vector[pair[double, int64_t]] weighted
+    cdef Py_ssize_t level, i
+    cdef int64_t total = 0, cumulative = 0
+    cdef double target
+
+    for level in range(levels.size()):
+        for i in range(levels[level].size()):
+            weighted.push_back(pair[double, int64_t](levels[level][i], <int64_t>1 << level))
+            total += <int64_t>1 << level
+    if weighted.size() == 0:
+        return None
+
+    sort(weighted.begin(), weighted.end())
+    target = quantile * total
+    for i in range(weighted.size()):
+        cumulative += weighted[i].second
+        if cumulative >= target:
+            return weighted[i].first
+    return weighted[weighted.size() - 1].first
+
+
+cdef cnp.ndarray float_values(column):
+    if isinstance(column, pyarrow.ChunkedArray):
+        column = column.combine_chunks()
+    return numpy.ascontiguousarray(
+        column.cast(pyarrow.float64()).to_numpy(zero_copy_only=False), dtype=numpy.float64
+    )
+
+
+cdef class KLLSketch:
+    """
+    Estimates quantiles of numeric values, the rank error is about 1.65 / k; the sketch
+    keeps about 3 * k values.
+
+    Values are kept in levels, values in level `n` stand for 2 ** n of the values seen.
+    When a level is full it's sorted and every other value is promoted to the next level.
+    """
+
+    cdef vector[vector[double]] levels
+    cdef int64_t size
+    cdef int64_t max_size
+    cdef uint64_t random_state
+    cdef public int k
+    cdef public int64_t count
+
+    def __init__(self, int k=200):
+        if k < 8:
+            raise ValueError("KLL sketches must have k of at least 8")
+        self.k = k
+        self.count = 0
+        self.size = 0
+        self.random_state = 88172645463325252
+        self.levels.resize(1)
+        self.max_size = kll_capacity_total(k, 1)
+
+    cdef void compress(self):
+        self.size -= kll_compress(self.levels, self.k, &self.random_state)
+        self.max_size = kll_capacity_total(self.k, self.levels.size())
+
+    def update(self, column):
+        cdef Py_ssize_t i
+        cdef const double[::1] values = float_values(column)
+        cdef double value
+
+        for i in range(values.shape[0]):
+            value = values[i]
+            if isnan(value):
+                continue
+            self.levels[0].push_back(value)
+            self.size += 1
+            self.count += 1
+            if self.size >= self.max_size:
+                self.compress()
+
+    def merge(self, KLLSketch other):
+        cdef Py_ssize_t level, i
+        while self.levels.size() < other.levels.size():
+            self.levels.push_back(vector[double]())
+        self.max_size = kll_capacity_total(self.k, self.levels.size())
+        for level in range(other.levels.size()):
+            for i in range(other.levels[level].size()):
+                self.levels[level].push_back(other.levels[level][i])
+        self.size += other.size
+        self.count += other.count
+        while self.size >= self.max_size:
+            self.compress()
+
+    def quantile(self, double quantile):
+        """
+        The value at a quantile, between 0 and 1, of the values seen; None if there
+        weren't any values.
+        """
+        return kll_quantile(self.levels, quantile)
+
+    def __reduce__(self):
+        cdef Py_ssize_t level
+        levels = [list(self.levels[level]) for level in range(self.levels.size())]
+        return _restore_kll, (self.k, self.count, levels)
+
+
+def _restore_kll(k, count, levels):
+    cdef KLLSketch sketch = KLLSketch(k)
+    cdef Py_ssize_t level
+    sketch.levels.resize(len(levels))
+    for level, values in enumerate(levels):
+        sketch.levels[level] = values
+        sketch.size += len(values)
+    sketch.count = count
+    sketch.max_size = kll_capacity_total(k, sketch.levels.size())
+    return sketch
+
+
+cdef inline void cms_add(
+    int64_t* counts, int width, int depth, uint64_t value, int64_t count
+) noexcept nogil:
+    cdef uint64_t first = value & 0xFFFFFFFFULL
+    cdef uint64_t second = value >> 32
+    cdef int row
+    for row in range(depth):
+        counts[row * width + (first + row * second) % width] += count
+
+
+cdef inline int64_t cms_estimate(
+    const int64_t* counts, int width, int depth, uint64_t value
+) noexcept nogil:
+    cdef uint64_t first = value & 0xFFFFFFFFULL
+    cdef uint64_t second = value >> 32
+    cdef int64_t estimate = counts[first % width]
+    cdef int64_t count
+    cdef int row
+    for row in range(1, depth):
+        count = counts[row * width + (first + row * second) % width]
+        if count < estimate:
+            estimate = count
+    return estimate
+
+
+cdef class CountMinSketch:
+    """
+    Estimates how often values appear, estimates are never under the true count and are
+    over by at most e / width of all the values seen (with probability 1 - e ** -depth).
+
+    The values which look most frequent are kept as candidates for the most frequent
+    values; a value dropped from the candidates keeps being counted, so it can come back.
+    """
+
+    cdef cnp.ndarray counts
+    cdef dict candidates
+    cdef public int width
+    cdef public int depth
+    cdef public int capacity
+
+    def __init__(self, int capacity=64, int width=1024, int depth=4):
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.counts = numpy.zeros(width * depth, dtype=numpy.int64)
+        self.candidates = {}
+
+    cdef cnp.ndarray estimates(self, const uint64_t[::1] hashes):
+        cdef Py_ssize_t i
+        cdef int64_t[::1] counts = self.counts
+        result = numpy.empty(hashes.shape[0], dtype=numpy.int64)
+        cdef int64_t[::1] result_view = result
+        for i in range(hashes.shape[0]):
+            result_view[i] = cms_estimate(&counts[0], self.width, self.depth, hashes[i])
+        return result
+
+    cdef void keep_candidates(self, dict new_candidates):
+        """
+        Keep the candidates, from the current and new ones, with the highest estimates.
+        """
+        for value_hash, value in new_candidates.items():
+            self.candidates.setdefault(value_hash, value)
+        if len(self.candidates) <= self.capacity:
+            return
+        hashes = numpy.fromiter(self.candidates.keys(), dtype=numpy.uint64)
+        keep = numpy.lexsort((hashes, -self.estimates(hashes)))[: self.capacity]
+        self.candidates = {int(h): self.candidates[int(h)] for h in hashes[keep]}
+
+    def update(self, column):
+        cdef Py_ssize_t i
+        cdef const uint64_t[::1] hashes_view
+        cdef const uint8_t[::1] valid
+        cdef int64_t[::1] counts = self.counts
+
+        hashes, valid_array = hash_values(column)
+        hashes_view = hashes
+        valid = valid_array
+        for i in range(hashes_view.shape[0]):
+            if valid[i]:
+                cms_add(&counts[0], self.width, self.depth, hashes_view[i], 1)
+
+        # the distinct values in this morsel which could be candidates
+        present = numpy.nonzero(valid_array)[0]
+        if present.size == 0:
+            return
+        unique_hashes, first = numpy.unique(hashes[present], return_index=True)
+        if unique_hashes.size > self.capacity:
+            best = numpy.lexsort((unique_hashes, -self.estimates(unique_hashes)))
+            best = best[: self.capacity]
+            unique_hashes, first = unique_hashes[best], first[best]
+        values = column.take(present[first]).to_pylist()
+        self.keep_candidates({int(h): v for h, v in zip(unique_hashes, values)})
+
+    def merge(self, CountMinSketch other):
+        if other.width != self.width or other.depth != self.depth:
+            raise ValueError("Only CountMinSketches with the same width and depth can be merged")
+        self.counts += other.counts
+        self.keep_candidates(other.candidates)
+
+    def estimate(self, value_hash) -> int:
+        cdef int64_t[::1] counts = self.counts
+        return cms_estimate(&counts[0], self.width, self.depth, value_hash)
+
+    def most_frequent(self, int k=1) -> list:
+        """
+        The k values which look most frequent, most frequent first.
+        """
+        if not self.candidates:
+            return []
+        hashes = numpy.fromiter(self.candidates.keys(), dtype=numpy.uint64)
+        order = numpy.lexsort((hashes, -self.estimates(hashes)))[:k]
+        return [self.candidates[int(h)] for h in hashes[order]]
+
+    def __reduce__(self):
+        return _restore_count_min, (
+            self.capacity,
+            self.width,
+            self.depth,
+            self.counts.tobytes(),
+            self.candidates,
+        )
+
+
+def _restore_count_min(capacity, width, depth, counts, candidates):
+    cdef CountMinSketch sketch = CountMinSketch(capacity, width, depth)
+    sketch.counts = numpy.frombuffer(counts, dtype=numpy.int64).copy()
+    sketch.candidates = dict(candidates)
+    return sketch
+
+
+cdef class GroupedHyperLogLog:
+    """
+    A HyperLogLog for each of a number of groups.
+
+    A group keeps the hashes of its values until there are more of them than would fit
+    in its registers, so groups with few values are small and are counted exactly; the
+    hashes are then moved into registers.
+    """
+
+    cdef vector[vector[uint64_t]] sparse
+    cdef vector[vector[uint8_t]] registers
+    cdef Py_ssize_t limit
+    cdef public int precision
+
+    def __init__(self, int precision=12):
+        if precision < 4 or precision > 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        # the number of hashes which fit in the space of the registers
+        self.limit = (1 << precision) // 8
+
+    cdef void compact(self, Py_ssize_t group):
+        cdef vector[uint64_t]* hashes = &self.sparse[group]
+        cdef vector[uint64_t] empty
+        cdef Py_ssize_t i
+
+        sort(hashes.begin(), hashes.end())
+        hashes.erase(unique(hashes.begin(), hashes.end()), hashes.end())
+        if <Py_ssize_t>hashes.size() <= self.limit // 2:
+            return
+        self.registers[group].assign(1 << self.precision, 0)
+        for i in range(hashes.size()):
+            hll_add(self.registers[group].data(), self.precision, hashes[0][i])
+        hashes.swap(empty)
+
+    def update(self, column, const int64_t[::1] groups, Py_ssize_t group_count):
+        """
+        Add the values of a column to the sketches of the groups, `groups` has the group
+        of each value and `group_count` is the number of groups there are.
+        """
+        cdef Py_ssize_t i, group
+        cdef const uint64_t[::1] hashes
+        cdef const uint8_t[::1] valid
+
+        if <Py_ssize_t>self.sparse.size() < group_count:
+            self.sparse.resize(group_count)
+            self.registers.resize(group_count)
+
+        hashes, valid = hash_values(column)
+        for i in range(hashes.shape[0]):
+            if not valid[i]:
+                continue
+            group = groups[i]
+            if self.registers[group].size() > 0:
+                hll_add(self.registers[group].data(), self.precision, hashes[i])
+            else:
+                self.sparse[group].push_back(hashes[i])
+                if <Py_ssize_t>self.sparse[group].size() >= self.limit:
+                    self.compact(group)
+
+    def estimates(self, const int64_t[::1] groups) -> list:
+        """
+        The estimated number of distinct values in each of the groups.
+        """
+        cdef Py_ssize_t i, group
+        result = []
+        for i in range(groups.shape[0]):
+            group = groups[i]
+            if group >= <Py_ssize_t>self.sparse.size():
+                result.append(0)
+            elif self.registers[group].size() > 0:
+                result.append(hll_estimate(self.registers[group].data(), self.registers[group].size()))
+            else:
+                self.compact(group)
+                result.append(self.sparse[group].size())
+        return result
+
+
+cdef class GroupedKLLSketch:
+    """
+    A KLLSketch for each of a number of groups; a group only holds the values it has
+    seen until it has more than k.
+    """
+
+    cdef vector[vector[vector[double]]] levels
+    cdef vector[int64_t] sizes
+    cdef vector[int64_t] max_sizes
+    cdef uint64_t random_state
+    cdef public int k
+
+    def __init__(self, int k=200):
+        if k < 8:
+            raise ValueError("KLL sketches must have k of at least 8")
+        self.k = k
+        self.random_state = 88172645463325252
+
+    def update(self, column, const int64_t[::1] groups, Py_ssize_t group_count):
+        """
+        Add the values of a column to the sketches of the groups, `groups` has the group
+        of each value and `group_count` is the number of groups there are.
+        """
+        cdef Py_ssize_t i, group
+        cdef const double[::1] values = float_values(column)
+        cdef double value
+
+        if <Py_ssize_t>self.levels.size() < group_count:
+            self.levels.resize(group_count)
+            self.sizes.resize(group_count, 0)
+            self.max_sizes.resize(group_count, kll_capacity_total(self.k, 1))
+
+        for i in range(values.shape[0]):
+            value = values[i]
+            if isnan(value):
+                continue
+            group = groups[i]
+            if self.levels[group].size() == 0:
+                self.levels[group].resize(1)
+            self.levels[group][0].push_back(value)
+            self.sizes[group] += 1
+            if self.sizes[group] >= self.max_sizes[group]:
+                self.sizes[group] -= kll_compress(self.levels[group], self.k, &self.random_state)
+                self.max_sizes[group] = kll_capacity_total(self.k, self.levels[group].size())
+
+    def quantiles(self, const int64_t[::1] groups, double quantile) -> list:
+        """
+        The value at a quantile, between 0 and 1, of the values in each of the groups;
+        None for groups without values.
+        """
+        cdef Py_ssize_t i, group
+        result = []
+        for i in range(groups.shape[0]):
+            group = groups[i]
+            if group >= <Py_ssize_t>self.levels.size():
+                result.append(None)
+            else:
+                result.append(kll_quantile(self.levels[group], quantile))
+        return result
+
+
+cdef class GroupedCountMinSketch:
+    """
+    A CountMinSketch for each of a number of groups.
+
+    A group counts its values exactly until it has seen more distinct values than would
+    fit in the space of a sketch, the counts are then moved into a sketch and the values
+    which look most frequent are kept as candidates, as CountMinSketch does.
+
+    The values are held once, by their hash, for all of the groups; values which are no
+    longer counted exactly or candidates in any group are dropped.
+    """
+
+    cdef vector[unordered_map[uint64_t, int64_t]] exact
+    cdef vector[vector[int64_t]] counts
+    cdef vector[vector[uint64_t]] candidates
+    cdef vector[vector[uint64_t]] pending
+    cdef dict values
+    cdef Py_ssize_t live
+    cdef Py_ssize_t limit
+    cdef public int width
+    cdef public int depth
+    cdef public int capacity
+
+    def __init__(self, int capacity=64, int width=1024, int depth=4):
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        # about the number of exact counts which fit in the space of a sketch
+        self.limit = max(capacity, width * depth // 8)
+        self.values = {}
+        self.live = 0
+
+    cdef void keep_candidates(self, Py_ssize_t group, vector[uint64_t]& hashes):
+        """
+        Keep the hashes with the highest estimates, of these and the group's candidates.
+        """
+        cdef vector[pair[int64_t, uint64_t]] ranked
+        cdef const int64_t* counts = self.counts[group].data()
+        cdef Py_ssize_t i
+
+        for i in range(self.candidates[group].size()):
+            hashes.push_back(self.candidates[group][i])
+        sort(hashes.begin(), hashes.end())
+        hashes.erase(unique(hashes.begin(), hashes.end()), hashes.end())
+        for i in range(hashes.size()):
+            ranked.push_back(
+                pair[int64_t, uint64_t](
+                    -cms_estimate(counts, self.width, self.depth, hashes[i]), hashes[i]
+                )
+            )
+        sort(ranked.begin(), ranked.end())
+        self.candidates[group].clear()
+        for i in range(min(<Py_ssize_t>ranked.size(), <Py_ssize_t>self.capacity)):
+            self.candidates[group].push_back(ranked[i].second)
+
+    cdef void to_sketch(self, Py_ssize_t group):
+        cdef unordered_map[uint64_t, int64_t] empty
+        cdef vector[uint64_t] hashes
+        cdef pair[uint64_t, int64_t] item
+
+        self.counts[group].assign(self.width * self.depth, 0)
+        for item in self.exact[group]:
+            cms_add(self.counts[group].data(), self.width, self.depth, item.first, item.second)
+            hashes.push_back(item.first)
+        self.exact[group].swap(empty)
+        self.keep_candidates(group, hashes)
+
+    def update(self, column, const int64_t[::1] groups, Py_ssize_t group_count):
+        """
+        Add the values of a column to the sketches of the groups, `groups` has the group
+        of each value and `group_count` is the number of groups there are.
+        """
+        cdef Py_ssize_t i, group
+        cdef uint64_t value_hash
+        cdef const uint64_t[::1] hashes_view
+        cdef const uint8_t[::1] valid
+        cdef vector[Py_ssize_t] touched
+        cdef vector[uint64_t] empty
+
+        if <Py_ssize_t>self.exact.size() < group_count:
+            self.exact.resize(group_count)
+            self.counts.resize(group_count)
+            self.candidates.resize(group_count)
+            self.pending.resize(group_count)
+
+        hashes, valid_array = hash_values(column)
+        hashes_view = hashes
+        valid = valid_array
+        for i in range(hashes_view.shape[0]):
+            if not valid[i]:
+                continue
+            group = groups[i]
+            value_hash = hashes_view[i]
+            if self.counts[group].size() == 0:
+                self.exact[group][value_hash] += 1
+                if <Py_ssize_t>self.exact[group].size() > self.limit:
+                    self.to_sketch(group)
+            else:
+                cms_add(self.counts[group].data(), self.width, self.depth, value_hash, 1)
+                if self.pending[group].size() == 0:
+                    touched.push_back(group)
+                self.pending[group].push_back(value_hash)
+
+        # the values seen in sketched groups in this morsel could be candidates
+        for i in range(touched.size()):
+            group = touched[i]
+            self.keep_candidates(group, self.pending[group])
+            self.pending[group].swap(empty)
+            empty.clear()
+
+        # hold the values, by their hash
+        present = numpy.flatnonzero(valid_array)
+        if present.size == 0:
+            return
+        unique_hashes, first = numpy.unique(hashes[present], return_index=True)
+        values = column.take(present[first]).to_pylist()
+        for value_hash, value in zip(unique_hashes.tolist(), values):
+            self.values.setdefault(value_hash, value)
+        if len(self.values) > 2 * self.live + 4096:
+            self.drop_values()
+
+    cdef void drop_values(self):
+        """
+        Drop the values which aren't counted exactly or candidates in any group.
+        """
+        cdef Py_ssize_t group, i
+        cdef pair[uint64_t, int64_t] item
+        cdef vector[uint64_t] live
+
+        for group in range(self.exact.size()):
+            for item in self.exact[group]:
+                live.push_back(item.first)
+            for i in range(self.candidates[group].size()):
+                live.push_back(self.candidates[group][i])
+        values = self.values
+        self.values = {h: values[h] for h in set(live) if h in values}
+        self.live = len(self.values)
+
+    def most_frequent(self, const int64_t[::1] groups, int k=1) -> list:
+        """
+        The k values which look most frequent in each of the groups, most frequent first.
+        """
+        cdef Py_ssize_t i, j, group
+        cdef vector[pair[int64_t, uint64_t]] ranked
+        cdef pair[uint64_t, int64_t] item
+        cdef const int64_t* counts
+
+        result = []
+        for i in range(groups.shape[0]):
+            group = groups[i]
+            ranked.clear()
+            if group < <Py_ssize_t>self.exact.size():
+                if self.counts[group].size() == 0:
+                    for item in self.exact[group]:
+                        ranked.push_back(pair[int64_t, uint64_t](-item.second, item.first))
+                else:
+                    counts = self.counts[group].data()
+                    for j in range(self.candidates[group].size()):
+                        ranked.push_back(
+                            pair[int64_t, uint64_t](
+                                -cms_estimate(
+                                    counts, self.width, self.depth, self.candidates[group][j]
+                                ),
+                                self.candidates[group][j],
+                            )
+                        )
+            sort(ranked.begin(), ranked.end())
+            result.append(
+                [self.values[ranked[j].second] for j in range(min(<Py_ssize_t>ranked.size(), k))]
+            )
+        return result
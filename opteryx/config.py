@@ -149,7 +149,49 @@ MAX_READ_BUFFER_CAPACITY: int = memory_allocation_calculation(float(get("MAX_REA
 """Read buffer pool size in either bytes or fraction of system memory."""
 
 CONCURRENT_READS: int = int(get("CONCURRENT_READS", 4))
-"""Number of read workers per data source."""
+"""Initial number of reads in flight per data source, this is adjusted as data is read."""
+
+MAX_CONCURRENT_READS: int = int(get("MAX_CONCURRENT_READS", 32))
+"""Maximum number of reads in flight per data source."""
+
+LOCAL_READ_THREADS: int = int(get("LOCAL_READ_THREADS", 8))
+"""Number of threads, shared by all queries, reading files from local disk."""
+
+DISABLE_MEMORY_MAPPED_READS: bool = bool(get("DISABLE_MEMORY_MAPPED_READS", False))
+"""Copy local Parquet and Arrow files into memory rather than memory mapping them."""
+
+HTTP_CONNECTIONS: int = int(get("HTTP_CONNECTIONS", 100))
+"""Maximum number of connections, shared by all queries, open to remote data sources."""
+
+HTTP_CONNECTIONS_PER_HOST: int = int(get("HTTP_CONNECTIONS_PER_HOST", 32))
+"""Maximum number of connections, shared by all queries, open to any one remote endpoint."""
+
+HTTP_KEEP_ALIVE: float = float(get("HTTP_KEEP_ALIVE", 30))
+"""Seconds idle connections to remote data sources are kept open to be reused."""
+
+ENABLE_DECODED_MORSEL_CACHE: bool = bool(get("ENABLE_DECODED_MORSEL_CACHE", False))
+"""Cache the decoded, projected and filtered contents of blobs as Arrow IPC."""
+
+DECODED_MORSEL_CACHE_LOCATION: Optional[str] = get("DECODED_MORSEL_CACHE_LOCATION")
+"""Folder to write the decoded morsel cache to, the Buffer Pool is used if not set."""
+
+ENABLE_QUERY_RESULT_CACHE: bool = bool(get("ENABLE_QUERY_RESULT_CACHE", False))
+"""Cache the results of queries, invalidated when the data read by the query changes."""
+
+QUERY_RESULT_CACHE_LOCATION: Optional[str] = get("QUERY_RESULT_CACHE_LOCATION")
+"""Folder to write the query result cache to, the Buffer Pool is used if not set."""
+
+ENABLE_PLAN_CACHE: bool = bool(get("ENABLE_PLAN_CACHE", False))
+"""Cache the optimized plans of queries, invalidated when the datasets read change."""
+
+PLAN_CACHE_SIZE: int = int(get("PLAN_CACHE_SIZE", 256))
+"""Maximum number of plans held in the plan cache."""
+
+METADATA_CACHE_TTL: float = float(get("METADATA_CACHE_TTL", 0))
+"""Seconds blob listings and inferred schemas are cached for, 0 disables the cache."""
+
+METADATA_CACHE_SIZE: int = int(get("METADATA_CACHE_SIZE", 1024))
+"""Maximum number of blob listings and schemas held in the metadata cache."""
 
 DATA_CATALOG_PROVIDER: str = get("DATA_CATALOG_PROVIDER")
 """Data Catalog provider."""
@@ -15,6 +15,7 @@ import os
 import pyarrow
 
 from opteryx.connectors.arrow_connector import ArrowConnector
+from opteryx.connectors.arrow_connector import ArrowStream
 from opteryx.connectors.aws_s3_connector import AwsS3Connector
 from opteryx.connectors.cql_connector import CqlConnector
 from opteryx.connectors.disk_connector import DiskConnector
@@ -63,18 +64,17 @@ def register_store(prefix, connector, *, remove_prefix: bool = False, **kwargs):
 
 def register_df(name, frame):
     """register a orso, pandas or Polars dataframe"""
-    # polars (maybe others) - the polars to arrow API is a mess
-    if hasattr(frame, "_df"):
-        frame = frame._df
-    if "PyDataFrame" in str(type(frame)):
-        arrow = frame.to_arrow(compat_level=1)
-        if not isinstance(arrow, pyarrow.Table):
-            from opteryx.exceptions import NotSupportedError
+    # polars exports strings as views, which pyarrow can't cast, so ask for the
+    # oldest layout; the buffers are shared rather than copied where possible
+    if "polars" in str(type(frame)) and hasattr(frame, "to_arrow"):
+        import polars
 
-            raise NotSupportedError(
-                "Polars not supported whilst changes are being made to the Polars to Arrow APIs"
-            )
-        register_arrow(name, arrow)
+        register_arrow(name, frame.to_arrow(compat_level=polars.CompatLevel.oldest()))
+        return
+    # anything else which can be read as an Arrow stream (pandas, duckdb, Opteryx
+    # cursors) is read when it is queried rather than being converted now
+    if hasattr(frame, "__arrow_c_stream__") and not isinstance(frame, pyarrow.Table):
+        register_arrow(name, frame)
         return
     if hasattr(frame, "to_arrow"):
         arrow = frame.to_arrow()
@@ -96,7 +96,9 @@ def register_df(name, frame):
 
 
 def register_arrow(name, table):
-    """register an arrow table"""
+    """register an arrow table, or an object implementing __arrow_c_stream__"""
+    if not isinstance(table, pyarrow.Table) and hasattr(table, "__arrow_c_stream__"):
+        table = ArrowStream(table)
     materialized_datasets = MaterializedDatasets()
     materialized_datasets[name] = table
     register_store(name, ArrowConnector)
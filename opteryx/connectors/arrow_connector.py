@@ -14,8 +14,13 @@
 Arrow Reader
 
 Used to read datasets registered using the register_arrow or register_df functions.
+
+Objects exposing the Arrow PyCapsule stream interface (`__arrow_c_stream__`) are held as
+streams and only read when a query reads the dataset, the batches are not copied.
 """
 
+import threading
+
 import pyarrow
 from orso.schema import FlatColumn
 from orso.schema import RelationSchema
@@ -26,6 +31,54 @@ from opteryx.shared import MaterializedDatasets
 from opteryx.utils import arrow
 
 
+class ArrowStream:
+    """
+    Wrap an object which implements `__arrow_c_stream__` so it can be read lazily.
+
+    Not all sources can be read more than once (e.g. a Cursor or a RecordBatchReader),
+    so the stream is only opened once and the batches are kept as they are read; later
+    reads replay the kept batches and then carry on reading the stream where an earlier
+    read stopped. The batches are kept, not copied.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._reader = None
+        self._batches: list = []
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def _open(self) -> pyarrow.RecordBatchReader:
+        if self._reader is None:
+            self._reader = pyarrow.RecordBatchReader.from_stream(self.source)
+        return self._reader
+
+    @property
+    def schema(self) -> pyarrow.Schema:
+        with self._lock:
+            return self._open().schema
+
+    def _batch(self, index: int):
+        with self._lock:
+            if index < len(self._batches):
+                return self._batches[index]
+            if self._exhausted:
+                return None
+            try:
+                batch = self._open().read_next_batch()
+            except StopIteration:
+                self._exhausted = True
+                return None
+            self._batches.append(batch)
+            return batch
+
+    def to_batches(self):
+        index = 0
+        while (batch := self._batch(index)) is not None:
+            yield batch
+            index += 1
+
+
 class ArrowConnector(BaseConnector):
     __mode__ = "Internal"
     __type__ = "ARROW"
@@ -50,6 +103,15 @@ class ArrowConnector(BaseConnector):
     def read_dataset(self, columns: list = None, **kwargs) -> pyarrow.Table:
         dataset = self._datasets[self.dataset]
 
+        if isinstance(dataset, ArrowStream):
+            schema = dataset.schema
+            for batch in dataset.to_batches():
+                morsel = pyarrow.Table.from_batches([batch], schema=schema)
+                if columns:
+                    morsel = arrow.post_read_projector(morsel, columns)
+                yield morsel
+            return
+
         batch_size = DEFAULT_MORSEL_SIZE // (dataset.nbytes / dataset.num_rows)
 
         for batch in dataset.to_batches(max_chunksize=batch_size):
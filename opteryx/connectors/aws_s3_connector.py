@@ -16,12 +16,17 @@ MinIo Reader - also works with AWS
 
 import asyncio
 import os
+import threading
+from typing import AsyncIterator
+from typing import Dict
 from typing import List
+from typing import Optional
 
 import pyarrow
 from orso.schema import RelationSchema
 from orso.tools import single_item_cache
 
+from opteryx.config import HTTP_CONNECTIONS_PER_HOST
 from opteryx.connectors.base.base_connector import BaseConnector
 from opteryx.connectors.capabilities import Asynchronous
 from opteryx.connectors.capabilities import Cacheable
@@ -31,11 +36,44 @@ from opteryx.exceptions import DatasetNotFoundError
 from opteryx.exceptions import MissingDependencyError
 from opteryx.exceptions import UnmetRequirementError
 from opteryx.exceptions import UnsupportedFileTypeError
+from opteryx.shared import MetadataCache
 from opteryx.utils import paths
 from opteryx.utils.file_decoders import VALID_EXTENSIONS
 from opteryx.utils.file_decoders import get_decoder
 
 OS_SEP = os.sep
+# MinIO clients hold a pool of connections, the clients are shared by all connectors
+# to the same endpoint so connections are reused between queries
+_minio_clients: dict = {}
+_minio_clients_lock = threading.Lock()
+
+
+def get_minio_client(end_point: str, access_key: str, secret_key: str, secure: bool):
+    from minio import Minio  # type:ignore
+
+    key = (end_point, access_key, secret_key, secure)
+    with _minio_clients_lock:
+        client = _minio_clients.get(key)
+        if client is None:
+            import certifi
+            import urllib3
+
+            # the MinIO defaults, with the pool sized to the reads we have in flight
+            timeout = 300
+            http_client = urllib3.PoolManager(
+                timeout=urllib3.Timeout(connect=timeout, read=timeout),
+                maxsize=HTTP_CONNECTIONS_PER_HOST,
+                cert_reqs="CERT_REQUIRED",
+                ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+                retries=urllib3.Retry(
+                    total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+                ),
+            )
+            client = Minio(
+                end_point, access_key, secret_key, secure=secure, http_client=http_client
+            )
+            _minio_clients[key] = client
+    return client
 
 
 class AwsS3Connector(BaseConnector, Cacheable, Partitionable, Asynchronous):
@@ -65,24 +103,55 @@ class AwsS3Connector(BaseConnector, Cacheable, Partitionable, Asynchronous):
                 "MinIo (S3) adapter requires MINIO_END_POINT, MINIO_ACCESS_KEY and MINIO_SECRET_KEY set in environment variables."
             )
 
-        self.minio = Minio(end_point, access_key, secret_key, secure=secure)
+        self.minio = get_minio_client(end_point, access_key, secret_key, secure)
         self.dataset = self.dataset.replace(".", OS_SEP)
 
         # we're going to cache the first blob as the schema and dataset reader
         # sometimes both start here
         self.cached_first_blob = None
+        self.blob_versions: Dict[str, str] = {}
+
+    def get_blob_version(self, blob_name: str) -> Optional[str]:
+        """
+        The etag of the blob, this is collected when the blobs are listed.
+        """
+        return self.blob_versions.get(blob_name)
 
     @single_item_cache
     def get_list_of_blob_names(self, *, prefix: str) -> List[str]:
+        metadata_cache = MetadataCache()
+        cached_listing = metadata_cache.get_listing(self.__type__, prefix)
+        if cached_listing is not None:
+            self.statistics.metadata_cache_hits += 1
+            blob_names, versions = cached_listing
+            self.blob_versions.update(versions)
+            return blob_names
+
         bucket, object_path, _, _ = paths.get_parts(prefix)
         blobs = self.minio.list_objects(bucket_name=bucket, prefix=object_path, recursive=True)
-        blobs = (
-            bucket + "/" + blob.object_name for blob in blobs if not blob.object_name.endswith("/")
-        )
 
-        return sorted(
-            blob for blob in blobs if ("." + blob.split(".")[-1].lower()) in VALID_EXTENSIONS
-        )
+        blob_names = []
+        for blob in blobs:
+            if blob.object_name.endswith("/"):
+                continue
+            blob_name = bucket + "/" + blob.object_name
+            if ("." + blob_name.split(".")[-1].lower()) in VALID_EXTENSIONS:
+                blob_names.append(blob_name)
+                if blob.etag:
+                    self.blob_versions[blob_name] = blob.etag
+
+        blob_names = sorted(blob_names)
+        metadata_cache.set_listing(self.__type__, prefix, blob_names, self.blob_versions)
+        return blob_names
+
+    async def async_get_list_of_blob_names(
+        self, *, prefix: str, **kwargs
+    ) -> AsyncIterator[List[str]]:
+        """
+        The MinIO client is synchronous, so the listing is run in a thread, this allows
+        the listings of different prefixes to run concurrently.
+        """
+        yield await asyncio.to_thread(self.get_list_of_blob_names, prefix=prefix)
 
     def read_dataset(
         self, columns: list = None, just_schema: bool = False, **kwargs
@@ -119,40 +188,50 @@ class AwsS3Connector(BaseConnector, Cacheable, Partitionable, Asynchronous):
         if self.schema:
             return self.schema
 
+        metadata_cache = MetadataCache()
+        qualifiers = (self.partition_scheme.__class__.__name__, self.start_date, self.end_date)
+        self.schema = metadata_cache.get_schema(self.__type__, self.dataset, *qualifiers)
+        if self.schema is not None:
+            self.statistics.metadata_cache_hits += 1
+            return self.schema
+
         # Read first blob for schema inference and cache it
         self.schema = next(self.read_dataset(just_schema=True), None)
 
         if self.schema is None:
             raise DatasetNotFoundError(dataset=self.dataset)
 
+        metadata_cache.set_schema(self.__type__, self.dataset, self.schema, *qualifiers)
         return self.schema
 
+    def _read_object(self, blob_name: str) -> bytes:
+        bucket, object_path, name, extension = paths.get_parts(blob_name)
+        stream = self.minio.get_object(bucket, object_path + "/" + name + extension)
+        try:
+            return stream.read()
+        finally:
+            # return the connection to the pool so it can be reused
+            stream.close()
+            stream.release_conn()
+
     async def async_read_blob(self, *, blob_name, pool, statistics, **kwargs):
         from opteryx import system_statistics
 
-        try:
-            bucket, object_path, name, extension = paths.get_parts(blob_name)
-            # DEBUG: log ("READ   ", name)
-            stream = self.minio.get_object(bucket, object_path + "/" + name + extension)
-            data = stream.read()
+        # DEBUG: log ("READ   ", blob_name)
+        # the MinIO client is synchronous, read in a thread so we don't block the other
+        # reads on the event loop
+        data = await asyncio.to_thread(self._read_object, blob_name)
 
+        ref = await pool.commit(data)
+        while ref is None:
+            statistics.stalls_writing_to_read_buffer += 1
+            await asyncio.sleep(0.1)
+            system_statistics.cpu_wait_seconds += 0.1
             ref = await pool.commit(data)
-            while ref is None:
-                statistics.stalls_writing_to_read_buffer += 1
-                await asyncio.sleep(0.1)
-                system_statistics.cpu_wait_seconds += 0.1
-                ref = await pool.commit(data)
-            statistics.bytes_read += len(data)
-            return ref
-        finally:
-            stream.close()
+        statistics.bytes_read += len(data)
+        return ref
 
     def read_blob(self, *, blob_name, **kwargs):
-        try:
-            bucket, object_path, name, extension = paths.get_parts(blob_name)
-            stream = self.minio.get_object(bucket, object_path + "/" + name + extension)
-            content = stream.read()
-            self.statistics.bytes_read += len(content)
-            return content
-        finally:
-            stream.close()
+        content = self._read_object(blob_name)
+        self.statistics.bytes_read += len(content)
+        return content
@@ -16,11 +16,15 @@ The BaseConnector provides a common interface for all storage connectors.
 
 from typing import Any
 from typing import Dict
+from typing import Generator
 from typing import Iterable
+from typing import List
 from typing import Optional
 
 import pyarrow
 from orso.schema import RelationSchema
+from orso.schema import convert_orso_schema_to_arrow_schema
+from orso.types import OrsoTypes
 
 from opteryx.models import QueryStatistics
 
@@ -90,35 +94,81 @@ class BaseConnector:
         columns: Optional[list] = None,
         morsel_size: int = DEFAULT_MORSEL_SIZE,
         initial_chunk_size: int = INITIAL_CHUNK_SIZE,
-    ) -> pyarrow.Table:
-        chunk = []
-        self.chunk_size = initial_chunk_size  # we reset each time
-        morsel = None
-
-        for index, record in enumerate(dictset):
-            _id = record.pop("_id", None)
-            # column selection
-            if columns:
-                record = {k.source_column: record.get(k.source_column) for k in columns}
-            record["id"] = None if _id is None else str(_id)
+        schema: Optional[RelationSchema] = None,
+    ) -> Generator[pyarrow.Table, None, None]:
+        """
+        Convert documents to morsels, a column at a time.
 
+        The '_id' of each document is returned in the 'id' column. The types of the
+        columns are taken from the schema, if we have one, or from the first morsel, so
+        we only infer types for columns we haven't seen values for before.
+        """
+        chunk: List[dict] = []
+        self.chunk_size = initial_chunk_size  # we reset each time
+        names: Dict[str, None] = {}
+        if columns:
+            names = dict.fromkeys(col.source_column for col in columns)
+        types: Dict[str, pyarrow.DataType] = {}
+        if schema:
+            types = {
+                field.name: field.type
+                for column, field in zip(
+                    schema.columns, convert_orso_schema_to_arrow_schema(schema)
+                )
+                if column.type and column.type != OrsoTypes._MISSING_TYPE
+            }
+
+        def _build_morsel() -> pyarrow.Table:
+            if not columns:
+                # documents don't all have the same fields
+                for record in chunk:
+                    names.update(dict.fromkeys(record))
+            morsel = _dictset_to_arrow(chunk, list(names), types)
+            for field in morsel.schema:
+                if field.name not in types and not pyarrow.types.is_null(field.type):
+                    types[field.name] = field.type
+            return morsel
+
+        for record in dictset:
+            if "_id" in record:
+                _id = record.pop("_id")
+                record["id"] = None if _id is None else str(_id)
+                names["id"] = None
             chunk.append(record)
 
-            if index == self.chunk_size - 1:
-                morsel = pyarrow.Table.from_pylist(chunk)
+            if len(chunk) == self.chunk_size:
+                morsel = _build_morsel()
                 # Estimate the number of records to fill the morsel size
-                if morsel.nbytes > 0:
-                    self.chunk_size = int(morsel_size // (morsel.nbytes / self.chunk_size))
-                yield morsel
-                chunk = []
-            elif (index > self.chunk_size - 1) and (index - self.chunk_size) % self.chunk_size == 0:
-                morsel = pyarrow.Table.from_pylist(chunk)
+                if self.chunk_size == initial_chunk_size and morsel.nbytes > 0:
+                    self.chunk_size = max(
+                        int(morsel_size // (morsel.nbytes / self.chunk_size)), MIN_CHUNK_SIZE
+                    )
                 yield morsel
                 chunk = []
 
         if chunk:
-            morsel = pyarrow.Table.from_pylist(chunk)
-            yield morsel
+            yield _build_morsel()
+
+
+def _dictset_to_arrow(
+    records: List[dict], names: List[str], types: Dict[str, pyarrow.DataType]
+) -> pyarrow.Table:
+    """
+    Build a table from documents a column at a time, where the values don't match the
+    expected type for the column we let Arrow infer the type.
+    """
+    arrays = []
+    for name in names:
+        values = [record.get(name) for record in records]
+        data_type = types.get(name)
+        if data_type is not None:
+            try:
+                arrays.append(pyarrow.array(values, type=data_type))
+                continue
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError):
+                pass
+        arrays.append(pyarrow.array(values))
+    return pyarrow.Table.from_arrays(arrays, names=names)
 
 
 class DatasetReader:
@@ -10,9 +10,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from opteryx.connectors.capabilities.aggregate_pushable import AggregatePushable
 from opteryx.connectors.capabilities.asynchronous import Asynchronous
 from opteryx.connectors.capabilities.cacheable import Cacheable
+from opteryx.connectors.capabilities.limit_pushable import LimitPushable
 from opteryx.connectors.capabilities.partitionable import Partitionable
 from opteryx.connectors.capabilities.predicate_pushable import PredicatePushable
+from opteryx.connectors.capabilities.top_n_pushable import TopNPushable
 
-__all__ = ("Asynchronous", "Cacheable", "Partitionable", "PredicatePushable")
+__all__ = (
+    "AggregatePushable",
+    "Asynchronous",
+    "Cacheable",
+    "LimitPushable",
+    "Partitionable",
+    "PredicatePushable",
+    "TopNPushable",
+)
@@ -0,0 +1,56 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This is both a marker and a wrapper for key functionality to support pushing aggregations
+(including GROUP BY) to the system performing the read, for example remote database
+servers. Only the aggregated rows are returned to Opteryx.
+
+Aggregations are only pushed when they are directly over the read, after any filters
+have been pushed to the connector. The groups must be columns and the aggregates must
+be one of the supported functions over a column (or '*' for COUNT).
+
+The connector is responsible for returning tables with a column for each group and
+aggregate, named with the identity of the group or aggregate.
+"""
+
+from typing import Dict
+
+from opteryx.managers.expression import NodeType
+from opteryx.models import Node
+
+
+class AggregatePushable:
+    PUSHABLE_AGGREGATES: Dict[str, bool] = {
+        "COUNT": False,
+        "SUM": False,
+        "MIN": False,
+        "MAX": False,
+        "AVG": False,
+    }
+
+    def __init__(self, **kwargs):
+        pass
+
+    def can_push_aggregate(self, aggregator: Node) -> bool:
+        if aggregator.node_type != NodeType.AGGREGATOR:
+            return False
+        if not self.PUSHABLE_AGGREGATES.get(aggregator.value, False):
+            return False
+        if aggregator.distinct or aggregator.order or aggregator.limit:
+            return False
+        if len(aggregator.parameters) != 1:
+            return False
+        parameter = aggregator.parameters[0]
+        if parameter.node_type == NodeType.WILDCARD:
+            return aggregator.value == "COUNT"
+        return parameter.node_type == NodeType.IDENTIFIER
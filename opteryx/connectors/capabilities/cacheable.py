@@ -13,7 +13,9 @@
 
 import asyncio
 from functools import wraps
+from typing import Optional
 
+import pyarrow
 from orso.cityhash import CityHash64
 
 from opteryx.config import MAX_CACHE_EVICTIONS_PER_QUERY
@@ -29,7 +31,7 @@ SOURCE_ORIGIN = 3
 
 class Cacheable:
     """
-    This class is just a marker - it is empty.
+    This class is mostly a marker.
 
     Caching is added in the binding phase.
     """
@@ -40,6 +42,44 @@ class Cacheable:
     def read_blob(self, *, blob_name, **kwargs):
         pass
 
+    def get_blob_version(self, blob_name: str) -> Optional[str]:
+        """
+        Return a token which changes when the blob changes (e.g. mtime or etag), this
+        is used to determine if cached decoded versions of the blob are still valid.
+
+        Returns None when the version isn't known, these blobs are never cached.
+        """
+        return None
+
+    def get_dataset_fingerprint(self) -> Optional[str]:
+        """
+        Return a token which changes when the dataset changes, this is built from the
+        blobs in the dataset and their versions.
+
+        Returns None if the version of any of the blobs isn't known.
+        """
+        blob_names = self.partition_scheme.get_blobs_in_partition(
+            start_date=self.start_date,
+            end_date=self.end_date,
+            blob_list_getter=self.get_list_of_blob_names,
+            prefix=self.dataset,
+            predicates=None,
+        )
+        versions = []
+        for blob_name in blob_names:
+            version = self.get_blob_version(blob_name)
+            if version is None:
+                return None
+            versions.append(f"{blob_name}:{version}")
+        return hex(CityHash64("|".join(versions)))
+
+
+def _set_remote_cache(remote_cache, key: bytes, payload):
+    # memory mapped files are copied so the cache doesn't hold the mapping open
+    if isinstance(payload, pyarrow.Buffer):
+        payload = payload.to_pybytes()
+    remote_cache.set(key, payload)
+
 
 def async_read_thru_cache(func):
     """
@@ -65,6 +105,7 @@ def async_read_thru_cache(func):
     if not remote_cache:
         # rather than make decisions - just use a dummy
         remote_cache = NullCache()
+    has_remote_cache = not isinstance(remote_cache, NullCache)
 
     buffer_pool = BufferPool()
 
@@ -81,11 +122,16 @@ def async_read_thru_cache(func):
             payload = None
             my_keys.add(key)
 
+            # the caches are called in threads, the event loop is shared by the reads of
+            # every query and a slow cache or a large copy would hold all of them up
+
             # try the buffer pool first
-            payload = buffer_pool.get(key, zero_copy=False)
+            payload = await asyncio.to_thread(buffer_pool.get, key, zero_copy=False)
             if payload is not None:
                 source = SOURCE_BUFFER_POOL
-                remote_cache.touch(key)  # help the remote cache track LRU
+                if has_remote_cache:
+                    # help the remote cache track LRU
+                    await asyncio.to_thread(remote_cache.touch, key)
                 statistics.bufferpool_hits += 1
                 read_buffer_ref = await pool.commit(payload)  # type: ignore
                 while read_buffer_ref is None:
@@ -97,7 +143,8 @@ def async_read_thru_cache(func):
                 return read_buffer_ref
 
             # try the remote cache next
-            payload = remote_cache.get(key)
+            if has_remote_cache:
+                payload = await asyncio.to_thread(remote_cache.get, key)
             if payload is not None:
                 source = SOURCE_REMOTE_CACHE
                 statistics.remote_cache_hits += 1
@@ -124,14 +171,20 @@ def async_read_thru_cache(func):
                 raise  # Optionally re-raise the error after logging it
 
         finally:
+            # memory mapped local files are already in the OS page cache, we don't copy
+            # them to the buffer pool but they may be worth sharing in the remote cache
+            memory_mapped = isinstance(read_buffer_ref, pyarrow.Buffer)
+            if memory_mapped:
+                payload = read_buffer_ref
+
             # If we found the file, see if we need to write it to the caches
-            if source != SOURCE_NOT_FOUND and evictions_remaining > 0:
+            if source != SOURCE_NOT_FOUND and not memory_mapped and evictions_remaining > 0:
                 # we set a per-query eviction limit
                 payload = await pool.read(read_buffer_ref)  # type: ignore
 
                 if source != SOURCE_BUFFER_POOL and len(payload) < buffer_pool.size // 10:
                     # if we didn't get it from the buffer pool (origin or remote cache) we add it
-                    evicted = buffer_pool.set(key, payload)
+                    evicted = await asyncio.to_thread(buffer_pool.set, key, payload)
                     if evicted:
                         # if we're evicting items we just put in the cache, stop
                         if evicted in my_keys:
@@ -141,8 +194,10 @@ def async_read_thru_cache(func):
                         statistics.cache_evictions += 1
 
             if source == SOURCE_ORIGIN and len(payload) < MAX_CACHEABLE_ITEM_SIZE:
-                # If we read from the source, it's not in the remote cache
-                remote_cache.set(key, payload)
+                # If we read from the source, it's not in the remote cache, copying a memory
+                # mapped file reads all of it so we only do that if there's a cache to keep it
+                if has_remote_cache:
+                    await asyncio.to_thread(_set_remote_cache, remote_cache, key, payload)
             else:
                 statistics.cache_oversize += 1
 
@@ -0,0 +1,25 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This is a marker for connectors which can apply a LIMIT when reading.
+
+Where nothing between the LIMIT and the read changes the number of rows (e.g. filters
+which couldn't be pushed to the connector, joins or aggregations), the limit (plus any
+offset) is sent to the connector so only the rows needed are read. The LIMIT is still
+applied by Opteryx so connectors can treat it as a hint.
+"""
+
+
+class LimitPushable:
+    def __init__(self, **kwargs):
+        pass
@@ -0,0 +1,26 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This is a marker for connectors which can apply an ORDER BY with a LIMIT (top-N) when
+reading.
+
+The ordering is sent to the connector as a list of (column identity, direction) tuples,
+the columns are always columns of the relation being read, or when aggregates have been
+pushed to the connector, the aggregates or groups. The ORDER BY and LIMIT are still
+applied by Opteryx, this means only N rows are read but they are still sorted.
+"""
+
+
+class TopNPushable:
+    def __init__(self, **kwargs):
+        pass
@@ -17,13 +17,20 @@ given as a folder on local disk
 
 import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Union
 
 import pyarrow
 from orso.schema import RelationSchema
 from orso.types import OrsoTypes
 
+from opteryx.config import DISABLE_MEMORY_MAPPED_READS
+from opteryx.config import LOCAL_READ_THREADS
 from opteryx.connectors.base.base_connector import BaseConnector
 from opteryx.connectors.capabilities import Asynchronous
 from opteryx.connectors.capabilities import Cacheable
@@ -33,6 +40,8 @@ from opteryx.exceptions import DataError
 from opteryx.exceptions import DatasetNotFoundError
 from opteryx.exceptions import EmptyDatasetError
 from opteryx.exceptions import UnsupportedFileTypeError
+from opteryx.shared import MetadataCache
+from opteryx.utils.file_decoders import MEMORY_MAPPABLE_EXTENSIONS
 from opteryx.utils.file_decoders import TUPLE_OF_VALID_EXTENSIONS
 from opteryx.utils.file_decoders import get_decoder
 
@@ -42,6 +51,53 @@ OS_SEP = os.sep
 if not hasattr(os, "O_BINARY"):
     os.O_BINARY = 0  # Value has no effect on non-Windows platforms
 
+# shared by all queries, the threads are only started when they're first needed
+LOCAL_READ_POOL = ThreadPoolExecutor(
+    max_workers=LOCAL_READ_THREADS, thread_name_prefix="opteryx-local-read"
+)
+
+
+def read_local_file(file_name: str, will_need: bool = False) -> Union[bytes, pyarrow.Buffer]:
+    """
+    Read a file from local disk.
+
+    Parquet and Arrow files are memory mapped, the decoders read them in place so the
+    file isn't copied into memory and only the pages we decode are read from disk. The
+    returned buffer keeps the mapping open for as long as it, or any data decoded
+    without copying from it, is referenced.
+
+    We're using the low-level read for other files, on the whole it's about 5% faster -
+    not much faster considering the effort to bench-mark different disk access methods,
+    but as one of the slowest parts of the system we wanted to find if there was a
+    faster way.
+
+    Set will_need when the file is read ahead of being decoded, the OS then loads
+    memory mapped Arrow files in the background rather than as they are decoded. Parquet
+    files aren't loaded ahead, only the column chunks and row groups which are decoded
+    are read from them.
+    """
+    if not DISABLE_MEMORY_MAPPED_READS and file_name.lower().endswith(MEMORY_MAPPABLE_EXTENSIONS):
+        if (
+            will_need
+            and hasattr(os, "posix_fadvise")
+            and not file_name.lower().endswith(".parquet")
+        ):
+            # ask the OS to start loading the file, the pages are otherwise read as
+            # they are decoded, Arrow files are usually decoded in full
+            file_descriptor = os.open(file_name, os.O_RDONLY | os.O_BINARY)
+            try:
+                os.posix_fadvise(file_descriptor, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(file_descriptor)
+        with pyarrow.memory_map(file_name, "r") as mapped_file:
+            return mapped_file.read_buffer()
+
+    file_descriptor = os.open(file_name, os.O_RDONLY | os.O_BINARY)
+    try:
+        return os.read(file_descriptor, os.path.getsize(file_name))
+    finally:
+        os.close(file_descriptor)
+
 
 class DiskConnector(BaseConnector, Cacheable, Partitionable, PredicatePushable, Asynchronous):
     __mode__ = "Blob"
@@ -84,15 +140,10 @@ class DiskConnector(BaseConnector, Cacheable, Partitionable, PredicatePushable,
         self.cached_first_blob = None  # Cache for the first blob in the dataset
         self.blob_list = {}
 
-    def read_blob(self, *, blob_name, **kwargs) -> bytes:
+    def read_blob(self, *, blob_name, **kwargs) -> Union[bytes, pyarrow.Buffer]:
         """
         Read a blob (binary large object) from disk.
 
-        We're using the low-level read, on the whole it's about 5% faster - not
-        much faster considering the effort to bench-mark different disk access
-        methods, but as one of the slowest parts of the system we wanted to find
-        if there was a faster way.
-
         Parameters:
             blob_name: str
                 The name of the blob file to read.
@@ -100,32 +151,44 @@ class DiskConnector(BaseConnector, Cacheable, Partitionable, PredicatePushable,
                 Arbitrary keyword arguments.
 
         Returns:
-            The blob as bytes.
+            The blob as bytes, or as a memory mapped buffer.
         """
-        file_descriptor = os.open(blob_name, os.O_RDONLY | os.O_BINARY)
-        try:
-            size = os.path.getsize(blob_name)
-            self.statistics.bytes_read += size
-            return os.read(file_descriptor, size)
-        finally:
-            os.close(file_descriptor)
+        data = read_local_file(blob_name)
+        self.statistics.bytes_read += len(data)
+        return data
 
     async def async_read_blob(self, *, blob_name, pool, statistics, **kwargs):
         from opteryx import system_statistics
 
         # DEBUG: log ("READ   ", blob_name)
-        with open(blob_name, "rb") as file:
-            data = file.read()
-            if len(data) > pool.size():
-                raise ValueError(f"File {blob_name} is too large for read buffer")
+        # read in the I/O threads so the reads are concurrent and don't block the event loop
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(
+            LOCAL_READ_POOL, partial(read_local_file, blob_name, will_need=True)
+        )
+        statistics.bytes_read += len(data)
+        if isinstance(data, pyarrow.Buffer):
+            # memory mapped files are decoded in place, they don't go through the pool
+            return data
+        if len(data) > pool.size():
+            raise ValueError(f"File {blob_name} is too large for read buffer")
+        ref = await pool.commit(data)
+        while ref is None:
+            statistics.stalls_writing_to_read_buffer += 1
+            await asyncio.sleep(0.1)
+            system_statistics.cpu_wait_seconds += 0.1
             ref = await pool.commit(data)
-            while ref is None:
-                statistics.stalls_writing_to_read_buffer += 1
-                await asyncio.sleep(0.1)
-                system_statistics.cpu_wait_seconds += 0.1
-                ref = await pool.commit(data)
-            statistics.bytes_read += len(data)
-            return ref
+        return ref
+
+    def get_blob_version(self, blob_name: str) -> Optional[str]:
+        """
+        The version of a file on disk is its modification time and size.
+        """
+        try:
+            stat = os.stat(blob_name)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
 
     def get_list_of_blob_names(self, *, prefix: str) -> List[str]:
         """
@@ -142,6 +205,13 @@ class DiskConnector(BaseConnector, Cacheable, Partitionable, PredicatePushable,
         if prefix in self.blob_list:
             return self.blob_list[prefix]
 
+        metadata_cache = MetadataCache()
+        cached_listing = metadata_cache.get_listing(self.__type__, prefix)
+        if cached_listing is not None:
+            self.statistics.metadata_cache_hits += 1
+            self.blob_list[prefix], _ = cached_listing
+            return self.blob_list[prefix]
+
         blobs = sorted(
             os.path.join(root, file)
             for root, _, files in os.walk(prefix)
@@ -150,8 +220,17 @@ class DiskConnector(BaseConnector, Cacheable, Partitionable, PredicatePushable,
         )
 
         self.blob_list[prefix] = blobs
+        metadata_cache.set_listing(self.__type__, prefix, blobs)
         return blobs
 
+    async def async_get_list_of_blob_names(
+        self, *, prefix: str, **kwargs
+    ) -> AsyncIterator[List[str]]:
+        """
+        List the blob files in the given directory path without blocking the event loop.
+        """
+        yield await asyncio.to_thread(self.get_list_of_blob_names, prefix=prefix)
+
     def read_dataset(
         self,
         columns: list = None,
@@ -204,6 +283,13 @@ class DiskConnector(BaseConnector, Cacheable, Partitionable, PredicatePushable,
         if self.schema:
             return self.schema
 
+        metadata_cache = MetadataCache()
+        qualifiers = (self.partition_scheme.__class__.__name__, self.start_date, self.end_date)
+        self.schema = metadata_cache.get_schema(self.__type__, self.dataset, *qualifiers)
+        if self.schema is not None:
+            self.statistics.metadata_cache_hits += 1
+            return self.schema
+
         self.schema = next(self.read_dataset(just_schema=True), None)
 
         if self.schema is None:
@@ -211,4 +297,5 @@ class DiskConnector(BaseConnector, Cacheable, Partitionable, PredicatePushable,
                 raise EmptyDatasetError(dataset=self.dataset.replace(OS_SEP, "."))
             raise DatasetNotFoundError(dataset=self.dataset)
 
+        metadata_cache.set_schema(self.__type__, self.dataset, self.schema, *qualifiers)
         return self.schema
@@ -15,9 +15,9 @@ The file connector provides the reader for when a file name is provided as the
 dataset name in a query.
 """
 
-import os
 from typing import Dict
 from typing import Optional
+from typing import Union
 
 import pyarrow
 from orso.schema import RelationSchema
@@ -25,19 +25,16 @@ from orso.types import OrsoTypes
 
 from opteryx.connectors.base.base_connector import BaseConnector
 from opteryx.connectors.capabilities import PredicatePushable
+from opteryx.connectors.disk_connector import read_local_file
 from opteryx.exceptions import DataError
 from opteryx.exceptions import DatasetNotFoundError
 from opteryx.utils.file_decoders import get_decoder
 
-# Define os.O_BINARY for non-Windows platforms if it's not already defined
-if not hasattr(os, "O_BINARY"):
-    os.O_BINARY = 0  # Value has no effect on non-Windows platforms
-
 
 class FileConnector(BaseConnector, PredicatePushable):
     __mode__ = "Blob"
     __type__ = "FILE"
-    _byte_array: Optional[bytes] = None  # Instance attribute to store file bytes
+    _byte_array: Optional[Union[bytes, pyarrow.Buffer]] = None  # the file's contents
 
     PUSHABLE_OPS: Dict[str, bool] = {
         "Eq": True,
@@ -72,14 +69,11 @@ class FileConnector(BaseConnector, PredicatePushable):
 
     def _read_file(self) -> None:
         """
-        Reads the dataset file and stores its content in _byte_array attribute.
+        Reads the dataset file and stores its content in _byte_array attribute, Parquet
+        and Arrow files are memory mapped rather than read.
         """
         if self._byte_array is None:
-            file_descriptor = os.open(self.dataset, os.O_RDONLY | os.O_BINARY)
-            try:
-                self._byte_array = os.read(file_descriptor, os.path.getsize(self.dataset))
-            finally:
-                os.close(file_descriptor)
+            self._byte_array = read_local_file(self.dataset)
 
     def read_dataset(
         self, columns: list = None, predicates: list = None, **kwargs
@@ -11,10 +11,15 @@
 # limitations under the License.
 
 import asyncio
+import datetime
 import os
+import threading
 import urllib.request
+from typing import AsyncIterator
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import pyarrow
 from orso.schema import RelationSchema
@@ -29,6 +34,7 @@ from opteryx.exceptions import DatasetNotFoundError
 from opteryx.exceptions import DatasetReadError
 from opteryx.exceptions import MissingDependencyError
 from opteryx.exceptions import UnsupportedFileTypeError
+from opteryx.shared import MetadataCache
 from opteryx.utils import paths
 from opteryx.utils.file_decoders import TUPLE_OF_VALID_EXTENSIONS
 from opteryx.utils.file_decoders import get_decoder
@@ -57,6 +63,55 @@ def get_storage_credentials():
     return _storage_client._credentials
 
 
+# tokens expiring within this time are refreshed in the background, the auth library
+# treats tokens as invalid a few minutes before they expire so this must be longer
+TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=10)
+_token_lock = threading.Lock()
+_token_refreshing = threading.Event()
+
+
+def _token_expires_soon(credentials) -> bool:
+    expiry = getattr(credentials, "expiry", None)
+    if expiry is None:
+        return False
+    # the auth library holds expiry as a naive UTC datetime
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return expiry - now < TOKEN_REFRESH_MARGIN
+
+
+def _refresh_credentials(credentials):
+    from google.auth.transport.requests import Request
+
+    with _token_lock:
+        try:
+            # another thread may have refreshed the token while we waited
+            if not credentials.valid or _token_expires_soon(credentials):
+                credentials.refresh(Request())
+        finally:
+            _token_refreshing.clear()
+
+
+def get_access_token() -> str:
+    """
+    Get a token for the GCS API, this is shared by all connectors.
+
+    Tokens which are about to expire are refreshed on a background thread, so reads only
+    wait for a token when the token has already expired.
+    """
+    credentials = get_storage_credentials()
+    if not credentials.valid:
+        _refresh_credentials(credentials)
+    elif _token_expires_soon(credentials) and not _token_refreshing.is_set():
+        _token_refreshing.set()
+        threading.Thread(
+            target=_refresh_credentials,
+            args=(credentials,),
+            name="opteryx-gcs-token-refresh",
+            daemon=True,
+        ).start()
+    return credentials.token
+
+
 class GcpCloudStorageConnector(
     BaseConnector, Cacheable, Partitionable, PredicatePushable, Asynchronous
 ):
@@ -103,11 +158,8 @@ class GcpCloudStorageConnector(
         # sometimes both start here
         self.client_credentials = get_storage_credentials()
 
-        # Cache access tokens for accessing GCS
-        if not self.client_credentials.valid:
-            request = Request()
-            self.client_credentials.refresh(request)
-        self.access_token = self.client_credentials.token
+        # get a token now so the first reads don't wait for one
+        get_access_token()
 
         # Create a HTTP connection session to reduce effort for each fetch
         # synchronous only
@@ -115,6 +167,7 @@ class GcpCloudStorageConnector(
 
         # cache so we only fetch this once
         self.blob_list = {}
+        self.blob_versions: Dict[str, str] = {}
 
     def read_blob(self, *, blob_name, **kwargs):
         # For performance we use the GCS API directly, this is roughly 10%
@@ -122,14 +175,6 @@ class GcpCloudStorageConnector(
         # 10% can be measured in seconds.
         bucket, _, _, _ = paths.get_parts(blob_name)
 
-        # Ensure the credentials are valid, refreshing them if necessary
-        if not self.client_credentials.valid:  # pragma: no cover
-            from google.auth.transport.requests import Request
-
-            request = Request()
-            self.client_credentials.refresh(request)
-            self.access_token = self.client_credentials.token
-
         if "kh" not in bucket:
             bucket = bucket.replace("va_data", "va-data")
             bucket = bucket.replace("data_", "data-")
@@ -138,7 +183,7 @@ class GcpCloudStorageConnector(
         url = f"https://storage.googleapis.com/storage/v1/b/{bucket}/o/{object_full_path}?alt=media"
 
         response = self.session.get(
-            url, headers={"Authorization": f"Bearer {self.access_token}"}, timeout=30
+            url, headers={"Authorization": f"Bearer {get_access_token()}"}, timeout=30
         )
         if response.status_code != 200:
             raise DatasetReadError(f"Unable to read '{blob_name}' - {response.status_code}")
@@ -153,14 +198,6 @@ class GcpCloudStorageConnector(
         bucket, _, _, _ = paths.get_parts(blob_name)
         # DEBUG: log ("READ   ", blob_name)
 
-        # Ensure the credentials are valid, refreshing them if necessary
-        if not self.client_credentials.valid:  # pragma: no cover
-            from google.auth.transport.requests import Request
-
-            request = Request()
-            self.client_credentials.refresh(request)
-            self.access_token = self.client_credentials.token
-
         if "kh" not in bucket:
             bucket = bucket.replace("va_data", "va-data")
             bucket = bucket.replace("data_", "data-")
@@ -170,10 +207,10 @@ class GcpCloudStorageConnector(
         url = f"https://storage.googleapis.com/storage/v1/b/{bucket}/o/{object_full_path}?alt=media"
 
         async with session.get(
-            url, headers={"Authorization": f"Bearer {self.access_token}"}, timeout=30
+            url, headers={"Authorization": f"Bearer {get_access_token()}"}, timeout=30
         ) as response:
             if response.status != 200:
-                raise Exception(f"Unable to read '{blob_name}' - {response.status_code}")
+                raise DatasetReadError(f"Unable to read '{blob_name}' - {response.status}")
             data = await response.read()
             ref = await pool.commit(data)
             while ref is None:
@@ -184,11 +221,13 @@ class GcpCloudStorageConnector(
             statistics.bytes_read += len(data)
             return ref
 
-    def get_list_of_blob_names(self, *, prefix: str) -> List[str]:
-        # only fetch once per prefix (partition)
-        if prefix in self.blob_list:
-            return self.blob_list[prefix]
+    def get_blob_version(self, blob_name: str) -> Optional[str]:
+        """
+        The generation of the blob, this is collected when the blobs are listed.
+        """
+        return self.blob_versions.get(blob_name)
 
+    def _get_listing_url(self, prefix: str) -> Tuple[str, str]:
         bucket, object_path, _, _ = paths.get_parts(prefix)
         if "kh" not in bucket:
             bucket = bucket.replace("va_data", "va-data")
@@ -198,17 +237,40 @@ class GcpCloudStorageConnector(
 
         object_path = urllib.parse.quote(object_path, safe="")
         bucket = urllib.parse.quote(bucket, safe="")  # Ensure bucket name is URL-safe
-        url = f"https://storage.googleapis.com/storage/v1/b/{bucket}/o?prefix={object_path}&fields=items(name)"
+        return (
+            bucket,
+            f"https://storage.googleapis.com/storage/v1/b/{bucket}/o?prefix={object_path}&fields=items(name,generation),nextPageToken",
+        )
 
-        # Ensure the credentials are valid, refreshing them if necessary
-        if not self.client_credentials.valid:  # pragma: no cover
-            from google.auth.transport.requests import Request
+    def _get_listing_headers(self) -> dict:
+        return {"Authorization": f"Bearer {get_access_token()}"}
 
-            request = Request()
-            self.client_credentials.refresh(request)
-            self.access_token = self.client_credentials.token
+    def _get_blobs_on_page(self, bucket: str, blob_data: dict) -> List[str]:
+        blob_names: List[str] = []
+        for blob in blob_data.get("items", []):
+            name = blob["name"]
+            if name.endswith(TUPLE_OF_VALID_EXTENSIONS):
+                blob_name = f"{bucket}/{name}"
+                blob_names.append(blob_name)
+                if blob.get("generation"):
+                    self.blob_versions[blob_name] = blob["generation"]
+        return blob_names
 
-        headers = {"Authorization": f"Bearer {self.access_token}"}
+    def get_list_of_blob_names(self, *, prefix: str) -> List[str]:
+        # only fetch once per prefix (partition)
+        if prefix in self.blob_list:
+            return self.blob_list[prefix]
+
+        metadata_cache = MetadataCache()
+        cached_listing = metadata_cache.get_listing(self.__type__, prefix)
+        if cached_listing is not None:
+            self.statistics.metadata_cache_hits += 1
+            self.blob_list[prefix], versions = cached_listing
+            self.blob_versions.update(versions)
+            return self.blob_list[prefix]
+
+        bucket, url = self._get_listing_url(prefix)
+        headers = self._get_listing_headers()
 
         params = None
         blob_names: List[str] = []
@@ -219,11 +281,7 @@ class GcpCloudStorageConnector(
                 raise DatasetReadError(f"Error fetching blob list: {response.text}")
 
             blob_data = response.json()
-            blob_names.extend(
-                f"{bucket}/{name}"
-                for name in (blob["name"] for blob in blob_data.get("items", []))
-                if name.endswith(TUPLE_OF_VALID_EXTENSIONS)
-            )
+            blob_names.extend(self._get_blobs_on_page(bucket, blob_data))
 
             page_token = blob_data.get("nextPageToken")
             if not page_token:
@@ -231,8 +289,53 @@ class GcpCloudStorageConnector(
             params = {"pageToken": page_token}
 
         self.blob_list[prefix] = blob_names
+        metadata_cache.set_listing(self.__type__, prefix, blob_names, self.blob_versions)
         return blob_names
 
+    async def async_get_list_of_blob_names(
+        self, *, prefix: str, session
+    ) -> AsyncIterator[List[str]]:
+        """
+        List the blobs with a prefix, yielding each page of the listing as it arrives so
+        the blobs on the first pages can be read while the later pages are fetched.
+        """
+        if prefix in self.blob_list:
+            yield self.blob_list[prefix]
+            return
+
+        metadata_cache = MetadataCache()
+        cached_listing = metadata_cache.get_listing(self.__type__, prefix)
+        if cached_listing is not None:
+            self.statistics.metadata_cache_hits += 1
+            self.blob_list[prefix], versions = cached_listing
+            self.blob_versions.update(versions)
+            yield self.blob_list[prefix]
+            return
+
+        bucket, url = self._get_listing_url(prefix)
+        headers = self._get_listing_headers()
+
+        params: dict = {}
+        blob_names: List[str] = []
+        while True:
+            async with session.get(url, headers=headers, timeout=30, params=params) as response:
+                if response.status != 200:  # pragma: no cover
+                    raise DatasetReadError(f"Error fetching blob list: {await response.text()}")
+                blob_data = await response.json()
+
+            page = self._get_blobs_on_page(bucket, blob_data)
+            blob_names.extend(page)
+            if page:
+                yield page
+
+            page_token = blob_data.get("nextPageToken")
+            if not page_token:
+                break
+            params = {"pageToken": page_token}
+
+        self.blob_list[prefix] = blob_names
+        metadata_cache.set_listing(self.__type__, prefix, blob_names, self.blob_versions)
+
     def read_dataset(
         self,
         columns: list = None,
@@ -275,10 +378,18 @@ class GcpCloudStorageConnector(
         if self.schema:
             return self.schema
 
+        metadata_cache = MetadataCache()
+        qualifiers = (self.partition_scheme.__class__.__name__, self.start_date, self.end_date)
+        self.schema = metadata_cache.get_schema(self.__type__, self.dataset, *qualifiers)
+        if self.schema is not None:
+            self.statistics.metadata_cache_hits += 1
+            return self.schema
+
         # Read first blob for schema inference and cache it
         self.schema = next(self.read_dataset(just_schema=True), None)
 
         if self.schema is None:
             raise DatasetNotFoundError(dataset=self.dataset)
 
+        metadata_cache.set_schema(self.__type__, self.dataset, self.schema, *qualifiers)
         return self.schema
@@ -114,12 +114,19 @@ class GcpFireStoreConnector(BaseConnector, PredicatePushable):
                     )
                 )
 
+        # only fetch the fields we need, the document id is always returned
+        if columns:
+            field_paths = [col.source_column for col in columns if col.source_column != "id"]
+            if field_paths:
+                documents = documents.select(field_paths)
+
         documents = documents.stream()
 
         for morsel in self.chunk_dictset(
             ({**doc.to_dict(), "_id": doc.id} for doc in documents),
             columns=columns,
             initial_chunk_size=chunk_size,
+            schema=self.schema,
         ):
             if collected_predicates:
                 morsel = filter_records(collected_predicates, morsel)
@@ -18,25 +18,80 @@ Based on the now deprecated Mabel MongoDB reader
 https://github.com/mabel-dev/mabel/blob/6bcd978b90870187d5eff939be3f5845a3cdf900/mabel/adapters/mongo/mongodb_reader.py
 """
 
+import datetime
 import os
+from typing import Any
+from typing import Dict
 from typing import Generator
 
+import numpy
 from orso.schema import FlatColumn
 from orso.schema import RelationSchema
+from orso.types import OrsoTypes
 
 from opteryx.connectors.base.base_connector import INITIAL_CHUNK_SIZE
 from opteryx.connectors.base.base_connector import BaseConnector
+from opteryx.connectors.capabilities import PredicatePushable
 from opteryx.exceptions import DatasetNotFoundError
 from opteryx.exceptions import MissingDependencyError
 from opteryx.exceptions import UnmetRequirementError
+from opteryx.managers.expression import NodeType
 
 
-class MongoDbConnector(BaseConnector):
+def _to_mongo_value(value: Any) -> Any:
+    """Convert literals to the types the MongoDB driver accepts"""
+    if isinstance(value, numpy.datetime64):
+        value = value.astype("datetime64[us]")
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time.min)
+    return value
+
+
+class MongoDbConnector(BaseConnector, PredicatePushable):
     __mode__ = "Collection"
     __type__ = "MONGODB"
 
+    PUSHABLE_OPS: Dict[str, bool] = {
+        "Eq": True,
+        "NotEq": True,
+        "Gt": True,
+        "GtEq": True,
+        "Lt": True,
+        "LtEq": True,
+    }
+
+    OPS_XLAT: Dict[str, str] = {
+        "Eq": "$eq",
+        "NotEq": "$nin",
+        "Gt": "$gt",
+        "GtEq": "$gte",
+        "Lt": "$lt",
+        "LtEq": "$lte",
+    }
+
+    # when the identifier is on the right, the comparison is reversed
+    OPS_REVERSED: Dict[str, str] = {
+        "Eq": "Eq",
+        "NotEq": "NotEq",
+        "Gt": "Lt",
+        "GtEq": "LtEq",
+        "Lt": "Gt",
+        "LtEq": "GtEq",
+    }
+
+    PUSHABLE_TYPES = {
+        OrsoTypes.BOOLEAN,
+        OrsoTypes.DOUBLE,
+        OrsoTypes.INTEGER,
+        OrsoTypes.VARCHAR,
+        OrsoTypes.TIMESTAMP,
+    }
+
     def __init__(self, *args, database: str = None, connection: str = None, **kwargs):
-        super().__init__(*args, **kwargs)
+        BaseConnector.__init__(self, **kwargs)
+        PredicatePushable.__init__(self, **kwargs)
 
         try:
             import pymongo  # type:ignore
@@ -64,15 +119,66 @@ class MongoDbConnector(BaseConnector):
                 "MongoDB connector requires 'database' set in register_stpre or MONGODB_DATABASE set in environment variables."
             )
 
+    def can_push(self, operator, types: set = None) -> bool:
+        if not super().can_push(operator, types):
+            return False
+        # we can only push comparisons of a field to a literal, 'id' is the
+        # string form of the '_id' field so comparisons to it can't be pushed
+        operands = {operator.condition.left.node_type, operator.condition.right.node_type}
+        if operands != {NodeType.IDENTIFIER, NodeType.LITERAL}:
+            return False
+        identifier = (
+            operator.condition.left
+            if operator.condition.left.node_type == NodeType.IDENTIFIER
+            else operator.condition.right
+        )
+        return identifier.source_column != "id"
+
+    def _build_filter(self, predicates: list) -> dict:
+        """
+        Convert the pushed predicates to a MongoDB filter document.
+        """
+        conditions = []
+        for predicate in predicates:
+            operator = predicate.value
+            if predicate.left.node_type == NodeType.IDENTIFIER:
+                identifier, literal = predicate.left, predicate.right
+            else:
+                identifier, literal = predicate.right, predicate.left
+                operator = self.OPS_REVERSED[operator]
+            value = _to_mongo_value(literal.value)
+            if operator == "NotEq":
+                # SQL comparisons exclude nulls, MongoDB's $ne doesn't
+                value = [value, None]
+            conditions.append({identifier.source_column: {self.OPS_XLAT[operator]: value}})
+        if not conditions:
+            return {}
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
+
     def read_dataset(
-        self, columns: list = None, chunk_size: int = INITIAL_CHUNK_SIZE, **kwargs
+        self,
+        columns: list = None,
+        chunk_size: int = INITIAL_CHUNK_SIZE,
+        predicates: list = None,
+        **kwargs,
     ) -> Generator:
         import pymongo
 
         client = pymongo.MongoClient(self.connection)  # type:ignore
         database = client[self.database]
-        documents = database[self.dataset].find()
-        for morsel in self.chunk_dictset(documents, columns=columns, initial_chunk_size=chunk_size):
+
+        # only fetch the fields we need, the '_id' is always returned
+        projection = None
+        if columns is not None:
+            projection = {col.source_column: True for col in columns if col.source_column != "id"}
+            projection = projection or {"_id": True}
+
+        documents = database[self.dataset].find(self._build_filter(predicates or []), projection)
+        for morsel in self.chunk_dictset(
+            documents, columns=columns, initial_chunk_size=chunk_size, schema=self.schema
+        ):
             yield morsel
 
     def get_dataset_schema(self) -> RelationSchema:
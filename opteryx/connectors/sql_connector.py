@@ -15,32 +15,117 @@ The SQL Connector downloads data from remote servers and converts them
 to pyarrow tables so they can be processed as per any other data source.
 """
 
+import datetime
+import decimal
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Dict
 from typing import Generator
+from typing import List
+from typing import Optional
 from typing import Tuple
 
 import pyarrow
-from orso import DataFrame
 from orso.schema import ConstantColumn
 from orso.schema import FlatColumn
 from orso.schema import RelationSchema
+from orso.schema import convert_orso_schema_to_arrow_schema
 from orso.tools import random_string
 from orso.types import PYTHON_TO_ORSO_MAP
+from orso.types import OrsoTypes
 
 from opteryx.config import OPTERYX_DEBUG
 from opteryx.connectors.base.base_connector import DEFAULT_MORSEL_SIZE
 from opteryx.connectors.base.base_connector import INITIAL_CHUNK_SIZE
 from opteryx.connectors.base.base_connector import MIN_CHUNK_SIZE
 from opteryx.connectors.base.base_connector import BaseConnector
+from opteryx.connectors.capabilities import AggregatePushable
+from opteryx.connectors.capabilities import LimitPushable
 from opteryx.connectors.capabilities import PredicatePushable
+from opteryx.connectors.capabilities import TopNPushable
 from opteryx.exceptions import MissingDependencyError
 from opteryx.exceptions import UnmetRequirementError
 from opteryx.managers.expression import Node
 from opteryx.managers.expression import NodeType
+from opteryx.shared import MetadataCache
 from opteryx.third_party.query_builder import Query
 
+NATIVE_ARROW_BATCH_SIZE: int = 100_000
+PARTITIONABLE_TYPES = (int, float, decimal.Decimal, datetime.date, datetime.datetime)
+
+
+def _rows_to_arrow(rows: list, schema: RelationSchema) -> pyarrow.Table:
+    """
+    Convert rows to an Arrow table a column at a time, if the values don't match the
+    types in the schema, we let Arrow infer the types.
+    """
+    arrow_schema = convert_orso_schema_to_arrow_schema(schema)
+    columns = list(zip(*rows)) if rows else [[] for _ in arrow_schema]
+    try:
+        return pyarrow.Table.from_arrays(
+            [
+                pyarrow.array(column, type=field.type)
+                for column, field in zip(columns, arrow_schema)
+            ],
+            schema=arrow_schema,
+        )
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError):
+        return pyarrow.Table.from_arrays(
+            [pyarrow.array(column) for column in columns], names=arrow_schema.names
+        )
+
+
+def _cast_to_schema(morsel: pyarrow.Table, schema: RelationSchema) -> pyarrow.Table:
+    """
+    Cast the morsel to the types in the schema, some databases return wider types than
+    we expect (e.g. DuckDB returns SUMs of integers as decimals), where the values can't
+    be cast we leave the types as they are.
+    """
+    arrow_schema = convert_orso_schema_to_arrow_schema(schema)
+    if morsel.schema.types == arrow_schema.types:
+        return morsel
+    try:
+        return morsel.cast(arrow_schema)
+    except (ValueError, pyarrow.ArrowNotImplementedError, pyarrow.ArrowTypeError):
+        return morsel
+
+
+def _native_arrow_reader(dbapi_cursor, batch_size: int) -> Optional[pyarrow.RecordBatchReader]:
+    """
+    Get a RecordBatchReader from the DBAPI cursor if the driver can return Arrow.
+    """
+    for method in ("to_arrow_reader", "fetch_record_batch"):
+        fetch = getattr(dbapi_cursor, method, None)
+        if callable(fetch):
+            try:
+                return fetch(batch_size)
+            except TypeError:
+                # ADBC doesn't take a batch size
+                return fetch()
+    return None
+
+
+def _partition_bounds(lowest, highest, partitions: int) -> list:
+    """
+    Split the range between the lowest and highest values into even ranges, returning
+    the bounds of the ranges. Works for numbers, dates and times.
+    """
+    if partitions < 2 or not isinstance(lowest, PARTITIONABLE_TYPES) or isinstance(lowest, bool):
+        return []
+    if lowest == highest:
+        return [lowest, highest]
+    span = highest - lowest
+    if isinstance(lowest, (float, decimal.Decimal)):
+        bounds = [lowest + span * i / partitions for i in range(partitions)]
+    else:
+        bounds = [lowest + span * i // partitions for i in range(partitions)]
+    # ranges narrower than one value are collapsed
+    bounds = sorted(set(bounds))
+    return bounds + [highest]
+
 
 def _handle_operand(operand: Node, parameters: dict) -> Tuple[Any, dict]:
     if operand.node_type == NodeType.IDENTIFIER:
@@ -55,10 +140,36 @@ def _handle_operand(operand: Node, parameters: dict) -> Tuple[Any, dict]:
     return f":{name}", parameters
 
 
-class SqlConnector(BaseConnector, PredicatePushable):
+class SqlConnector(
+    BaseConnector, PredicatePushable, LimitPushable, TopNPushable, AggregatePushable
+):
     __mode__ = "Sql"
     __type__ = "SQL"
 
+    PUSHABLE_AGGREGATES: Dict[str, bool] = {
+        "COUNT": True,
+        "SUM": True,
+        "MIN": True,
+        "MINIMUM": True,
+        "MAX": True,
+        "MAXIMUM": True,
+        "AVG": True,
+        "AVERAGE": True,
+        "MEAN": True,
+    }
+
+    AGGREGATES_XLAT: Dict[str, str] = {
+        "COUNT": "COUNT",
+        "SUM": "SUM",
+        "MIN": "MIN",
+        "MINIMUM": "MIN",
+        "MAX": "MAX",
+        "MAXIMUM": "MAX",
+        "AVG": "AVG",
+        "AVERAGE": "AVG",
+        "MEAN": "AVG",
+    }
+
     PUSHABLE_OPS: Dict[str, bool] = {
         "Eq": True,
         "NotEq": True,
@@ -93,9 +204,20 @@ class SqlConnector(BaseConnector, PredicatePushable):
         "IsNotNull": "IS NOT NULL",
     }
 
-    def __init__(self, *args, connection: str = None, engine=None, **kwargs):
+    def __init__(
+        self,
+        *args,
+        connection: str = None,
+        engine=None,
+        partition_column: Optional[str] = None,
+        partitions: int = 1,
+        **kwargs,
+    ):
         BaseConnector.__init__(self, **kwargs)
         PredicatePushable.__init__(self, **kwargs)
+        LimitPushable.__init__(self, **kwargs)
+        TopNPushable.__init__(self, **kwargs)
+        AggregatePushable.__init__(self, **kwargs)
 
         try:
             from sqlalchemy import MetaData
@@ -118,37 +240,19 @@ class SqlConnector(BaseConnector, PredicatePushable):
         self.schema = None  # type: ignore
         self.metadata = MetaData()
 
+        # partitioned reads split the dataset on a numeric or date column, the primary
+        # key is used if a column isn't provided, and read the ranges concurrently
+        self.partition_column = partition_column
+        self.partitions = max(1, partitions)
+
     def can_push(self, operator: Node, types: set = None) -> bool:
         if super().can_push(operator, types):
             return True
         return operator.condition.node_type == NodeType.UNARY_OPERATOR
 
-    def read_dataset(  # type:ignore
-        self,
-        *,
-        columns: list = None,
-        predicates: list = None,
-        chunk_size: int = INITIAL_CHUNK_SIZE,  # type:ignore
-    ) -> Generator[pyarrow.Table, None, None]:  # type:ignore
-        from sqlalchemy.sql import text
-
-        self.chunk_size = chunk_size
-        result_schema = self.schema
-
+    def _build_query(self, select: list, predicates: list) -> Tuple[Query, dict]:
         query_builder = Query().FROM(self.dataset)
-
-        # Update the SQL and the target morsel schema if we've pushed a projection
-        if columns:
-            column_names = [col.schema_column.name for col in columns]
-            query_builder.add("SELECT", *column_names)
-            result_schema.columns = [  # type:ignore
-                col
-                for col in self.schema.columns  # type:ignore
-                if col.name in column_names  # type:ignore
-            ]
-        else:
-            query_builder.add("SELECT", "1")
-            self.schema.columns = [ConstantColumn(name="1", value=1)]  # type:ignore
+        query_builder.add("SELECT", *select)
 
         # Update SQL if we've pushed predicates
         parameters: dict = {}
@@ -168,48 +272,280 @@ class SqlConnector(BaseConnector, PredicatePushable):
 
                 query_builder.WHERE(f"{left_value} {operator} {right_value}")
 
-        at_least_once = False
+        return query_builder, parameters
+
+    def _primary_key(self) -> Optional[str]:
+        """
+        Get the primary key of the dataset, if it is a single column.
+        """
+        from sqlalchemy import inspect
+
+        schema, _, table = self.dataset.rpartition(".")
+        try:
+            constraint = inspect(self._engine).get_pk_constraint(table, schema=schema or None)
+        except Exception:  # pragma: no cover - not all dialects can do this
+            return None
+        columns = constraint.get("constrained_columns") or []
+        return columns[0] if len(columns) == 1 else None
+
+    def _partition_ranges(self, predicates: list) -> List[Tuple[str, dict]]:
+        """
+        Split the dataset into ranges of the partition column, the ranges are returned
+        as WHERE conditions and their parameters.
+        """
+        from sqlalchemy.sql import text
+
+        column = self.partition_column or self._primary_key()
+        if column is None:
+            return []
+
+        query_builder, parameters = self._build_query(
+            [f"MIN({column})", f"MAX({column})"], predicates
+        )
+        with self._engine.connect() as conn:
+            lowest, highest = conn.execute(text(str(query_builder)), parameters).fetchone()
+
+        bounds = _partition_bounds(lowest, highest, self.partitions)
+        if len(bounds) < 2:
+            return []
+
+        ranges = []
+        for index, (lower, upper) in enumerate(zip(bounds, bounds[1:])):
+            last = index == len(bounds) - 2
+            condition = f"{column} >= :partition_lower AND {column} {'<=' if last else '<'} :partition_upper"
+            if index == 0:
+                # rows without a value in the partition column are read with the first range
+                condition = f"{column} IS NULL OR ({condition})"
+            ranges.append((f"({condition})", {"partition_lower": lower, "partition_upper": upper}))
+        return ranges
+
+    def _read_query(
+        self, query: str, parameters: dict, result_schema: RelationSchema
+    ) -> Generator[pyarrow.Table, None, None]:
+        from sqlalchemy.sql import text
 
-        convert_time = 0.0
+        chunk_size = self.chunk_size
 
         with self._engine.connect() as conn:
-            # DEBUG: log ("READ DATASET\n", str(query_builder))
+            # DEBUG: log ("READ DATASET\n", query)
             # DEBUG: log ("PARAMETERS\n", parameters)
             # Execution Options allows us to handle datasets larger than memory
             result = conn.execution_options(stream_results=True, max_row_buffer=25000).execute(
-                text(str(query_builder)), parameters=parameters
+                text(query), parameters=parameters
             )
 
+            # Some drivers (DuckDB, ADBC) can return the result as Arrow
+            reader = _native_arrow_reader(result.cursor, NATIVE_ARROW_BATCH_SIZE)
+            if reader is not None:
+                names = [column.name for column in result_schema.columns]
+                while True:
+                    t = time.monotonic_ns()
+                    try:
+                        batch = reader.read_next_batch()
+                    except StopIteration:
+                        break
+                    finally:
+                        self.statistics.time_waiting_sql += time.monotonic_ns() - t
+                    morsel = pyarrow.Table.from_batches([batch])
+                    # the columns are named as they were in the SELECT
+                    if morsel.num_columns == len(names):
+                        morsel = morsel.rename_columns(names)
+                    yield morsel
+                return
+
             while True:
                 t = time.monotonic_ns()
-                batch_rows = result.fetchmany(self.chunk_size)
-                self.statistics.time_waiting_sql = time.monotonic_ns() - t
+                batch_rows = result.fetchmany(chunk_size)
+                self.statistics.time_waiting_sql += time.monotonic_ns() - t
                 if not batch_rows:
                     break
 
-                # convert the SqlAlchemy Results to Arrow using Orso
-                b = time.monotonic_ns()
-                morsel = DataFrame(schema=result_schema, rows=batch_rows).arrow()
-                convert_time += time.monotonic_ns() - b
+                # convert the SqlAlchemy Results to Arrow a column at a time
+                t = time.monotonic_ns()
+                morsel = _rows_to_arrow(batch_rows, result_schema)
+                self.statistics.time_converting_sql += time.monotonic_ns() - t
                 yield morsel
-                at_least_once = True
 
                 # Dynamically adjust chunk size based on the data size, we start by downloading
                 # 500 records to get an idea of the row size, assuming these 500 are
                 # representative, we work out how many rows fit into 16Mb (check setting).
                 # Don't keep recalculating, this is not a cheap operation and it's predicting
                 # the future so isn't going to ever be 100% correct
-                if self.chunk_size == INITIAL_CHUNK_SIZE and morsel.nbytes > 0:
-                    self.chunk_size = int(len(morsel) // (morsel.nbytes / DEFAULT_MORSEL_SIZE)) + 1
-                    self.chunk_size = (self.chunk_size // MIN_CHUNK_SIZE) * MIN_CHUNK_SIZE
-                    self.chunk_size = max(self.chunk_size, MIN_CHUNK_SIZE)
-                    self.chunk_size = min(self.chunk_size, 1000000)  # cap at 1 million
-                    # DEBUG: log (f"CHANGING CHUNK SIZE TO {self.chunk_size} was {INITIAL_CHUNK_SIZE}.")
+                if chunk_size == INITIAL_CHUNK_SIZE and morsel.nbytes > 0:
+                    chunk_size = int(len(morsel) // (morsel.nbytes / DEFAULT_MORSEL_SIZE)) + 1
+                    chunk_size = (chunk_size // MIN_CHUNK_SIZE) * MIN_CHUNK_SIZE
+                    chunk_size = max(chunk_size, MIN_CHUNK_SIZE)
+                    chunk_size = min(chunk_size, 1000000)  # cap at 1 million
+                    # DEBUG: log (f"CHANGING CHUNK SIZE TO {chunk_size} was {INITIAL_CHUNK_SIZE}.")
+
+    def _read_partitions(
+        self, queries: List[Tuple[str, dict]], result_schema: RelationSchema
+    ) -> Generator[pyarrow.Table, None, None]:
+        """
+        Read each of the queries on its own connection, morsels are returned in the order
+        they are read.
+        """
+        morsels: queue.Queue = queue.Queue(maxsize=len(queries) * 2)
+        stop = threading.Event()
+
+        def _put(item):
+            while not stop.is_set():
+                try:
+                    morsels.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def _worker(query, parameters):
+            reader = self._read_query(query, parameters, result_schema)
+            try:
+                for morsel in reader:
+                    if stop.is_set():
+                        return
+                    _put(morsel)
+            except Exception as err:  # pragma: no cover
+                _put(err)
+            finally:
+                # close the connection on the thread which opened it
+                reader.close()
+                _put(None)
+
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            for query, parameters in queries:
+                pool.submit(_worker, query, parameters)
+            try:
+                remaining = len(queries)
+                while remaining:
+                    item = morsels.get()
+                    if item is None:
+                        remaining -= 1
+                    elif isinstance(item, Exception):  # pragma: no cover
+                        raise item
+                    else:
+                        yield item
+            finally:
+                stop.set()
+
+    def _aggregate_projection(
+        self, aggregates: list, groups: list
+    ) -> Tuple[list, RelationSchema, Dict[str, str]]:
+        """
+        Build the SELECT for pushed aggregates, the schema of the results and the SQL
+        expression for each group and aggregate (for ORDER BY).
+        """
+        select: list = []
+        columns: list = []
+        expressions: Dict[str, str] = {}
+
+        for index, group in enumerate(groups):
+            expression = group.schema_column.name
+            select.append((f"_group_{index}", expression))
+            columns.append(
+                FlatColumn(name=group.schema_column.identity, type=group.schema_column.type)
+            )
+            expressions[group.schema_column.identity] = expression
+
+        for index, aggregate in enumerate(aggregates):
+            if aggregate.schema_column.identity in expressions:
+                # the same aggregate is used more than once in the query
+                continue
+            parameter = aggregate.parameters[0]
+            function = self.AGGREGATES_XLAT[aggregate.value]
+            if parameter.node_type == NodeType.WILDCARD:
+                expression = f"{function}(*)"
+            else:
+                expression = f"{function}({parameter.schema_column.name})"
+            if function == "COUNT":
+                result_type = OrsoTypes.INTEGER
+            elif function == "AVG":
+                result_type = OrsoTypes.DOUBLE
+            else:
+                result_type = parameter.schema_column.type
+            select.append((f"_aggregate_{index}", expression))
+            columns.append(FlatColumn(name=aggregate.schema_column.identity, type=result_type))
+            expressions[aggregate.schema_column.identity] = expression
 
-        if not at_least_once:
-            yield DataFrame(schema=result_schema).arrow()
+        return select, RelationSchema(name=self.dataset, columns=columns), expressions
+
+    def read_dataset(  # type:ignore
+        self,
+        *,
+        columns: list = None,
+        predicates: list = None,
+        chunk_size: int = INITIAL_CHUNK_SIZE,  # type:ignore
+        limit: int = None,
+        order_by: list = None,
+        aggregates: list = None,
+        groups: list = None,
+    ) -> Generator[pyarrow.Table, None, None]:  # type:ignore
+        self.chunk_size = chunk_size
+        result_schema = self.schema
+        predicates = predicates or []
+        groups = groups or []
+
+        # Update the SQL and the target morsel schema if we've pushed a projection
+        if aggregates:
+            select, result_schema, expressions = self._aggregate_projection(aggregates, groups)
+        elif columns:
+            select = [col.schema_column.name for col in columns]
+            result_schema.columns = [  # type:ignore
+                col
+                for col in self.schema.columns  # type:ignore
+                if col.name in select  # type:ignore
+            ]
+            expressions = {col.schema_column.identity: col.schema_column.name for col in columns}
+        else:
+            select = ["1"]
+            self.schema.columns = [ConstantColumn(name="1", value=1)]  # type:ignore
+            expressions = {}
+
+        # we can't partition reads which are aggregated or limited
+        ranges = []
+        if self.partitions > 1 and not aggregates and limit is None:
+            ranges = self._partition_ranges(predicates)
+
+        if ranges:
+            queries = []
+            for condition, range_parameters in ranges:
+                query_builder, parameters = self._build_query(select, predicates)
+                query_builder.WHERE(condition)
+                queries.append((str(query_builder), {**parameters, **range_parameters}))
+            self.statistics.sql_partitions_read += len(queries)
+            morsels = self._read_partitions(queries, result_schema)
+        else:
+            query_builder, parameters = self._build_query(select, predicates)
+            if groups:
+                query_builder.add(
+                    "GROUP BY", *(expressions[g.schema_column.identity] for g in groups)
+                )
+            for identity, direction in order_by or []:
+                expression = expressions[identity]
+                direction = "ASC" if direction == "ascending" else "DESC"
+                # Opteryx puts nulls last whichever the direction, so the null key is
+                # always ascending
+                query_builder.add(
+                    "ORDER BY",
+                    f"CASE WHEN {expression} IS NULL THEN 1 ELSE 0 END ASC",
+                    f"{expression} {direction}",
+                )
+            if limit is not None:
+                query_builder.LIMIT(str(int(limit)))
+            morsels = self._read_query(str(query_builder), parameters, result_schema)
 
-        # DEBUG: log (f"time spent converting: {convert_time/1e9}s")
+        at_least_once = False
+        try:
+            for morsel in morsels:
+                if aggregates:
+                    # aggregates aren't cast to the bound schema by the reader node
+                    morsel = _cast_to_schema(morsel, result_schema)
+                yield morsel
+                at_least_once = True
+        finally:
+            # release the connection when the plan stops reading, e.g. after a LIMIT
+            morsels.close()
+
+        if not at_least_once:
+            yield _rows_to_arrow([], result_schema)
 
     def get_dataset_schema(self) -> RelationSchema:
         from sqlalchemy import Table
@@ -217,6 +553,13 @@ class SqlConnector(BaseConnector, PredicatePushable):
         if self.schema:
             return self.schema
 
+        metadata_cache = MetadataCache()
+        engine = repr(self._engine.url)
+        self.schema = metadata_cache.get_schema(self.__type__, self.dataset, engine)
+        if self.schema is not None:
+            self.statistics.metadata_cache_hits += 1
+            return self.schema
+
         # get the schema from the dataset
         # DEBUG: log ("GET SQL SCHEMA:", self.dataset)
         try:
@@ -264,4 +607,5 @@ class SqlConnector(BaseConnector, PredicatePushable):
                 )
                 # DEBUG: log ("SCHEMA:", self.schema)
 
+        metadata_cache.set_schema(self.__type__, self.dataset, self.schema, engine)
         return self.schema
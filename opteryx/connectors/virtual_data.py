@@ -31,6 +31,9 @@ from opteryx.connectors.capabilities import Partitionable
 from opteryx.exceptions import DatasetNotFoundError
 from opteryx.utils import arrow
 
+# these datasets don't change between queries
+STATIC_DATASETS = {"$astronauts", "$missions", "$planets", "$satellites", "$stop_words"}
+
 WELL_KNOWN_DATASETS = {
     "$astronauts": (virtual_datasets.astronauts, True),
     "$planets": (virtual_datasets.planets, True),
@@ -82,6 +85,16 @@ class SampleDataConnector(BaseConnector, Partitionable):
             variables=self.variables,
         )
 
+    def get_dataset_fingerprint(self) -> typing.Optional[str]:
+        """
+        The static datasets only change when the engine does.
+        """
+        if self.dataset in STATIC_DATASETS:
+            from opteryx import __version__
+
+            return f"{self.dataset}:{__version__}"
+        return None
+
     def get_dataset_schema(self) -> RelationSchema:
         if self.dataset not in WELL_KNOWN_DATASETS:
             suggestion = suggest(self.dataset)
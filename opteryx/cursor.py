@@ -18,6 +18,7 @@ from functools import wraps
 from itertools import chain
 from typing import Any
 from typing import Dict
+from typing import Generator
 from typing import Iterable
 from typing import List
 from typing import Optional
@@ -44,6 +45,7 @@ from opteryx.models import QueryStatistics
 from opteryx.shared.rolling_log import RollingLog
 from opteryx.utils import sql
 
+ENABLE_QUERY_RESULT_CACHE = config.ENABLE_QUERY_RESULT_CACHE
 PROFILE_LOCATION = config.PROFILE_LOCATION
 QUERY_LOG_LOCATION = config.QUERY_LOG_LOCATION
 QUERY_LOG_SIZE = config.QUERY_LOG_SIZE
@@ -141,6 +143,9 @@ class Cursor(DataFrame):
         self._query_status = QueryStatus._UNDEFINED
         self._result_type = ResultType._UNDEFINED
         self._rowcount = None
+        self._morsels = iter([])
+        self._first_morsel = None
+        self._rows_fetched = False
         DataFrame.__init__(self, rows=[], schema=[])
 
     @property
@@ -204,7 +209,8 @@ class Cursor(DataFrame):
         start = time.time_ns()
         for plan in plans:
             self._statistics.time_planning += time.time_ns() - start
-            results = plan.execute()
+            self._plan = plan
+            results = self._execute_plan(plan, operation, params, visibility_filters)
             start = time.time_ns()
 
         system_statistics.queries_executed += 1
@@ -217,6 +223,42 @@ class Cursor(DataFrame):
             )
             return results
 
+    def _execute_plan(
+        self,
+        plan,
+        operation: str,
+        params: Union[Iterable, Dict, None],
+        visibility_filters: Optional[Dict[str, Any]],
+    ):
+        """
+        Execute a plan, serving the results from the query result cache if we've seen
+        this query before and the data it reads hasn't changed.
+        """
+        if not ENABLE_QUERY_RESULT_CACHE:
+            yield from plan.execute()
+            return
+
+        from opteryx.shared import QueryResultCache
+
+        result_cache = QueryResultCache()
+        key = result_cache.key(operation, params, visibility_filters, plan)
+        if key is None:
+            yield from plan.execute()
+            return
+
+        cached = result_cache.get(key)
+        if cached is not None:
+            self._statistics.result_cache_hits += 1
+            # the consumers of the results expect a generator of morsels
+            yield (morsel for morsel in [cached]), ResultType.TABULAR
+            return
+
+        self._statistics.result_cache_misses += 1
+        for data, result_type in plan.execute():
+            if result_type == ResultType.TABULAR:
+                data = result_cache.capture(key, data)
+            yield data, result_type
+
     def _execute_statements(
         self,
         operation,
@@ -297,12 +339,139 @@ class Cursor(DataFrame):
                 self._rowcount = result_data.record_count  # type: ignore
                 self._query_status = result_data.status  # type: ignore
             elif self._result_type == ResultType.TABULAR:
-                self._rows, self._schema = converters.from_arrow(result_data)
+                # we only read the first morsel, the rest of the plan runs as the
+                # results are fetched
+                self._morsels = iter(result_data)
+                self._first_morsel = next(self._morsels, None)
+                if self._first_morsel is None:
+                    self._rows, self._schema = converters.from_arrow([])
+                else:
+                    self._schema = RelationSchema(
+                        name="arrow",
+                        columns=[
+                            FlatColumn.from_arrow(field) for field in self._first_morsel.schema
+                        ],
+                    )
+                    self._rows = self._rows_from_morsels()
                 self._cursor = iter(self._rows)
                 self._query_status = QueryStatus.SQL_SUCCESS
             else:  # pragma: no cover
                 self._query_status = QueryStatus.SQL_FAILURE
 
+    def _pending_morsels(self) -> Generator[pyarrow.Table, None, None]:
+        """
+        Yield the morsels which haven't been read from the plan yet.
+        """
+        if self._first_morsel is not None:
+            morsel, self._first_morsel = self._first_morsel, None
+            yield morsel
+        # don't use 'yield from', closing this generator would close the plan
+        for morsel in self._morsels:
+            yield morsel
+
+    def _rows_from_morsels(self) -> Generator[tuple, None, None]:
+        """
+        Convert the results to rows one morsel at a time, so we only hold one morsel's
+        rows at a time and can stop without running the rest of the plan.
+        """
+        self._rows_fetched = True
+        for morsel in self._pending_morsels():
+            rows, _ = converters.from_arrow(morsel)
+            yield from rows
+
+    @require_state(CursorState.EXECUTED)
+    def record_batch_reader(self, size: Optional[int] = None) -> pyarrow.RecordBatchReader:
+        """
+        Stream the results of the query as Arrow record batches.
+
+        The plan is executed as the batches are read, so stopping early avoids running
+        the rest of the plan. This can't be used after rows have been fetched.
+
+        Parameters:
+            size: int, optional
+                The maximum number of rows in each batch, defaults to the morsel size.
+
+        Returns:
+            A pyarrow RecordBatchReader.
+        """
+        if self._result_type != ResultType.TABULAR:
+            raise InvalidCursorStateError("Only tabular results can be read as record batches.")
+        if self._rows_fetched:
+            raise InvalidCursorStateError(
+                "Rows have already been fetched, results can't be read as record batches."
+            )
+
+        # empty morsels may not have the types of the data, don't take the schema from them
+        while self._first_morsel is not None and self._first_morsel.num_rows == 0:
+            next_morsel = next(self._morsels, None)
+            if next_morsel is None:
+                break
+            self._first_morsel = next_morsel
+
+        schema = self._first_morsel.schema if self._first_morsel is not None else pyarrow.schema([])
+
+        def _batches():
+            for morsel in self._pending_morsels():
+                if morsel.schema != schema:
+                    try:
+                        morsel = morsel.cast(schema)
+                    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as err:
+                        raise InconsistentSchemaError(
+                            "Unable to resolve different schemas, this may be due to uncoercible column types."
+                        ) from err
+                yield from morsel.to_batches(max_chunksize=size)
+
+        return pyarrow.RecordBatchReader.from_batches(schema, _batches())
+
+    def __arrow_c_stream__(self, requested_schema=None):
+        """
+        Export the result using the Arrow PyCapsule stream interface, the morsels are
+        handed over as they are created rather than being collected first.
+        """
+        return self.record_batch_reader().__arrow_c_stream__(requested_schema)
+
+    def fetch_batches(
+        self, size: Optional[int] = None
+    ) -> Generator[pyarrow.RecordBatch, None, None]:
+        """
+        Fetch the results of the query as Arrow record batches, one at a time.
+
+        Parameters:
+            size: int, optional
+                The maximum number of rows in each batch, defaults to the morsel size.
+        """
+        yield from self.record_batch_reader(size)
+
+    def arrow(self, size: Optional[int] = None) -> pyarrow.Table:
+        """
+        Get the results as an Arrow table, read directly from the plan when no rows
+        have been fetched; with a size only enough of the plan to fill it is run.
+
+        Parameters:
+            size: int, optional
+                Limit the number of rows returned, defaults to all rows.
+        """
+        if self._result_type != ResultType.TABULAR or self._rows_fetched:
+            return super().arrow(size)
+
+        morsels: List[pyarrow.Table] = []
+        collected = 0
+        for morsel in self._pending_morsels():
+            morsels.append(morsel)
+            collected += morsel.num_rows
+            if size is not None and collected >= size:
+                break
+        try:
+            table = pyarrow.concat_tables(morsels, promote_options="permissive")
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as err:  # pragma: no cover
+            raise InconsistentSchemaError(
+                "Unable to resolve different schemas, this may be due to uncoercible column types."
+            ) from err
+
+        # the rows are still available to be fetched after this
+        self._first_morsel = table
+        return table.slice(0, size) if size is not None else table
+
     @property
     def result_type(self) -> ResultType:
         return self._result_type
@@ -391,7 +560,19 @@ class Cursor(DataFrame):
     def close(self):
         """
         Closes the cursor, releasing any resources and closing the associated connection.
+
+        If the results haven't all been read, the rest of the plan isn't run and reads
+        which are in flight are cancelled.
         """
+        if self._plan is not None:
+            self._plan.cancel()
+        try:
+            # stop the plan now rather than when the cursor is garbage collected
+            self._morsels.close()
+        except (AttributeError, ValueError):
+            # not a generator, or being read in another thread which will see the
+            # plan has been cancelled
+            pass
         self._connection.close()
 
     def __repr__(self):  # pragma: no cover
@@ -0,0 +1,368 @@
+#!/usr/bin/env python
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Arrow Flight Server
+
+Serve queries over the network using Arrow Flight. Queries are run in the server
+process, so the buffer pool, the metadata cache and the plan cache are shared by every
+client and stay warm between queries. Results are streamed to clients as record
+batches as the plan creates them.
+
+A request is either a SQL statement or JSON with 'sql' and optionally 'params' keys.
+Requests can be sent as the command of a flight descriptor to `get_flight_info`, which
+runs the query and returns the schema and a ticket to read the results with, or as the
+ticket to `do_get` to run the query and read the results in one call. Tickets which
+haven't been read don't hold a query slot, they expire after `PENDING_QUERY_TIMEOUT`
+seconds and the oldest are discarded when there are too many of them.
+
+    python -m opteryx.flight_server --port 8815
+
+    client = pyarrow.flight.connect("grpc://localhost:8815")
+    table = client.do_get(pyarrow.flight.Ticket(b"SELECT * FROM $planets")).read_all()
+
+Queries can read local files, so by default the server only listens on the loopback
+address. To listen on other addresses clients must be authenticated, e.g. with a
+shared token:
+
+    python -m opteryx.flight_server --host 0.0.0.0 --token <secret>
+
+    client = pyarrow.flight.connect("grpc://server:8815")
+    client.authenticate(TokenClientAuthHandler("<secret>"))
+"""
+
+import hmac
+import ipaddress
+import threading
+import time
+import uuid
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urlparse
+
+import orjson
+import pyarrow
+import typer
+from pyarrow import flight
+
+import opteryx
+from opteryx.constants import ResultType
+from opteryx.exceptions import InvalidConfigurationError
+from opteryx.exceptions import PermissionsError
+
+TICKET_PREFIX = b"opteryx-query:"
+PENDING_QUERY_TIMEOUT: float = 30
+"""Seconds a ticket returned by get_flight_info can be read for."""
+
+
+def parse_request(request: bytes) -> Tuple[str, Any]:
+    """
+    Get the SQL statement and the parameters from a request.
+    """
+    text = request.decode()
+    if not text.lstrip().startswith("{"):
+        return text, None
+    try:
+        body = orjson.loads(text)
+    except orjson.JSONDecodeError as err:
+        raise flight.FlightServerError(f"Unable to parse request - {err}") from err
+    if not isinstance(body, dict) or "sql" not in body:
+        raise flight.FlightServerError("Request must include a 'sql' key.")
+    return body["sql"], body.get("params")
+
+
+def to_flight_error(err: Exception) -> Exception:
+    """
+    Convert an error from running a query into an error Flight can return to the client.
+    """
+    if isinstance(err, flight.FlightError):
+        return err
+    message = f"{type(err).__name__}: {err}"
+    if isinstance(err, PermissionsError):
+        return flight.FlightUnauthorizedError(message)
+    return flight.FlightServerError(message)
+
+
+def is_loopback(location: str) -> bool:
+    """
+    Is the location only reachable from this machine.
+    """
+    host = urlparse(location).hostname or ""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class TokenAuthHandler(flight.ServerAuthHandler):
+    """
+    Authenticate clients with a token shared with the server; clients authenticate with
+    a `TokenClientAuthHandler` holding the same token.
+
+    The token is sent as is, use TLS if the network isn't trusted.
+    """
+
+    def __init__(self, token: str):
+        self.token = token.encode()
+
+    def _check(self, token: Optional[bytes]):
+        if not hmac.compare_digest(token or b"", self.token):
+            raise flight.FlightUnauthenticatedError("Invalid authentication token.")
+
+    def authenticate(self, outgoing, incoming):
+        token = incoming.read()
+        self._check(token)
+        outgoing.write(token)
+
+    def is_valid(self, token):
+        self._check(token)
+        return b""
+
+
+class TokenClientAuthHandler(flight.ClientAuthHandler):
+    """
+    Authenticate with a server using a `TokenAuthHandler`.
+    """
+
+    def __init__(self, token: str):
+        self.token = token.encode()
+
+    def authenticate(self, outgoing, incoming):
+        outgoing.write(self.token)
+        self.token = incoming.read()
+
+    def get_token(self):
+        return self.token
+
+
+class QueryStream:
+    """
+    Iterate over the record batches of a query, holding one of the server's query slots
+    until the batches have been read or the stream is discarded. Discarding the stream
+    closes the cursor, which stops the query.
+
+    A stream waiting for its ticket to be read is suspended, it gives up its slot and
+    takes one again when it is resumed.
+    """
+
+    def __init__(
+        self,
+        reader: pyarrow.RecordBatchReader,
+        release,
+        max_result_bytes=None,
+        cursor=None,
+    ):
+        self.reader = reader
+        self.schema = reader.schema
+        self.max_result_bytes = max_result_bytes
+        self._release = release
+        self._cursor = cursor
+        self._bytes = 0
+
+    def __iter__(self):
+        try:
+            for batch in self.reader:
+                self._bytes += batch.nbytes
+                if self.max_result_bytes and self._bytes > self.max_result_bytes:
+                    raise flight.FlightServerError(
+                        f"Query result is larger than the limit of {self.max_result_bytes} bytes."
+                    )
+                yield batch
+        except Exception as err:
+            raise to_flight_error(err) from err
+        finally:
+            self.close()
+
+    def suspend(self):
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def resume(self, release):
+        self._release = release
+
+    def close(self):
+        cursor, self._cursor = self._cursor, None
+        release, self._release = self._release, None
+        try:
+            if cursor is not None:
+                cursor.close()
+        finally:
+            if release is not None:
+                release()
+
+    def __del__(self):
+        self.close()
+
+
+class FlightServer(flight.FlightServerBase):
+    """
+    Run queries for Arrow Flight clients.
+
+    Parameters:
+        location: str
+            The URI to listen on, the port is chosen by the OS if it is 0; only loopback
+            addresses can be used without an auth_handler
+        auth_handler: flight.ServerAuthHandler (optional)
+            Authenticates clients, e.g. TokenAuthHandler
+        max_concurrent_queries: int
+            The number of queries which can be running at once, and the number of tickets
+            from get_flight_info which can be waiting to be read
+        max_result_bytes: int (optional)
+            The most data a single query can return, queries which exceed this fail
+        queue_timeout: float
+            Seconds to wait for a query slot before rejecting the request
+        connection_kwargs:
+            Passed to `opteryx.connect` for each query, e.g. permissions and memberships
+    """
+
+    def __init__(
+        self,
+        location: str = "grpc://127.0.0.1:8815",
+        *,
+        auth_handler: Optional[flight.ServerAuthHandler] = None,
+        max_concurrent_queries: int = 8,
+        max_result_bytes: Optional[int] = None,
+        queue_timeout: float = 30,
+        **connection_kwargs,
+    ):
+        # queries can read local files, don't let anyone on the network run them
+        if auth_handler is None and not is_loopback(location):
+            raise InvalidConfigurationError(
+                config_item="location",
+                provided_value=location,
+                valid_value_description="a loopback address unless an auth_handler is provided.",
+            )
+        super().__init__(location, auth_handler=auth_handler)
+        self.max_result_bytes = max_result_bytes
+        self.queue_timeout = queue_timeout
+        self.connection_kwargs = connection_kwargs
+        self.max_pending_queries = max_concurrent_queries
+        self._slots = threading.BoundedSemaphore(max_concurrent_queries)
+        self._pending: Dict[bytes, Tuple[float, QueryStream]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire_slot(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise flight.FlightUnavailableError("Too many concurrent queries, try again later.")
+
+    def _execute(self, request: bytes) -> QueryStream:
+        statement, params = parse_request(request)
+        self._acquire_slot()
+        cursor = None
+        try:
+            conn = opteryx.connect(**self.connection_kwargs)
+            cursor = conn.cursor()
+            cursor.execute(statement, params)
+            if cursor.result_type == ResultType.TABULAR:
+                reader = cursor.record_batch_reader()
+            else:
+                reader = cursor.arrow().to_reader()
+        except Exception as err:
+            if cursor is not None:
+                cursor.close()
+            self._slots.release()
+            raise to_flight_error(err) from err
+        return QueryStream(reader, self._slots.release, self.max_result_bytes, cursor)
+
+    def _expire_pending(self, keep: Optional[int] = None):
+        """
+        Discard the tickets which have expired, and the oldest tickets if there are more
+        than keep waiting to be read.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [ticket for ticket, (expires, _) in self._pending.items() if expires < now]
+            if keep is not None:
+                # tickets are held in the order they were issued
+                oldest = [t for t in self._pending if t not in expired]
+                expired.extend(oldest[: max(0, len(oldest) - keep)])
+            streams = [self._pending.pop(ticket)[1] for ticket in expired]
+        for stream in streams:
+            stream.close()
+
+    def get_flight_info(self, context, descriptor):
+        if descriptor.descriptor_type != flight.DescriptorType.CMD:
+            raise flight.FlightServerError("Only command descriptors are supported.")
+        stream = self._execute(descriptor.command)
+        # the ticket may never be read, so it doesn't hold a query slot while it waits
+        stream.suspend()
+        self._expire_pending(keep=self.max_pending_queries - 1)
+        ticket = TICKET_PREFIX + uuid.uuid4().hex.encode()
+        with self._lock:
+            self._pending[ticket] = (time.monotonic() + PENDING_QUERY_TIMEOUT, stream)
+        # no locations, the results are read from this server
+        endpoint = flight.FlightEndpoint(ticket, [])
+        return flight.FlightInfo(stream.schema, descriptor, [endpoint], -1, -1)
+
+    def do_get(self, context, ticket):
+        self._expire_pending()
+        if ticket.ticket.startswith(TICKET_PREFIX):
+            with self._lock:
+                pending = self._pending.pop(ticket.ticket, None)
+            if pending is None:
+                raise flight.FlightServerError("Ticket has expired or has already been read.")
+            stream = pending[1]
+            try:
+                self._acquire_slot()
+            except flight.FlightError:
+                stream.close()
+                raise
+            stream.resume(self._slots.release)
+        else:
+            stream = self._execute(ticket.ticket)
+        return flight.GeneratorStream(stream.schema, iter(stream))
+
+    def list_actions(self, context):
+        return [("cancel", "Discard a ticket returned by get_flight_info without reading it.")]
+
+    def do_action(self, context, action):
+        if action.type != "cancel":
+            raise flight.FlightServerError(f"Unknown action '{action.type}'.")
+        with self._lock:
+            pending = self._pending.pop(action.body.to_pybytes(), None)
+        if pending is not None:
+            pending[1].close()
+        return []
+
+
+# fmt:off
+def main(
+    host: str = typer.Option(default="127.0.0.1", help="Address to listen on."),
+    port: int = typer.Option(default=8815, help="Port to listen on."),
+    token: str = typer.Option(default="", envvar="OPTERYX_FLIGHT_TOKEN", help="Token clients must authenticate with, required to listen on non-loopback addresses."),
+    max_concurrent_queries: int = typer.Option(default=8, help="Queries which can run at once."),
+    max_result_bytes: int = typer.Option(default=0, help="Largest result a query can return, 0 for no limit."),
+):
+# fmt:on
+    """
+    Opteryx Arrow Flight Server
+    """
+    server = FlightServer(
+        f"grpc://{host}:{port}",
+        auth_handler=TokenAuthHandler(token) if token else None,
+        max_concurrent_queries=max_concurrent_queries,
+        max_result_bytes=max_result_bytes or None,
+        memberships=["opteryx"],
+    )
+    print(f"Opteryx version {opteryx.__version__} Flight server listening on {host}:{server.port}")
+    server.serve()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
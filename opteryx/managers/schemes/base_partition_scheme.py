@@ -10,7 +10,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import datetime
+from typing import AsyncIterator
 from typing import Callable
 from typing import List
 from typing import Optional
@@ -42,3 +44,29 @@ class BasePartitionScheme:
     ) -> List[str]:
         """filter the blobs acording to the chosen scheme"""
         raise NotImplementedError()
+
+    async def async_get_blobs_in_partition(
+        self,
+        *,
+        async_blob_list_getter: Callable,
+        blob_list_getter: Callable,
+        prefix: str,
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        **kwargs,
+    ) -> AsyncIterator[List[str]]:
+        """
+        Yield batches of the blobs in the partition as they are found, so reading can
+        start before the listing has completed.
+
+        Schemes which can't select blobs incrementally run the synchronous filter in a
+        thread and yield all of the blobs as a single batch.
+        """
+        yield await asyncio.to_thread(
+            self.get_blobs_in_partition,
+            blob_list_getter=blob_list_getter,
+            prefix=prefix,
+            start_date=start_date,
+            end_date=end_date,
+            **kwargs,
+        )
@@ -11,6 +11,7 @@
 # limitations under the License.
 
 import datetime
+from typing import AsyncIterator
 from typing import Callable
 from typing import List
 from typing import Optional
@@ -29,3 +30,15 @@ class DefaultPartitionScheme(BasePartitionScheme):
         **kwargs,
     ) -> List[str]:
         return blob_list_getter(prefix=prefix)
+
+    async def async_get_blobs_in_partition(
+        self,
+        *,
+        async_blob_list_getter: Callable,
+        prefix: str,
+        **kwargs,
+    ) -> AsyncIterator[List[str]]:
+        # every blob is in the partition, so each page of the listing can be read as
+        # soon as it arrives
+        async for blob_names in async_blob_list_getter(prefix=prefix):
+            yield blob_names
@@ -10,9 +10,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import concurrent.futures
 import datetime
 import os
+from typing import AsyncIterator
 from typing import Callable
 from typing import List
 from typing import Optional
@@ -23,6 +25,7 @@ from opteryx.utils.dates import date_range
 from opteryx.utils.file_decoders import DATA_EXTENSIONS
 
 OS_SEP = os.sep
+CONCURRENT_LISTINGS = 16
 
 
 class UnsupportedSegementationError(DataError):
@@ -64,6 +67,77 @@ def is_complete_and_not_invalid(blobs, as_at):
     return complete and not ignore
 
 
+def process_as_ats(blobs, as_at_label, control_blobs):
+    as_ats = sorted({extract_prefix(blob, "as_at_") for blob in blobs if as_at_label in blob})
+    if len(as_ats) == 0:
+        return blobs
+    valid_blobs = []
+    while as_ats:
+        as_at = as_ats.pop()
+        if as_at is None:
+            continue
+        if is_complete_and_not_invalid(control_blobs, as_at):
+            valid_blobs = [blob for blob in blobs if as_at in blob]
+            break
+        else:
+            blobs = [blob for blob in blobs if as_at not in blob]
+    return valid_blobs
+
+
+def date_prefix(prefix: str, date: datetime.datetime) -> str:
+    return f"{prefix}{OS_SEP}year_{date.year:04d}{OS_SEP}month_{date.month:02d}{OS_SEP}day_{date.day:02d}"
+
+
+def select_blobs_for_day(
+    blob_names: List[str],
+    *,
+    prefix: str,
+    date: datetime.datetime,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> List[str]:
+    """
+    Select the blobs to read from the blobs in a day's folder, this handles the hourly
+    segments and the as_at frames.
+    """
+    by_label = f"{OS_SEP}by_"
+    as_at_label = f"{OS_SEP}as_at"
+
+    if len(blob_names) == 0:
+        return []
+
+    control_blobs: List[str] = []
+    data_blobs: List[str] = []
+
+    for blob in blob_names:
+        ext = os.path.splitext(blob)[1]
+        if ext not in DATA_EXTENSIONS:
+            control_blobs.append(blob)
+        else:
+            data_blobs.append(blob)
+            if by_label in blob:
+                segment = extract_prefix(blob, "by_")
+                if segment != "by_hour":
+                    raise UnsupportedSegementationError(dataset=prefix, segment=segment)
+
+    if any(f"{OS_SEP}by_hour{OS_SEP}" in blob_name for blob_name in data_blobs):
+        start = min(start, date)
+        end = max(end, date)
+
+        selected_blobs = []
+
+        for hour in date_range(start, end, "1h"):
+            hour_label = f"{OS_SEP}by_hour{OS_SEP}hour={hour.hour:02d}/"
+            # Filter for the specific hour, if hour folders exist
+            if any(hour_label in blob_name for blob_name in data_blobs):
+                hours_blobs = [blob_name for blob_name in data_blobs if hour_label in blob_name]
+                selected_blobs.extend(process_as_ats(hours_blobs, as_at_label, control_blobs))
+    else:
+        selected_blobs = process_as_ats(data_blobs, "as_at_", control_blobs)
+
+    return selected_blobs
+
+
 class MabelPartitionScheme(BasePartitionScheme):
     """
     Handle reading data using the Mabel partition scheme.
@@ -81,71 +155,11 @@ class MabelPartitionScheme(BasePartitionScheme):
         """filter the blobs acording to the chosen scheme"""
 
         midnight = datetime.datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        by_label = f"{OS_SEP}by_"
-        as_at_label = f"{OS_SEP}as_at"
-
-        def process_as_ats(blobs, as_at_label, control_blobs):
-            as_ats = sorted(
-                {extract_prefix(blob, "as_at_") for blob in blobs if as_at_label in blob}
-            )
-            if len(as_ats) == 0:
-                return blobs
-            valid_blobs = []
-            while as_ats:
-                as_at = as_ats.pop()
-                if as_at is None:
-                    continue
-                if is_complete_and_not_invalid(control_blobs, as_at):
-                    valid_blobs = [blob for blob in blobs if as_at in blob]
-                    break
-                else:
-                    blobs = [blob for blob in blobs if as_at not in blob]
-            return valid_blobs
 
         def _inner(*, date, start, end):
-            date_path = f"{prefix}{OS_SEP}year_{date.year:04d}{OS_SEP}month_{date.month:02d}{OS_SEP}day_{date.day:02d}"
-            by_label = f"{OS_SEP}by_"
-            as_at_label = f"{OS_SEP}as_at"
-
             # Call your method to get the list of blob names
-            blob_names = blob_list_getter(prefix=date_path)
-            if len(blob_names) == 0:
-                return []
-
-            control_blobs: List[str] = []
-            data_blobs: List[str] = []
-
-            for blob in blob_names:
-                ext = os.path.splitext(blob)[1]
-                if ext not in DATA_EXTENSIONS:
-                    control_blobs.append(blob)
-                else:
-                    data_blobs.append(blob)
-                    if by_label in blob:
-                        segment = extract_prefix(blob, "by_")
-                        if segment != "by_hour":
-                            raise UnsupportedSegementationError(dataset=prefix, segment=segment)
-
-            if any(f"{OS_SEP}by_hour{OS_SEP}" in blob_name for blob_name in data_blobs):
-                start = min(start, date)
-                end = max(end, date)
-
-                selected_blobs = []
-
-                for hour in date_range(start, end, "1h"):
-                    hour_label = f"{OS_SEP}by_hour{OS_SEP}hour={hour.hour:02d}/"
-                    # Filter for the specific hour, if hour folders exist
-                    if any(hour_label in blob_name for blob_name in data_blobs):
-                        hours_blobs = [
-                            blob_name for blob_name in data_blobs if hour_label in blob_name
-                        ]
-                        selected_blobs.extend(
-                            process_as_ats(hours_blobs, as_at_label, control_blobs)
-                        )
-            else:
-                selected_blobs = process_as_ats(data_blobs, "as_at_", control_blobs)
-
-            return selected_blobs
+            blob_names = blob_list_getter(prefix=date_prefix(prefix, date))
+            return select_blobs_for_day(blob_names, prefix=prefix, date=date, start=start, end=end)
 
         start_date = start_date or midnight
         end_date = end_date or midnight.replace(hour=23, minute=59)
@@ -164,3 +178,37 @@ class MabelPartitionScheme(BasePartitionScheme):
                 found.update(future.result())
 
         return sorted(found)
+
+    async def async_get_blobs_in_partition(
+        self,
+        *,
+        async_blob_list_getter: Callable,
+        prefix: str,
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+        **kwargs,
+    ) -> AsyncIterator[List[str]]:
+        """
+        List the days in the range concurrently, each day's blobs are yielded as soon
+        as that day's listing is complete.
+        """
+        midnight = datetime.datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        start_date = start_date or midnight
+        end_date = end_date or midnight.replace(hour=23, minute=59)
+
+        semaphore = asyncio.Semaphore(CONCURRENT_LISTINGS)
+
+        async def _inner(date):
+            async with semaphore:
+                blob_names: List[str] = []
+                async for page in async_blob_list_getter(prefix=date_prefix(prefix, date)):
+                    blob_names.extend(page)
+            return select_blobs_for_day(
+                blob_names, prefix=prefix, date=date, start=start_date, end=end_date
+            )
+
+        tasks = [_inner(date) for date in date_range(start_date, end_date, "1d")]
+        for task in asyncio.as_completed(tasks):
+            selected_blobs = await task
+            if selected_blobs:
+                yield sorted(selected_blobs)
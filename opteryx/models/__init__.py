@@ -12,6 +12,7 @@
 
 from opteryx.compiled.structures.node import Node
 from opteryx.models.connection_context import ConnectionContext
+from opteryx.models.dynamic_filter import DynamicFilter
 from opteryx.models.execution_tree import ExecutionTree
 from opteryx.models.logical_column import LogicalColumn
 from opteryx.models.non_tabular_result import NonTabularResult
@@ -20,6 +21,7 @@ from opteryx.models.query_statistics import QueryStatistics
 
 __all__ = (
     "ConnectionContext",
+    "DynamicFilter",
     "ExecutionTree",
     "LogicalColumn",
     "Node",
@@ -0,0 +1,74 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Dynamic Filter
+
+A filter which is only known, and is tightened, as the query runs.
+
+For ORDER BY ... LIMIT n queries, once the Heap Sort is holding n rows, rows which are
+worse than the n-th row on the first sort key can't be in the result. The Heap Sort
+publishes that value here and the readers use it to discard rows as they are read, and
+to skip the parquet row groups which only hold rows which would be discarded.
+
+Rows equal to the threshold are kept, they may be better on a later sort key. Nulls
+are always after the threshold so are discarded.
+"""
+
+from typing import Optional
+from typing import Tuple
+
+import pyarrow
+import pyarrow.compute
+
+
+class DynamicFilter:
+    def __init__(self, identity: str, source_column: str, direction: str):
+        self.identity = identity
+        self.source_column = source_column
+        self.ascending = direction == "ascending"
+        self.threshold: Optional[pyarrow.Scalar] = None
+
+    def update(self, threshold: Optional[pyarrow.Scalar]):
+        """
+        Set the threshold, the Heap Sort only ever tightens it.
+        """
+        self.threshold = threshold
+
+    def to_dnf(self) -> Optional[Tuple[str, str, object]]:
+        """
+        The filter in the form PyArrow uses to filter parquet files, in terms of the
+        column names in the file.
+        """
+        threshold = self.threshold
+        if threshold is None:
+            return None
+        return (self.source_column, "<=" if self.ascending else ">=", threshold.as_py())
+
+    def apply(self, morsel: pyarrow.Table) -> pyarrow.Table:
+        """
+        Remove the rows which can't be in the result, the morsel's columns are named with
+        their identities.
+        """
+        threshold = self.threshold
+        if threshold is None or self.identity not in morsel.column_names:
+            return morsel
+        column = morsel.column(self.identity)
+        try:
+            if self.ascending:
+                mask = pyarrow.compute.less_equal(column, threshold)
+            else:
+                mask = pyarrow.compute.greater_equal(column, threshold)
+        except (pyarrow.ArrowNotImplementedError, pyarrow.ArrowInvalid):  # pragma: no cover
+            return morsel
+        # comparisons with nulls are null, filter drops these
+        return morsel.filter(mask)
@@ -142,6 +142,15 @@ class ExecutionTree(Graph):
         else:
             yield results, ResultType.TABULAR
 
+    def cancel(self):
+        """
+        Stop executing the plan, the readers stop reading and cancel reads in flight.
+
+        This can be called from a different thread to the one executing the plan.
+        """
+        for _, operator in self.nodes(data=True):
+            operator.properties.cancelled.set()
+
     def explain(self):
         from opteryx import operators
 
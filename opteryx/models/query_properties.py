@@ -12,6 +12,7 @@
 
 import datetime
 from dataclasses import dataclass
+from threading import Event
 from typing import Any
 
 
@@ -30,3 +31,5 @@ class QueryProperties:
         self.cache = None
         self.qid = qid
         self.ctes: dict = {}
+        # set to stop executing the query, e.g. when the cursor is closed early
+        self.cancelled = Event()
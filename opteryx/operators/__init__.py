@@ -31,11 +31,12 @@ from .heap_sort_node import HeapSortNode  # Heap
 # from .information_schema_node import InformationSchemaNode  # information_schema
 from .inner_join_node import InnerJoinNode
 from .inner_join_node_single import InnerJoinSingleNode
+from .interval_join_node import IntervalJoinNode  # JOIN ON range conditions
 from .join_node import JoinNode
 from .limit_node import LimitNode  # select the first N records
 
 # from .metadata_writer_node import MetadataWriterNode
-# from .morsel_defragment_node import MorselDefragmentNode  # consolidate small morsels
+from .morsel_defragment_node import MorselDefragmentNode  # consolidate small morsels
 from .noop_node import NoOpNode  # No Operation
 from .outer_join_node import OuterJoinNode
 from .projection_node import ProjectionNode  # remove unwanted columns including renames
@@ -48,6 +49,7 @@ from .show_create_node import ShowCreateNode  # SHOW CREATE VIEW
 # from .show_functions_node import ShowFunctionsNode  # supported functions
 from .show_value_node import ShowValueNode  # display node for SHOW
 from .sort_node import SortNode  # order by selected columns
+from .sorted_aggregate_and_group_node import SortedAggregateAndGroupNode  # GROUP BY ordered data
 from .union_node import UnionNode
 
 
@@ -38,9 +38,21 @@ from opteryx.operators import OperatorType
 from opteryx.operators.aggregate_node import build_aggregations
 from opteryx.operators.aggregate_node import extract_evaluations
 from opteryx.operators.aggregate_node import project
+from opteryx.operators.aggregate_node import sketch_aggregators
 from opteryx.operators.base_plan_node import BasePlanDataObject
 
 
+class GroupedSketches:
+    """
+    The sketches for the sketch aggregates, each holds a sketch for every group; the
+    groups are numbered in the order they are first seen.
+    """
+
+    def __init__(self, aggregators: list):
+        self.group_ids: dict = {}
+        self.sketches = [aggregator.new_sketch(grouped=True) for aggregator in aggregators]
+
+
 @dataclass
 class AggregateAndGroupDataObject(BasePlanDataObject):
     groups: list = None
@@ -88,6 +100,7 @@ class AggregateAndGroupNode(BasePlanNode):
         # get the aggregated groupings and functions
         self.group_by_columns = list({node.schema_column.identity for node in self.groups})
         self.column_map, self.aggregate_functions = build_aggregations(self.aggregates)
+        self.sketch_aggregators = sketch_aggregators(self.aggregates)
 
         self.do = AggregateAndGroupDataObject()
 
@@ -107,14 +120,56 @@ class AggregateAndGroupNode(BasePlanNode):
 
     def execute(self) -> Generator[pyarrow.Table, None, None]:
         morsels = self._producers[0]  # type:ignore
+        sketches = GroupedSketches(self.sketch_aggregators)
+        collected: list = []
+        empty_groups = None
 
         # merge all the morsels together into one table, selecting only the columns
         # we're pretty sure we're going to use - this will fail for datasets
         # larger than memory
-        table = pyarrow.concat_tables(
-            project(morsels.execute(), self.all_identifiers),
-            promote_options="permissive",
-        )
+        #
+        # the sketch aggregates are updated as the morsels arrive, if they're the
+        # only aggregates we only need to keep the groups from the morsels
+        for morsel in project(morsels.execute(), self.all_identifiers):
+            if self.sketch_aggregators:
+                groups = self._update_sketches(sketches, morsel)
+                if not self.aggregate_functions:
+                    if groups.num_rows > 0:
+                        collected.append(groups)
+                    elif empty_groups is None:
+                        empty_groups = groups
+                    continue
+            collected.append(morsel)
+
+        yield self._groups(collected or [empty_groups], sketches)
+
+    def _groups(self, collected: list, sketches: GroupedSketches) -> pyarrow.Table:
+        """
+        Aggregate the collected morsels, or if only sketches are being used, the groups
+        collected from the morsels, and add the results from the sketches.
+        """
+        if self.aggregate_functions or not self.sketch_aggregators:
+            groups = self._aggregate(collected)
+        else:
+            start_time = time.time_ns()
+            groups = pyarrow.concat_tables(collected, promote_options="permissive")
+            groups = groups.group_by(self.group_by_columns).aggregate([])
+            groups = groups.select(self.group_by_columns)
+            self.statistics.time_grouping += time.time_ns() - start_time
+
+        if self.sketch_aggregators:
+            start_time = time.time_ns()
+            keys = _group_keys(groups, self.group_by_columns)
+            group_ids = numpy.array([sketches.group_ids[key] for key in keys], dtype=numpy.int64)
+            for aggregator, sketch in zip(self.sketch_aggregators, sketches.sketches):
+                values = aggregator.group_results(sketch, group_ids)
+                groups = groups.append_column(aggregator.identity, pyarrow.array(values))
+            self.statistics.time_grouping += time.time_ns() - start_time
+
+        return groups
+
+    def _aggregate(self, morsels):
+        table = pyarrow.concat_tables(morsels, promote_options="permissive")
 
         # Allow grouping by functions by evaluating them first
         start_time = time.time_ns()
@@ -156,4 +211,48 @@ class AggregateAndGroupNode(BasePlanNode):
 
         self.statistics.time_grouping += time.time_ns() - start_time
 
-        yield groups
+        return groups
+
+    def _update_sketches(self, sketches: GroupedSketches, morsel: pyarrow.Table) -> pyarrow.Table:
+        """
+        Update the sketches for all of the groups in the morsel, returns the groups.
+        """
+        start_time = time.time_ns()
+        morsel = evaluate_and_append(self.evaluatable_nodes, morsel)
+        morsel = evaluate_and_append(self.groups, morsel)
+        self.statistics.time_evaluating += time.time_ns() - start_time
+
+        start_time = time.time_ns()
+        rows = pyarrow.array(numpy.arange(morsel.num_rows, dtype=numpy.int64))
+        groups = (
+            morsel.select(self.group_by_columns)
+            .append_column("$rows", rows)
+            .group_by(self.group_by_columns, use_threads=False)
+            .aggregate([("$rows", "list")])
+        )
+
+        # number the groups, and label each row with the number of its group
+        group_ids = sketches.group_ids
+        keys = _group_keys(groups, self.group_by_columns)
+        numbers = numpy.array(
+            [group_ids.setdefault(key, len(group_ids)) for key in keys], dtype=numpy.int64
+        )
+        row_lists = groups.column("$rows_list").combine_chunks()
+        row_groups = numpy.empty(morsel.num_rows, dtype=numpy.int64)
+        row_groups[row_lists.flatten().to_numpy()] = numpy.repeat(
+            numbers, row_lists.value_lengths().to_numpy()
+        )
+
+        for aggregator, sketch in zip(self.sketch_aggregators, sketches.sketches):
+            aggregator.update(sketch, morsel, row_groups, len(group_ids))
+        self.statistics.time_grouping += time.time_ns() - start_time
+
+        return groups.select(self.group_by_columns)
+
+
+def _group_keys(groups: pyarrow.Table, columns: list) -> list:
+    """
+    The group values as tuples, NaNs are grouped together so they're given the same key.
+    """
+    columns = [groups.column(column).to_pylist() for column in columns]
+    return [tuple(v if v == v else "NaN" for v in key) for key in zip(*columns)]
@@ -25,6 +25,8 @@ from typing import Generator
 import numpy
 import pyarrow
 
+from opteryx.exceptions import IncorrectTypeError
+from opteryx.exceptions import InvalidFunctionParameterError
 from opteryx.exceptions import UnsupportedSyntaxError
 from opteryx.managers.expression import NodeType
 from opteryx.managers.expression import evaluate_and_append
@@ -41,6 +43,10 @@ AGGREGATORS = {
     "ALL": "all",
     "ANY": "any",
     "APPROXIMATE_MEDIAN": "approximate_median",
+    "APPROX_COUNT_DISTINCT": "approx_count_distinct",  # sketch
+    "APPROX_MOST_FREQUENT": "approx_most_frequent",  # sketch
+    "APPROX_PERCENTILE": "approx_percentile",  # sketch
+    "APPROX_TOP_K": "approx_top_k",  # sketch
     "ARRAY_AGG": "hash_list",
     "COUNT": "count",  # counts only non nulls
     "COUNT_DISTINCT": "count_distinct",
@@ -62,6 +68,124 @@ AGGREGATORS = {
     "VARIANCE": "variance",
 }
 
+# these aggregators are estimated from sketches, which are updated morsel by morsel
+SKETCH_AGGREGATORS = {
+    "APPROX_COUNT_DISTINCT",
+    "APPROX_MOST_FREQUENT",
+    "APPROX_PERCENTILE",
+    "APPROX_TOP_K",
+}
+
+
+class SketchAggregator:
+    """
+    An aggregate which is estimated from a sketch. The sketches are a fixed size and are
+    updated a morsel at a time, so the values don't need to be held in memory.
+    """
+
+    def __init__(self, aggregator):
+        self.function = aggregator.value
+        self.identity = aggregator.schema_column.identity
+        self.column = aggregator.parameters[0]
+        self.argument = None
+
+        if self.column.node_type == NodeType.WILDCARD:
+            raise UnsupportedSyntaxError(f"`{self.function}` cannot be used with `*`")
+        if self.function == "APPROX_PERCENTILE":
+            self.argument = _literal_parameter(aggregator, float, "a percentile")
+            if not 0 <= self.argument <= 1:
+                raise InvalidFunctionParameterError(
+                    "`APPROX_PERCENTILE` percentile must be between 0 and 1."
+                )
+        elif self.function == "APPROX_TOP_K":
+            self.argument = _literal_parameter(aggregator, int, "the number of values")
+            if self.argument < 1:
+                raise InvalidFunctionParameterError(
+                    "`APPROX_TOP_K` number of values must be at least 1."
+                )
+
+    def new_sketch(self, grouped: bool = False):
+        """
+        A new sketch, or if grouped, a sketch which holds a sketch for each group.
+        """
+        from opteryx.compiled.structures import CountMinSketch
+        from opteryx.compiled.structures import GroupedCountMinSketch
+        from opteryx.compiled.structures import GroupedHyperLogLog
+        from opteryx.compiled.structures import GroupedKLLSketch
+        from opteryx.compiled.structures import HyperLogLog
+        from opteryx.compiled.structures import KLLSketch
+
+        if self.function == "APPROX_COUNT_DISTINCT":
+            return GroupedHyperLogLog() if grouped else HyperLogLog()
+        if self.function == "APPROX_PERCENTILE":
+            return GroupedKLLSketch() if grouped else KLLSketch()
+        capacity = max(64, (self.argument or 1) * 4)
+        if grouped:
+            return GroupedCountMinSketch(capacity=capacity)
+        return CountMinSketch(capacity=capacity)
+
+    def update(self, sketch, morsel: pyarrow.Table, groups=None, group_count: int = 0):
+        """
+        Update the sketch with the values in the morsel; for grouped sketches `groups`
+        is the group of each row and `group_count` the number of groups.
+        """
+        if self.column.node_type == NodeType.LITERAL:
+            values = pyarrow.array(numpy.full(morsel.num_rows, self.column.value))
+        else:
+            values = morsel[self.column.schema_column.identity]
+        try:
+            if groups is None:
+                sketch.update(values)
+            else:
+                sketch.update(values, groups, group_count)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError) as err:
+            raise IncorrectTypeError(
+                f"`{self.function}` can only be used on numeric values, not `{values.type}`."
+            ) from err
+
+    def result(self, sketch):
+        if self.function == "APPROX_COUNT_DISTINCT":
+            return sketch.estimate()
+        if self.function == "APPROX_PERCENTILE":
+            return sketch.quantile(self.argument)
+        if self.function == "APPROX_TOP_K":
+            return sketch.most_frequent(self.argument)
+        values = sketch.most_frequent(1)
+        return values[0] if values else None
+
+    def group_results(self, sketch, groups) -> list:
+        """
+        The result for each of the groups from a grouped sketch.
+        """
+        if self.function == "APPROX_COUNT_DISTINCT":
+            return sketch.estimates(groups)
+        if self.function == "APPROX_PERCENTILE":
+            return sketch.quantiles(groups, self.argument)
+        if self.function == "APPROX_TOP_K":
+            return sketch.most_frequent(groups, self.argument)
+        return [values[0] if values else None for values in sketch.most_frequent(groups, 1)]
+
+
+def _literal_parameter(aggregator, cast, description):
+    if len(aggregator.parameters) != 2 or aggregator.parameters[1].node_type != NodeType.LITERAL:
+        raise InvalidFunctionParameterError(
+            f"`{aggregator.value}` requires {description} as its second parameter."
+        )
+    return cast(aggregator.parameters[1].value)
+
+
+def sketch_aggregators(aggregates) -> list:
+    """
+    The aggregates in the SELECT which are estimated from sketches
+    """
+    aggregators = get_all_nodes_of_type(aggregates, select_nodes=(NodeType.AGGREGATOR,))
+    aggregators = {
+        aggregator.schema_column.identity: SketchAggregator(aggregator)
+        for aggregator in aggregators
+        if aggregator.value in SKETCH_AGGREGATORS
+    }
+    return list(aggregators.values())
+
 
 def _is_count_star(aggregates):
     """
@@ -99,6 +223,8 @@ def build_aggregations(aggregators):
 
     for root in aggregators:
         for aggregator in get_all_nodes_of_type(root, select_nodes=(NodeType.AGGREGATOR,)):
+            if aggregator.value in SKETCH_AGGREGATORS:
+                continue
             field_node = aggregator.parameters[0]
             count_options = None
 
@@ -130,6 +256,8 @@ def _non_group_aggregates(aggregates, table):
     result = {}
 
     for aggregate in aggregates:
+        if aggregate.value in SKETCH_AGGREGATORS:
+            continue
         if aggregate.node_type in (NodeType.AGGREGATOR,):
             column_node = aggregate.parameters[0]
             if column_node.node_type == NodeType.LITERAL:
@@ -206,6 +334,7 @@ class AggregateNode(BasePlanNode):
         self.evaluatable_nodes = extract_evaluations(self.aggregates)
 
         self.column_map, self.aggregate_functions = build_aggregations(self.aggregates)
+        self.sketch_aggregators = sketch_aggregators(self.aggregates)
 
         self.do = AggregateDataObject()
 
@@ -233,12 +362,35 @@ class AggregateNode(BasePlanNode):
             )
             return
 
+        sketches = [aggregator.new_sketch() for aggregator in self.sketch_aggregators]
+        collected = []
+
         # merge all the morsels together into one table, selecting only the columns
         # we're pretty sure we're going to use - this will fail for datasets
         # larger than memory until we implement some form of partitioning
-        table = pyarrow.concat_tables(
-            project(morsels.execute(), self.all_identifiers), promote_options="none"
-        )
+        #
+        # the sketch aggregates are updated as the morsels arrive, if they're the
+        # only aggregates we don't need to keep the morsels at all
+        for morsel in project(morsels.execute(), self.all_identifiers):
+            if sketches:
+                self._update_sketches(sketches, morsel)
+                if not self.column_map:
+                    continue
+            collected.append(morsel)
+
+        start_time = time.time_ns()
+        results = {
+            aggregator.identity: aggregator.result(sketch)
+            for aggregator, sketch in zip(self.sketch_aggregators, sketches)
+        }
+        self.statistics.time_aggregating += time.time_ns() - start_time
+
+        if not self.column_map:
+            yield pyarrow.Table.from_pylist([results])
+            return
+
+        table = pyarrow.concat_tables(collected, promote_options="none")
+        del collected
 
         # Allow grouping by functions by evaluating them first
         start_time = time.time_ns()
@@ -260,7 +412,19 @@ class AggregateNode(BasePlanNode):
 
         # name the aggregate fields and add them to the Columns data
         aggregates = aggregates.select(list(self.column_map.keys()))
+        for identity, value in results.items():
+            aggregates = aggregates.append_column(identity, pyarrow.array([value]))
 
         self.statistics.time_aggregating += time.time_ns() - start_time
 
         yield aggregates
+
+    def _update_sketches(self, sketches, morsel):
+        start_time = time.time_ns()
+        morsel = evaluate_and_append(self.evaluatable_nodes, morsel)
+        self.statistics.time_evaluating += time.time_ns() - start_time
+
+        start_time = time.time_ns()
+        for aggregator, sketch in zip(self.sketch_aggregators, sketches):
+            aggregator.update(sketch, morsel)
+        self.statistics.time_aggregating += time.time_ns() - start_time
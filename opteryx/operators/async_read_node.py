@@ -21,12 +21,16 @@ normalizes the data into the format for internal processing.
 
 import asyncio
 import queue
-import threading
 import time
+from collections import deque
 from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+from typing import Deque
+from typing import Dict
 from typing import Generator
+from typing import Optional
 
-import aiohttp
 import pyarrow
 import pyarrow.parquet
 from orso.schema import RelationSchema
@@ -37,10 +41,14 @@ from opteryx.exceptions import DataError
 from opteryx.operators.base_plan_node import BasePlanDataObject
 from opteryx.operators.read_node import ReaderNode
 from opteryx.shared import AsyncMemoryPool
+from opteryx.shared import HttpSessionPool
 from opteryx.shared import MemoryPool
+from opteryx.shared.decoded_cache import DecodedMorselCache
 from opteryx.utils.file_decoders import get_decoder
 
 CONCURRENT_READS = config.CONCURRENT_READS
+MAX_CONCURRENT_READS = config.MAX_CONCURRENT_READS
+ENABLE_DECODED_MORSEL_CACHE = config.ENABLE_DECODED_MORSEL_CACHE
 MAX_READ_BUFFER_CAPACITY = config.MAX_READ_BUFFER_CAPACITY
 
 
@@ -81,24 +89,184 @@ def normalize_morsel(schema: RelationSchema, morsel: pyarrow.Table) -> pyarrow.T
     return morsel.select([col.identity for col in schema.columns])
 
 
-async def fetch_data(blob_names, pool, reader, reply_queue, statistics):
-    semaphore = asyncio.Semaphore(CONCURRENT_READS)
-    session = aiohttp.ClientSession()
+# the concurrency each dataset finished its last read with, the next read starts there
+LEARNED_READ_CONCURRENCY: Dict[str, int] = {}
+LEARNED_READ_CONCURRENCY_SIZE: int = 1024
+
+
+class AdaptiveConcurrency:
+    """
+    Limit the number of reads in flight, adjusting the limit as the data is read using
+    Additive Increase, Multiplicative Decrease (AIMD) as TCP does for congestion.
+
+    Reads are measured in rounds, a round ends when as many reads as the limit have
+    completed. At the end of each round:
+
+    - if readers had to wait to write to the read buffer, the decoder isn't keeping up,
+      or if throughput fell after the limit was last increased, the limit is halved
+    - if there are more blobs waiting to be decoded than the limit, the consumer is the
+      bottleneck and the limit is held
+    - otherwise the limit is increased by one
+    """
+
+    # throughput falling below this fraction of the previous round is a drop
+    THROUGHPUT_DROP: float = 0.7
+
+    def __init__(
+        self,
+        statistics,
+        backlog: Callable[[], int],
+        initial: int = CONCURRENT_READS,
+        maximum: int = MAX_CONCURRENT_READS,
+    ):
+        self.statistics = statistics
+        self.backlog = backlog
+        self.maximum = max(1, maximum)
+        self.limit = max(1, min(initial, self.maximum))
+        self.in_flight = 0
+        self._waiters: Optional[Deque[asyncio.Future]] = None
+        self._increased = False
+        self._previous_throughput = 0.0
+        self._start_round()
+
+    def _start_round(self):
+        self._round_reads = 0
+        self._round_start = time.monotonic_ns()
+        self._round_bytes = self.statistics.bytes_read
+        self._round_stalls = self.statistics.stalls_writing_to_read_buffer
+
+    async def acquire(self):
+        if self._waiters is None:
+            # created here so it belongs to the event loop doing the reads
+            self._waiters = deque()
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        # the slot is handed over by release, only as many waiters as there are free
+        # slots are woken, not every waiting read
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # cancelled waiters are skipped when they reach the front of the queue
+            if not waiter.cancelled():
+                # we were given a slot as we were cancelled, pass it on
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    async def release(self):
+        self.in_flight -= 1
+        self._round_reads += 1
+        if self._round_reads >= self.limit:
+            self._adjust()
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _adjust(self):
+        elapsed = max(time.monotonic_ns() - self._round_start, 1)
+        # blobs read from the caches aren't counted in bytes_read
+        read_bytes = self.statistics.bytes_read - self._round_bytes
+        throughput = (read_bytes or self._round_reads) / elapsed
+
+        stalled = self.statistics.stalls_writing_to_read_buffer > self._round_stalls
+        slowed = self._increased and throughput < self._previous_throughput * self.THROUGHPUT_DROP
+
+        self._increased = False
+        if stalled or slowed:
+            self.limit = max(1, self.limit // 2)
+        elif self.backlog() < self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self._increased = True
+
+        self._previous_throughput = throughput
+        self.statistics.read_concurrency_peak = max(
+            self.statistics.read_concurrency_peak, self.limit
+        )
+        self._start_round()
+
+
+async def fetch_data(
+    blob_names, pool, reader, reply_queue, statistics, skip=None, concurrency=None, reverse=False
+):
+    """
+    Read blobs, putting the references to the read blobs on the reply queue.
+
+    blob_names is either a list of blob names, or a callable which is given the session
+    and returns an async iterator of batches of blob names. The second form allows the
+    blobs to be read while the dataset is still being listed.
+
+    skip is a callable which returns True for blobs which don't need to be read.
+
+    concurrency is the AdaptiveConcurrency limiting the reads in flight.
+
+    reverse reads the blobs in the reverse of the order they are listed, the whole
+    dataset is listed before any blobs are read.
+
+    If this is cancelled, because the consumer has stopped early, the reads in flight
+    are cancelled and no more blobs are read.
+
+    This runs on the HttpSessionPool's event loop, the readers are given the shared
+    HTTP session so connections are reused between scans and between queries.
+    """
+    if concurrency is None:
+        concurrency = AdaptiveConcurrency(statistics, reply_queue.qsize)
+    session = HttpSessionPool().session
 
     async def fetch_and_process(blob_name):
-        async with semaphore:
+        await concurrency.acquire()
+        try:
             start_per_blob = time.monotonic_ns()
             reference = await reader(
                 blob_name=blob_name, pool=pool, session=session, statistics=statistics
             )
             reply_queue.put((blob_name, reference))  # Put data onto the queue
             statistics.time_reading_blobs += time.monotonic_ns() - start_per_blob
-
-    tasks = (fetch_and_process(blob) for blob in blob_names)
-
-    await asyncio.gather(*tasks)
-    reply_queue.put(None)
-    await session.close()
+        finally:
+            await concurrency.release()
+
+    tasks: list = []
+    try:
+        if callable(blob_names) and reverse:
+            start = time.monotonic_ns()
+            blob_names = [blob async for batch in blob_names(session) for blob in batch]
+            statistics.time_listing_blobs += time.monotonic_ns() - start
+        if reverse:
+            blob_names = list(reversed(blob_names))
+
+        if callable(blob_names):
+            start = time.monotonic_ns()
+            async for batch in blob_names(session):
+                statistics.time_listing_blobs += time.monotonic_ns() - start
+                tasks.extend(
+                    asyncio.create_task(fetch_and_process(blob))
+                    for blob in batch
+                    if skip is None or not skip(blob)
+                )
+                start = time.monotonic_ns()
+        else:
+            tasks = [
+                asyncio.create_task(fetch_and_process(blob))
+                for blob in blob_names
+                if skip is None or not skip(blob)
+            ]
+
+        await asyncio.gather(*tasks)
+        reply_queue.put(None)
+    except Exception as err:
+        # hand the error to the consumer, otherwise it would wait forever
+        reply_queue.put(err)
+    finally:
+        # if we failed or were cancelled, don't leave reads running
+        for task in tasks:
+            task.cancel()
 
 
 @dataclass
@@ -118,6 +286,39 @@ class AsyncReaderNode(ReaderNode):
     def from_dict(cls, dic: dict) -> "AsyncReaderNode":  # pragma: no cover
         raise NotImplementedError()
 
+    def _cancel_reads(self, read_future, data_queue: queue.Queue):
+        """
+        The consumer stopped before everything was read (e.g. a LIMIT was satisfied or
+        the cursor was closed), cancel the reads in flight and release the blobs which
+        have been read but not decoded.
+        """
+        read_future.cancel()
+        self.statistics.cancelled_scans += 1
+        while True:
+            try:
+                item = data_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None or isinstance(item, Exception):
+                continue
+            _, reference = item
+            if isinstance(reference, int):
+                self.pool.release(reference)
+
+    def _prepare_morsel(self, orso_schema, morsel, arrow_schema):
+        morsel = normalize_morsel(orso_schema, morsel)
+        if arrow_schema:
+            morsel = morsel.cast(arrow_schema)
+        else:
+            arrow_schema = morsel.schema
+        morsel = self._apply_dynamic_filter(morsel)
+
+        self.statistics.blobs_read += 1
+        self.statistics.rows_read += morsel.num_rows
+        self.statistics.bytes_processed += morsel.nbytes
+
+        return morsel, arrow_schema
+
     def execute(self) -> Generator:
         from opteryx import system_statistics
 
@@ -131,105 +332,168 @@ class AsyncReaderNode(ReaderNode):
                 orso_schema_cols.append(col)
         orso_schema.columns = orso_schema_cols
 
-        blob_names = reader.partition_scheme.get_blobs_in_partition(
-            start_date=reader.start_date,
-            end_date=reader.end_date,
-            blob_list_getter=reader.get_list_of_blob_names,
-            prefix=reader.dataset,
-            predicates=self.predicates,
-        )
-
-        if len(blob_names) == 0:
-            # if we don't have any matching blobs, create an empty dataset
-            # TODO: rewrite
-            from orso import DataFrame
-
-            as_arrow = DataFrame(rows=[], schema=orso_schema).arrow()
-            renames = [orso_schema.column(col).identity for col in as_arrow.column_names]
-            as_arrow = as_arrow.rename_columns(renames)
-            yield as_arrow
-
-        data_queue: queue.Queue = queue.Queue()
-
-        loop = asyncio.new_event_loop()
-        read_thread = threading.Thread(
-            target=lambda: loop.run_until_complete(
-                fetch_data(
-                    blob_names,
-                    AsyncMemoryPool(self.pool),
-                    reader.async_read_blob,
-                    data_queue,
-                    self.statistics,
-                )
-            ),
-            daemon=True,
-        )
-        read_thread.start()
-
         morsel = None
         arrow_schema = None
+        data_queue: queue.Queue = queue.Queue()
 
-        while True:
-            try:
-                # Attempt to get an item with a timeout.
-                item = data_queue.get(timeout=0.1)
-            except queue.Empty:
-                # Increment stall count if the queue is empty.
-                self.statistics.stalls_reading_from_read_buffer += 1
-                system_statistics.io_wait_seconds += 0.1
-                continue  # Skip the rest of the loop and try to get an item again.
-
-            if item is None:
-                # Break out of the loop if the item is None, indicating a termination condition.
-                break
+        # blobs we've previously decoded with the same projection and selection
+        # don't need to be read or decoded again
+        decoded_cache = None
+        cache_keys: dict = {}
+        if (
+            ENABLE_DECODED_MORSEL_CACHE
+            and "NO_CACHE" not in self.hints
+            and hasattr(reader, "get_blob_version")
+        ):
+            decoded_cache = DecodedMorselCache()
+
+        def read_from_decoded_cache(blob_name):
+            if decoded_cache is None:
+                return False
+            key = decoded_cache.key(
+                blob_name, reader.get_blob_version(blob_name), self.columns, self.predicates
+            )
+            cached_morsel = decoded_cache.get(key)
+            if cached_morsel is None:
+                cache_keys[blob_name] = key
+                return False
+            data_queue.put((blob_name, cached_morsel))
+            return True
+
+        async_blob_list_getter = getattr(reader, "async_get_list_of_blob_names", None)
+        if async_blob_list_getter is None:
+            # the connector can't list asynchronously, list the blobs in the thread
+            async def async_blob_list_getter(*, prefix, **kwargs):
+                yield await asyncio.to_thread(reader.get_list_of_blob_names, prefix=prefix)
+
+        def list_blobs(session):
+            return reader.partition_scheme.async_get_blobs_in_partition(
+                start_date=reader.start_date,
+                end_date=reader.end_date,
+                async_blob_list_getter=partial(async_blob_list_getter, session=session),
+                blob_list_getter=reader.get_list_of_blob_names,
+                prefix=reader.dataset,
+                predicates=self.predicates,
+            )
 
-            blob_name, reference = item
+        # start at the concurrency the last read of this dataset finished with
+        learned_key = f"{reader.__type__}:{reader.dataset}"
+        concurrency = AdaptiveConcurrency(
+            self.statistics,
+            data_queue.qsize,
+            initial=LEARNED_READ_CONCURRENCY.get(learned_key, CONCURRENT_READS),
+        )
 
-            decoder = get_decoder(blob_name)
+        # the reads run on the event loop shared by all scans
+        read_future = HttpSessionPool().run(
+            fetch_data(
+                list_blobs,
+                AsyncMemoryPool(self.pool),
+                reader.async_read_blob,
+                data_queue,
+                self.statistics,
+                skip=read_from_decoded_cache,
+                concurrency=concurrency,
+                # datasets are usually listed in the order they were written, if we're
+                # after the highest values we're more likely to find them at the end
+                reverse=self.dynamic_filter is not None and not self.dynamic_filter.ascending,
+            )
+        )
 
-            try:
-                # the sync readers include the decode time as part of the read time
+        finished = False
+        try:
+            while True:
+                if self.properties.cancelled.is_set():
+                    # the query has been cancelled, the reads are cancelled below
+                    return
                 try:
-                    # This pool is being used by async processes in another thread, using
-                    # zero copy versions occassionally results in data getting corrupted
-                    # due to a read-after-free type error
-                    start = time.monotonic_ns()
-                    blob_bytes = self.pool.read_and_release(reference, zero_copy=False)
-                    decoded = decoder(
-                        blob_bytes, projection=self.columns, selection=self.predicates
+                    # Attempt to get an item with a timeout.
+                    item = data_queue.get(timeout=0.1)
+                except queue.Empty:
+                    # Increment stall count if the queue is empty.
+                    self.statistics.stalls_reading_from_read_buffer += 1
+                    system_statistics.io_wait_seconds += 0.1
+                    continue  # Skip the rest of the loop and try to get an item again.
+
+                if item is None:
+                    # Break out of the loop if the item is None, indicating a termination condition.
+                    break
+
+                if isinstance(item, Exception):
+                    # listing or reading the dataset failed
+                    read_future.result()
+                    raise item
+
+                blob_name, reference = item
+
+                if isinstance(reference, pyarrow.Table):
+                    self.statistics.decoded_cache_hits += 1
+                    morsel, arrow_schema = self._prepare_morsel(
+                        orso_schema, reference, arrow_schema
                     )
-                except Exception as err:
-                    from pyarrow import ArrowInvalid
+                    yield morsel
+                    continue
+
+                decoder = get_decoder(blob_name)
 
-                    if isinstance(err, ArrowInvalid) and "No match for" in str(err):
-                        raise DataError(
-                            f"Unable to read blob {blob_name} - this error is likely caused by a blob having an significantly different schema to previously handled blobs, or the data catalog."
+                try:
+                    # the sync readers include the decode time as part of the read time
+                    try:
+                        # This pool is being used by async processes in another thread, using
+                        # zero copy versions occassionally results in data getting corrupted
+                        # due to a read-after-free type error
+                        start = time.monotonic_ns()
+                        if isinstance(reference, pyarrow.Buffer):
+                            # memory mapped local files are decoded in place
+                            blob_bytes = reference
+                        else:
+                            blob_bytes = self.pool.read_and_release(reference, zero_copy=False)
+                        decoded = decoder(
+                            blob_bytes,
+                            projection=self.columns,
+                            selection=self.predicates,
+                            dynamic_filter=self.dynamic_filter,
                         )
-                    raise DataError(f"Unable to read blob {blob_name} - error {err}") from err
-                self.statistics.time_reading_blobs += time.monotonic_ns() - start
-                num_rows, _, morsel = decoded
-                self.statistics.rows_seen += num_rows
-
-                morsel = normalize_morsel(orso_schema, morsel)
-                if arrow_schema:
-                    morsel = morsel.cast(arrow_schema)
-                else:
-                    arrow_schema = morsel.schema
-
-                self.statistics.blobs_read += 1
-                self.statistics.rows_read += morsel.num_rows
-                self.statistics.bytes_processed += morsel.nbytes
-
-                yield morsel
-            except Exception as err:
-                self.statistics.add_message(f"failed to read {blob_name}")
-                self.statistics.failed_reads += 1
-                import warnings
-
-                warnings.warn(f"failed to read {blob_name} - {err}")
-
-        # Ensure the thread is closed
-        read_thread.join()
+                    except Exception as err:
+                        from pyarrow import ArrowInvalid
+
+                        if isinstance(err, ArrowInvalid) and "No match for" in str(err):
+                            raise DataError(
+                                f"Unable to read blob {blob_name} - this error is likely caused by a blob having an significantly different schema to previously handled blobs, or the data catalog."
+                            )
+                        raise DataError(f"Unable to read blob {blob_name} - error {err}") from err
+                    self.statistics.time_reading_blobs += time.monotonic_ns() - start
+                    num_rows, _, morsel = decoded
+                    self.statistics.rows_seen += num_rows
+
+                    # blobs decoded with a dynamic filter may be missing rows
+                    if (
+                        decoded_cache is not None
+                        and self.dynamic_filter is None
+                        and decoded_cache.set(cache_keys.get(blob_name), morsel)
+                    ):
+                        self.statistics.decoded_cache_inserts += 1
+
+                    morsel, arrow_schema = self._prepare_morsel(orso_schema, morsel, arrow_schema)
+                    yield morsel
+                except Exception as err:
+                    self.statistics.add_message(f"failed to read {blob_name}")
+                    self.statistics.failed_reads += 1
+                    import warnings
+
+                    warnings.warn(f"failed to read {blob_name} - {err}")
+            finished = True
+        finally:
+            if not finished:
+                self._cancel_reads(read_future, data_queue)
+
+        # Ensure the reads have finished
+        read_future.result()
+
+        LEARNED_READ_CONCURRENCY.pop(learned_key, None)
+        if len(LEARNED_READ_CONCURRENCY) >= LEARNED_READ_CONCURRENCY_SIZE:
+            LEARNED_READ_CONCURRENCY.pop(next(iter(LEARNED_READ_CONCURRENCY)))
+        LEARNED_READ_CONCURRENCY[learned_key] = concurrency.limit
 
         if morsel:
             self.statistics.columns_read += morsel.num_columns
@@ -22,14 +22,20 @@ here rather than calling the join() functions
 import time
 from dataclasses import dataclass
 from typing import Generator
+from typing import Optional
 from typing import Set
 from typing import Tuple
 
 import numpy
 import pyarrow
+import pyarrow.compute
 from orso.schema import FlatColumn
 
 from opteryx.managers.expression import NodeType
+from opteryx.managers.expression import evaluate
+from opteryx.managers.expression import evaluate_and_append
+from opteryx.managers.expression import format_expression
+from opteryx.managers.expression import get_all_nodes_of_type
 from opteryx.models import Node
 from opteryx.models import QueryProperties
 from opteryx.operators import BasePlanNode
@@ -37,9 +43,37 @@ from opteryx.operators import OperatorType
 from opteryx.operators.base_plan_node import BasePlanDataObject
 
 INTERNAL_BATCH_SIZE: int = 7500  # config
-MAX_JOIN_SIZE: int = 1000  # config
 MORSEL_SIZE_BYTES: int = 16 * 1024 * 1024
-CROSS_JOIN_UNNEST_BATCH_SIZE = 10000
+
+
+def _unnest_list_column(
+    column: pyarrow.Array, value_set: Optional[pyarrow.Array] = None
+) -> Tuple[numpy.ndarray, pyarrow.Array]:
+    """
+    Unnest a list column, working from the list offsets rather than the individual lists.
+
+    Parameters:
+        column: The list column to unnest, with no null lists.
+        value_set: If provided, only values in this set are returned.
+
+    Returns:
+        The row each value came from, and the values.
+    """
+    from opteryx.compiled.cross_join import build_rows_indices
+
+    if pyarrow.types.is_fixed_size_list(column.type):
+        column = column.cast(pyarrow.list_(column.type.value_type))
+
+    indices = build_rows_indices(column.offsets.to_numpy())
+    # the values buffer of the list column, taking account of the column being sliced
+    values = column.flatten()
+
+    if value_set is not None:
+        mask = pyarrow.compute.is_in(values, value_set=value_set)
+        indices = indices[mask.to_numpy(zero_copy_only=False)]
+        values = values.filter(mask)
+
+    return indices, values
 
 
 def _cross_join_unnest_column(
@@ -62,119 +96,100 @@ def _cross_join_unnest_column(
     Returns:
         A generator that yields the resulting `pyarrow.Table` objects.
     """
-    from opteryx.compiled.cross_join import build_filtered_rows_indices_and_column
-    from opteryx.compiled.cross_join import build_rows_indices_and_column
-    from opteryx.compiled.structures import HashSet
+    from opteryx.compiled.structures import DistinctSet
     from opteryx.compiled.structures import list_distinct
 
-    hash_set = HashSet()
+    seen = DistinctSet()
 
     # Check if the source node type is an identifier, raise error otherwise
     if source.node_type != NodeType.IDENTIFIER:
         raise NotImplementedError("Can only CROSS JOIN UNNEST on a column")
 
-    column_type = None
-    batch_size: int = INTERNAL_BATCH_SIZE
+    target_type = target_column.arrow_field.type
+    value_set = None
     at_least_once = False
-    single_column_collector = []
+    single_column_collector: list = []
+    single_column_bytes = 0
+
+    def _single_column_morsel():
+        schema = pyarrow.schema([pyarrow.field(name=target_column.identity, type=target_type)])
+        arrow_array = pyarrow.chunked_array(single_column_collector)
+        if arrow_array.type != target_type:
+            arrow_array = arrow_array.cast(target_type)
+        return pyarrow.Table.from_arrays([arrow_array], schema=schema)
 
     # Loop through each morsel from the morsels execution
     for left_morsel in morsels.execute():
         start = time.monotonic_ns()
-        # Break the morsel into batches to avoid memory issues
-        for left_block in left_morsel.to_batches(max_chunksize=batch_size):
-            new_block = None
+        for left_block in left_morsel.to_batches():
             # Fetch the data of the column to be unnested
-            column_data = left_block[source.schema_column.identity]
+            column_data = left_block.column(source.schema_column.identity)
 
             # Filter out null values
-            valid_offsets = column_data.is_valid()
-            column_data = column_data.drop_null()
+            if column_data.null_count > 0:
+                valid_offsets = column_data.is_valid()
+                column_data = column_data.filter(valid_offsets)
+                left_block = left_block.filter(valid_offsets)
             if len(column_data) == 0:
                 continue
-            left_block = left_block.filter(valid_offsets)
-            # Set column_type if it hasn't been determined already
-            if column_type is None:
-                column_type = column_data.type.value_type
+
+            if conditions is not None and value_set is None:
+                value_set = pyarrow.array(list(conditions))
+                try:
+                    value_set = value_set.cast(column_data.type.value_type)
+                except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError):
+                    # leave the comparison to is_in
+                    pass
 
             # Build indices and new column data
-            if conditions is None:
-                indices, new_column_data = build_rows_indices_and_column(
-                    column_data.to_numpy(False)
-                )
-            else:
-                indices, new_column_data = build_filtered_rows_indices_and_column(
-                    column_data.to_numpy(False), conditions
-                )
+            indices, new_column_data = _unnest_list_column(column_data, value_set)
 
             if single_column and distinct and indices.size > 0:
                 # if the unnest target is the only field in the SELECT and we're DISTINCTING
-                indices = numpy.array(indices, dtype=numpy.int32)
-                new_column_data, indices, hash_set = list_distinct(
-                    new_column_data, indices, hash_set
+                new_column_data, indices, seen = list_distinct(new_column_data, indices, seen)
+
+            if len(indices) == 0:
+                continue
+
+            if single_column:
+                single_column_collector.append(new_column_data)
+                single_column_bytes += new_column_data.nbytes
+                if single_column_bytes >= MORSEL_SIZE_BYTES:
+                    new_block = _single_column_morsel()
+                    single_column_collector.clear()
+                    single_column_bytes = 0
+                    statistics.time_cross_join_unnest += time.monotonic_ns() - start
+                    yield new_block
+                    start = time.monotonic_ns()
+                    at_least_once = True
+                continue
+
+            # Size the morsels we create by how many bytes each row will be
+            total_rows = len(indices)
+            row_bytes = left_block.nbytes / left_block.num_rows
+            row_bytes += new_column_data.nbytes / total_rows
+            block_size = max(1, int(MORSEL_SIZE_BYTES // max(row_bytes, 1)))
+
+            for start_block in range(0, total_rows, block_size):
+                end_block = min(start_block + block_size, total_rows)
+
+                # Create a new block using the chunk of indices
+                new_block = left_block.take(indices[start_block:end_block])
+                new_block = pyarrow.Table.from_batches([new_block], schema=left_morsel.schema)
+
+                # Append the corresponding chunk of new_column_data to the block
+                new_block = new_block.append_column(
+                    target_column.identity,
+                    new_column_data.slice(start_block, end_block - start_block),
                 )
 
-            if len(indices) > 0:
-                if single_column:
-                    single_column_collector.extend(new_column_data)
-                    if len(single_column_collector) > INTERNAL_BATCH_SIZE:
-                        schema = pyarrow.schema(
-                            [
-                                pyarrow.field(
-                                    name=target_column.identity, type=target_column.arrow_field.type
-                                )
-                            ]
-                        )
-                        arrow_array = pyarrow.array(single_column_collector)
-                        if arrow_array.type != target_column.arrow_field.type:
-                            arrow_array = arrow_array.cast(target_column.arrow_field.type)
-                        new_block = pyarrow.Table.from_arrays([arrow_array], schema=schema)
-                        single_column_collector.clear()
-                        del arrow_array
-                        statistics.time_cross_join_unnest += time.monotonic_ns() - start
-                        yield new_block
-                        start = time.monotonic_ns()
-                        at_least_once = True
-                else:
-                    # Rebuild the block with the new column data if we have any rows to build for
-
-                    total_rows = len(indices)  # Both arrays have the same length
-                    block_size = MORSEL_SIZE_BYTES / (left_block.nbytes / left_block.num_rows)
-                    block_size = int(block_size // 1000) * 1000
-
-                    for start_block in range(0, total_rows, block_size):
-                        # Compute the end index for the current chunk
-                        end_block = min(start_block + block_size, total_rows)
-
-                        # Slice the current chunk of indices and new_column_data
-                        indices_chunk = indices[start_block:end_block]
-                        new_column_data_chunk = new_column_data[start_block:end_block]
-
-                        # Create a new block using the chunk of indices
-                        indices_chunk = numpy.array(indices_chunk, dtype=numpy.int32)
-                        new_block = left_block.take(indices_chunk)
-                        new_block = pyarrow.Table.from_batches(
-                            [new_block], schema=left_morsel.schema
-                        )
-
-                        # Append the corresponding chunk of new_column_data to the block
-                        new_block = new_block.append_column(
-                            target_column.identity, pyarrow.array(new_column_data_chunk)
-                        )
-
-                        statistics.time_cross_join_unnest += time.monotonic_ns() - start
-                        yield new_block
-                        at_least_once = True
-                        start = time.monotonic_ns()
+                statistics.time_cross_join_unnest += time.monotonic_ns() - start
+                yield new_block
+                at_least_once = True
+                start = time.monotonic_ns()
 
     if single_column_collector:
-        schema = pyarrow.schema(
-            [pyarrow.field(name=target_column.identity, type=target_column.arrow_field.type)]
-        )
-        arrow_array = pyarrow.array(single_column_collector)
-        if arrow_array.type != target_column.arrow_field.type:
-            arrow_array = arrow_array.cast(target_column.arrow_field.type)
-        new_block = pyarrow.Table.from_arrays([arrow_array], schema=schema)
+        new_block = _single_column_morsel()
         statistics.time_cross_join_unnest += time.monotonic_ns() - start
         yield new_block
         at_least_once = True
@@ -219,74 +234,153 @@ def _cross_join_unnest_literal(
             start = time.monotonic_ns()
 
 
-def _cartesian_product(*arrays):
+def _pair_blocks(left_rows: int, right_rows: int, block_size: int):
     """
-    Cartesian product of arrays creates every combination of the elements in the arrays
+    Generate the pairs of row indices of the cartesian product a block at a time, left
+    rows in order with each paired with every right row in order.
     """
-    array_count = len(arrays)
-    arr = numpy.empty([len(array) for array in arrays] + [array_count], dtype=numpy.int64)
-    for i, array in enumerate(numpy.ix_(*arrays)):
-        arr[..., i] = array
-    return numpy.hsplit(arr.reshape(-1, array_count), array_count)
+    total_pairs = left_rows * right_rows
+    for start in range(0, total_pairs, block_size):
+        pairs = numpy.arange(start, min(start + block_size, total_pairs), dtype=numpy.int64)
+        yield numpy.divmod(pairs, right_rows)
 
 
-def _cross_join(left, right, statistics):
+def _rows_per_block(left: pyarrow.Table, right: pyarrow.Table) -> int:
     """
-    A cross join is the cartesian product of two tables - this usually isn't very
-    useful, but it does allow you to the theta joins (non-equi joins)
+    The number of pairs of rows from left and right which fit in MORSEL_SIZE_BYTES.
     """
+    row_bytes = left.nbytes / max(left.num_rows, 1) + right.nbytes / max(right.num_rows, 1)
+    return max(1, int(MORSEL_SIZE_BYTES // max(row_bytes, 1)))
 
-    def _chunker(seq_1, seq_2, size):
-        """
-        Chunk two equal length interables into size sized chunks
 
-        This returns a generator.
-        """
-        return (
-            (seq_1[pos : pos + size], seq_2[pos : pos + size]) for pos in range(0, len(seq_1), size)
-        )
+def _condition_tables(
+    condition: Node, left: pyarrow.Table, right: pyarrow.Table
+) -> Tuple[pyarrow.Table, pyarrow.Table]:
+    """
+    The columns of left and right which the condition references.
+    """
+    condition_columns = {
+        node.schema_column.identity
+        for node in get_all_nodes_of_type(condition, (NodeType.IDENTIFIER,))
+    }
+    left = left.select([column for column in left.column_names if column in condition_columns])
+    right = right.select([column for column in right.column_names if column in condition_columns])
+    return left, right
+
+
+def _matching_pairs(condition: Node, left: pyarrow.Table, right: pyarrow.Table, pairs):
+    """
+    Reduce blocks of candidate pairs of rows to the pairs which match the condition, left
+    and right should only have the columns the condition references.
+    """
+    from opteryx.utils.arrow import align_tables
+
+    function_evaluations = get_all_nodes_of_type(condition, (NodeType.FUNCTION,))
+
+    for left_indices, right_indices in pairs:
+        if left.num_columns == 0 and right.num_columns == 0:
+            # the condition doesn't reference any columns (e.g. RANDOM() < 0.5), it
+            # still needs to be evaluated once for each pair
+            candidates = pyarrow.Table.from_batches(
+                [
+                    pyarrow.RecordBatch.from_struct_array(
+                        pyarrow.nulls(left_indices.size, pyarrow.struct([]))
+                    )
+                ]
+            )
+        else:
+            candidates = align_tables(left, right, left_indices, right_indices)
+        candidates = evaluate_and_append(function_evaluations, candidates)
+        mask = evaluate(condition, candidates)
+        if not isinstance(mask, pyarrow.lib.BooleanArray):
+            mask = pyarrow.array(mask, type=pyarrow.bool_())
+        mask = pyarrow.compute.fill_null(mask, False).to_numpy(zero_copy_only=False)
+        yield left_indices[mask], right_indices[mask]
+
 
+def _take_pairs(left: pyarrow.Table, right: pyarrow.Table, pairs, block_size: int):
+    """
+    Build the rows for blocks of pairs of row indices, in morsels of block_size rows.
+    """
     from opteryx.utils.arrow import align_tables
 
+    pending_left: list = []
+    pending_right: list = []
+    pending_rows = 0
+
+    for left_indices, right_indices in pairs:
+        if left_indices.size == 0:
+            continue
+        pending_left.append(left_indices)
+        pending_right.append(right_indices)
+        pending_rows += left_indices.size
+
+        # build the rows once we have a morsel's worth
+        while pending_rows >= block_size:
+            left_indices = numpy.concatenate(pending_left)
+            right_indices = numpy.concatenate(pending_right)
+            yield align_tables(left, right, left_indices[:block_size], right_indices[:block_size])
+            pending_left = [left_indices[block_size:]]
+            pending_right = [right_indices[block_size:]]
+            pending_rows = pending_left[0].size
+
+    if pending_rows > 0:
+        yield align_tables(
+            left, right, numpy.concatenate(pending_left), numpy.concatenate(pending_right)
+        )
+
+
+def _empty_join(left_schema: pyarrow.Schema, right_schema: pyarrow.Schema) -> pyarrow.Table:
+    fields = [pyarrow.field(name=f.name, type=f.type) for f in right_schema] + [
+        pyarrow.field(name=f.name, type=f.type) for f in left_schema
+    ]
+    combined_schemas = pyarrow.schema(fields)
+    return pyarrow.Table.from_arrays(
+        [pyarrow.array([]) for _ in combined_schemas], schema=combined_schemas
+    )
+
+
+def _cross_join(left, right, statistics, condition: Node = None):
+    """
+    A cross join is the cartesian product of two tables - this usually isn't very
+    useful, but it does allow you to the theta joins (non-equi joins)
+
+    The pairs of rows are generated a block at a time and the output morsels are sized
+    to MORSEL_SIZE_BYTES. If we have a condition (a nested loop join), it is evaluated
+    against just the columns it references and only the matching pairs are built.
+    """
     at_least_once = False
     left_schema = None
-    right_schema = right.schema
 
     for left_morsel in left.execute():
         if left_schema is None:
             left_schema = left_morsel.schema
+        if left_morsel.num_rows == 0 or right.num_rows == 0:
+            continue
         start = time.monotonic_ns()
-        # Iterate through left table in chunks of size INTERNAL_BATCH_SIZE
-        for left_block in left_morsel.to_batches(max_chunksize=INTERNAL_BATCH_SIZE):
-            # Convert the chunk to a table to retain column names
-            left_block = pyarrow.Table.from_batches([left_block], schema=left_morsel.schema)
+        block_size = _rows_per_block(left_morsel, right)
 
-            # Create an array of row indices for each table
-            left_array = numpy.arange(left_block.num_rows, dtype=numpy.int64)
-            right_array = numpy.arange(right.num_rows, dtype=numpy.int64)
+        if condition is None:
+            pairs = _pair_blocks(left_morsel.num_rows, right.num_rows, block_size)
+        else:
+            left_condition, right_condition = _condition_tables(condition, left_morsel, right)
+            pairs = _pair_blocks(
+                left_morsel.num_rows,
+                right.num_rows,
+                _rows_per_block(left_condition, right_condition),
+            )
+            pairs = _matching_pairs(condition, left_condition, right_condition, pairs)
 
-            # Calculate the cartesian product of the two arrays of row indices
-            left_align, right_align = _cartesian_product(left_array, right_array)
+        for table in _take_pairs(left_morsel, right, pairs, block_size):
+            statistics.time_cross_join += time.monotonic_ns() - start
+            yield table
+            at_least_once = True
+            start = time.monotonic_ns()
 
-            # Further break down the result into manageable chunks of size MAX_JOIN_SIZE
-            for left_chunk, right_chunk in _chunker(left_align, right_align, MAX_JOIN_SIZE):
-                # Align the tables using the specified chunks of row indices
-                table = align_tables(left_block, right, left_chunk.flatten(), right_chunk.flatten())
-
-                # Yield the resulting table to the caller
-                statistics.time_cross_join += time.monotonic_ns() - start
-                yield table
-                at_least_once = True
-                start = time.monotonic_ns()
+        statistics.time_cross_join += time.monotonic_ns() - start
 
     if not at_least_once:
-        fields = [pyarrow.field(name=f.name, type=f.type) for f in right_schema] + [
-            pyarrow.field(name=f.name, type=f.type) for f in left_schema
-        ]
-        combined_schemas = pyarrow.schema(fields)
-        yield pyarrow.Table.from_arrays(
-            [pyarrow.array([]) for _ in combined_schemas], schema=combined_schemas
-        )
+        yield _empty_join(left_schema, right.schema)
 
 
 @dataclass
@@ -296,6 +390,7 @@ class CrossJoinDataObject(BasePlanDataObject):
     _unnest_target: str = None
     _filters: str = None
     _distinct: bool = False
+    _condition: str = None
 
 
 class CrossJoinNode(BasePlanNode):
@@ -318,6 +413,8 @@ class CrossJoinNode(BasePlanNode):
         self._unnest_target = config.get("unnest_target")
         self._filters = config.get("filters")
         self._distinct = config.get("distinct", False)
+        # conditions on the joined rows, fused into the join so we only build matching rows
+        self._condition = config.get("condition")
 
         # handle variation in how the unnested column is represented
         if self._unnest_column:
@@ -346,6 +443,8 @@ class CrossJoinNode(BasePlanNode):
         filters = ""
         if self._filters:
             filters = f"({self._unnest_target.name} IN ({', '.join(self._filters)}))"
+        if self._condition:
+            filters = f"({format_expression(self._condition)})"
         return f"CROSS JOIN {filters}"
 
     def execute(self) -> Generator:
@@ -353,8 +452,10 @@ class CrossJoinNode(BasePlanNode):
         right_node = self._producers[1]  # type:ignore
 
         if self._unnest_column is None:
-            right_table = pyarrow.concat_tables(right_node.execute(), promote_options="none")  # type:ignore
-            yield from _cross_join(left_node, right_table, self.statistics)
+            right_table = pyarrow.concat_tables(
+                right_node.execute(), promote_options="none"
+            )  # type:ignore
+            yield from _cross_join(left_node, right_table, self.statistics, self._condition)
 
         elif isinstance(self._unnest_column.value, tuple):
             yield from _cross_join_unnest_literal(
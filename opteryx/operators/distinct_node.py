@@ -33,13 +33,13 @@ class DistinctNode(BasePlanNode):
     operator_type = OperatorType.PASSTHRU
 
     def __init__(self, properties: QueryProperties, **config):
-        from opteryx.compiled.structures import HashSet
+        from opteryx.compiled.structures import DistinctSet
 
         super().__init__(properties=properties)
         self._distinct_on = config.get("on")
         if self._distinct_on:
             self._distinct_on = [col.schema_column.identity for col in self._distinct_on]
-        self.hash_set = HashSet()
+        self.seen = DistinctSet()
 
     @classmethod
     def from_json(cls, json_obj: str) -> "BasePlanNode":  # pragma: no cover
@@ -56,9 +56,9 @@ class DistinctNode(BasePlanNode):
     def execute(self) -> Generator[pyarrow.Table, None, None]:
         from opteryx.compiled.structures import distinct
 
-        # We create a HashSet outside the distinct call, this allows us to pass
-        # the hash to each run of the distinct which means we don't need to concat
-        # all of the tables together to return a result.
+        # We create a DistinctSet outside the distinct call, this allows us to pass
+        # the rows we've seen to each run of the distinct which means we don't need to
+        # concat all of the tables together to return a result.
         #
         # Being able to run morsel-by-morsel means if we have a LIMIT clause, we can
         # limit processing
@@ -68,9 +68,7 @@ class DistinctNode(BasePlanNode):
 
         for morsel in morsels.execute():
             start = time.monotonic_ns()
-            unique_indexes, self.hash_set = distinct(
-                morsel, columns=self._distinct_on, seen_hashes=self.hash_set
-            )
+            unique_indexes, self.seen = distinct(morsel, columns=self._distinct_on, seen=self.seen)
 
             if len(unique_indexes) > 0:
                 distinct_table = morsel.take(unique_indexes)
@@ -15,18 +15,24 @@ Heap Sort Node
 
 This is a SQL Query Execution Plan Node.
 
-This node orders a dataset, note that Heap Sort in this instance isn't the heap sort
-algorithm, it is an approach where a heap of n items (the limit) is maintained as the
-data passes through the operator. Because we are working with chunks, we build small
-batches which we order and then discard the excess items.
+This node orders a dataset and keeps the first n (the limit) rows, it is used in place
+of a Sort and a Limit when a query has an ORDER BY and a LIMIT.
 
-This is faster, particularly when working with large datasets even though we're now
-sorting smaller chunks over and over again.
+We keep the best n rows seen so far; for each morsel we select the morsel's best n rows
+without sorting the morsel, and then select the best n rows from those and the rows we
+are already holding. We only hold the sort keys of the best rows, and a reference to
+where the rest of the row is held, so the rows are only gathered at the end.
+
+Once we hold n rows, morsels where every value of the first sort key is worse than the
+n-th row can't contribute any rows so are skipped without being ordered.
 """
 
 import time
 from dataclasses import dataclass
 from typing import Generator
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 import numpy
 import pyarrow
@@ -39,6 +45,67 @@ from opteryx.operators import BasePlanNode
 from opteryx.operators import OperatorType
 from opteryx.operators.base_plan_node import BasePlanDataObject
 
+MORSEL_COLUMN = "$morsel"
+ROW_COLUMN = "$row"
+
+
+def select_top_k(table: pyarrow.Table, k: int, sort_keys: List[Tuple[str, str]]) -> pyarrow.Array:
+    """
+    The indices of the best k rows of the table, not in order.
+
+    Ordering is the same as sorting, nulls (and NaNs) are after all other values.
+    """
+    if table.num_rows <= k:
+        return pyarrow.array(numpy.arange(table.num_rows))
+    try:
+        indices = pyarrow.compute.select_k_unstable(table, k=k, sort_keys=sort_keys)
+        # rows with null keys aren't selected, if there aren't enough rows without nulls
+        # we need some of the nulls so fall back to sorting
+        if len(indices) == k:
+            return indices
+    except pyarrow.ArrowNotImplementedError:  # pragma: no cover
+        # types which can't be selected, but may be able to be sorted
+        pass
+    return pyarrow.compute.sort_indices(table, sort_keys=sort_keys)[:k]
+
+
+def worst_first_key(keys: pyarrow.Table, sort_keys: List[Tuple[str, str]]):
+    """
+    The value of the first sort key of the worst row we're holding, rows worse than this
+    can't be in the result. We don't have a threshold if we're holding nulls or NaNs.
+    """
+    column_name, direction = sort_keys[0]
+    column = keys.column(column_name)
+    if column.null_count > 0:
+        return None
+    if (
+        pyarrow.types.is_floating(column.type)
+        and pyarrow.compute.any(pyarrow.compute.is_nan(column)).as_py()
+    ):
+        return None
+    try:
+        min_max = pyarrow.compute.min_max(column)
+    except pyarrow.ArrowNotImplementedError:  # pragma: no cover
+        return None
+    return min_max["max"] if direction == "ascending" else min_max["min"]
+
+
+def cannot_improve(morsel: pyarrow.Table, sort_keys: List[Tuple[str, str]], threshold) -> bool:
+    """
+    Every row in the morsel is worse than the threshold on the first sort key.
+    """
+    column_name, direction = sort_keys[0]
+    try:
+        min_max = pyarrow.compute.min_max(morsel.column(column_name))
+        if direction == "ascending":
+            best = min_max["min"]
+            # all of the values are null (or NaN), these are after the threshold
+            return not best.is_valid or pyarrow.compute.greater(best, threshold).as_py()
+        best = min_max["max"]
+        return not best.is_valid or pyarrow.compute.less(best, threshold).as_py()
+    except (pyarrow.ArrowNotImplementedError, pyarrow.ArrowInvalid):  # pragma: no cover
+        return False
+
 
 @dataclass
 class HeapSortDataObject(BasePlanDataObject):
@@ -53,6 +120,11 @@ class HeapSortNode(BasePlanNode):
         super().__init__(properties=properties)
         self.order_by = config.get("order_by", [])
         self.limit: int = config.get("limit", -1)
+        # the first sort key of the worst row we're holding, once we're holding the limit
+        self.threshold = None
+        # the filter the scan uses to discard rows worse than the threshold, this is
+        # connected by the planner when the scan is producing the first sort key
+        self.dynamic_filter = None
 
         self.do = HeapSortDataObject(order_by=self.order_by, limit=self.limit)
 
@@ -71,8 +143,8 @@ class HeapSortNode(BasePlanNode):
         return "Heap Sort"
 
     def execute(self) -> Generator[pyarrow.Table, None, None]:  # pragma: no cover
-        table = None
         morsels = self._producers[0]  # type:ignore
+        morsel = None
 
         mapped_order = []
 
@@ -89,61 +161,81 @@ class HeapSortNode(BasePlanNode):
                     f"`ORDER BY` must reference columns as they appear in the `SELECT` clause. {cnfe}"
                 )
 
-        for morsel in morsels.execute():
+        if self.limit == 0:
+            # we only need the schema
+            producer = morsels.execute()
+            morsel = next(producer, None)
+            producer.close()
+            yield morsel.slice(offset=0, length=0) if morsel is not None else morsel
+            return
+
+        key_names = [column_name for column_name, _ in mapped_order]
+        # the sort keys of the best rows so far, and which morsel and row they're from
+        keys: Optional[pyarrow.Table] = None
+        # the rows of each morsel which are in the best rows so far
+        candidates: dict = {}
+
+        for morsel_number, morsel in enumerate(morsels.execute()):
             start_time = time.time_ns()
 
-            if table:
-                # Concatenate the accumulated table with the new morsel
-                table = concat_tables([table, morsel], promote_options="permissive")
-            else:
-                table = morsel
+            if morsel.num_rows == 0:
+                continue
 
-            # Determine if any columns are string-based
-            use_pyarrow_sort = any(
-                pyarrow.types.is_string(table.column(column_name).type)
-                or pyarrow.types.is_binary(table.column(column_name).type)
-                for column_name, _ in mapped_order
+            if self.threshold is not None and cannot_improve(morsel, mapped_order, self.threshold):
+                self.statistics.heap_sort_morsels_skipped += 1
+                self.statistics.time_heap_sorting += time.time_ns() - start_time
+                continue
+
+            rows = morsel.take(select_top_k(morsel, self.limit, mapped_order))
+            candidates[morsel_number] = rows
+
+            morsel_keys = rows.select(key_names)
+            morsel_keys = morsel_keys.append_column(
+                MORSEL_COLUMN,
+                pyarrow.array(numpy.full(rows.num_rows, morsel_number, dtype=numpy.int32)),
+            )
+            morsel_keys = morsel_keys.append_column(
+                ROW_COLUMN, pyarrow.array(numpy.arange(rows.num_rows, dtype=numpy.int32))
             )
 
-            # strings are sorted faster user pyarrow, single columns faster using compute
-            if len(mapped_order) == 1 and use_pyarrow_sort:
-                column_name, sort_direction = mapped_order[0]
-                column = table.column(column_name)
-                if sort_direction == "ascending":
-                    sort_indices = pyarrow.compute.sort_indices(column)
-                else:
-                    sort_indices = pyarrow.compute.sort_indices(column)[::-1]
-                table = table.take(sort_indices[: self.limit])
-            # strings are sorted faster using pyarrow
-            elif use_pyarrow_sort:
-                table = table.sort_by(mapped_order).slice(offset=0, length=self.limit)
-            # single column sort using numpy
-            elif len(mapped_order) == 1:
-                # Single-column sort using mergesort to take advantage of partially sorted data
-                column_name, sort_direction = mapped_order[0]
-                column = table.column(column_name).to_numpy()
-                if sort_direction == "ascending":
-                    sort_indices = numpy.argsort(column)
-                else:
-                    sort_indices = numpy.argsort(column)[::-1]  # Reverse for descending
-                # Slice the sorted table
-                table = table.take(sort_indices[: self.limit])
-            # multi column sort using numpy
+            if keys is None:
+                keys = morsel_keys
             else:
-                # Multi-column sort using lexsort
-                columns_for_sorting = []
-                directions = []
-                for column_name, sort_direction in mapped_order:
-                    column = table.column(column_name).to_numpy()
-                    columns_for_sorting.append(column)
-                    directions.append(1 if sort_direction == "ascending" else -1)
-
-                sort_indices = numpy.lexsort(
-                    [col[::direction] for col, direction in zip(columns_for_sorting, directions)]
-                )
-                # Slice the sorted table
-                table = table.take(sort_indices[: self.limit])
+                keys = concat_tables([keys, morsel_keys], promote_options="permissive")
+                keys = keys.take(select_top_k(keys, self.limit, mapped_order))
+
+                # release the rows of morsels which have been displaced
+                holding = set(pyarrow.compute.unique(keys.column(MORSEL_COLUMN)).to_pylist())
+                for number in [number for number in candidates if number not in holding]:
+                    candidates.pop(number)
+
+            if keys.num_rows >= self.limit:
+                self.threshold = worst_first_key(keys, mapped_order)
+                if self.dynamic_filter is not None:
+                    self.dynamic_filter.update(self.threshold)
 
             self.statistics.time_heap_sorting += time.time_ns() - start_time
 
+        if keys is None:
+            # there's no data, return an empty table with the right schema
+            yield morsel.slice(offset=0, length=0) if morsel is not None else morsel
+            return
+
+        start_time = time.time_ns()
+
+        # order the best rows, then gather them from the morsels they are from
+        keys = keys.take(pyarrow.compute.sort_indices(keys, sort_keys=mapped_order))
+        offsets = numpy.zeros(max(candidates) + 1, dtype=numpy.int64)
+        position = 0
+        for number, rows in candidates.items():
+            offsets[number] = position
+            position += rows.num_rows
+        table = concat_tables(candidates.values(), promote_options="permissive")
+        row_numbers = (
+            offsets[keys.column(MORSEL_COLUMN).to_numpy()] + keys.column(ROW_COLUMN).to_numpy()
+        )
+        table = table.take(row_numbers)
+
+        self.statistics.time_heap_sorting += time.time_ns() - start_time
+
         yield table
@@ -0,0 +1,399 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Interval Join Node
+
+This is a SQL Query Execution Plan Node.
+
+Joins where a value from one relation must be in a range from the other relation, for
+example `ON a.x BETWEEN b.lo AND b.hi` or `ON a.ts >= b.start AND a.ts < b.end`.
+
+Rather than testing every pair of rows, the values (the points) are sorted and the
+start and end of each range are found with a binary search, every point between them
+is in the range. Any other parts of the condition are tested on just these pairs.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Generator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy
+import pyarrow
+
+from opteryx.managers.expression import NodeType
+from opteryx.managers.expression import format_expression
+from opteryx.models import Node
+from opteryx.models import QueryProperties
+from opteryx.operators import BasePlanNode
+from opteryx.operators import OperatorType
+from opteryx.operators.base_plan_node import BasePlanDataObject
+from opteryx.operators.cross_join_node import _condition_tables
+from opteryx.operators.cross_join_node import _empty_join
+from opteryx.operators.cross_join_node import _matching_pairs
+from opteryx.operators.cross_join_node import _pair_blocks
+from opteryx.operators.cross_join_node import _rows_per_block
+from opteryx.operators.cross_join_node import _take_pairs
+
+# point <op> bound - the bound is a lower bound for Gt and GtEq, an upper for Lt and LtEq
+RANGE_COMPARISONS = {"Gt", "GtEq", "Lt", "LtEq"}
+FLIPPED_COMPARISONS = {"Gt": "Lt", "GtEq": "LtEq", "Lt": "Gt", "LtEq": "GtEq"}
+
+
+@dataclass
+class IntervalBounds:
+    point: Node
+    lower: Optional[Node] = None
+    lower_inclusive: bool = True
+    upper: Optional[Node] = None
+    upper_inclusive: bool = True
+    residual: Optional[Node] = None
+
+
+def _conjuncts(condition: Node) -> List[Node]:
+    if condition.node_type == NodeType.AND:
+        return _conjuncts(condition.left) + _conjuncts(condition.right)
+    return [condition]
+
+
+def find_interval_bounds(
+    condition: Node, left_relation_names: List[str], right_relation_names: List[str]
+) -> Optional[IntervalBounds]:
+    """
+    Find a column from one relation which the condition compares to a range of columns
+    from the other relation.
+
+    Parameters:
+        condition: Node
+            The join condition, BETWEEN has already been rewritten as >= and <=.
+        left_relation_names: List[str]
+            The relations on one side of the join.
+        right_relation_names: List[str]
+            The relations on the other side of the join.
+
+    Returns:
+        The point column, the bounds of the range and the rest of the condition; or None
+        if the condition doesn't compare columns from each relation with <, <=, > or >=.
+    """
+    if condition is None:
+        return None
+
+    conjuncts = _conjuncts(condition)
+    # the candidate bounds for each column, and the conjuncts they came from, keyed by
+    # the column's identity
+    candidates: dict = {}
+    for conjunct in conjuncts:
+        if (
+            conjunct.node_type != NodeType.COMPARISON_OPERATOR
+            or conjunct.value not in RANGE_COMPARISONS
+            or conjunct.left.node_type != NodeType.IDENTIFIER
+            or conjunct.right.node_type != NodeType.IDENTIFIER
+        ):
+            continue
+        sources = (conjunct.left.source, conjunct.right.source)
+        if not (
+            (sources[0] in left_relation_names and sources[1] in right_relation_names)
+            or (sources[0] in right_relation_names and sources[1] in left_relation_names)
+        ):
+            continue
+        # either side could be the point, with the other side being a bound on it
+        for point, comparison, bound in (
+            (conjunct.left, conjunct.value, conjunct.right),
+            (conjunct.right, FLIPPED_COMPARISONS[conjunct.value], conjunct.left),
+        ):
+            bounds, used = candidates.setdefault(
+                point.schema_column.identity, (IntervalBounds(point), [])
+            )
+            if comparison in ("Gt", "GtEq") and bounds.lower is None:
+                bounds.lower = bound
+                bounds.lower_inclusive = comparison == "GtEq"
+                used.append(conjunct)
+            elif comparison in ("Lt", "LtEq") and bounds.upper is None:
+                bounds.upper = bound
+                bounds.upper_inclusive = comparison == "LtEq"
+                used.append(conjunct)
+
+    if not candidates:
+        return None
+
+    # prefer columns bounded on both sides
+    bounds, used = max(candidates.values(), key=lambda candidate: len(candidate[1]))
+
+    # everything we're not using to find the ranges still needs to be tested
+    for conjunct in conjuncts:
+        if not any(conjunct is u for u in used):
+            bounds.residual = (
+                conjunct
+                if bounds.residual is None
+                else Node(NodeType.AND, left=bounds.residual, right=conjunct)
+            )
+
+    return bounds
+
+
+def _is_orderable(data_type: pyarrow.DataType) -> bool:
+    """
+    Types where sorting the values in numpy orders them the same as comparing them.
+    """
+    return (
+        pyarrow.types.is_integer(data_type)
+        or pyarrow.types.is_floating(data_type)
+        or pyarrow.types.is_decimal(data_type)
+        or pyarrow.types.is_timestamp(data_type)
+        or pyarrow.types.is_date(data_type)
+        or pyarrow.types.is_time(data_type)
+        or pyarrow.types.is_duration(data_type)
+        or pyarrow.types.is_string(data_type)
+        or pyarrow.types.is_large_string(data_type)
+    )
+
+
+def _common_type(*types: pyarrow.DataType) -> Optional[pyarrow.DataType]:
+    """
+    The type to compare the points and bounds as, None if they can't be compared.
+    """
+    if not all(_is_orderable(t) for t in types):
+        return None
+    if all(t == types[0] for t in types):
+        return types[0]
+    if all(pyarrow.types.is_integer(t) for t in types):
+        return pyarrow.int64()
+    if all(pyarrow.types.is_integer(t) or pyarrow.types.is_floating(t) for t in types):
+        return pyarrow.float64()
+    if all(pyarrow.types.is_timestamp(t) or pyarrow.types.is_date(t) for t in types):
+        return pyarrow.timestamp("us")
+    if all(pyarrow.types.is_string(t) or pyarrow.types.is_large_string(t) for t in types):
+        return pyarrow.string()
+    return None
+
+
+def _to_numpy(column, data_type: pyarrow.DataType) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    The values of the column as the given type, and which of them aren't null (or NaN).
+    """
+    if isinstance(column, pyarrow.ChunkedArray):
+        column = column.combine_chunks()
+    if column.type != data_type:
+        column = column.cast(data_type)
+    if column.null_count == 0:
+        values = column.to_numpy(zero_copy_only=False)
+        valid = numpy.ones(values.size, dtype=numpy.bool_)
+    else:
+        # nulls are replaced with one of the other values, they're never in a range but
+        # they do need to be comparable with the other values
+        valid = column.is_valid().to_numpy(zero_copy_only=False)
+        non_null = column.drop_null().to_numpy(zero_copy_only=False)
+        values = numpy.empty(valid.size, dtype=non_null.dtype)
+        values[valid] = non_null
+        if non_null.size > 0:
+            values[~valid] = non_null[0]
+    if values.dtype.kind == "f":
+        valid &= ~numpy.isnan(values)
+    return values, valid
+
+
+def _sort_points(
+    points: numpy.ndarray, valid: numpy.ndarray
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Sort the non-null points, returning their row numbers in order and their values.
+    """
+    rows = numpy.flatnonzero(valid)
+    order = rows[numpy.argsort(points[rows], kind="stable")]
+    return order, points[order]
+
+
+def _find_ranges(
+    sorted_points: numpy.ndarray, bounds: IntervalBounds, lower, upper, valid: numpy.ndarray
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    The positions of the first and after the last of the sorted points in each range.
+    """
+    rows = valid.size
+    if lower is None:
+        starts = numpy.zeros(rows, dtype=numpy.int64)
+    else:
+        side = "left" if bounds.lower_inclusive else "right"
+        starts = numpy.searchsorted(sorted_points, lower, side=side).astype(numpy.int64)
+    if upper is None:
+        ends = numpy.full(rows, sorted_points.size, dtype=numpy.int64)
+    else:
+        side = "right" if bounds.upper_inclusive else "left"
+        ends = numpy.searchsorted(sorted_points, upper, side=side).astype(numpy.int64)
+    # ranges with a null bound are empty, as are ranges which end before they start
+    ends = numpy.where(valid, numpy.maximum(ends, starts), starts)
+    return starts, ends
+
+
+def _interval_pairs(
+    order: numpy.ndarray, starts: numpy.ndarray, ends: numpy.ndarray, block_size: int
+) -> Generator[Tuple[numpy.ndarray, numpy.ndarray], None, None]:
+    """
+    Generate the pairs of (range row, point row) a block at a time, each range row is
+    paired with the points from starts to ends in the sorted points.
+    """
+    counts = ends - starts
+    cumulative = numpy.cumsum(counts)
+    ranges = counts.size
+    row = 0
+    while row < ranges:
+        # the ranges whose pairs fit in this block, at least one range
+        limit = (cumulative[row - 1] if row > 0 else 0) + block_size
+        end_row = max(row + 1, int(numpy.searchsorted(cumulative, limit, side="right")))
+        block_counts = counts[row:end_row]
+        pair_count = int(block_counts.sum())
+        if pair_count > 0:
+            range_rows = numpy.repeat(numpy.arange(row, end_row, dtype=numpy.int64), block_counts)
+            # the position of each pair in the sorted points, counting from its range's start
+            offsets = numpy.cumsum(block_counts) - block_counts - starts[row:end_row]
+            positions = numpy.arange(pair_count, dtype=numpy.int64) - numpy.repeat(
+                offsets, block_counts
+            )
+            yield range_rows, order[positions]
+        row = end_row
+
+
+@dataclass
+class IntervalJoinDataObject(BasePlanDataObject):
+    _condition: str = None
+
+
+class IntervalJoinNode(BasePlanNode):
+    """
+    Implements an INNER JOIN on a range condition
+    """
+
+    operator_type = OperatorType.PASSTHRU
+
+    def __init__(self, properties: QueryProperties, **config):
+        super().__init__(properties=properties)
+
+        self._left_relation = config.get("left_relation_names")
+        self._right_relation = config.get("right_relation_names")
+        self._condition = config.get("condition")
+        self._bounds = find_interval_bounds(
+            self._condition, self._left_relation, self._right_relation
+        )
+        # the sorted points from the right relation, by the type they were compared as
+        self._sorted_right: dict = {}
+
+    @classmethod
+    def from_json(cls, json_obj: str) -> "BasePlanNode":  # pragma: no cover
+        raise NotImplementedError()
+
+    @property
+    def name(self):  # pragma: no cover
+        return "Interval Join"
+
+    @property
+    def config(self):  # pragma: no cover
+        return f"INTERVAL JOIN ({format_expression(self._condition)})"
+
+    def _range_pairs(self, left: pyarrow.Table, right: pyarrow.Table, block_size: int):
+        """
+        The candidate pairs from the ranges, or None if the points and bounds can't be
+        compared (the join falls back to testing every pair).
+        """
+        bounds = self._bounds
+        point = bounds.point.schema_column.identity
+        bound_columns = [
+            bound.schema_column.identity for bound in (bounds.lower, bounds.upper) if bound
+        ]
+        # the relations may not be on the side of the join the plan says they are, so
+        # we work out which side has the points from the columns we have
+        points_on_right = point in right.column_names
+        points_table, ranges_table = (right, left) if points_on_right else (left, right)
+        if point not in points_table.column_names or any(
+            column not in ranges_table.column_names for column in bound_columns
+        ):
+            return None
+
+        data_type = _common_type(
+            points_table.schema.field(point).type,
+            *(ranges_table.schema.field(column).type for column in bound_columns),
+        )
+        if data_type is None:
+            return None
+
+        try:
+            if points_on_right and data_type in self._sorted_right:
+                order, sorted_points = self._sorted_right[data_type]
+            else:
+                order, sorted_points = _sort_points(
+                    *_to_numpy(points_table.column(point), data_type)
+                )
+                if points_on_right:
+                    self._sorted_right[data_type] = (order, sorted_points)
+
+            valid = numpy.ones(ranges_table.num_rows, dtype=numpy.bool_)
+            lower = upper = None
+            if bounds.lower is not None:
+                lower, lower_valid = _to_numpy(
+                    ranges_table.column(bounds.lower.schema_column.identity), data_type
+                )
+                valid &= lower_valid
+            if bounds.upper is not None:
+                upper, upper_valid = _to_numpy(
+                    ranges_table.column(bounds.upper.schema_column.identity), data_type
+                )
+                valid &= upper_valid
+            starts, ends = _find_ranges(sorted_points, bounds, lower, upper, valid)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError, TypeError):
+            return None
+
+        pairs = _interval_pairs(order, starts, ends, block_size)
+        if points_on_right:
+            return pairs
+        return ((left_rows, right_rows) for right_rows, left_rows in pairs)
+
+    def execute(self) -> Generator:
+        left_node = self._producers[0]  # type:ignore
+        right_node = self._producers[1]  # type:ignore
+
+        right = pyarrow.concat_tables(right_node.execute(), promote_options="none")
+        residual = self._bounds.residual
+        at_least_once = False
+        left_schema = None
+
+        for left_morsel in left_node.execute():
+            if left_schema is None:
+                left_schema = left_morsel.schema
+            if left_morsel.num_rows == 0 or right.num_rows == 0:
+                continue
+            start = time.monotonic_ns()
+            block_size = _rows_per_block(left_morsel, right)
+
+            condition = residual
+            pairs = self._range_pairs(left_morsel, right, block_size)
+            if pairs is None:
+                # we can't compare the points to the ranges, test every pair of rows
+                self.statistics.interval_join_fallback += 1
+                condition = self._condition
+                pairs = _pair_blocks(left_morsel.num_rows, right.num_rows, block_size)
+            if condition is not None:
+                pairs = _matching_pairs(
+                    condition, *_condition_tables(condition, left_morsel, right), pairs
+                )
+
+            for table in _take_pairs(left_morsel, right, pairs, block_size):
+                self.statistics.time_interval_join += time.monotonic_ns() - start
+                yield table
+                at_least_once = True
+                start = time.monotonic_ns()
+
+            self.statistics.time_interval_join += time.monotonic_ns() - start
+
+        if not at_least_once:
+            yield _empty_join(left_schema, right.schema)
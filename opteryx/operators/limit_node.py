@@ -50,8 +50,13 @@ class LimitNode(BasePlanNode):
         return str(self.limit) + " OFFSET " + str(self.offset)
 
     def execute(self) -> Generator[pyarrow.Table, None, None]:
-        morsels = self._producers[0]  # type:ignore
+        morsels = self._producers[0].execute()  # type:ignore
         start_time = time.monotonic_ns()
-        limited = arrow.limit_records(morsels.execute(), limit=self.limit, offset=self.offset)
+        limited = arrow.limit_records(morsels, limit=self.limit, offset=self.offset)
         self.statistics.time_limiting += time.monotonic_ns() - start_time
-        return limited  # type: ignore
+        try:
+            yield from limited
+        finally:
+            # once we have enough records stop the producers, readers cancel the reads
+            # they have in flight rather than reading the rest of the dataset
+            morsels.close()
@@ -0,0 +1,163 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Morsel Defragment Node
+
+This is a SQL Query Execution Plan Node.
+
+    Orignally implemented to test if datasets have any records as they pass through the DAG, this
+    function normalizes the number of bytes per morsel.
+
+    This is to balance two competing demands:
+        - operate in a low memory environment, if the morsels are too large they may cause the
+          process to fail.
+        - operate quickly, if we spend our time doing Vecorization/SIMD on morsel with few records
+           we're not working as fast as we can.
+
+    The low-water mark is 75% of the target size, less than this we look to merge morsels together.
+    This is more common following selective filters and joins, which can leave morsels of a few
+    records, we consolidate tens of morsels into a single morsel.
+
+    The high-water mark is 199% of the target size, more than this we split the morsel. Splitting
+    at a size any less than this will end up with morsels less that the target morsel size.
+
+    We also have a record count limit, this is because of quirks with PyArrow, it changes long
+    arrays into ChunkedArrays which behave differently to Arrays in some circumstances.
+"""
+
+import time
+from typing import Generator
+from typing import List
+
+import pyarrow
+
+from opteryx.config import MORSEL_SIZE
+from opteryx.models import QueryProperties
+from opteryx.operators import BasePlanNode
+from opteryx.operators import OperatorType
+
+MORSEL_SIZE_BYTES: int = MORSEL_SIZE  # 64Mb by default
+MORSEL_SIZE_COUNT: int = 500000  # hard record count limit, half a million
+HIGH_WATER: float = 1.99  # Split morsels over 199% of MORSEL_SIZE
+LOW_WATER: float = 0.75  # Merge morsels under 75% of MORSEL_SIZE
+
+
+class MorselDefragmentNode(BasePlanNode):
+    operator_type = OperatorType.PASSTHRU
+
+    def __init__(self, properties: QueryProperties, **config):
+        super().__init__(properties=properties)
+
+    @classmethod
+    def from_json(cls, json_obj: str) -> "BasePlanNode":  # pragma: no cover
+        raise NotImplementedError()
+
+    @property
+    def name(self):  # pragma: no cover
+        return "Morsel Defragment"
+
+    @property
+    def config(self):  # pragma: no cover
+        return ""
+
+    def _merge(self, collected: List[pyarrow.Table]) -> pyarrow.Table:
+        if len(collected) == 1:
+            return collected[0]
+        self.statistics.morsel_merges += len(collected) - 1
+        # the morsels are small, copying them into one set of arrays is cheap and saves
+        # the following operators working through lots of small chunks
+        return pyarrow.concat_tables(collected, promote_options="none").combine_chunks()
+
+    def execute(self) -> Generator:
+        morsels = self._producers[0]  # type:ignore
+
+        collected: List[pyarrow.Table] = []
+        collected_bytes = 0
+        collected_rows = 0
+        empty_morsel = None
+        at_least_one_morsel = False
+
+        for morsel in morsels.execute():
+            start = time.monotonic_ns()
+
+            if morsel.num_rows == 0:
+                # we only need to pass on an empty morsel if we have nothing else
+                if empty_morsel is None:
+                    empty_morsel = morsel
+                continue
+
+            # we don't merge morsels with different schemas, emit what we've collected
+            if collected and not morsel.schema.equals(collected[0].schema):
+                merged = self._merge(collected)
+                collected, collected_bytes, collected_rows = [], 0, 0
+                self.statistics.time_defragmenting += time.monotonic_ns() - start
+                yield merged
+                at_least_one_morsel = True
+                start = time.monotonic_ns()
+
+            # work out some stats about what we have
+            morsel_bytes = morsel.nbytes
+            morsel_records = morsel.num_rows
+
+            # if we're more than double the target size, split the morsel
+            if (
+                morsel_bytes > (MORSEL_SIZE_BYTES * HIGH_WATER)
+                or morsel_records > MORSEL_SIZE_COUNT
+            ):
+                if collected:
+                    merged = self._merge(collected)
+                    collected, collected_bytes, collected_rows = [], 0, 0
+                    self.statistics.time_defragmenting += time.monotonic_ns() - start
+                    yield merged
+                    start = time.monotonic_ns()
+
+                average_record_size = morsel_bytes / morsel_records
+                new_row_count = max(
+                    1, min(int(MORSEL_SIZE_BYTES / max(average_record_size, 1)), MORSEL_SIZE_COUNT)
+                )
+                self.statistics.morsel_splits += 1
+                for offset in range(0, morsel_records, new_row_count):
+                    new_morsel = morsel.slice(offset=offset, length=new_row_count)
+                    self.statistics.time_defragmenting += time.monotonic_ns() - start
+                    yield new_morsel
+                    start = time.monotonic_ns()
+                at_least_one_morsel = True
+                continue
+
+            # if we're less than 75% of the morsel size, hold what we have so far and go
+            # collect the next morsel
+            collected.append(morsel)
+            collected_bytes += morsel_bytes
+            collected_rows += morsel_records
+            if (
+                collected_bytes >= (MORSEL_SIZE_BYTES * LOW_WATER)
+                or collected_rows >= MORSEL_SIZE_COUNT
+            ):
+                merged = self._merge(collected)
+                collected, collected_bytes, collected_rows = [], 0, 0
+                self.statistics.time_defragmenting += time.monotonic_ns() - start
+                yield merged
+                at_least_one_morsel = True
+                continue
+
+            self.statistics.time_defragmenting += time.monotonic_ns() - start
+
+        # if we're at the end and haven't emitted all the records, emit them now
+        if collected:
+            start = time.monotonic_ns()
+            merged = self._merge(collected)
+            self.statistics.time_defragmenting += time.monotonic_ns() - start
+            yield merged
+        elif not at_least_one_morsel and empty_morsel is not None:
+            # we have to emit something to the next step
+            yield empty_morsel
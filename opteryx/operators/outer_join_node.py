@@ -245,6 +245,17 @@ def left_semi_join(
         A pyarrow.Table containing the result of the LEFT SEMI JOIN operation.
     """
     right_relation = pyarrow.concat_tables(right_relation.execute(), promote_options="none")
+    left_morsels = left_relation.execute()
+    left_batch = None
+
+    if right_relation.num_rows == 0:
+        # nothing can match, we only need the first morsel for the schema so we stop
+        # the left relation rather than reading all of it
+        left_batch = next(left_morsels, None)
+        if left_batch is not None:
+            left_morsels.close()
+            yield left_batch.slice(0, 0)
+            return
 
     hash_table = HashTable()
     non_null_right_values = right_relation.select(right_columns).itercolumns()
@@ -253,7 +264,7 @@ def left_semi_join(
 
     at_least_once = False
     # Iterate over the left_relation in chunks
-    for left_batch in left_relation.execute():
+    for left_batch in left_morsels:
         left_indexes = []
         left_values = left_batch.select(left_columns).itercolumns()
 
@@ -267,7 +278,7 @@ def left_semi_join(
             yield left_batch.take(left_indexes)
             at_least_once = True
 
-    if not at_least_once:
+    if not at_least_once and left_batch is not None:
         yield left_batch.slice(0, 0)
 
 
@@ -141,9 +141,15 @@ class ReaderNode(BasePlanNode):
         self.hints = parameters.get("hints", [])
         self.columns = parameters.get("columns", [])
         self.predicates = parameters.get("predicates", [])
+        self.limit = parameters.get("limit")
+        self.order_by = parameters.get("order_by")
+        self.aggregates = parameters.get("aggregates")
+        self.groups = parameters.get("groups")
 
         self.connector = parameters.get("connector")
         self.schema = parameters.get("schema")
+        # set by the planner when a Heap Sort can tell us which rows it doesn't need
+        self.dynamic_filter = None
 
         if len(self.hints) != 0:
             self.statistics.add_message("All HINTS are currently ignored")
@@ -185,6 +191,17 @@ class ReaderNode(BasePlanNode):
             f"{' WITH(' + ','.join(self.parameters.get('hints')) + ')' if self.parameters.get('hints') else ''})"
         )
 
+    def _apply_dynamic_filter(self, morsel: pyarrow.Table) -> pyarrow.Table:
+        """
+        Discard the rows the Heap Sort this scan is feeding has told us it doesn't need.
+        """
+        if self.dynamic_filter is None:
+            return morsel
+        num_rows = morsel.num_rows
+        morsel = self.dynamic_filter.apply(morsel)
+        self.statistics.rows_removed_by_dynamic_filter += num_rows - morsel.num_rows
+        return morsel
+
     def execute(self) -> Generator:
         """Perform this step, time how long is spent doing work"""
 
@@ -201,21 +218,37 @@ class ReaderNode(BasePlanNode):
         orso_schema.columns = orso_schema_cols
         arrow_schema = None
         start_clock = time.monotonic_ns()
-        reader = self.connector.read_dataset(columns=self.columns, predicates=self.predicates)
+        # limits, orders and aggregates are only set if the connector can push them
+        arguments = {"columns": self.columns, "predicates": self.predicates}
+        if self.limit is not None:
+            arguments["limit"] = self.limit
+        if self.order_by:
+            arguments["order_by"] = self.order_by
+        if self.aggregates:
+            arguments["aggregates"] = self.aggregates
+            arguments["groups"] = self.groups
+        reader = self.connector.read_dataset(**arguments)
         for morsel in reader:
-            # try to make each morsel have the same schema
-            morsel = struct_to_jsonb(morsel)
-            morsel = normalize_morsel(orso_schema, morsel)
-            if arrow_schema is None:
-                arrow_schema = merge_schemas(self.schema, morsel.schema)
-            if arrow_schema.names:
-                morsel = morsel.cast(arrow_schema)
+            # pushed aggregates are returned with the columns named with their identities
+            if not self.aggregates:
+                # try to make each morsel have the same schema
+                morsel = struct_to_jsonb(morsel)
+                morsel = normalize_morsel(orso_schema, morsel)
+                if arrow_schema is None:
+                    arrow_schema = merge_schemas(self.schema, morsel.schema)
+                if arrow_schema.names:
+                    morsel = morsel.cast(arrow_schema)
+            morsel = self._apply_dynamic_filter(morsel)
 
             self.statistics.time_reading_blobs += time.monotonic_ns() - start_clock
             self.statistics.blobs_read += 1
             self.statistics.rows_read += morsel.num_rows
             self.statistics.bytes_processed += morsel.nbytes
             yield morsel
+            if self.properties.cancelled.is_set():
+                # the query has been cancelled, stop reading
+                reader.close()
+                return
             start_clock = time.monotonic_ns()
         if morsel:
             self.statistics.columns_read += morsel.num_columns
@@ -0,0 +1,106 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Sorted Grouping Node
+
+This is a SQL Query Execution Plan Node.
+
+This groups and aggregates data which arrives ordered on the group keys. The rows for
+each group are together, so a group is complete when the group key changes; complete
+groups are aggregated and emitted as the data streams through rather than the whole
+relation being collected first. Only the rows of the group at the end of the last
+morsel are held back, in case the group continues into the next morsel.
+"""
+
+import time
+from typing import Generator
+
+import numpy
+import pyarrow
+import pyarrow.compute
+
+from opteryx.managers.expression import evaluate_and_append
+from opteryx.operators import OperatorType
+from opteryx.operators.aggregate_and_group_node import AggregateAndGroupNode
+from opteryx.operators.aggregate_and_group_node import GroupedSketches
+from opteryx.operators.aggregate_node import project
+
+
+def _last_group_start(morsel: pyarrow.Table, columns: list) -> int:
+    """
+    Find where the rows with the same group keys as the last row start.
+    """
+    same = numpy.ones(morsel.num_rows, dtype=numpy.bool_)
+    for column_name in columns:
+        column = morsel.column(column_name)
+        last = column[-1]
+        if not last.is_valid:
+            matches = column.is_null()
+        elif pyarrow.types.is_floating(column.type) and numpy.isnan(last.as_py()):
+            matches = pyarrow.compute.is_nan(column).fill_null(False)
+        else:
+            matches = pyarrow.compute.equal(column, last).fill_null(False)
+        same &= matches.to_numpy(zero_copy_only=False)
+    different = numpy.flatnonzero(~same)
+    return int(different[-1]) + 1 if different.size > 0 else 0
+
+
+class SortedAggregateAndGroupNode(AggregateAndGroupNode):
+    operator_type = OperatorType.PASSTHRU
+
+    @property
+    def name(self):  # pragma: no cover
+        return "Sorted Group"
+
+    def execute(self) -> Generator[pyarrow.Table, None, None]:
+        morsels = self._producers[0]  # type:ignore
+        carried = None
+        empty = None
+
+        for morsel in project(morsels.execute(), self.all_identifiers):
+            if morsel.num_rows == 0:
+                if empty is None:
+                    empty = morsel
+                continue
+
+            start_time = time.time_ns()
+            morsel = evaluate_and_append(self.evaluatable_nodes, morsel)
+            morsel = evaluate_and_append(self.groups, morsel)
+            self.statistics.time_evaluating += time.time_ns() - start_time
+
+            if carried is not None:
+                morsel = pyarrow.concat_tables([carried, morsel], promote_options="permissive")
+
+            # the last group may carry on into the next morsel, so hold it back
+            start_time = time.time_ns()
+            boundary = _last_group_start(morsel, self.group_by_columns)
+            carried = morsel.slice(boundary)
+            self.statistics.time_grouping += time.time_ns() - start_time
+
+            if boundary > 0:
+                self.statistics.sorted_groups_emitted += 1
+                yield self._complete_groups(morsel.slice(0, boundary))
+
+        if carried is not None:
+            yield self._complete_groups(carried)
+        elif empty is not None:
+            yield self._complete_groups(empty)
+
+    def _complete_groups(self, morsel: pyarrow.Table) -> pyarrow.Table:
+        sketches = GroupedSketches(self.sketch_aggregators)
+        collected = [morsel]
+        if self.sketch_aggregators:
+            groups = self._update_sketches(sketches, morsel)
+            if not self.aggregate_functions:
+                collected = [groups]
+        return self._groups(collected, sketches)
@@ -59,6 +59,7 @@ from opteryx.models import ExecutionTree
 from opteryx.models import Node
 
 PROFILE_LOCATION = config.PROFILE_LOCATION
+ENABLE_PLAN_CACHE = config.ENABLE_PLAN_CACHE
 
 
 def build_literal_node(
@@ -136,6 +137,7 @@ def query_planner(
     from opteryx.planner.logical_planner import do_logical_planning_phase
     from opteryx.planner.sql_rewriter import do_sql_rewrite
     from opteryx.planner.temporary_physical_planner import create_physical_plan
+    from opteryx.shared import PlanCache
     from opteryx.third_party import sqloxide
 
     # SQL Rewriter extracts temporal filters
@@ -151,6 +153,28 @@ def query_planner(
     else:
         params = [p for p in parameters or []]
 
+    plan_cache = None
+    plan_key = None
+    if ENABLE_PLAN_CACHE:
+        start = time.monotonic_ns()
+        plan_cache = PlanCache()
+        plan_key = plan_cache.key(
+            clean_sql, temporal_filters, params, visibility_filters, connection.context.memberships
+        )
+        optimized_plan = plan_cache.get(plan_key, connection, statistics)
+        statistics.time_planning_plan_cache += time.monotonic_ns() - start
+        if optimized_plan is not None:
+            statistics.plan_cache_hits += 1
+
+            start = time.monotonic_ns()
+            query_properties = QueryProperties(qid=qid, variables=connection.context.variables)
+            physical_plan = create_physical_plan(optimized_plan, query_properties)
+            statistics.time_planning_physical_planner += time.monotonic_ns() - start
+            yield physical_plan
+            return
+        if plan_key is not None:
+            statistics.plan_cache_misses += 1
+
     # Parser converts the SQL command into an AST
     try:
         parsed_statements = sqloxide.parse_sql(clean_sql, dialect="mysql")
@@ -197,6 +221,11 @@ def query_planner(
         optimized_plan = do_cost_based_optimizer(bound_plan, statistics)
         statistics.time_planning_optimizer += time.monotonic_ns() - start
 
+        if plan_cache is not None and len(parsed_statements) == 1:
+            start = time.monotonic_ns()
+            plan_cache.set(plan_key, query_type, optimized_plan)
+            statistics.time_planning_plan_cache += time.monotonic_ns() - start
+
         # before we write the new optimizer and execution engine, convert to a V1 plan
         start = time.monotonic_ns()
         query_properties = QueryProperties(qid=qid, variables=connection.context.variables)
@@ -97,6 +97,14 @@ def get_mismatched_condition_column_types(node: Node, relaxed: bool = False) ->
     return None  # if we reach here, it means we didn't find any inconsistencies
 
 
+def is_equi_join(condition_node: Node) -> bool:
+    """
+    Is every comparison in the join condition an equals comparison.
+    """
+    comparisons = get_all_nodes_of_type(condition_node, (NodeType.COMPARISON_OPERATOR,))
+    return all(comparison.value == "Eq" for comparison in comparisons)
+
+
 def extract_join_fields(
     condition_node: Node,
     left_relation_names: List[str],
@@ -222,6 +230,65 @@ def convert_using_to_on(
     return conditions[0]
 
 
+def create_connector(node: Node, statistics, connection):
+    """
+    Create the connector which will serve a Scan node and wire up the connector's
+    capabilities (variables, partition dates and caching).
+
+    Parameters:
+        node: Node
+            The Scan node, if the relation was found in the catalog the node has the
+            location and disposition of the relation.
+        statistics: QueryStatistics
+            The statistics for the query the connector is being created for.
+        connection: ConnectionContext
+            The context of the connection running the query.
+
+    Returns:
+        The connector
+    """
+    from opteryx.connectors import connector_factory
+    from opteryx.connectors.capabilities import Asynchronous
+    from opteryx.connectors.capabilities import Cacheable
+    from opteryx.connectors.capabilities import Partitionable
+    from opteryx.connectors.capabilities.cacheable import async_read_thru_cache
+    from opteryx.managers.schemes.tarchia_schema import TarchiaScheme
+
+    if node.found_in_catalog:
+        if node.disposition == "EXTERNAL":
+            # explicitly told it's external
+            connector = connector_factory(node.location, statistics=statistics)
+        else:
+            connector = connector_factory(
+                node.location, statistics=statistics, partition_scheme=TarchiaScheme
+            )
+            connector.dataset = node.relation
+    else:
+        connector = connector_factory(node.relation, statistics=statistics)
+
+    connector_capabilities = connector.__class__.mro()
+
+    if hasattr(connector, "variables"):
+        connector.variables = connection.variables
+    if Partitionable in connector_capabilities:
+        connector.start_date = node.start_date
+        connector.end_date = node.end_date
+    if Cacheable in connector_capabilities:
+        # We add the caching mechanism here if the connector is Cacheable and
+        # we've not disable caching
+        if "NO_CACHE" in (node.hints or []):
+            pass
+        if Asynchronous in connector_capabilities:
+            original_read_blob = connector.async_read_blob
+            connector.async_read_blob = async_read_thru_cache(original_read_blob)
+        else:
+            from opteryx.exceptions import InvalidInternalStateError
+
+            raise InvalidInternalStateError("Connector is Cachable but not Async")
+
+    return connector
+
+
 class BinderVisitor:
     """
     The BinderVisitor visits each node in the query plan and adds catalogue information
@@ -645,11 +712,27 @@ class BinderVisitor:
                 node.left_relation_names,
                 node.right_relation_names,
             )
+        if node.on and node.type == "inner" and not is_equi_join(node.on):
+            # INNER JOINs on a range (e.g. ON a.x BETWEEN b.lo AND b.hi) are run as a
+            # CROSS JOIN with the ON as its condition, this is planned as an interval join
+            from opteryx.operators.interval_join_node import find_interval_bounds
+
+            node.on, context = inner_binder(node.on, context)
+            if not find_interval_bounds(
+                node.on, node.left_relation_names, node.right_relation_names
+            ):
+                from opteryx.exceptions import UnsupportedSyntaxError
+
+                raise UnsupportedSyntaxError("Only JOINs with equals comparisons supported")
+
+            node.type = "cross join"
+            node.condition = node.on
+            node.on = None
+            node.columns = get_all_nodes_of_type(node.condition, (NodeType.IDENTIFIER,))
         if node.on:
             # All except CROSS JOINs have been mapped to have an ON condition
             # The JOIN operator only support ON conditions.
-            comparisons = get_all_nodes_of_type(node.on, (NodeType.COMPARISON_OPERATOR,))
-            if not all(com.value == "Eq" for com in comparisons):
+            if not is_equi_join(node.on):
                 from opteryx.exceptions import UnsupportedSyntaxError
 
                 raise UnsupportedSyntaxError("Only JOINs with equals comparisons supported")
@@ -840,14 +923,8 @@ class BinderVisitor:
         return node, context
 
     def visit_scan(self, node: Node, context: BindingContext) -> Tuple[Node, BindingContext]:
-        from opteryx.connectors import connector_factory
-        from opteryx.connectors.capabilities import Asynchronous
-        from opteryx.connectors.capabilities import Cacheable
-        from opteryx.connectors.capabilities import Partitionable
-        from opteryx.connectors.capabilities.cacheable import async_read_thru_cache
         from opteryx.managers.catalog import catalog_factory
         from opteryx.managers.permissions import can_read_table
-        from opteryx.managers.schemes.tarchia_schema import TarchiaScheme
 
         if node.alias in context.relations:
             raise AmbiguousDatasetError(dataset=node.alias)
@@ -863,47 +940,17 @@ class BinderVisitor:
                 node.disposition = catalog_table.get("disposition")
                 node.location = catalog_table.get("location")
 
-                if node.disposition == "EXTERNAL":
-                    # explicitly told it's external
-                    node.connector = connector_factory(node.location, statistics=context.statistics)
-                else:
-                    node.connector = connector_factory(
-                        node.location, statistics=context.statistics, partition_scheme=TarchiaScheme
-                    )
-                    node.connector.dataset = node.relation
-
                 catalog_schema = catalog_table.get("schema", {})
                 catalog_schema["name"] = catalog_table.get("location")
                 node.schema = RelationSchema.from_dict(catalog_schema)
 
-        if not catalog_table:
-            # work out which connector will be serving this request
-            node.connector = connector_factory(node.relation, statistics=context.statistics)
+        # work out which connector will be serving this request
+        node.connector = create_connector(node, context.statistics, context.connection)
 
         # ensure this user can read the table
         if not can_read_table(context.connection.memberships, node.relation):
             raise PermissionError(f"User does not have permission to read {node.relation}")
 
-        connector_capabilities = node.connector.__class__.mro()
-
-        if hasattr(node.connector, "variables"):
-            node.connector.variables = context.connection.variables
-        if Partitionable in connector_capabilities:
-            node.connector.start_date = node.start_date
-            node.connector.end_date = node.end_date
-        if Cacheable in connector_capabilities:
-            # We add the caching mechanism here if the connector is Cacheable and
-            # we've not disable caching
-            if "NO_CACHE" in (node.hints or []):
-                pass
-            if Asynchronous in connector_capabilities:
-                original_read_blob = node.connector.async_read_blob
-                node.connector.async_read_blob = async_read_thru_cache(original_read_blob)
-            else:
-                from opteryx.exceptions import InvalidInternalStateError
-
-                raise InvalidInternalStateError("Connector is Cachable but not Async")
-
         if not node.found_in_catalog:
             node.schema = node.connector.get_dataset_schema()
         node.schema.aliases.append(node.alias)
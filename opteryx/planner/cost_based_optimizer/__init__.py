@@ -87,8 +87,12 @@ class CostBasedOptimizerVisitor:
             PredicatePushdownStrategy(statistics),
             ProjectionPushdownStrategy(statistics),
             DistinctPushdownStrategy(statistics),
+            AggregatePushdownStrategy(statistics),
+            LimitPushdownStrategy(statistics),
             OperatorFusionStrategy(statistics),
             RedundantOperationsStrategy(statistics),
+            DefragmentMorselsStrategy(statistics),
+            SortedAggregationStrategy(statistics),
             ConstantFoldingStrategy(statistics),
         ]
 
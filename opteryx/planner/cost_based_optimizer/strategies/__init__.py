@@ -1,21 +1,29 @@
+from .aggregate_pushdown import AggregatePushdownStrategy
 from .boolean_simplication import BooleanSimplificationStrategy
 from .constant_folding import ConstantFoldingStrategy
+from .defragment_morsels import DefragmentMorselsStrategy
 from .distinct_pushdown import DistinctPushdownStrategy
+from .limit_pushdown import LimitPushdownStrategy
 from .operator_fusion import OperatorFusionStrategy
 from .predicate_pushdown import PredicatePushdownStrategy
 from .predicate_rewriter import PredicateRewriteStrategy
 from .projection_pushdown import ProjectionPushdownStrategy
 from .redundant_operators import RedundantOperationsStrategy
+from .sorted_aggregation import SortedAggregationStrategy
 from .split_conjunctive_predicates import SplitConjunctivePredicatesStrategy
 
 __all__ = [
+    "AggregatePushdownStrategy",
     "BooleanSimplificationStrategy",
     "ConstantFoldingStrategy",
+    "DefragmentMorselsStrategy",
     "DistinctPushdownStrategy",
+    "LimitPushdownStrategy",
     "OperatorFusionStrategy",
     "PredicatePushdownStrategy",
     "PredicateRewriteStrategy",
     "ProjectionPushdownStrategy",
     "RedundantOperationsStrategy",
+    "SortedAggregationStrategy",
     "SplitConjunctivePredicatesStrategy",
 ]
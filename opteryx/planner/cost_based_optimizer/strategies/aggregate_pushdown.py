@@ -0,0 +1,77 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Optimization Rule - Aggregate Pushdown
+
+Type: Heuristic
+Goal: Reduce Rows
+
+Where an aggregation (with or without a GROUP BY) is directly over a read, and the
+connector can perform the aggregation (e.g. remote SQL databases), we send the
+aggregation to the connector and remove it from the plan. This means only the
+aggregated rows are transferred to Opteryx.
+
+Order:
+    This plan must run after the Predicate Pushdown, filters between the aggregate and
+    the read which couldn't be pushed to the connector prevent the aggregate being
+    pushed.
+"""
+
+from opteryx.connectors.capabilities import AggregatePushable
+from opteryx.managers.expression import NodeType
+from opteryx.planner.logical_planner import LogicalPlan
+from opteryx.planner.logical_planner import LogicalPlanNode
+from opteryx.planner.logical_planner import LogicalPlanStepType
+
+from .optimization_strategy import OptimizationStrategy
+from .optimization_strategy import OptimizerContext
+
+
+class AggregatePushdownStrategy(OptimizationStrategy):
+    def visit(self, node: LogicalPlanNode, context: OptimizerContext) -> OptimizerContext:
+        if not context.optimized_plan:
+            context.optimized_plan = context.pre_optimized_tree.copy()  # type: ignore
+
+        if node.node_type not in (
+            LogicalPlanStepType.AggregateAndGroup,
+            LogicalPlanStepType.Aggregate,
+        ):
+            return context
+
+        producers = context.optimized_plan.ingoing_edges(context.node_id)
+        if len(producers) != 1:  # pragma: no cover
+            return context
+        scan_nid = producers[0][0]
+        scan = context.optimized_plan[scan_nid]
+        if scan.node_type != LogicalPlanStepType.Scan or not isinstance(
+            scan.connector, AggregatePushable
+        ):
+            return context
+
+        groups = node.groups or []
+        if not all(group.node_type == NodeType.IDENTIFIER for group in groups):
+            return context
+        if not all(scan.connector.can_push_aggregate(agg) for agg in node.aggregates):
+            return context
+
+        scan.aggregates = node.aggregates
+        scan.groups = groups
+        context.optimized_plan[scan_nid] = scan
+        context.optimized_plan.remove_node(context.node_id, heal=True)
+        self.statistics.optimization_aggregate_pushdown += 1
+
+        return context
+
+    def complete(self, plan: LogicalPlan, context: OptimizerContext) -> LogicalPlan:
+        # No finalization needed for this strategy
+        return plan
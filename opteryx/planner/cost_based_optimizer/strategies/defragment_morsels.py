@@ -0,0 +1,82 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This optimization runs after the plan has otherwise been optimized, it puts a
+Defragment step after the operators which can leave lots of small morsels.
+
+Filters (including predicates pushed into the scans) and joins produce whatever
+survives, this is often morsels of a few rows. The operators which follow them do
+the same work for a morsel of ten rows as they do for a morsel of a million, so
+these small morsels are merged together.
+
+We don't defragment where the results are only being collected for the end of the
+query, or where they are feeding a LIMIT or a Heap Sort, collecting morsels would
+mean reading data the LIMIT doesn't need, and would hold back the rows the Heap Sort
+uses to tell the scans which rows they can skip.
+"""
+
+from orso.tools import random_string
+
+from opteryx.planner.logical_planner import LogicalPlan
+from opteryx.planner.logical_planner import LogicalPlanNode
+from opteryx.planner.logical_planner import LogicalPlanStepType
+
+from .optimization_strategy import OptimizationStrategy
+from .optimization_strategy import OptimizerContext
+
+# operators which pass on each morsel as they receive it
+STREAMING_OPERATORS = (
+    LogicalPlanStepType.Project,
+    LogicalPlanStepType.Filter,
+    LogicalPlanStepType.Distinct,
+)
+
+
+def _benefits_from_defragmenting(plan: LogicalPlan, nid: str) -> bool:
+    consumers = plan.outgoing_edges(nid)
+    if len(consumers) != 1:
+        return False
+    consumer = plan[consumers[0][1]]
+    # filters after filters only need defragmenting after the last filter
+    if consumer.node_type in (
+        LogicalPlanStepType.Exit,
+        LogicalPlanStepType.Defragment,
+        LogicalPlanStepType.Filter,
+    ):
+        return False
+    while consumer.node_type in STREAMING_OPERATORS:
+        consumers = plan.outgoing_edges(consumers[0][1])
+        if len(consumers) != 1:
+            break
+        consumer = plan[consumers[0][1]]
+    return consumer.node_type not in (LogicalPlanStepType.Limit, LogicalPlanStepType.HeapSort)
+
+
+class DefragmentMorselsStrategy(OptimizationStrategy):
+    def visit(self, node: LogicalPlanNode, context: OptimizerContext) -> OptimizerContext:
+        if not context.optimized_plan:
+            context.optimized_plan = context.pre_optimized_tree.copy()  # type: ignore
+
+        if (
+            node.node_type in (LogicalPlanStepType.Filter, LogicalPlanStepType.Join)
+            or (node.node_type == LogicalPlanStepType.Scan and node.predicates)
+        ) and _benefits_from_defragmenting(context.optimized_plan, context.node_id):
+            defrag = LogicalPlanNode(node_type=LogicalPlanStepType.Defragment)
+            context.optimized_plan.insert_node_after(random_string(), defrag, context.node_id)
+            self.statistics.optimization_defragment_morsels += 1
+
+        return context
+
+    def complete(self, plan: LogicalPlan, context: OptimizerContext) -> LogicalPlan:
+        # No finalization needed for this strategy
+        return plan
@@ -0,0 +1,101 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Optimization Rule - Limit Pushdown
+
+Type: Heuristic
+Goal: Reduce Rows
+
+Where a LIMIT, or an ORDER BY and LIMIT (top-N), are over a read with nothing between
+them which changes the number of rows, and the connector can apply them, we send the
+limit and ordering to the connector. This means only the rows we're going to return
+are transferred to Opteryx.
+
+The LIMIT and ORDER BY remain in the plan, they are cheap when the number of rows is
+already small and the connector can treat the limit as a hint.
+
+Order:
+    This plan must run after the Predicate Pushdown and the Aggregate Pushdown, and
+    before Operator Fusion which fuses ORDER BY and LIMIT into a HEAP SORT.
+"""
+
+from opteryx.connectors.capabilities import LimitPushable
+from opteryx.connectors.capabilities import TopNPushable
+from opteryx.managers.expression import NodeType
+from opteryx.planner.logical_planner import LogicalPlan
+from opteryx.planner.logical_planner import LogicalPlanNode
+from opteryx.planner.logical_planner import LogicalPlanStepType
+
+from .optimization_strategy import OptimizationStrategy
+from .optimization_strategy import OptimizerContext
+
+
+def _scan_identities(scan: LogicalPlanNode) -> set:
+    """The identities of the columns the read will return"""
+    if scan.aggregates:
+        return {column.schema_column.identity for column in scan.aggregates + scan.groups}
+    return {column.schema_column.identity for column in scan.columns or []}
+
+
+class LimitPushdownStrategy(OptimizationStrategy):
+    def visit(self, node: LogicalPlanNode, context: OptimizerContext) -> OptimizerContext:
+        if not context.optimized_plan:
+            context.optimized_plan = context.pre_optimized_tree.copy()  # type: ignore
+
+        if node.node_type == LogicalPlanStepType.Limit:
+            context.collected_limit = node if node.limit is not None else None
+            context.collected_order = None
+            return context
+
+        if node.node_type == LogicalPlanStepType.Order and context.collected_limit:
+            if context.collected_order is None and all(
+                column.node_type == NodeType.IDENTIFIER for column, _ in node.order_by
+            ):
+                context.collected_order = node.order_by
+            else:
+                context.collected_limit = None
+            return context
+
+        if node.node_type == LogicalPlanStepType.Project:
+            # projections don't change the number of rows
+            return context
+
+        if node.node_type == LogicalPlanStepType.Scan and context.collected_limit:
+            limit = context.collected_limit.limit + (context.collected_limit.offset or 0)
+            order = context.collected_order
+            if order is None and isinstance(node.connector, LimitPushable):
+                node.limit = limit
+                context.optimized_plan[context.node_id] = node
+                self.statistics.optimization_limit_pushdown += 1
+            elif (
+                order is not None
+                and isinstance(node.connector, TopNPushable)
+                and {column.schema_column.identity for column, _ in order}.issubset(
+                    _scan_identities(node)
+                )
+            ):
+                node.limit = limit
+                node.order_by = [
+                    (column.schema_column.identity, direction) for column, direction in order
+                ]
+                context.optimized_plan[context.node_id] = node
+                self.statistics.optimization_top_n_pushdown += 1
+
+        # anything else we can't push past
+        context.collected_limit = None
+        context.collected_order = None
+        return context
+
+    def complete(self, plan: LogicalPlan, context: OptimizerContext) -> LogicalPlan:
+        # No finalization needed for this strategy
+        return plan
@@ -18,12 +18,19 @@ Some operators can be fused to be faster.
 Initially we fused Limit and Order operators, this allows us to use a heap sort
 algorithm (basically we dicard records we know aren't going to be kept early).
 
+We also fuse Filters into the CROSS JOIN they're filtering, this makes the CROSS JOIN
+a nested loop join - the condition is tested for each pair of rows and only the
+matching pairs are created, rather than creating every pair and then filtering them.
+
 Note that predicate and projection pushdowns may also fuse operators. Most commonly
 we fuse the READ operator with SELECTION and PROJECTION operators, we also push into
 JOINs, this is sometimes as part of the join condition, but we also push SELECTIONs
 into joins.
 """
 
+from opteryx.managers.expression import NodeType
+from opteryx.managers.expression import get_all_nodes_of_type
+from opteryx.models import Node
 from opteryx.planner.logical_planner import LogicalPlan
 from opteryx.planner.logical_planner import LogicalPlanNode
 from opteryx.planner.logical_planner import LogicalPlanStepType
@@ -50,6 +57,31 @@ class OperatorFusionStrategy(OptimizationStrategy):
                     context.optimized_plan.remove_node(context.node_id, heal=True)
                     self.statistics.optimization_fuse_operators_heap_sort += 1
 
+        if (
+            node.node_type == LogicalPlanStepType.Join
+            and node.type == "cross join"
+            and not node.unnest_column
+        ):
+            edges = context.optimized_plan.outgoing_edges(context.node_id)
+            while len(edges) == 1:
+                next_node_id = edges[0][1]
+                next_node = context.optimized_plan[next_node_id]
+                if next_node.node_type != LogicalPlanStepType.Filter or get_all_nodes_of_type(
+                    next_node.condition, (NodeType.AGGREGATOR,)
+                ):
+                    break
+                if node.condition:
+                    condition = Node(node_type=NodeType.AND)
+                    condition.left = node.condition
+                    condition.right = next_node.condition
+                    node.condition = condition
+                else:
+                    node.condition = next_node.condition
+                context.optimized_plan.remove_node(next_node_id, heal=True)
+                self.statistics.optimization_fuse_operators_nested_loop_join += 1
+                edges = context.optimized_plan.outgoing_edges(context.node_id)
+            context.optimized_plan[context.node_id] = node
+
         return context
 
     def complete(self, plan: LogicalPlan, context: OptimizerContext) -> LogicalPlan:
@@ -26,6 +26,7 @@ class OptimizerContext:
 
         self.seen_projections: int = 0
         self.seen_unions: int = 0
+        self.seen_distincts: int = 0
 
         self.collected_predicates: list = []
         """We collect predicates we should be able to push to reads and joins"""
@@ -36,6 +37,10 @@ class OptimizerContext:
         self.collected_distincts: list = []
         """We collect distincts to try to eliminate records earlier"""
 
+        self.collected_limit = None
+        self.collected_order = None
+        """We collect limits, and orders under limits, to push to reads"""
+
 
 class OptimizationStrategy:
     def __init__(self, statistics):
@@ -42,8 +42,22 @@ class ProjectionPushdownStrategy(OptimizationStrategy):
         # aren't referenced in the outer query.
         if node.node_type == LogicalPlanStepType.Union:
             context.seen_unions += 1
+        # DISTINCT compares whole rows, so the columns of the projection it is over can't
+        # be removed, but DISTINCT ON only needs the columns it is on
+        if node.node_type == LogicalPlanStepType.Distinct:
+            if node.on:
+                context.collected_identities.update(
+                    col.schema_column.identity
+                    for col in get_all_nodes_of_type(node.on, (NodeType.IDENTIFIER,))
+                    if col.schema_column
+                )
+            else:
+                context.seen_distincts += 1
         if node.node_type == LogicalPlanStepType.Project:
-            if context.seen_unions == 0 and context.seen_projections > 0:
+            if context.seen_distincts > 0:
+                # the projection a DISTINCT is over keeps all of its columns
+                context.seen_distincts -= 1
+            elif context.seen_unions == 0 and context.seen_projections > 0:
                 node.columns = [
                     n for n in node.columns if n.schema_column.identity in node.pre_update_columns
                 ]
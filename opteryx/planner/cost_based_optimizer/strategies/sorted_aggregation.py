@@ -0,0 +1,90 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This optimization finds GROUP BYs over data which is already ordered on the group keys.
+The rows for each group arrive together, so the aggregation can be done as the data
+streams through, each group is emitted when the group key changes rather than the
+whole relation being collected and hashed.
+
+We only do this when the order is certain, that is an ORDER BY (a Sort or a Heap Sort)
+which leads with the group keys, and reaches the GROUP BY only through operators which
+keep the order of the rows.
+"""
+
+from opteryx.managers.expression import NodeType
+from opteryx.planner.logical_planner import LogicalPlan
+from opteryx.planner.logical_planner import LogicalPlanNode
+from opteryx.planner.logical_planner import LogicalPlanStepType
+
+from .optimization_strategy import OptimizationStrategy
+from .optimization_strategy import OptimizerContext
+
+# operators which pass on the rows in the order they receive them
+ORDER_PRESERVING_OPERATORS = (
+    LogicalPlanStepType.Project,
+    LogicalPlanStepType.Filter,
+    LogicalPlanStepType.Distinct,
+    LogicalPlanStepType.Limit,
+    LogicalPlanStepType.Defragment,
+    LogicalPlanStepType.Subquery,
+)
+
+
+def _ordering(plan: LogicalPlan, nid: str) -> list:
+    """
+    The identities of the columns the rows arriving at a node are ordered by, if we
+    know they are ordered.
+    """
+    producers = plan.ingoing_edges(nid)
+    while len(producers) == 1:
+        producer = plan[producers[0][0]]
+        if producer.node_type in (LogicalPlanStepType.Order, LogicalPlanStepType.HeapSort):
+            ordering = []
+            for column, _ in producer.order_by:
+                if column.schema_column is None:
+                    break
+                ordering.append(column.schema_column.identity)
+            return ordering
+        if producer.node_type not in ORDER_PRESERVING_OPERATORS:
+            break
+        producers = plan.ingoing_edges(producers[0][0])
+    return []
+
+
+def _groups_are_ordered(plan: LogicalPlan, nid: str, groups: list) -> bool:
+    if not groups or any(
+        group.node_type == NodeType.LITERAL or group.schema_column is None for group in groups
+    ):
+        return False
+    identities = {group.schema_column.identity for group in groups}
+    ordering = _ordering(plan, nid)
+    return set(ordering[: len(identities)]) == identities
+
+
+class SortedAggregationStrategy(OptimizationStrategy):
+    def visit(self, node: LogicalPlanNode, context: OptimizerContext) -> OptimizerContext:
+        if not context.optimized_plan:
+            context.optimized_plan = context.pre_optimized_tree.copy()  # type: ignore
+
+        if node.node_type == LogicalPlanStepType.AggregateAndGroup and _groups_are_ordered(
+            context.optimized_plan, context.node_id, node.groups
+        ):
+            node.sorted_groups = True
+            context.optimized_plan[context.node_id] = node
+            self.statistics.optimization_sorted_aggregation += 1
+
+        return context
+
+    def complete(self, plan: LogicalPlan, context: OptimizerContext) -> LogicalPlan:
+        # No finalization needed for this strategy
+        return plan
@@ -59,6 +59,7 @@ class LogicalPlanStepType(int, Enum):
     Distinct = auto()
     Exit = auto()
     HeapSort = auto()
+    Defragment = auto()  # merge small morsels
 
     CTE = auto()
     Subquery = auto()
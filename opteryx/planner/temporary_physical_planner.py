@@ -22,7 +22,9 @@ from orso.schema import OrsoTypes
 
 from opteryx import operators
 from opteryx.exceptions import UnsupportedSyntaxError
+from opteryx.models import DynamicFilter
 from opteryx.models import ExecutionTree
+from opteryx.operators.interval_join_node import find_interval_bounds
 from opteryx.planner.logical_planner import LogicalPlanStepType
 
 
@@ -38,9 +40,12 @@ def create_physical_plan(logical_plan, query_properties) -> ExecutionTree:
         if node_type == LogicalPlanStepType.Aggregate:
             node = operators.AggregateNode(query_properties, aggregates=node_config["aggregates"])
         elif node_type == LogicalPlanStepType.AggregateAndGroup:
-            node = operators.AggregateAndGroupNode(query_properties, groups=node_config["groups"], aggregates=node_config["aggregates"], projection=node_config["projection"])
-        #        elif node_type == LogicalPlanStepType.Defragment:
-        #            node = operators.MorselDefragmentNode(query_properties, **node_config)
+            if node_config.get("sorted_groups"):
+                node = operators.SortedAggregateAndGroupNode(query_properties, groups=node_config["groups"], aggregates=node_config["aggregates"], projection=node_config["projection"])
+            else:
+                node = operators.AggregateAndGroupNode(query_properties, groups=node_config["groups"], aggregates=node_config["aggregates"], projection=node_config["projection"])
+        elif node_type == LogicalPlanStepType.Defragment:
+            node = operators.MorselDefragmentNode(query_properties, **node_config)
         elif node_type == LogicalPlanStepType.Distinct:
             node = operators.DistinctNode(query_properties, **node_config)
         elif node_type == LogicalPlanStepType.Exit:
@@ -64,6 +69,9 @@ def create_physical_plan(logical_plan, query_properties) -> ExecutionTree:
             elif node_config.get("type") in ("left outer", "full outer", "right outer", "left anti", "left semi"):
                 # We use out own implementation of OUTER JOINS
                 node = operators.OuterJoinNode(query_properties, **node_config)
+            elif node_config.get("type") == "cross join" and find_interval_bounds(node_config.get("condition"), node_config.get("left_relation_names"), node_config.get("right_relation_names")):
+                # Range conditions (BETWEEN, or >= and <) are joined by sorting and searching
+                node = operators.IntervalJoinNode(query_properties, **node_config)
             elif node_config.get("type") == "cross join":
                 # Pyarrow doesn't have a CROSS JOIN
                 node = operators.CrossJoinNode(query_properties, **node_config)
@@ -116,4 +124,40 @@ def create_physical_plan(logical_plan, query_properties) -> ExecutionTree:
     for source, destination, relation in logical_plan.edges():
         plan.add_edge(source, destination, relation)
 
+    connect_dynamic_filters(plan)
+
     return plan
+
+
+def connect_dynamic_filters(plan: ExecutionTree):
+    """
+    Heap Sorts publish the first sort key of the worst row they're holding, if the scan
+    producing that column is only separated from the Heap Sort by filters and
+    projections, it can discard rows which are worse than that as it reads them.
+    """
+    for nid, node in plan.nodes(data=True):
+        if not isinstance(node, operators.HeapSortNode) or not node.order_by:
+            continue
+        column, direction = node.order_by[0]
+        identity = getattr(getattr(column, "schema_column", None), "identity", None)
+        if identity is None:
+            continue
+
+        producer = nid
+        while len(producers := plan.ingoing_edges(producer)) == 1:
+            producer = producers[0][0]
+            producer_node = plan[producer]
+            if isinstance(producer_node, operators.ReaderNode):
+                for scan_column in producer_node.columns:
+                    if scan_column.schema_column.identity == identity:
+                        dynamic_filter = DynamicFilter(
+                            identity, scan_column.source_column, direction
+                        )
+                        node.dynamic_filter = dynamic_filter
+                        producer_node.dynamic_filter = dynamic_filter
+                        break
+                break
+            if not isinstance(
+                producer_node, (operators.FilterNode, operators.ProjectionNode, operators.NoOpNode)
+            ):
+                break
@@ -13,13 +13,23 @@
 from opteryx.compiled.structures import MemoryPool
 from opteryx.shared.async_memory_pool import AsyncMemoryPool
 from opteryx.shared.buffer_pool import BufferPool
+from opteryx.shared.decoded_cache import DecodedMorselCache
+from opteryx.shared.http_session_pool import HttpSessionPool
 from opteryx.shared.materialized_datasets import MaterializedDatasets
+from opteryx.shared.metadata_cache import MetadataCache
+from opteryx.shared.plan_cache import PlanCache
+from opteryx.shared.result_cache import QueryResultCache
 from opteryx.shared.rolling_log import RollingLog
 
 __all__ = (
     "AsyncMemoryPool",
     "BufferPool",
+    "DecodedMorselCache",
+    "HttpSessionPool",
     "MaterializedDatasets",
     "MemoryPool",
+    "MetadataCache",
+    "PlanCache",
+    "QueryResultCache",
     "RollingLog",
 )
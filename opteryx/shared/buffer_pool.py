@@ -23,6 +23,7 @@ is slot-based.
 The Buffer Pool is a global resource and used across all Connections and Cursors.
 """
 
+from threading import Lock
 from typing import Optional
 
 from opteryx.config import MAX_LOCAL_BUFFER_CAPACITY
@@ -34,23 +35,28 @@ class _BufferPool:
     """
     Buffer Pool is a class implementing a Least Recently Used (LRU) policy for
     eviction.
+
+    The pool is used from the threads reading for all queries, a lock keeps the LRU and
+    the memory pool consistent.
     """
 
-    slots = "_lru", "_memory_pool", "size"
+    slots = "_lru", "_memory_pool", "size", "_lock"
 
     def __init__(self):
         self._lru = LRU2()
         self._memory_pool = MemoryPool(name="BufferPool", size=MAX_LOCAL_BUFFER_CAPACITY)
         self.size = self._memory_pool.size
+        self._lock = Lock()
 
     def get(self, key: bytes, zero_copy: bool = True) -> Optional[bytes]:
         """
         Retrieve an item from the pool, return None if the item isn't found.
         """
-        mp_key = self._lru.get(key)
-        if mp_key is not None:
-            return self._memory_pool.read(mp_key, zero_copy=zero_copy)
-        return None
+        with self._lock:
+            mp_key = self._lru.get(key)
+            if mp_key is not None:
+                return self._memory_pool.read(mp_key, zero_copy=zero_copy)
+            return None
 
     def set(self, key: bytes, value) -> Optional[str]:
         """
@@ -64,6 +70,10 @@ class _BufferPool:
         Returns:
             The key of the evicted item if eviction occurred, otherwise None.
         """
+        with self._lock:
+            return self._set(key, value)
+
+    def _set(self, key: bytes, value) -> Optional[str]:
         # First check if we can commit the value to the memory pool
         if not self._memory_pool.available_space() >= len(value):
             evicted_key, evicted_value = self._lru.evict(details=True)
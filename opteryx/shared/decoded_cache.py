@@ -0,0 +1,112 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Decoded Morsel Cache.
+
+The Buffer Pool and remote caches hold the raw bytes of blobs, a hit on those caches
+still needs the blob to be decoded, projected and filtered. This cache holds the output
+of the decoders (after projection and selection pushdowns) as Arrow IPC, so a hit skips
+both the read and the decode.
+
+Entries are keyed on the blob name, the version of the blob (e.g. mtime or etag), the
+columns projected and the predicates pushed to the decoder - a change to any of these
+is a different entry. Blobs without a known version are never cached.
+
+The cache is held in the Buffer Pool, unless a location on disk is configured, in which
+case the entries are written as Arrow IPC files and memory-mapped when read.
+
+The cache is opt-in, set ENABLE_DECODED_MORSEL_CACHE to enable it.
+"""
+
+from typing import Iterable
+from typing import Optional
+
+from orso.cityhash import CityHash64
+
+from opteryx.config import DECODED_MORSEL_CACHE_LOCATION
+from opteryx.shared.ipc_cache import ArrowIpcCache
+
+KEY_PREFIX = b"decoded:"
+
+
+def _stringify_predicates(predicates: Optional[list]) -> str:
+    from opteryx.managers.expression.formatter import format_expression
+
+    if not predicates:
+        return ""
+    return "&".join(sorted(format_expression(predicate) for predicate in predicates))
+
+
+def _stringify_projection(columns: Optional[Iterable]) -> str:
+    if columns is None:
+        return "*"
+    return ",".join(
+        sorted(f"{column.source_column}:{column.schema_column.name}" for column in columns)
+    )
+
+
+class _DecodedMorselCache(ArrowIpcCache):
+    """
+    Hold decoded morsels, these are stored as Arrow IPC.
+    """
+
+    def __init__(self, location: Optional[str] = DECODED_MORSEL_CACHE_LOCATION):
+        super().__init__(key_prefix=KEY_PREFIX, location=location)
+
+    @staticmethod
+    def key(
+        blob_name: str,
+        version: Optional[str],
+        columns: Optional[Iterable] = None,
+        predicates: Optional[list] = None,
+    ) -> Optional[bytes]:
+        """
+        Build the key for a decoded blob, if we don't know the version of the blob
+        we can't tell if the cached entry is stale so we don't create a key.
+        """
+        if version is None:
+            return None
+        fingerprint = "|".join(
+            (
+                blob_name,
+                str(version),
+                _stringify_projection(columns),
+                _stringify_predicates(predicates),
+            )
+        )
+        return KEY_PREFIX + hex(CityHash64(fingerprint)).encode()
+
+
+class DecodedMorselCache(_DecodedMorselCache):
+    """
+    Singleton wrapper for the _DecodedMorselCache class.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = cls._create_instance()
+        return cls._instance
+
+    @classmethod
+    def _create_instance(cls):
+        return _DecodedMorselCache()
+
+    @classmethod
+    def reset(cls):
+        """
+        Reset the DecodedMorselCache singleton instance.
+        """
+        cls._instance = None
+        cls._instance = cls._create_instance()
@@ -0,0 +1,150 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+HTTP Session Pool.
+
+Reading blobs from remote stores is mostly waiting on the network, creating a new HTTP
+session for each scan means each scan pays for new TCP and TLS handshakes and none of
+the connections opened by earlier queries are reused.
+
+This holds a single event loop, run on a background thread, and a single HTTP session
+on that loop which all of the async readers use. aiohttp sessions belong to the event
+loop they were created on, so sharing the session means sharing the loop; scans submit
+their reads to the loop rather than each creating their own.
+
+The session's connector keeps idle connections open for HTTP_KEEP_ALIVE seconds, holds
+at most HTTP_CONNECTIONS connections with at most HTTP_CONNECTIONS_PER_HOST to any one
+endpoint, and caches DNS lookups.
+"""
+
+import asyncio
+import atexit
+import threading
+from concurrent.futures import Future
+from typing import Coroutine
+from typing import Optional
+
+import aiohttp
+
+from opteryx.config import HTTP_CONNECTIONS
+from opteryx.config import HTTP_CONNECTIONS_PER_HOST
+from opteryx.config import HTTP_KEEP_ALIVE
+
+DNS_CACHE_SECONDS: int = 300
+
+
+class _HttpSessionPool:
+    """
+    Hold the shared event loop and the HTTP session used by the async readers.
+    """
+
+    def __init__(
+        self,
+        connections: int = HTTP_CONNECTIONS,
+        connections_per_host: int = HTTP_CONNECTIONS_PER_HOST,
+        keep_alive: float = HTTP_KEEP_ALIVE,
+    ):
+        self.connections = connections
+        self.connections_per_host = connections_per_host
+        self.keep_alive = keep_alive
+        self.lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        The shared event loop, started the first time it is needed.
+        """
+        with self.lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="opteryx-async-io", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coroutine: Coroutine) -> Future:
+        """
+        Run a coroutine on the shared event loop, returning a future for its result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The shared HTTP session, this must be used from the shared event loop.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connections,
+                limit_per_host=self.connections_per_host,
+                keepalive_timeout=self.keep_alive,
+                ttl_dns_cache=DNS_CACHE_SECONDS,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def close(self):
+        """
+        Close the HTTP session and stop the event loop.
+        """
+        with self.lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None or loop.is_closed():
+            return
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+class HttpSessionPool(_HttpSessionPool):
+    """
+    Singleton wrapper for the _HttpSessionPool class.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        # creating the instance starts a thread, so only create one
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls._create_instance()
+        return cls._instance
+
+    @classmethod
+    def _create_instance(cls):
+        return _HttpSessionPool()
+
+    @classmethod
+    def reset(cls):
+        """
+        Reset the HttpSessionPool singleton instance.
+        """
+        with cls._lock:
+            if cls._instance is not None:
+                cls._instance.close()
+            cls._instance = cls._create_instance()
+
+
+@atexit.register
+def _close_session_pool():  # pragma: no cover
+    if HttpSessionPool._instance is not None:
+        HttpSessionPool._instance.close()
@@ -0,0 +1,125 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Arrow IPC Cache.
+
+Tables are serialized as Arrow IPC and held in the Buffer Pool, or, if a location is
+provided, written as Arrow IPC files to that location. Files are memory-mapped when they
+are read so reading a cached table doesn't copy the data.
+
+This is the storage used by the caches which hold tables rather than raw bytes.
+"""
+
+import os
+from typing import Optional
+
+import pyarrow
+from pyarrow import ipc
+
+from opteryx.shared.buffer_pool import BufferPool
+
+
+class ArrowIpcCache:
+    """
+    Hold tables as Arrow IPC, in the Buffer Pool or as files on disk.
+    """
+
+    slots = "_buffer_pool", "_key_prefix", "_location", "hits", "misses", "inserts"
+
+    def __init__(self, key_prefix: bytes, location: Optional[str] = None):
+        self._buffer_pool = BufferPool()
+        self._key_prefix = key_prefix
+        self._location = location
+        if self._location:
+            os.makedirs(self._location, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+
+    def _file_name(self, key: bytes) -> str:
+        return os.path.join(self._location, key[len(self._key_prefix) :].decode() + ".arrow")
+
+    def get(self, key: Optional[bytes]) -> Optional[pyarrow.Table]:
+        """
+        Retrieve a table from the cache, return None if not found.
+        """
+        if key is None:
+            return None
+
+        if self._location:
+            file_name = self._file_name(key)
+            if not os.path.exists(file_name):
+                self.misses += 1
+                return None
+            # the table references the mapped file, there is no copy
+            source = pyarrow.memory_map(file_name, "r")
+            table = ipc.open_file(source).read_all()
+            self.hits += 1
+            return table
+
+        payload = self._buffer_pool.get(key, zero_copy=False)
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return ipc.open_stream(pyarrow.py_buffer(payload)).read_all()
+
+    def set(self, key: Optional[bytes], table: pyarrow.Table) -> bool:
+        """
+        Attempt to save a table to the cache.
+
+        Returns:
+            True if the table was saved
+        """
+        if key is None:
+            return False
+
+        if self._location:
+            # write to a temporary name and move, so readers never see partial files
+            file_name = self._file_name(key)
+            temp_name = f"{file_name}.{os.getpid()}.tmp"
+            with pyarrow.OSFile(temp_name, "wb") as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(temp_name, file_name)
+            self.inserts += 1
+            return True
+
+        sink = pyarrow.BufferOutputStream()
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        payload = sink.getvalue()
+
+        # don't let a single entry flood the Buffer Pool
+        if payload.size > self._buffer_pool.size // 10:
+            return False
+
+        self._buffer_pool.set(key, payload.to_pybytes())
+        self.inserts += 1
+        return True
+
+    def invalidate(self, key: Optional[bytes]):
+        """
+        Remove an entry from the disk cache, Buffer Pool entries age out.
+        """
+        if key is not None and self._location:
+            file_name = self._file_name(key)
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    @property
+    def stats(self) -> tuple:
+        """
+        Return the hit, miss and insert statistics for the cache.
+        """
+        return self.hits, self.misses, self.inserts
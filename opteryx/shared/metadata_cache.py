@@ -0,0 +1,179 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Metadata Cache.
+
+A new connector is created for each relation in each query, so anything the connector
+learns about the dataset is forgotten at the end of the query. Listing the blobs in a
+dataset and inferring the schema of a dataset can take longer than the query, this
+process-wide cache holds these between queries and connections.
+
+Entries expire after METADATA_CACHE_TTL seconds, the cache holds at most
+METADATA_CACHE_SIZE entries with the least recently used entries removed first. Entries
+can be removed explicitly with `invalidate`, e.g. after writing to a dataset.
+
+Setting METADATA_CACHE_TTL to 0 (the default) disables the cache.
+"""
+
+import copy
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from orso.schema import RelationSchema
+
+from opteryx.config import METADATA_CACHE_SIZE
+from opteryx.config import METADATA_CACHE_TTL
+
+LISTING = "listing"
+SCHEMA = "schema"
+
+
+class _MetadataCache:
+    """
+    Hold blob listings and dataset schemas with a time-to-live.
+    """
+
+    def __init__(self, ttl: float = METADATA_CACHE_TTL, size: int = METADATA_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.size > 0
+
+    def _get(self, key: tuple) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self.entries.pop(key)
+            self.misses += 1
+        return None
+
+    def _set(self, key: tuple, value: Any):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def get_listing(
+        self, connector: str, prefix: str
+    ) -> Optional[Tuple[List[str], Dict[str, str]]]:
+        """
+        Get the blob names, and their versions, for a prefix.
+        """
+        entry = self._get((LISTING, connector, prefix))
+        if entry is None:
+            return None
+        blob_names, versions = entry
+        return list(blob_names), versions
+
+    def set_listing(
+        self,
+        connector: str,
+        prefix: str,
+        blob_names: List[str],
+        versions: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Save the blob names, and their versions, for a prefix.
+        """
+        if versions:
+            versions = {blob: versions[blob] for blob in blob_names if blob in versions}
+        self._set((LISTING, connector, prefix), (tuple(blob_names), versions or {}))
+
+    def get_schema(self, connector: str, dataset: str, *qualifiers) -> Optional[RelationSchema]:
+        """
+        Get the schema of a dataset, qualifiers are anything else the schema depends on
+        (e.g. the date range for partitioned datasets).
+        """
+        schema = self._get((SCHEMA, connector, dataset, *qualifiers))
+        # the planner and the readers update the schema so we return a copy
+        return copy.deepcopy(schema) if schema is not None else None
+
+    def set_schema(self, connector: str, dataset: str, schema: RelationSchema, *qualifiers):
+        """
+        Save the schema of a dataset.
+        """
+        if schema is not None:
+            self._set((SCHEMA, connector, dataset, *qualifiers), copy.deepcopy(schema))
+
+    def invalidate(self, dataset: Optional[str] = None):
+        """
+        Remove entries for a dataset, and any blob listings under the dataset. If no
+        dataset is provided, the cache is cleared.
+        """
+        with self.lock:
+            if dataset is None:
+                self.entries.clear()
+                return
+            names = {dataset, dataset.replace(".", "/"), dataset.replace(".", os.sep)}
+            prefixes = tuple(name.rstrip("/" + os.sep) + os.sep for name in names) + tuple(
+                name.rstrip("/" + os.sep) + "/" for name in names
+            )
+            for key in list(self.entries):
+                name = key[2]
+                if name in names or name.startswith(prefixes):
+                    self.entries.pop(key)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def stats(self) -> tuple:
+        return (self.hits, self.misses)
+
+
+class MetadataCache(_MetadataCache):
+    """
+    Singleton wrapper for the _MetadataCache class.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = cls._create_instance()
+        return cls._instance
+
+    @classmethod
+    def _create_instance(cls):
+        return _MetadataCache()
+
+    @classmethod
+    def reset(cls):
+        """
+        Reset the MetadataCache singleton instance.
+        """
+        cls._instance = None
+        cls._instance = cls._create_instance()
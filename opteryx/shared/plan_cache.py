@@ -0,0 +1,200 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Plan Cache.
+
+Parsing, binding and optimizing a query can take longer than executing it for small
+queries. This cache holds the optimized logical plans of queries so repeated queries
+skip straight to the physical planner.
+
+Entries are keyed on the normalized SQL (after the SQL Rewriter has removed the temporal
+clauses), the temporal ranges, the parameters, the visibility filters and the roles of
+the user. The parameters are part of the key because the binder and optimizers fold
+and push the parameter values, they can't be swapped in an optimized plan.
+
+Connectors are not held in the cache, each use of a plan creates new connectors for
+the query. Each Scan records the fingerprint of the dataset when the plan was created,
+if the dataset has changed (e.g. blobs have been added or replaced) the plan, and the
+schema bound into it, is discarded. Plans reading datasets which can't be
+fingerprinted aren't cached.
+
+Only single statement queries are cached, queries referencing variables or calling
+functions which return different values each time they are run aren't cached.
+
+The cache is opt-in, set ENABLE_PLAN_CACHE to enable it.
+"""
+
+import copy
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+
+import orjson
+from orso.cityhash import CityHash64
+
+from opteryx.config import PLAN_CACHE_SIZE
+from opteryx.shared.result_cache import VOLATILE_FUNCTIONS
+
+CACHEABLE_QUERY_TYPES = {"Query"}
+
+
+def _scans(plan):
+    from opteryx.planner.logical_planner import LogicalPlanStepType
+
+    for nid, node in plan.nodes(data=True):
+        if node.node_type == LogicalPlanStepType.Scan:
+            yield nid, node
+
+
+class _PlanCache:
+    """
+    Hold optimized logical plans in a bounded LRU.
+    """
+
+    def __init__(self, size: int = PLAN_CACHE_SIZE):
+        self.size = size
+        self.plans: OrderedDict = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        statement: str,
+        temporal_filters: Iterable,
+        parameters: Any,
+        visibility_filters: Optional[Dict[str, Any]],
+        memberships: Optional[Iterable[str]],
+    ) -> Optional[str]:
+        """
+        Build the key for a query, None is returned if the query can't be cached.
+        """
+        if VOLATILE_FUNCTIONS.search(statement) or "@" in statement:
+            return None
+
+        try:
+            serialized = orjson.dumps(
+                [temporal_filters, parameters, visibility_filters, sorted(memberships or [])],
+                default=str,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            ).decode()
+        except TypeError:  # pragma: no cover
+            return None
+
+        return hex(CityHash64(f"{statement}|{serialized}"))
+
+    def get(self, key: Optional[str], connection, statistics):
+        """
+        Get a plan for a query, the plan is a copy of the cached plan with new connectors
+        created for this query. None is returned if there is no valid plan cached.
+        """
+        if key is None:
+            return None
+
+        with self.lock:
+            entry = self.plans.get(key)
+            if entry is not None:
+                self.plans.move_to_end(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        query_type, cached_plan, fingerprints = entry
+        if query_type not in connection.permissions:
+            return None
+
+        from opteryx.planner.binder.binder_visitor import create_connector
+
+        plan = cached_plan.copy()
+        for nid, node in _scans(plan):
+            node.connector = create_connector(node, statistics, connection.context)
+            if node.connector.get_dataset_fingerprint() != fingerprints.get(nid):
+                # the dataset has changed since this plan was created
+                self.invalidate(key)
+                self.misses += 1
+                return None
+            # the readers prune the schema, don't let that leak into the cache
+            node.schema = copy.deepcopy(node.schema)
+
+        self.hits += 1
+        return plan
+
+    def set(self, key: Optional[str], query_type: str, plan) -> bool:
+        """
+        Add a plan to the cache, we only cache plans we know we can validate.
+        """
+        if key is None or query_type not in CACHEABLE_QUERY_TYPES or self.size <= 0:
+            return False
+
+        fingerprints = {}
+        for nid, node in _scans(plan):
+            get_fingerprint = getattr(node.connector, "get_dataset_fingerprint", None)
+            fingerprint = get_fingerprint() if get_fingerprint else None
+            if fingerprint is None:
+                return False
+            fingerprints[nid] = fingerprint
+
+        cached_plan = plan.copy()
+        for _, node in _scans(cached_plan):
+            node.connector = None
+            node.schema = copy.deepcopy(node.schema)
+
+        with self.lock:
+            self.plans[key] = (query_type, cached_plan, fingerprints)
+            self.plans.move_to_end(key)
+            while len(self.plans) > self.size:
+                self.plans.popitem(last=False)
+        return True
+
+    def invalidate(self, key: str):
+        """
+        Remove a plan from the cache.
+        """
+        with self.lock:
+            self.plans.pop(key, None)
+
+    def __len__(self):
+        return len(self.plans)
+
+    @property
+    def stats(self) -> tuple:
+        return (self.hits, self.misses)
+
+
+class PlanCache(_PlanCache):
+    """
+    Singleton wrapper for the _PlanCache class.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = cls._create_instance()
+        return cls._instance
+
+    @classmethod
+    def _create_instance(cls):
+        return _PlanCache()
+
+    @classmethod
+    def reset(cls):
+        """
+        Reset the PlanCache singleton instance.
+        """
+        cls._instance = None
+        cls._instance = cls._create_instance()
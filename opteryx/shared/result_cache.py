@@ -0,0 +1,150 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Query Result Cache.
+
+Holds the results of queries as Arrow IPC so repeated queries against unchanged data
+don't need to be executed again.
+
+Entries are keyed on the normalized SQL, the parameters, the visibility filters and a
+fingerprint of every dataset read by the plan. The fingerprint of a dataset is built by
+the connector (e.g. from the list of blobs and their versions), if any dataset in the
+plan can't be fingerprinted, the query isn't cached. Queries which call functions that
+return different values each time they are run (e.g. RANDOM or NOW) are never cached.
+
+The cache is opt-in, set ENABLE_QUERY_RESULT_CACHE to enable it.
+"""
+
+import re
+from typing import Any
+from typing import Dict
+from typing import Generator
+from typing import Optional
+
+import orjson
+import pyarrow
+from orso.cityhash import CityHash64
+
+from opteryx.config import QUERY_RESULT_CACHE_LOCATION
+from opteryx.shared.ipc_cache import ArrowIpcCache
+
+KEY_PREFIX = b"result:"
+
+# Functions which don't return the same value each time the query is run, this includes
+# functions which return values from the connection, such as the user.
+VOLATILE_FUNCTIONS = re.compile(
+    r"\b(CONNECTION_ID|CURRENT_DATE|CURRENT_TIME|DATABASE|NORMAL|NOW|RAND|RANDOM|RANDOM_STRING"
+    r"|TODAY|USER|UTC_TIMESTAMP|YESTERDAY)\b",
+    re.IGNORECASE,
+)
+
+
+def plan_fingerprint(plan) -> Optional[str]:
+    """
+    Build a fingerprint of the data read by a plan, if any of the datasets can't be
+    fingerprinted, the plan can't be fingerprinted.
+    """
+    from opteryx.operators import ReaderNode
+
+    fingerprints = []
+    for _, operator in plan.nodes(data=True):
+        if not isinstance(operator, ReaderNode):
+            continue
+        connector = operator.parameters.get("connector")
+        if not hasattr(connector, "get_dataset_fingerprint"):
+            return None
+        fingerprint = connector.get_dataset_fingerprint()
+        if fingerprint is None:
+            return None
+        fingerprints.append(
+            f"{operator.parameters.get('relation')}@{operator.parameters.get('start_date')}"
+            f"~{operator.parameters.get('end_date')}:{fingerprint}"
+        )
+    return "|".join(sorted(fingerprints))
+
+
+class _QueryResultCache(ArrowIpcCache):
+    """
+    Hold query results, these are stored as Arrow IPC.
+    """
+
+    def __init__(self, location: Optional[str] = QUERY_RESULT_CACHE_LOCATION):
+        super().__init__(key_prefix=KEY_PREFIX, location=location)
+
+    @staticmethod
+    def key(
+        statement: str,
+        parameters: Any,
+        visibility_filters: Optional[Dict[str, Any]],
+        plan,
+    ) -> Optional[bytes]:
+        """
+        Build the key for a query, None is returned if the query can't be cached.
+        """
+        if VOLATILE_FUNCTIONS.search(statement) or "@" in statement:
+            return None
+
+        fingerprint = plan_fingerprint(plan)
+        if fingerprint is None:
+            return None
+
+        try:
+            serialized = orjson.dumps(
+                [parameters, visibility_filters],
+                default=str,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            ).decode()
+        except TypeError:  # pragma: no cover
+            return None
+
+        fingerprint = "|".join((statement, serialized, fingerprint))
+        return KEY_PREFIX + hex(CityHash64(fingerprint)).encode()
+
+    def capture(self, key: bytes, morsels: Generator) -> Generator:
+        """
+        Pass the morsels through, if they are all consumed save them to the cache.
+        """
+        collected = []
+        for morsel in morsels:
+            collected.append(morsel)
+            yield morsel
+        if collected:
+            try:
+                self.set(key, pyarrow.concat_tables(collected, promote_options="permissive"))
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):  # pragma: no cover
+                pass
+
+
+class QueryResultCache(_QueryResultCache):
+    """
+    Singleton wrapper for the _QueryResultCache class.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = cls._create_instance()
+        return cls._instance
+
+    @classmethod
+    def _create_instance(cls):
+        return _QueryResultCache()
+
+    @classmethod
+    def reset(cls):
+        """
+        Reset the QueryResultCache singleton instance.
+        """
+        cls._instance = None
+        cls._instance = cls._create_instance()
@@ -192,14 +192,16 @@ class Graph(object):
 
             if current_depth < depth:
                 for edge in seeker(current_node):
-                    _, target, _ = edge
+                    source, target, _ = edge
+                    # walking backwards we move to the source of the edge
+                    next_node = source if reverse else target
 
                     # Add the edge to the traversed edges list
                     traversed_edges.append(edge)
 
-                    if target not in visited:
-                        visited.add(target)
-                        queue.append((target, current_depth + 1))
+                    if next_node not in visited:
+                        visited.add(next_node)
+                        queue.append((next_node, current_depth + 1))
 
         return traversed_edges
 
@@ -530,7 +532,7 @@ class Graph(object):
             except:
                 return obj
 
-        graph = Graph()
+        graph = self.__class__()
         graph._nodes = _inner_copy(self._nodes)
         graph._edges = self.copy_edges()
 
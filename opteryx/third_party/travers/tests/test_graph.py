@@ -120,6 +120,19 @@ def test_bfs():
     assert len(bfs) == 14
 
 
+def test_bfs_reverse():
+    graph = build_graph()
+
+    # walking backwards from Hungry Jacks, only Sharlene likes it
+    bfs = graph.breadth_first_search("Hungry Jacks", 1, reverse=True)
+    assert bfs == [("Sharlene", "Hungry Jacks", "Likes")]
+
+    # and we keep walking backwards past Sharlene
+    bfs = graph.breadth_first_search("Hungry Jacks", reverse=True)
+    assert len(bfs) == 7
+    assert ("Lainie", "Sharlene", "Mother") in bfs
+
+
 def test_incoming_edges():
     graph = build_graph()
     incoming = graph.ingoing_edges("Bindoon")
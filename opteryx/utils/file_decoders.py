@@ -16,6 +16,7 @@ Decode files from a raw binary format to a PyArrow Table.
 
 import io
 from enum import Enum
+from functools import partial
 from typing import BinaryIO
 from typing import Callable
 from typing import Dict
@@ -202,19 +203,21 @@ def lzma_decoder(
 
 
 def parquet_decoder(
-    buffer: Union[memoryview, bytes],
+    buffer: Union[memoryview, bytes, pyarrow.Buffer],
     *,
     projection: Optional[list] = None,
     selection: Optional[list] = None,
     just_schema: bool = False,
     force_read: bool = False,
+    dynamic_filter=None,
 ) -> Tuple[int, int, pyarrow.Table]:
     """
     Read parquet formatted files.
 
     Parameters:
-        buffer: Union[memoryview, bytes]
-            The input buffer containing the parquet file data.
+        buffer: Union[memoryview, bytes, pyarrow.Buffer]
+            The input buffer containing the parquet file data, a memory mapped file is
+            read in place so only the pages for the columns we read are loaded.
         projection: List, optional
             List of columns to project.
         selection: optional
@@ -223,6 +226,8 @@ def parquet_decoder(
             Flag to indicate if only schema is needed.
         force_read: bool, optional
             Flag to skip some optimizations.
+        dynamic_filter: DynamicFilter, optional
+            A filter set while the query runs, used to skip row groups.
     Returns:
         Tuple containing number of rows, number of columns, and the table or schema.
     """
@@ -263,15 +268,28 @@ def parquet_decoder(
         selected_columns = []
 
     # Read the parquet table with the optimized column list and selection filters
-    table = parquet.read_table(
+    read_table = partial(
+        parquet.read_table,
         stream,
         columns=selected_columns,
         pre_buffer=False,
-        filters=dnf_filter,
         use_threads=False,
         use_pandas_metadata=False,
     )
 
+    # rows which can't be in the result of an ORDER BY ... LIMIT, PyArrow uses this to
+    # skip the row groups whose statistics show they only hold these rows
+    dynamic_dnf = dynamic_filter.to_dnf() if dynamic_filter is not None else None
+    table = None
+    if dynamic_dnf is not None and dynamic_dnf[0] in selected_columns:
+        try:
+            table = read_table(filters=(dnf_filter or []) + [dynamic_dnf])
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError, TypeError):
+            # the threshold can't be compared with the column in this file
+            pass
+    if table is None:
+        table = read_table(filters=dnf_filter)
+
     # Any filters we couldn't push to PyArrow to read we run here
     if processed_selection:
         table = filter_records(processed_selection, table)
@@ -405,7 +423,7 @@ def psv_decoder(
 
 
 def arrow_decoder(
-    buffer: Union[memoryview, bytes],
+    buffer: Union[memoryview, bytes, pyarrow.Buffer],
     *,
     projection: Optional[list] = None,
     selection: Optional[list] = None,
@@ -415,7 +433,13 @@ def arrow_decoder(
     import pyarrow.feather as pf
 
     stream: BinaryIO = None
-    stream = MemoryViewStream(buffer) if isinstance(buffer, memoryview) else io.BytesIO(buffer)
+    if isinstance(buffer, pyarrow.Buffer):
+        # memory mapped files are read without copying
+        stream = pyarrow.BufferReader(buffer)
+    elif isinstance(buffer, memoryview):
+        stream = MemoryViewStream(buffer)
+    else:
+        stream = io.BytesIO(buffer)
     table = pf.read_table(stream)
     schema = table.schema
     if just_schema:
@@ -484,7 +508,7 @@ def avro_decoder(
 
 
 def ipc_decoder(
-    buffer: Union[memoryview, bytes],
+    buffer: Union[memoryview, bytes, pyarrow.Buffer],
     *,
     projection: Optional[list] = None,
     selection: Optional[list] = None,
@@ -496,7 +520,13 @@ def ipc_decoder(
     from pyarrow import ipc
 
     stream: BinaryIO = None
-    stream = MemoryViewStream(buffer) if isinstance(buffer, memoryview) else io.BytesIO(buffer)
+    if isinstance(buffer, pyarrow.Buffer):
+        # memory mapped files are read without copying
+        stream = pyarrow.BufferReader(buffer)
+    elif isinstance(buffer, memoryview):
+        stream = MemoryViewStream(buffer)
+    else:
+        stream = io.BytesIO(buffer)
     reader = ipc.open_stream(stream)
 
     batch_one = next(reader, None)
@@ -536,6 +566,9 @@ KNOWN_EXTENSIONS: Dict[str, Tuple[Callable, str]] = {
     "lzma": (lzma_decoder, ExtentionType.DATA),  # jsonl/lzma
 }
 
+# formats Arrow decodes in place, these are memory mapped rather than read when local
+MEMORY_MAPPABLE_EXTENSIONS = (".arrow", ".ipc", ".parquet")
+
 VALID_EXTENSIONS = set(f".{ext}" for ext in KNOWN_EXTENSIONS)
 TUPLE_OF_VALID_EXTENSIONS = tuple(VALID_EXTENSIONS)
 DATA_EXTENSIONS = set(
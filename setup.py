@@ -99,6 +99,13 @@ extensions = [
         language="c++",
         extra_compile_args=COMPILE_FLAGS + ["-std=c++17"],
     ),
+    Extension(
+        name="opteryx.compiled.structures.sketches",
+        sources=["opteryx/compiled/structures/sketches.pyx"],
+        include_dirs=include_dirs,
+        language="c++",
+        extra_compile_args=COMPILE_FLAGS + ["-std=c++17"],
+    ),
     Extension(
         name="opteryx.compiled.functions.vectors",
         sources=["opteryx/compiled/functions/vectors.pyx"],
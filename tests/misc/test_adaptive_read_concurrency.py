@@ -0,0 +1,106 @@
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import asyncio
+
+import opteryx
+from opteryx.models import QueryStatistics
+from opteryx.operators.async_read_node import LEARNED_READ_CONCURRENCY
+from opteryx.operators.async_read_node import AdaptiveConcurrency
+
+
+def _read(controller, statistics, reads, stall=False, read_bytes=1024):
+    peak_in_flight = 0
+
+    async def _one_read():
+        nonlocal peak_in_flight
+        await controller.acquire()
+        try:
+            peak_in_flight = max(peak_in_flight, controller.in_flight)
+            await asyncio.sleep(0.001)
+            statistics.bytes_read += read_bytes
+            if stall:
+                statistics.stalls_writing_to_read_buffer += 1
+        finally:
+            await controller.release()
+
+    async def _all_reads():
+        await asyncio.gather(*(_one_read() for _ in range(reads)))
+
+    asyncio.run(_all_reads())
+    return peak_in_flight
+
+
+def test_limit_increases_while_reads_keep_up():
+    statistics = QueryStatistics("adaptive-increase")
+    controller = AdaptiveConcurrency(statistics, lambda: 0, initial=2, maximum=8)
+    peak_in_flight = _read(controller, statistics, 100)
+    assert controller.limit == 8
+    assert peak_in_flight <= 8
+    assert statistics.read_concurrency_peak == 8
+
+
+def test_limit_halves_when_read_buffer_is_full():
+    statistics = QueryStatistics("adaptive-stalls")
+    controller = AdaptiveConcurrency(statistics, lambda: 0, initial=16, maximum=32)
+    _read(controller, statistics, 40, stall=True)
+    assert controller.limit == 1
+
+
+def test_limit_held_while_consumer_is_behind():
+    statistics = QueryStatistics("adaptive-backlog")
+    controller = AdaptiveConcurrency(statistics, lambda: 100, initial=4, maximum=32)
+    peak_in_flight = _read(controller, statistics, 40)
+    assert controller.limit == 4
+    assert peak_in_flight <= 4
+
+
+def test_many_blobs_are_scheduled_without_waking_every_waiter():
+    import queue
+    import time
+
+    from opteryx.operators.async_read_node import fetch_data
+
+    statistics = QueryStatistics("adaptive-many-blobs")
+    reply_queue: queue.Queue = queue.Queue()
+    controller = AdaptiveConcurrency(statistics, lambda: 0, initial=4, maximum=4)
+    peak_in_flight = 0
+
+    async def reader(*, blob_name, pool, session, statistics):
+        nonlocal peak_in_flight
+        peak_in_flight = max(peak_in_flight, controller.in_flight)
+        await asyncio.sleep(0)
+        return blob_name
+
+    start = time.monotonic()
+    asyncio.run(
+        fetch_data(
+            [f"blob_{i}" for i in range(8000)],
+            None,
+            reader,
+            reply_queue,
+            statistics,
+            concurrency=controller,
+        )
+    )
+    elapsed = time.monotonic() - start
+
+    assert reply_queue.qsize() == 8001
+    assert peak_in_flight <= 4
+    assert controller.in_flight == 0
+    # waking every waiter on each release took over 40 seconds for this many blobs
+    assert elapsed < 5, elapsed
+
+
+def test_learned_concurrency_is_kept_between_queries():
+    cur = opteryx.query("SELECT * FROM testdata.flat.formats.psv")
+    assert cur.arrow().num_rows > 0
+    assert "LOCAL:testdata/flat/formats/psv" in LEARNED_READ_CONCURRENCY, LEARNED_READ_CONCURRENCY
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
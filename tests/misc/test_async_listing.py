@@ -0,0 +1,77 @@
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import asyncio
+import datetime
+
+import opteryx
+from opteryx.connectors import DiskConnector
+from opteryx.managers.schemes import DefaultPartitionScheme
+from opteryx.managers.schemes import MabelPartitionScheme
+from opteryx.models import QueryStatistics
+
+
+def _list(scheme, connector, start_date=None, end_date=None):
+    async def _collect():
+        batches = []
+        async for batch in scheme.async_get_blobs_in_partition(
+            async_blob_list_getter=connector.async_get_list_of_blob_names,
+            blob_list_getter=connector.get_list_of_blob_names,
+            prefix=connector.dataset,
+            start_date=start_date,
+            end_date=end_date,
+        ):
+            batches.append(batch)
+        return batches
+
+    return asyncio.run(_collect())
+
+
+def test_async_listing_matches_sync_listing_for_mabel_partitions():
+    connector = DiskConnector(
+        dataset="testdata.partitioned.framed",
+        statistics=QueryStatistics(),
+        partition_scheme=MabelPartitionScheme,
+    )
+    scheme = MabelPartitionScheme()
+    start_date = datetime.datetime(2021, 3, 27)
+    end_date = datetime.datetime(2021, 3, 30)
+
+    batches = _list(scheme, connector, start_date, end_date)
+    expected = scheme.get_blobs_in_partition(
+        blob_list_getter=connector.get_list_of_blob_names,
+        prefix=connector.dataset,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    # each day with data is its own batch
+    assert len(batches) == 2, batches
+    assert sorted(blob for batch in batches for blob in batch) == expected
+
+
+def test_async_listing_for_default_partitions():
+    connector = DiskConnector(dataset="testdata.flat.formats.psv", statistics=QueryStatistics())
+    batches = _list(DefaultPartitionScheme(), connector)
+    assert len(batches) == 1
+    assert [blob for batch in batches for blob in batch] == connector.get_list_of_blob_names(
+        prefix=connector.dataset
+    )
+
+
+def test_reads_overlap_listing():
+    opteryx.register_store(
+        "testdata.partitioned", DiskConnector, partition_scheme=MabelPartitionScheme
+    )
+    cur = opteryx.query(
+        "SELECT * FROM testdata.partitioned.framed FOR DATES BETWEEN '2021-03-28' AND '2021-03-30'"
+    )
+    assert cur.shape == (200000, 1)
+    assert cur.stats["blobs_read"] == 2
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
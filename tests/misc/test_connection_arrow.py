@@ -47,6 +47,83 @@ def test_direct_as_arrow_no_limit():
     assert cur.stats["rows_read"] == 9, cur.stats
 
 
+def test_arrow_c_stream_export():
+    import pyarrow
+
+    import opteryx
+
+    conn = opteryx.connect()
+    cur = conn.cursor()
+    cur.execute("SELECT id, name FROM $satellites")
+    table = pyarrow.RecordBatchReader.from_stream(cur).read_all()
+
+    assert table.column_names == ["id", "name"]
+    assert table.num_rows == 177
+
+
+def test_register_arrow_c_stream():
+    import pyarrow
+
+    import opteryx
+    from opteryx.connectors import ArrowStream
+    from opteryx.shared import MaterializedDatasets
+
+    class StreamOnly:
+        def __init__(self, table):
+            self.table = table
+            self.reads = 0
+
+        def __arrow_c_stream__(self, requested_schema=None):
+            self.reads += 1
+            return self.table.__arrow_c_stream__(requested_schema)
+
+    source = StreamOnly(pyarrow.table({"a": [1, 2, 3], "b": ["x", "y", "z"]}))
+    opteryx.register_arrow("stream_only", source)
+    # nothing is read until the dataset is queried
+    assert source.reads == 0
+    assert isinstance(MaterializedDatasets()["stream_only"], ArrowStream)
+
+    assert opteryx.query("SELECT SUM(a), MAX(b) FROM stream_only").fetchone() == (6, "z")
+    # the stream opened to read the schema is the one which is read
+    assert source.reads == 1
+    assert opteryx.query("SELECT COUNT(*) FROM stream_only").fetchone() == (3,)
+    # later reads are from the batches kept from the first read
+    assert source.reads == 1
+
+
+def test_register_cursor_as_stream():
+    import opteryx
+
+    conn = opteryx.connect()
+    cur = conn.cursor()
+    cur.execute("SELECT id, name FROM $satellites WHERE planetId = 5")
+    opteryx.register_df("jupiter_moons", cur)
+
+    assert opteryx.query("SELECT COUNT(*) FROM jupiter_moons").fetchone() == (67,)
+    # a cursor can only be read once, it is still there for the next query
+    assert opteryx.query("SELECT COUNT(*) FROM jupiter_moons").fetchone() == (67,)
+    assert opteryx.query("SELECT MAX(id) FROM jupiter_moons").fetchone() == (
+        opteryx.query("SELECT MAX(id) FROM $satellites WHERE planetId = 5").fetchone()
+    )
+
+
+def test_register_record_batch_reader_read_in_parts():
+    import pyarrow
+
+    import opteryx
+
+    table = pyarrow.table({"a": list(range(100))})
+    reader = pyarrow.RecordBatchReader.from_batches(table.schema, table.to_batches(10))
+    opteryx.register_arrow("reader_in_parts", reader)
+
+    # the first query stops reading the stream early, the next reads the rest
+    assert opteryx.query("SELECT a FROM reader_in_parts LIMIT 5").rowcount == 5
+    assert opteryx.query("SELECT COUNT(*), SUM(a) FROM reader_in_parts").fetchone() == (
+        100,
+        4950,
+    )
+
+
 if __name__ == "__main__":  # pragma: no cover
     from tests.tools import run_tests
 
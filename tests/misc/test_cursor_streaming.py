@@ -0,0 +1,62 @@
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import pyarrow
+import pytest
+
+import opteryx
+from opteryx.exceptions import InvalidCursorStateError
+
+
+def _execute(statement):
+    conn = opteryx.connect()
+    cur = conn.cursor()
+    cur.execute(statement)
+    return cur
+
+
+def test_record_batch_reader():
+    cur = _execute("SELECT * FROM $satellites")
+    reader = cur.record_batch_reader()
+    assert isinstance(reader, pyarrow.RecordBatchReader)
+    table = reader.read_all()
+    assert table.shape == (177, 8)
+    assert reader.schema.names == table.column_names
+
+
+def test_fetch_batches_respects_size():
+    cur = _execute("SELECT id, name FROM $satellites")
+    batches = list(cur.fetch_batches(size=50))
+    assert all(batch.num_rows <= 50 for batch in batches)
+    assert sum(batch.num_rows for batch in batches) == 177
+    assert len(batches) >= 4
+
+
+def test_reader_after_rows_fetched_is_an_error():
+    cur = _execute("SELECT * FROM $planets")
+    cur.fetchone()
+    with pytest.raises(InvalidCursorStateError):
+        cur.record_batch_reader()
+
+
+def test_arrow_with_size_then_fetch_rows():
+    cur = _execute("SELECT id FROM $satellites")
+    assert cur.arrow(size=10).num_rows == 10
+    # the rows read to create the table are still available
+    assert cur.arrow().num_rows == 177
+    assert len(cur.fetchall()) == 177
+
+
+def test_empty_result():
+    cur = _execute("SELECT * FROM $planets WHERE id > 100")
+    assert cur.fetchone() is None
+    cur = _execute("SELECT * FROM $planets WHERE id > 100")
+    assert cur.arrow().num_rows == 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import pyarrow
+
+import opteryx
+from opteryx.shared.decoded_cache import _DecodedMorselCache
+
+
+def _table():
+    return pyarrow.Table.from_pydict({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+
+def test_key_requires_version():
+    cache = _DecodedMorselCache(location=None)
+    assert cache.key("blob.parquet", None) is None
+    assert cache.get(None) is None
+    assert not cache.set(None, _table())
+
+
+def test_key_changes_with_version():
+    cache = _DecodedMorselCache(location=None)
+    one = cache.key("blob.parquet", "1")
+    two = cache.key("blob.parquet", "2")
+    assert one != two
+    assert one == cache.key("blob.parquet", "1")
+
+
+def test_buffer_pool_round_trip():
+    cache = _DecodedMorselCache(location=None)
+    key = cache.key("test_buffer_pool_round_trip.parquet", "1")
+    assert cache.get(key) is None
+    assert cache.set(key, _table())
+    assert cache.get(key).equals(_table())
+
+
+def test_memory_mapped_round_trip():
+    with tempfile.TemporaryDirectory() as location:
+        cache = _DecodedMorselCache(location=location)
+        key = cache.key("test_memory_mapped_round_trip.parquet", "1")
+        assert cache.get(key) is None
+        assert cache.set(key, _table())
+        assert cache.get(key).equals(_table())
+        assert cache.stats == (1, 1, 1)
+        cache.invalidate(key)
+        assert cache.get(key) is None
+
+
+def test_reads_served_from_decoded_cache():
+    from opteryx.operators import async_read_node
+
+    async_read_node.ENABLE_DECODED_MORSEL_CACHE = True
+    try:
+        statement = "SELECT id, name FROM testdata.planets WHERE id > 3"
+        first = opteryx.query(statement)
+        assert first.rowcount == 6
+        second = opteryx.query(statement)
+        assert second.rowcount == 6
+        assert second.stats.get("decoded_cache_hits", 0) == 1, second.stats
+        assert sorted(first.arrow().column(0).to_pylist()) == sorted(
+            second.arrow().column(0).to_pylist()
+        )
+    finally:
+        async_read_node.ENABLE_DECODED_MORSEL_CACHE = False
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
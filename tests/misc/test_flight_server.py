@@ -0,0 +1,154 @@
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import orjson
+import pyarrow
+import pytest
+from pyarrow import flight
+
+from opteryx.exceptions import InvalidConfigurationError
+from opteryx.flight_server import FlightServer
+from opteryx.flight_server import QueryStream
+from opteryx.flight_server import TokenAuthHandler
+from opteryx.flight_server import TokenClientAuthHandler
+from opteryx.flight_server import is_loopback
+
+
+def _server(**kwargs):
+    server = FlightServer("grpc://127.0.0.1:0", **kwargs)
+    client = flight.connect(f"grpc://127.0.0.1:{server.port}")
+    return server, client
+
+
+def test_do_get_runs_statement():
+    server, client = _server()
+    try:
+        table = client.do_get(flight.Ticket(b"SELECT id, name FROM $planets")).read_all()
+        assert table.shape == (9, 2)
+        assert table.column_names == ["id", "name"]
+
+        request = orjson.dumps({"sql": "SELECT name FROM $planets WHERE id = ?", "params": [3]})
+        table = client.do_get(flight.Ticket(request)).read_all()
+        assert table.column(0).to_pylist() == ["Earth"]
+    finally:
+        server.shutdown()
+
+
+def test_get_flight_info_then_read():
+    server, client = _server()
+    try:
+        descriptor = flight.FlightDescriptor.for_command(b"SELECT * FROM $satellites")
+        info = client.get_flight_info(descriptor)
+        assert len(info.schema.names) == 8
+        ticket = info.endpoints[0].ticket
+        assert client.do_get(ticket).read_all().num_rows == 177
+        # tickets can only be read once
+        with pytest.raises(flight.FlightServerError):
+            client.do_get(ticket).read_all()
+    finally:
+        server.shutdown()
+
+
+def test_errors_are_returned():
+    server, client = _server()
+    try:
+        with pytest.raises(flight.FlightServerError, match="DatasetNotFoundError"):
+            client.do_get(flight.Ticket(b"SELECT * FROM $not_a_dataset")).read_all()
+    finally:
+        server.shutdown()
+
+
+def test_query_limits():
+    server, client = _server(max_concurrent_queries=1, queue_timeout=0.1, max_result_bytes=1024)
+    try:
+        descriptor = flight.FlightDescriptor.for_command(b"SELECT id FROM $planets")
+        info = client.get_flight_info(descriptor)
+        # the unread ticket doesn't hold the only slot
+        assert client.do_get(flight.Ticket(b"SELECT id FROM $planets")).read_all().num_rows == 9
+        list(client.do_action(flight.Action("cancel", info.endpoints[0].ticket.ticket)))
+        with pytest.raises(flight.FlightServerError, match="expired"):
+            client.do_get(info.endpoints[0].ticket).read_all()
+
+        with pytest.raises(flight.FlightServerError, match="limit"):
+            client.do_get(flight.Ticket(b"SELECT * FROM $satellites")).read_all()
+        # the slot is released when the query fails
+        assert client.do_get(flight.Ticket(b"SELECT id FROM $planets")).read_all().num_rows == 9
+    finally:
+        server.shutdown()
+
+
+def test_abandoned_tickets_do_not_block_the_server(monkeypatch):
+    import opteryx.flight_server
+
+    server, client = _server(max_concurrent_queries=2, queue_timeout=0.1)
+    try:
+        descriptor = flight.FlightDescriptor.for_command(b"SELECT id FROM $planets")
+        tickets = [client.get_flight_info(descriptor).endpoints[0].ticket for _ in range(5)]
+        # the tickets are never read, queries can still be run
+        assert client.do_get(flight.Ticket(b"SELECT id FROM $planets")).read_all().num_rows == 9
+        # only as many tickets as queries are kept, the oldest are discarded
+        assert len(server._pending) == 2
+        with pytest.raises(flight.FlightServerError, match="expired"):
+            client.do_get(tickets[0]).read_all()
+        assert client.do_get(tickets[-1]).read_all().num_rows == 9
+
+        # tickets which aren't read in time expire
+        monkeypatch.setattr(opteryx.flight_server, "PENDING_QUERY_TIMEOUT", 0)
+        ticket = client.get_flight_info(descriptor).endpoints[0].ticket
+        with pytest.raises(flight.FlightServerError, match="expired"):
+            client.do_get(ticket).read_all()
+        assert ticket.ticket not in server._pending
+    finally:
+        server.shutdown()
+
+
+def test_only_loopback_without_authentication():
+    assert is_loopback("grpc://127.0.0.1:8815")
+    assert is_loopback("grpc://localhost:8815")
+    assert is_loopback("grpc://[::1]:8815")
+    assert not is_loopback("grpc://0.0.0.0:8815")
+    assert not is_loopback("grpc://example.com:8815")
+
+    with pytest.raises(InvalidConfigurationError):
+        FlightServer("grpc://0.0.0.0:0")
+
+
+def test_token_authentication():
+    server = FlightServer("grpc://0.0.0.0:0", auth_handler=TokenAuthHandler("secret"))
+    try:
+        client = flight.connect(f"grpc://127.0.0.1:{server.port}")
+        with pytest.raises(flight.FlightUnauthenticatedError):
+            client.do_get(flight.Ticket(b"SELECT id FROM $planets")).read_all()
+        with pytest.raises(flight.FlightUnauthenticatedError):
+            client.authenticate(TokenClientAuthHandler("wrong"))
+
+        client = flight.connect(f"grpc://127.0.0.1:{server.port}")
+        client.authenticate(TokenClientAuthHandler("secret"))
+        assert client.do_get(flight.Ticket(b"SELECT id FROM $planets")).read_all().num_rows == 9
+    finally:
+        server.shutdown()
+
+
+def test_discarded_streams_close_the_cursor():
+    class Cursor:
+        closed = 0
+
+        def close(self):
+            self.closed += 1
+
+    released = []
+    cursor = Cursor()
+    reader = pyarrow.table({"a": [1, 2, 3]}).to_reader()
+    stream = QueryStream(reader, lambda: released.append(True), cursor=cursor)
+    stream.close()
+    stream.close()
+    assert cursor.closed == 1
+    assert released == [True]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
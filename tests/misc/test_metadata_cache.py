@@ -0,0 +1,93 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import pyarrow
+import pyarrow.parquet
+
+import opteryx
+from opteryx.shared import MetadataCache
+from opteryx.shared.metadata_cache import _MetadataCache
+
+
+def test_disabled_by_default():
+    cache = _MetadataCache(ttl=0)
+    cache.set_listing("LOCAL", "testdata/planets", ["a.parquet"])
+    assert cache.get_listing("LOCAL", "testdata/planets") is None
+
+
+def test_listing_expires():
+    cache = _MetadataCache(ttl=0.1)
+    cache.set_listing(
+        "GCS", "bucket/path", ["bucket/path/a.parquet"], {"bucket/path/a.parquet": "1"}
+    )
+    assert cache.get_listing("GCS", "bucket/path") == (
+        ["bucket/path/a.parquet"],
+        {"bucket/path/a.parquet": "1"},
+    )
+    time.sleep(0.2)
+    assert cache.get_listing("GCS", "bucket/path") is None
+
+
+def test_size_bound_and_invalidation():
+    cache = _MetadataCache(ttl=60, size=2)
+    cache.set_listing("LOCAL", "one", ["one/a"])
+    cache.set_listing("LOCAL", "two/2024", ["two/2024/a"])
+    cache.set_listing("LOCAL", "three", ["three/a"])
+    assert len(cache) == 2
+    assert cache.get_listing("LOCAL", "one") is None
+
+    cache.invalidate("two")
+    assert cache.get_listing("LOCAL", "two/2024") is None
+    assert cache.get_listing("LOCAL", "three") is not None
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_schema_is_copied():
+    cache = _MetadataCache(ttl=60)
+    schema = opteryx.query("SELECT * FROM $planets").schema
+    cache.set_schema("SAMPLE", "$planets", schema)
+    first = cache.get_schema("SAMPLE", "$planets")
+    first.columns = []
+    assert len(cache.get_schema("SAMPLE", "$planets").columns) == len(schema.columns)
+
+
+def test_listing_and_schema_shared_between_queries():
+    folder = tempfile.mkdtemp(dir=".")
+    dataset = os.path.basename(folder)
+    MetadataCache._instance = _MetadataCache(ttl=60)
+    try:
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pydict({"value": [1, 2, 3]}), f"{folder}/data.parquet"
+        )
+        statement = f"SELECT SUM(value) FROM {dataset}"
+        first = opteryx.query(statement)
+        assert first.fetchone()[0] == 6
+        assert first.stats.get("metadata_cache_hits", 0) == 0
+        second = opteryx.query(statement)
+        assert second.fetchone()[0] == 6
+        # the schema and the listing
+        assert second.stats.get("metadata_cache_hits", 0) == 2, second.stats
+
+        # new blobs aren't seen until the cache is invalidated
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pydict({"value": [4]}), f"{folder}/more_data.parquet"
+        )
+        assert opteryx.query(statement).fetchone()[0] == 6
+        MetadataCache().invalidate(dataset)
+        assert opteryx.query(statement).fetchone()[0] == 10
+    finally:
+        MetadataCache.reset()
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
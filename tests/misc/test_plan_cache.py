@@ -0,0 +1,94 @@
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import pyarrow
+import pyarrow.parquet
+
+import opteryx
+from opteryx import planner
+from opteryx.shared.plan_cache import _PlanCache
+
+
+def _run(statement, **kwargs):
+    conn = opteryx.connect()
+    curr = conn.cursor()
+    curr.execute(statement, **kwargs)
+    return curr
+
+
+def test_key_excludes_volatile_queries():
+    assert _PlanCache.key("SELECT NOW()", [], [], None, None) is None
+    assert _PlanCache.key("SELECT @var", [], [], None, None) is None
+    one = _PlanCache.key("SELECT * FROM t WHERE a = ?", [], [1], None, ["opteryx"])
+    two = _PlanCache.key("SELECT * FROM t WHERE a = ?", [], [2], None, ["opteryx"])
+    assert one is not None
+    assert one != two
+    assert one == _PlanCache.key("SELECT * FROM t WHERE a = ?", [], [1], None, ["opteryx"])
+
+
+def test_plan_cache_hits_for_repeated_queries():
+    planner.ENABLE_PLAN_CACHE = True
+    try:
+        statement = "SELECT name FROM $planets WHERE id > :id ORDER BY name"
+        first = _run(statement, params={"id": 3})
+        second = _run(statement, params={"id": 3})
+        third = _run(statement, params={"id": 4})
+        assert first.stats.get("plan_cache_hits", 0) == 0
+        assert second.stats.get("plan_cache_hits", 0) == 1, second.stats
+        assert third.stats.get("plan_cache_hits", 0) == 0
+        assert first.arrow().column(0).to_pylist() == second.arrow().column(0).to_pylist()
+        assert third.rowcount == 5
+    finally:
+        planner.ENABLE_PLAN_CACHE = False
+
+
+def test_plan_cache_checks_permissions():
+    planner.ENABLE_PLAN_CACHE = True
+    try:
+        statement = "SELECT COUNT(*) FROM $satellites"
+        _run(statement)
+        conn = opteryx.connect(permissions={"Analyze"})
+        curr = conn.cursor()
+        try:
+            curr.execute(statement)
+            assert False, "expected a permissions error"
+        except opteryx.exceptions.PermissionsError:
+            pass
+    finally:
+        planner.ENABLE_PLAN_CACHE = False
+
+
+def test_plan_cache_invalidated_when_schema_changes():
+    folder = tempfile.mkdtemp(dir=".")
+    dataset = os.path.basename(folder)
+    planner.ENABLE_PLAN_CACHE = True
+    try:
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pydict({"value": [1, 2, 3]}), f"{folder}/data.parquet"
+        )
+        statement = f"SELECT * FROM {dataset}"
+        assert _run(statement).shape == (3, 1)
+        assert _run(statement).stats.get("plan_cache_hits", 0) == 1
+
+        # replace the data with data with a different schema
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pydict({"value": [1, 2], "name": ["a", "b"]}),
+            f"{folder}/new_data.parquet",
+        )
+        os.remove(f"{folder}/data.parquet")
+        third = _run(statement)
+        assert third.stats.get("plan_cache_hits", 0) == 0
+        assert third.shape == (2, 2)
+    finally:
+        planner.ENABLE_PLAN_CACHE = False
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
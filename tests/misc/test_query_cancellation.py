@@ -0,0 +1,107 @@
+"""
+Test reads stop when the rest of the dataset isn't needed, because a LIMIT has been
+satisfied, a semi join can't match or the cursor was closed before the results were read
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import shutil
+import tempfile
+import threading
+import time
+
+import opteryx
+from opteryx.connectors import disk_connector
+
+SOURCE = "testdata/flat/ten_files/tweets-0000 copy 1.jsonl"
+BLOBS = 40
+
+
+def _counting_slow_reads(statement, action):
+    # a new dataset each time, so nothing is read from the caches
+    folder = tempfile.mkdtemp(dir=".")
+    for i in range(BLOBS):
+        shutil.copy(SOURCE, os.path.join(folder, f"tweets-{i:02}.jsonl"))
+    statement = statement.format(dataset=os.path.basename(folder))
+
+    started = set()
+    lock = threading.Lock()
+    real_read = disk_connector.read_local_file
+
+    def slow_read(file_name, **kwargs):
+        with lock:
+            started.add(file_name)
+        time.sleep(0.2)
+        return real_read(file_name, **kwargs)
+
+    disk_connector.read_local_file = slow_read
+    try:
+        cur = opteryx.query(statement)
+        result = action(cur)
+        # give any reads which weren't cancelled time to start
+        time.sleep(0.5)
+    finally:
+        disk_connector.read_local_file = real_read
+        shutil.rmtree(folder)
+    return cur, result, len(started)
+
+
+def test_limit_cancels_reads():
+    cur, num_rows, started = _counting_slow_reads(
+        "SELECT * FROM {dataset} LIMIT 3", lambda cur: cur.arrow().num_rows
+    )
+    assert num_rows == 3
+    assert started < BLOBS, started
+    assert cur.stats["cancelled_scans"] == 1, cur.stats
+
+
+def test_closing_cursor_cancels_reads():
+    cur, _, started = _counting_slow_reads("SELECT * FROM {dataset}", lambda cur: cur.close())
+    assert started < BLOBS, started
+    assert cur.stats["cancelled_scans"] == 1, cur.stats
+
+
+def test_semi_join_with_nothing_to_match_cancels_reads():
+    cur, num_rows, started = _counting_slow_reads(
+        "SELECT * FROM {dataset} AS t LEFT SEMI JOIN (SELECT * FROM $satellites WHERE id < 0) AS s ON t.username = s.name",
+        lambda cur: cur.arrow().num_rows,
+    )
+    assert num_rows == 0
+    assert started < BLOBS, started
+
+
+def test_semi_join_with_nothing_on_either_side():
+    import pyarrow
+
+    from opteryx.operators.outer_join_node import left_semi_join
+
+    class Relation:
+        def __init__(self, *morsels):
+            self.morsels = morsels
+
+        def execute(self):
+            yield from self.morsels
+
+    empty = pyarrow.table({"id": pyarrow.array([], pyarrow.int64())})
+    # the left side may not produce any morsels
+    assert list(left_semi_join(Relation(), Relation(empty), ["id"], ["id"])) == []
+    morsels = list(left_semi_join(Relation(empty), Relation(empty), ["id"], ["id"]))
+    assert [morsel.num_rows for morsel in morsels] == [0]
+
+
+def test_reading_everything_isnt_cancelled():
+    cur, num_rows, started = _counting_slow_reads(
+        "SELECT * FROM {dataset}", lambda cur: cur.arrow().num_rows
+    )
+    assert num_rows == 25 * BLOBS
+    assert started == BLOBS, started
+    assert "cancelled_scans" not in cur.stats, cur.stats
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
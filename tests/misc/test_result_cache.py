@@ -0,0 +1,86 @@
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import pyarrow
+import pyarrow.parquet
+
+import opteryx
+from opteryx import cursor
+
+
+def _run(statement, **kwargs):
+    conn = opteryx.connect()
+    curr = conn.cursor()
+    curr.execute(statement, **kwargs)
+    return curr
+
+
+def test_result_cache_hits_for_repeated_queries():
+    cursor.ENABLE_QUERY_RESULT_CACHE = True
+    try:
+        statement = "SELECT name FROM $planets WHERE id > 3 ORDER BY name"
+        first = _run(statement)
+        # results are only cached once they have been fully read
+        first_names = first.arrow().column(0).to_pylist()
+        second = _run(statement)
+        assert first.stats.get("result_cache_hits", 0) == 0
+        assert second.stats.get("result_cache_hits", 0) == 1, second.stats
+        assert first_names == second.arrow().column(0).to_pylist()
+
+        # different parameters are different entries
+        statement = "SELECT name FROM $planets WHERE id > :id"
+        third = _run(statement, params={"id": 3})
+        assert third.rowcount == 6
+        fourth = _run(statement, params={"id": 4})
+        assert fourth.stats.get("result_cache_hits", 0) == 0
+        assert fourth.rowcount == 5
+    finally:
+        cursor.ENABLE_QUERY_RESULT_CACHE = False
+
+
+def test_result_cache_skips_volatile_queries():
+    cursor.ENABLE_QUERY_RESULT_CACHE = True
+    try:
+        statement = "SELECT RANDOM() FROM $planets"
+        _run(statement)
+        second = _run(statement)
+        assert second.stats.get("result_cache_hits", 0) == 0
+    finally:
+        cursor.ENABLE_QUERY_RESULT_CACHE = False
+
+
+def test_result_cache_invalidated_when_data_changes():
+    folder = tempfile.mkdtemp(dir=".")
+    dataset = os.path.basename(folder)
+    cursor.ENABLE_QUERY_RESULT_CACHE = True
+    try:
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pydict({"value": [1, 2, 3]}), f"{folder}/data.parquet"
+        )
+        statement = f"SELECT SUM(value) FROM {dataset}"
+        assert _run(statement).fetchall()[0][0] == 6
+        second = _run(statement)
+        assert second.stats.get("result_cache_hits", 0) == 1
+        assert second.fetchall()[0][0] == 6
+
+        # replace the data in the dataset
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pydict({"value": [1, 2, 3, 4]}), f"{folder}/more_data.parquet"
+        )
+        os.remove(f"{folder}/data.parquet")
+        third = _run(statement)
+        assert third.stats.get("result_cache_hits", 0) == 0
+        assert third.fetchall()[0][0] == 10
+    finally:
+        cursor.ENABLE_QUERY_RESULT_CACHE = False
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
@@ -0,0 +1,103 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import sqlite3
+import tempfile
+
+import pyarrow
+
+import opteryx
+from opteryx.connectors import SqlConnector
+
+opteryx.register_store(
+    "sqlite",
+    SqlConnector,
+    remove_prefix=True,
+    connection="sqlite:///testdata/sqlite/database.db",
+)
+
+# fmt:off
+STATEMENTS = [
+    ("SELECT name FROM {table} LIMIT 3", "optimization_limit_pushdown"),
+    ("SELECT name FROM {table} WHERE planetId = 5 LIMIT 3", "optimization_limit_pushdown"),
+    ("SELECT name FROM {table} ORDER BY gm DESC LIMIT 5", "optimization_top_n_pushdown"),
+    ("SELECT name, id FROM {table} ORDER BY name LIMIT 3 OFFSET 2", "optimization_top_n_pushdown"),
+    ("SELECT name FROM {table} ORDER BY planetId DESC, name LIMIT 10", "optimization_top_n_pushdown"),
+    ("SELECT COUNT(*) FROM {table}", "optimization_aggregate_pushdown"),
+    ("SELECT COUNT(*), SUM(radius)::INTEGER, MIN(gm), MAX(name) FROM {table}", "optimization_aggregate_pushdown"),
+    ("SELECT MAX(gm) FROM {table} WHERE planetId = 99", "optimization_aggregate_pushdown"),
+    ("SELECT planetId, COUNT(*), MAX(gm), AVG(radius) FROM {table} GROUP BY planetId ORDER BY planetId", "optimization_aggregate_pushdown"),
+    ("SELECT planetId, COUNT(*) FROM {table} GROUP BY planetId HAVING COUNT(*) > 10 ORDER BY planetId", "optimization_aggregate_pushdown"),
+    ("SELECT planetId, COUNT(*) FROM {table} GROUP BY planetId ORDER BY COUNT(*) DESC LIMIT 2", "optimization_aggregate_pushdown"),
+    # these can't be pushed
+    ("SELECT name FROM {table} ORDER BY LENGTH(name), name LIMIT 3", None),
+    ("SELECT COUNT(*) FROM {table} WHERE LENGTH(name) > 5", None),
+    ("SELECT planetId, MAX(LENGTH(name)) FROM {table} GROUP BY planetId ORDER BY planetId", None),
+]
+# fmt:on
+
+
+@pytest.mark.parametrize("statement, flag", STATEMENTS)
+def test_sql_limit_and_aggregate_pushdown(statement, flag):
+    pushed = opteryx.query(statement.format(table="sqlite.satellites"))
+    rows = pushed.fetchall()
+    stats = pushed.stats
+    # the results match the same query against the in-memory dataset
+    assert rows == opteryx.query(statement.format(table="$satellites")).fetchall()
+    if flag is None:
+        assert not any(
+            stats.get(f"optimization_{name}_pushdown") for name in ("limit", "top_n", "aggregate")
+        ), stats
+    else:
+        assert stats.get(flag), stats
+
+
+def test_sql_limit_pushdown_reads_fewer_rows():
+    pushed = opteryx.query("SELECT name FROM sqlite.satellites LIMIT 3")
+    pushed.materialize()
+    assert pushed.stats["rows_read"] == 3, pushed.stats
+
+    pushed = opteryx.query("SELECT planetId, COUNT(*) FROM sqlite.satellites GROUP BY planetId")
+    pushed.materialize()
+    assert pushed.stats["rows_read"] == 7, pushed.stats
+
+
+def test_sql_top_n_pushdown_orders_nulls_last():
+    rows = [(i, None if i % 10 == 0 else i * 1.5) for i in range(1, 1001)]
+    path = os.path.join(tempfile.mkdtemp(), "nulls.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v DOUBLE)")
+    conn.executemany("INSERT INTO t VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+    opteryx.register_store(
+        "sqlite_nulls", SqlConnector, remove_prefix=True, connection=f"sqlite:///{path}"
+    )
+    opteryx.register_arrow(
+        "memory_nulls",
+        pyarrow.table({"id": [r[0] for r in rows], "v": [r[1] for r in rows]}),
+    )
+
+    # Opteryx puts nulls last whichever the direction
+    for statement in (
+        "SELECT id, v FROM {table} ORDER BY v DESC LIMIT 3",
+        "SELECT id, v FROM {table} ORDER BY v LIMIT 3",
+        "SELECT id, v FROM {table} ORDER BY v DESC LIMIT 5 OFFSET 898",
+        "SELECT id, v FROM {table} ORDER BY v LIMIT 5 OFFSET 898",
+    ):
+        pushed = opteryx.query(statement.format(table="sqlite_nulls.t"))
+        assert (
+            pushed.fetchall() == opteryx.query(statement.format(table="memory_nulls")).fetchall()
+        ), statement
+        assert pushed.stats.get("optimization_top_n_pushdown"), pushed.stats
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
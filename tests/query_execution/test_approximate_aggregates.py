@@ -0,0 +1,189 @@
+"""
+Test the approximate aggregates, these are estimated from sketches which are a fixed size
+and can be merged, so the values aren't held in memory
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import pickle
+from collections import Counter
+
+import numpy
+import pyarrow
+
+import opteryx
+from opteryx.compiled.structures import CountMinSketch
+from opteryx.compiled.structures import GroupedCountMinSketch
+from opteryx.compiled.structures import GroupedHyperLogLog
+from opteryx.compiled.structures import GroupedKLLSketch
+from opteryx.compiled.structures import HyperLogLog
+from opteryx.compiled.structures import KLLSketch
+
+
+def test_hyperloglog():
+    sketch = HyperLogLog()
+    sketch.update(pyarrow.array([]))
+    assert sketch.estimate() == 0
+
+    values = numpy.random.default_rng(1).integers(0, 2**40, 200_000)
+    for chunk in numpy.array_split(values, 10):
+        sketch.update(pyarrow.array(chunk))
+    assert abs(sketch.estimate() - len(numpy.unique(values))) / 200_000 < 0.05
+
+    # nulls aren't counted, duplicates aren't counted twice
+    small = HyperLogLog()
+    small.update(pyarrow.array(["a", "b", None, "a", "c", None]))
+    assert small.estimate() == 3
+
+    # merged sketches count the union
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(pyarrow.array([f"user-{i}" for i in range(0, 60_000)]))
+    right.update(pyarrow.array([f"user-{i}" for i in range(30_000, 90_000)]))
+    left.merge(right)
+    assert abs(left.estimate() - 90_000) / 90_000 < 0.05
+    assert pickle.loads(pickle.dumps(left)).estimate() == left.estimate()
+
+
+def test_kll_sketch():
+    values = numpy.random.default_rng(2).normal(size=500_000)
+    sketch = KLLSketch()
+    for chunk in numpy.array_split(values, 10):
+        sketch.update(pyarrow.array(chunk))
+    assert sketch.count == 500_000
+    for quantile in (0.01, 0.25, 0.5, 0.75, 0.99):
+        rank = (values < sketch.quantile(quantile)).mean()
+        assert abs(rank - quantile) < 0.02, (quantile, rank)
+
+    # small inputs are exact, nulls and NaNs are ignored
+    small = KLLSketch()
+    assert small.quantile(0.5) is None
+    small.update(pyarrow.array([4, 1, None, 3, 2, float("nan")]))
+    assert [small.quantile(q) for q in (0, 0.5, 1)] == [1, 2, 4]
+
+    restored = pickle.loads(pickle.dumps(sketch))
+    restored.merge(sketch)
+    assert restored.count == 1_000_000
+    assert abs(restored.quantile(0.5) - sketch.quantile(0.5)) < 0.05
+
+
+def test_count_min_sketch():
+    values = numpy.random.default_rng(3).zipf(1.5, 200_000)
+    sketch = CountMinSketch(capacity=32)
+    for chunk in numpy.array_split(values, 20):
+        sketch.update(pyarrow.array(chunk))
+    expected = [value for value, _ in Counter(values.tolist()).most_common(5)]
+    assert sketch.most_frequent(5) == expected
+
+    left, right = CountMinSketch(), CountMinSketch()
+    left.update(pyarrow.array(["a", "b", "b", None]))
+    right.update(pyarrow.array(["c", "c", "b", "b"]))
+    left.merge(right)
+    assert left.most_frequent(2) == ["b", "c"]
+    assert pickle.loads(pickle.dumps(left)).most_frequent(3) == ["b", "c", "a"]
+
+
+def test_grouped_sketches():
+    # group 0 has many distinct values, the rest have a few
+    rng = numpy.random.default_rng(4)
+    groups = numpy.concatenate([numpy.zeros(50_000), rng.integers(1, 1_000, 50_000)])
+    groups = groups.astype(numpy.int64)
+    values = numpy.concatenate([rng.integers(0, 2**40, 50_000), rng.integers(0, 5, 50_000)])
+    group_ids = numpy.arange(1_001, dtype=numpy.int64)
+
+    distinct = GroupedHyperLogLog()
+    percentiles = GroupedKLLSketch()
+    frequent = GroupedCountMinSketch(capacity=8)
+    for chunk in numpy.array_split(numpy.arange(100_000), 10):
+        column = pyarrow.array(values[chunk])
+        distinct.update(column, groups[chunk], 1_000)
+        percentiles.update(column, groups[chunk], 1_000)
+        frequent.update(column, groups[chunk], 1_000)
+
+    estimates = distinct.estimates(group_ids)
+    medians = percentiles.quantiles(group_ids, 0.5)
+    most_frequent = frequent.most_frequent(group_ids, 2)
+    for group in range(1_000):
+        group_values = values[groups == group]
+        # small groups are exact
+        if group > 0:
+            assert estimates[group] == len(numpy.unique(group_values))
+            assert medians[group] == numpy.sort(group_values)[(len(group_values) - 1) // 2]
+            counts = Counter(group_values.tolist())
+            expected = [count for _, count in counts.most_common(2)]
+            assert [counts[value] for value in most_frequent[group]] == expected
+    assert abs(estimates[0] - 50_000) / 50_000 < 0.05
+    assert abs((values[groups == 0] < medians[0]).mean() - 0.5) < 0.02
+    # groups which haven't been seen
+    assert estimates[1_000] == 0
+    assert medians[1_000] is None
+    assert most_frequent[1_000] == []
+
+    # the values which stand out are found in a group with many values
+    frequent = GroupedCountMinSketch(capacity=8)
+    column = numpy.concatenate([numpy.arange(10_000), numpy.full(500, 7), numpy.full(300, 3)])
+    frequent.update(pyarrow.array(column), numpy.zeros(column.size, dtype=numpy.int64), 1)
+    assert frequent.most_frequent(numpy.zeros(1, dtype=numpy.int64), 2) == [[7, 3]]
+
+
+def test_approximate_aggregates():
+    satellites = opteryx.query("SELECT name, planetId, radius FROM $satellites").arrow()
+    planets = Counter(satellites.column("planetId").to_pylist())
+
+    result = opteryx.query(
+        "SELECT APPROX_COUNT_DISTINCT(name) AS names, APPROX_TOP_K(planetId, 3) AS top, "
+        "APPROX_MOST_FREQUENT(planetId) AS most, APPROX_PERCENTILE(radius, 1) AS biggest, "
+        "COUNT(*) AS count FROM $satellites"
+    ).arrow()
+    row = result.to_pylist()[0]
+    assert abs(row["names"] - 177) <= 3
+    assert row["top"] == [p for p, _ in planets.most_common(3)]
+    assert row["most"] == planets.most_common(1)[0][0]
+    assert row["biggest"] == max(satellites.column("radius").to_pylist())
+    assert row["count"] == 177
+
+
+def test_approximate_aggregates_with_groups():
+    satellites = opteryx.query("SELECT name, planetId FROM $satellites").arrow().to_pylist()
+    expected = Counter(s["planetId"] for s in satellites)
+
+    for statement in (
+        "SELECT planetId, APPROX_COUNT_DISTINCT(name) AS c FROM $satellites GROUP BY planetId",
+        "SELECT planetId, APPROX_COUNT_DISTINCT(name) AS c, MAX(id) FROM $satellites GROUP BY planetId",
+    ):
+        result = opteryx.query(statement).arrow().to_pylist()
+        assert {row["planetId"]: row["c"] for row in result} == dict(expected), statement
+
+
+def test_approximate_aggregates_with_many_groups():
+    rng = numpy.random.default_rng(5)
+    table = pyarrow.table(
+        {"g": rng.integers(0, 20_000, 100_000), "v": rng.integers(0, 10, 100_000)}
+    )
+    opteryx.register_arrow("many_groups", table)
+
+    exact = {
+        row["g"]: row
+        for row in opteryx.query(
+            "SELECT g, COUNT_DISTINCT(v) AS d, MAX(v) AS m FROM many_groups GROUP BY g"
+        )
+        .arrow()
+        .to_pylist()
+    }
+    result = opteryx.query(
+        "SELECT g, APPROX_COUNT_DISTINCT(v) AS d, APPROX_PERCENTILE(v, 1) AS m, "
+        "APPROX_TOP_K(v, 2) AS top FROM many_groups GROUP BY g"
+    ).arrow()
+    assert result.num_rows == len(exact)
+    for row in result.to_pylist():
+        assert row["d"] == exact[row["g"]]["d"]
+        assert row["m"] == exact[row["g"]]["m"]
+        assert 1 <= len(row["top"]) <= 2
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
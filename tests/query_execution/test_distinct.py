@@ -0,0 +1,135 @@
+"""
+Test the DISTINCT kernel compares the values of rows, so rows with matching hashes
+aren't removed as duplicates
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import numpy
+import pyarrow
+import pytest
+
+import opteryx
+from opteryx.compiled.structures import DistinctSet
+from opteryx.compiled.structures import distinct
+from opteryx.compiled.structures import list_distinct
+
+
+def _distinct_rows(table, columns=None):
+    keep, _ = distinct(table, columns=columns)
+    return table.take(keep).to_pylist()
+
+
+def test_distinct_hash_collisions():
+    # hash(-1) == hash(-2) in Python
+    assert hash(-1) == hash(-2)
+    table = pyarrow.table({"a": [-1, -2, -1, -2]})
+    assert _distinct_rows(table) == [{"a": -1}, {"a": -2}]
+
+    # (0, 31) and (1, 0) have the same hash if combined as h1 * 31 + h2
+    table = pyarrow.table({"a": [0, 1, 0], "b": [31, 0, 31]})
+    assert _distinct_rows(table) == [{"a": 0, "b": 31}, {"a": 1, "b": 0}]
+
+    # the values of the columns aren't run together
+    table = pyarrow.table({"a": ["ab", "a", "ab"], "b": ["c", "bc", "c"]})
+    assert len(_distinct_rows(table)) == 2
+
+
+# fmt:off
+COLUMNS = [
+    (pyarrow.array([1, 1, None, None, 2]), [0, 2, 4]),
+    (pyarrow.array([0.0, -0.0, float("nan"), float("nan"), None]), [0, 2, 4]),
+    (pyarrow.array(["x", "x", None, "", ""]), [0, 2, 3]),
+    (pyarrow.array([True, None, False, True, None]), [0, 1, 2]),
+    (pyarrow.array([1, 1, 2, None], pyarrow.date32()), [0, 2, 3]),
+    (pyarrow.array([1, 2, 1], pyarrow.timestamp("us")), [0, 1]),
+    (pyarrow.array([2**64 - 1, 2**64 - 1, 1], pyarrow.uint64()), [0, 2]),
+    (pyarrow.array(["a", "b", "a"]).dictionary_encode(), [0, 1]),
+    (pyarrow.array([[1, 2], [1, 2], [2, 1], None]), [0, 2, 3]),
+    (pyarrow.array([{"a": 1}, {"a": 1}, {"a": 2}]), [0, 2]),
+    (pyarrow.array([None, None], pyarrow.null()), [0]),
+]
+# fmt:on
+
+
+@pytest.mark.parametrize("column, expected", COLUMNS)
+def test_distinct_types(column, expected):
+    keep, _ = distinct(pyarrow.table({"a": column}))
+    assert keep.tolist() == expected
+    # sliced columns
+    keep, _ = distinct(pyarrow.table({"a": column.slice(1)}))
+    assert keep.tolist() == distinct(pyarrow.table({"a": column[1:]}))[0].tolist()
+
+
+def test_distinct_across_morsels():
+    seen = DistinctSet()
+    table = pyarrow.table({"a": [1, 2, None, 1], "b": ["x", None, "y", "x"]})
+    keep, seen = distinct(table, seen=seen)
+    assert keep.tolist() == [0, 1, 2]
+    keep, seen = distinct(table, seen=seen)
+    assert keep.tolist() == []
+    keep, seen = distinct(pyarrow.table({"a": [2, 3], "b": ["x", None]}), seen=seen)
+    assert keep.tolist() == [0, 1]
+    assert len(seen) == 5
+
+    # the DISTINCT ON columns
+    keep, _ = distinct(table, columns=["b"])
+    assert keep.tolist() == [0, 1, 2]
+
+
+def test_list_distinct():
+    values = pyarrow.array(["a", "b", "a", None, None, "c"])
+    indices = numpy.array([0, 0, 1, 1, 2, 2], dtype=numpy.int64)
+    values, indices, seen = list_distinct(values, indices)
+    assert values.to_pylist() == ["a", "b", None, "c"]
+    assert indices.tolist() == [0, 0, 1, 2]
+
+    values, indices, _ = list_distinct(pyarrow.array(["c", "d"]), numpy.array([3, 4]), seen)
+    assert values.to_pylist() == ["d"]
+    assert indices.tolist() == [4]
+
+
+def test_distinct_queries():
+    names = opteryx.query("SELECT name FROM $astronauts").arrow().column("name").to_pylist()
+    assert opteryx.query("SELECT DISTINCT name FROM $astronauts").rowcount == len(set(names))
+
+    missions = opteryx.query("SELECT missions FROM $astronauts").arrow().column(0).to_pylist()
+    expected = {m for ms in missions if ms for m in ms}
+    cur = opteryx.query(
+        "SELECT DISTINCT mission FROM $astronauts CROSS JOIN UNNEST(missions) AS mission"
+    )
+    assert set(cur.arrow().column(0).to_pylist()) == expected
+    assert cur.rowcount == len(expected)
+
+
+def test_distinct_columns_are_kept_in_subqueries():
+    # the outer query doesn't reference the columns, but DISTINCT still needs them
+    satellites = opteryx.query("SELECT planetId, radius FROM $satellites").arrow().to_pylist()
+    planets = {s["planetId"] for s in satellites}
+    pairs = {(s["planetId"], s["radius"]) for s in satellites}
+
+    for statement, expected in (
+        ("SELECT COUNT(*) FROM (SELECT DISTINCT planetId FROM $satellites) AS x", len(planets)),
+        (
+            "SELECT COUNT(*) FROM (SELECT DISTINCT planetId, radius FROM $satellites) AS x",
+            len(pairs),
+        ),
+        (
+            "SELECT COUNT(*) FROM (SELECT DISTINCT planetId FROM $satellites) AS x WHERE planetId > 5",
+            len({p for p in planets if p > 5}),
+        ),
+        (
+            "SELECT COUNT(*) FROM (SELECT DISTINCT ON (planetId) planetId, name FROM $satellites) AS x",
+            len(planets),
+        ),
+    ):
+        assert opteryx.query(statement).fetchone() == (expected,), statement
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
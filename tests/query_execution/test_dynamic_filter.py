@@ -0,0 +1,105 @@
+"""
+Test the Heap Sort's threshold is used by the scans to discard rows and skip parquet row
+groups which can't be in the result of an ORDER BY ... LIMIT
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import shutil
+import tempfile
+
+import pyarrow
+import pyarrow.parquet
+import pytest
+
+import opteryx
+from opteryx.models import DynamicFilter
+
+FILES = 10
+ROWS_PER_FILE = 1000
+ROWS_PER_GROUP = 100
+
+
+@pytest.fixture(scope="module")
+def time_sorted_dataset():
+    # a new dataset, so nothing is read from the caches
+    folder = tempfile.mkdtemp(dir=".")
+    for i in range(FILES):
+        ts = list(range(i * ROWS_PER_FILE, (i + 1) * ROWS_PER_FILE))
+        table = pyarrow.table({"ts": ts, "value": [str(t) for t in ts]})
+        pyarrow.parquet.write_table(
+            table, os.path.join(folder, f"events-{i:02}.parquet"), row_group_size=ROWS_PER_GROUP
+        )
+    yield os.path.basename(folder)
+    shutil.rmtree(folder)
+
+
+@pytest.mark.parametrize(
+    "order, limit",
+    [("ts DESC", 50), ("ts", 50), ("ts DESC, value", 250), ("value DESC", 20)],
+)
+def test_dynamic_filter_matches_sort(time_sorted_dataset, order, limit):
+    statement = f"SELECT ts, value FROM {time_sorted_dataset} ORDER BY {order}"
+    expected = opteryx.query(statement).arrow().slice(0, limit)
+    cur = opteryx.query(f"{statement} LIMIT {limit}")
+    assert cur.arrow().to_pylist() == expected.to_pylist()
+    assert cur.stats["optimization_fuse_operators_heap_sort"] == 1, cur.stats
+
+
+def test_dynamic_filter_skips_row_groups(time_sorted_dataset):
+    cur = opteryx.query(f"SELECT * FROM {time_sorted_dataset} ORDER BY ts DESC LIMIT 50")
+    result = cur.arrow()
+    assert result.column("ts").to_pylist() == list(range(9999, 9949, -1))
+
+    # the last files are read first, once the heap is full only the row groups which
+    # could hold rows in the result are decoded (a few files are read at a time, so
+    # the files may not be decoded in the reverse order)
+    assert cur.stats["rows_seen"] == FILES * ROWS_PER_FILE, cur.stats
+    assert cur.stats["rows_read"] <= FILES * ROWS_PER_FILE // 2, cur.stats
+
+
+def test_dynamic_filter_with_a_filter(time_sorted_dataset):
+    cur = opteryx.query(
+        f"SELECT ts FROM {time_sorted_dataset} WHERE value LIKE '%7' ORDER BY ts DESC LIMIT 5"
+    )
+    assert cur.arrow().column("ts").to_pylist() == [9997, 9987, 9977, 9967, 9957]
+    assert cur.stats["rows_read"] < ROWS_PER_FILE * FILES, cur.stats
+
+
+def test_dynamic_filter_not_connected_through_aggregates(time_sorted_dataset):
+    cur = opteryx.query(
+        f"SELECT MAX(ts) AS ts FROM {time_sorted_dataset} GROUP BY value ORDER BY ts DESC LIMIT 3"
+    )
+    assert cur.arrow().column("ts").to_pylist() == [9999, 9998, 9997]
+    assert "rows_removed_by_dynamic_filter" not in cur.stats, cur.stats
+
+
+def test_dynamic_filter_apply():
+    table = pyarrow.table({"ts": [5, None, 1, 3, 4]})
+
+    ascending = DynamicFilter("ts", "source_ts", "ascending")
+    # no threshold, nothing is discarded
+    assert ascending.apply(table) == table
+    assert ascending.to_dnf() is None
+
+    ascending.update(pyarrow.scalar(3))
+    assert ascending.apply(table).column("ts").to_pylist() == [1, 3]
+    assert ascending.to_dnf() == ("source_ts", "<=", 3)
+
+    descending = DynamicFilter("ts", "source_ts", "descending")
+    descending.update(pyarrow.scalar(4))
+    assert descending.apply(table).column("ts").to_pylist() == [5, 4]
+    assert descending.to_dnf() == ("source_ts", ">=", 4)
+
+    # morsels without the column are untouched
+    other = pyarrow.table({"other": [1, 2]})
+    assert descending.apply(other) == other
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
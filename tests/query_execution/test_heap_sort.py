@@ -0,0 +1,100 @@
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import math
+from types import SimpleNamespace
+
+import pyarrow
+import pytest
+
+import opteryx
+from opteryx.models import QueryProperties
+from opteryx.operators import HeapSortNode
+
+# fmt:off
+STATEMENTS = [
+    ("$planets", "name DESC", 3),
+    ("$satellites", "planetId DESC, name DESC", 10),
+    ("$satellites", "planetId DESC, gm", 10),
+    ("$satellites", "magnitude DESC", 50),
+    ("$astronauts", "death_date DESC, name", 30),
+    ("$astronauts", "death_date, name", 300),
+    ("$astronauts", "year DESC, name DESC", 40),
+    ("$astronauts", "year DESC, name DESC", 1000),
+    ("testdata.flat.ten_files", "followers DESC", 7),
+    ("testdata.flat.ten_files", "username, followers DESC", 70),
+    ("testdata.flat.ten_files", "location DESC", 70),
+]
+# fmt:on
+
+
+@pytest.mark.parametrize("dataset, order, limit", STATEMENTS)
+def test_heap_sort_matches_sort(dataset, order, limit):
+    columns = ", ".join(column.split(" ")[0] for column in order.split(", "))
+    cur = opteryx.query(f"SELECT {columns} FROM {dataset} ORDER BY {order} LIMIT {limit}")
+    heap_sorted = cur.arrow()
+    assert cur.stats["optimization_fuse_operators_heap_sort"] == 1, cur.stats
+    sorted_ = opteryx.query(f"SELECT {columns} FROM {dataset} ORDER BY {order}").arrow()
+    assert heap_sorted.to_pylist() == sorted_.slice(0, limit).to_pylist()
+
+
+class _Producer:
+    def __init__(self, morsels):
+        self.morsels = morsels
+
+    def execute(self):
+        yield from self.morsels
+
+
+def _heap_sort(morsels, direction, limit):
+    column = SimpleNamespace(value="ts", schema_column=SimpleNamespace(identity="ts"))
+    node = HeapSortNode(
+        QueryProperties(qid="heap-sort", variables={}),
+        order_by=[(column, direction)],
+        limit=limit,
+    )
+    node.set_producers([_Producer(morsels)])
+    return next(node.execute()), node
+
+
+def test_heap_sort_skips_morsels_which_cant_improve():
+    morsels = [
+        pyarrow.table({"ts": list(range(start, start + 100)), "value": [start] * 100})
+        for start in (500, 0, 300, 200, 400, 100)
+    ]
+
+    result, node = _heap_sort(morsels, "ascending", 5)
+    assert result.column("ts").to_pylist() == [0, 1, 2, 3, 4]
+    assert result.column("value").to_pylist() == [0] * 5
+    # once the morsel starting at 0 is seen, the rest can't improve
+    assert node.statistics.heap_sort_morsels_skipped == 4
+    assert node.threshold.as_py() == 4
+
+    result, node = _heap_sort(morsels, "descending", 3)
+    assert result.column("ts").to_pylist() == [599, 598, 597]
+
+
+def test_heap_sort_nulls_are_last():
+    morsels = [
+        pyarrow.table({"ts": [None, 3.0, float("nan")]}),
+        pyarrow.table({"ts": [None, 1.0, None]}),
+    ]
+    result, node = _heap_sort(morsels, "ascending", 4)
+    values = result.column("ts").to_pylist()
+    # as when sorting, NaNs are before nulls
+    assert values[:2] == [1.0, 3.0]
+    assert math.isnan(values[2])
+    assert values[3] is None
+    # we're holding NaNs or nulls, so we can't skip anything
+    assert node.threshold is None
+
+    result, _ = _heap_sort(morsels, "descending", 2)
+    assert result.column("ts").to_pylist() == [3.0, 1.0]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
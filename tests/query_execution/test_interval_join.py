@@ -0,0 +1,138 @@
+"""
+Test joins on ranges are run as interval joins, these sort the points and search for
+the ranges rather than testing every pair of rows
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import numpy
+import pyarrow
+import pytest
+
+import opteryx
+from opteryx.exceptions import UnsupportedSyntaxError
+from opteryx.operators.interval_join_node import IntervalBounds
+from opteryx.operators.interval_join_node import _find_ranges
+from opteryx.operators.interval_join_node import _interval_pairs
+from opteryx.operators.interval_join_node import _sort_points
+from opteryx.operators.interval_join_node import _to_numpy
+
+
+def _planets_and_satellites(test):
+    planets = opteryx.query("SELECT id, numberOfMoons FROM $planets").arrow().to_pylist()
+    satellites = opteryx.query("SELECT id, gm, radius FROM $satellites").arrow().to_pylist()
+    return sorted((p["id"], s["id"]) for p in planets for s in satellites if test(p, s))
+
+
+def _astronauts(test):
+    astronauts = (
+        opteryx.query("SELECT name, birth_date, death_date FROM $astronauts").arrow().to_pylist()
+    )
+    return sorted(
+        (a["name"], b["name"])
+        for a in astronauts
+        for b in astronauts
+        if all(v is not None for v in (a["birth_date"], b["birth_date"], b["death_date"]))
+        and test(a, b)
+    )
+
+
+# fmt:off
+STATEMENTS = [
+    (
+        "SELECT p.id, s.id FROM $planets AS p INNER JOIN $satellites AS s ON s.id BETWEEN p.id AND p.numberOfMoons",
+        lambda: _planets_and_satellites(lambda p, s: p["id"] <= s["id"] <= p["numberOfMoons"]),
+    ),
+    (
+        "SELECT p.id, s.id FROM $planets AS p INNER JOIN $satellites AS s ON s.id >= p.id AND s.id < p.numberOfMoons",
+        lambda: _planets_and_satellites(lambda p, s: p["id"] <= s["id"] < p["numberOfMoons"]),
+    ),
+    (
+        "SELECT p.id, s.id FROM $planets AS p INNER JOIN $satellites AS s ON p.id > s.id AND p.numberOfMoons <= s.id",
+        lambda: _planets_and_satellites(lambda p, s: p["numberOfMoons"] <= s["id"] < p["id"]),
+    ),
+    (
+        # a bound which isn't a column is tested on the pairs in the range
+        "SELECT p.id, s.id FROM $planets AS p INNER JOIN $satellites AS s ON p.id BETWEEN s.id AND s.id + 2",
+        lambda: _planets_and_satellites(lambda p, s: s["id"] <= p["id"] <= s["id"] + 2),
+    ),
+    (
+        # the rest of the condition is tested on the pairs in the ranges
+        "SELECT p.id, s.id FROM $planets AS p INNER JOIN $satellites AS s ON s.radius BETWEEN p.id AND p.numberOfMoons AND s.gm > 1",
+        lambda: _planets_and_satellites(lambda p, s: p["id"] <= s["radius"] <= p["numberOfMoons"] and s["gm"] > 1),
+    ),
+    (
+        "SELECT p.id, s.id FROM $planets AS p CROSS JOIN $satellites AS s WHERE s.id > p.id AND s.id <= p.numberOfMoons",
+        lambda: _planets_and_satellites(lambda p, s: p["id"] < s["id"] <= p["numberOfMoons"]),
+    ),
+    (
+        # dates, with nulls in the ranges
+        "SELECT a.name, b.name FROM $astronauts AS a INNER JOIN $astronauts AS b ON a.birth_date > b.birth_date AND a.birth_date < b.death_date",
+        lambda: _astronauts(lambda a, b: b["birth_date"] < a["birth_date"] < b["death_date"]),
+    ),
+]
+# fmt:on
+
+
+@pytest.mark.parametrize("statement, expected", STATEMENTS)
+def test_interval_join(statement, expected):
+    plan = opteryx.query(f"EXPLAIN {statement}").arrow().column("operator").to_pylist()
+    assert "Interval Join" in plan, plan
+
+    result = opteryx.query(statement).arrow()
+    assert sorted(zip(result.column(0).to_pylist(), result.column(1).to_pylist())) == expected()
+
+
+def test_interval_join_residual_without_columns():
+    statement = (
+        "SELECT COUNT(*) FROM $planets AS p INNER JOIN $satellites AS s "
+        "ON s.id BETWEEN p.id AND p.numberOfMoons"
+    )
+    expected = opteryx.query(statement).fetchall()
+    assert opteryx.query(f"{statement} AND RANDOM() < 2").fetchall() == expected
+
+
+def test_interval_join_only_for_ranges():
+    # inequalities which aren't ranges between the relations still aren't supported
+    with pytest.raises(UnsupportedSyntaxError):
+        opteryx.query("SELECT * FROM $planets AS p INNER JOIN $satellites AS s ON p.id <> s.id")
+    with pytest.raises(UnsupportedSyntaxError):
+        opteryx.query("SELECT * FROM $planets AS p INNER JOIN $satellites AS s ON p.id > 3")
+
+
+def test_interval_ranges():
+    points, valid = _to_numpy(pyarrow.array([5, None, 1, 3, 3, 9]), pyarrow.int64())
+    assert valid.tolist() == [True, False, True, True, True, True]
+    order, sorted_points = _sort_points(points, valid)
+    assert order.tolist() == [2, 3, 4, 0, 5]
+    assert sorted_points.tolist() == [1, 3, 3, 5, 9]
+
+    lower, lower_valid = _to_numpy(pyarrow.array([3, 0, None, 6, 9]), pyarrow.int64())
+    upper, upper_valid = _to_numpy(pyarrow.array([5, 2, 4, 4, 20]), pyarrow.int64())
+    valid = lower_valid & upper_valid
+
+    # inclusive: 3 <= x <= 5, 0 <= x <= 2, null, 6 <= x <= 4 (empty), 9 <= x <= 20
+    bounds = IntervalBounds(None, lower=True, upper=True)
+    starts, ends = _find_ranges(sorted_points, bounds, lower, upper, valid)
+    assert (ends - starts).tolist() == [3, 1, 0, 0, 1]
+
+    pairs = list(_interval_pairs(order, starts, ends, 2))
+    ranges = numpy.concatenate([r for r, _ in pairs]).tolist()
+    rows = numpy.concatenate([p for _, p in pairs]).tolist()
+    assert list(zip(ranges, rows)) == [(0, 3), (0, 4), (0, 0), (1, 2), (4, 5)]
+
+    # exclusive: 3 < x < 5, 0 < x < 2, null, 6 < x < 4 (empty), 9 < x < 20
+    bounds = IntervalBounds(
+        None, lower=True, lower_inclusive=False, upper=True, upper_inclusive=False
+    )
+    starts, ends = _find_ranges(sorted_points, bounds, lower, upper, valid)
+    assert (ends - starts).tolist() == [0, 1, 0, 0, 0]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
@@ -0,0 +1,108 @@
+"""
+Test small morsels left by filters and joins are merged, and oversized morsels are
+split, by the Morsel Defragment operator
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import numpy
+import pyarrow
+from orso.tools import random_string
+
+import opteryx
+from opteryx.models import QueryProperties
+from opteryx.models import QueryStatistics
+from opteryx.operators import morsel_defragment_node
+from opteryx.operators.morsel_defragment_node import MorselDefragmentNode
+
+
+class _Producer:
+    def __init__(self, morsels):
+        self.morsels = morsels
+
+    def execute(self):
+        yield from self.morsels
+
+
+def _defragment(morsels):
+    qid = random_string()
+    node = MorselDefragmentNode(QueryProperties(qid=qid, variables={}))
+    node.statistics = QueryStatistics(qid)
+    node._producers = [_Producer(morsels)]
+    return list(node.execute()), node.statistics
+
+
+def _morsel(start, rows):
+    return pyarrow.table({"id": numpy.arange(start, start + rows, dtype=numpy.int64)})
+
+
+def test_small_morsels_are_merged(monkeypatch):
+    monkeypatch.setattr(morsel_defragment_node, "MORSEL_SIZE_BYTES", 8 * 1000)
+    # 100 morsels of 10 rows (80 bytes), we merge to at least 75% of 8000 bytes
+    morsels = [_morsel(i * 10, 10) for i in range(100)]
+    result, statistics = _defragment(morsels)
+
+    assert [m.num_rows for m in result] == [750, 250]
+    assert pyarrow.concat_tables(result).column("id").to_pylist() == list(range(1000))
+    # the merged morsels aren't left as lots of chunks
+    assert result[0].column("id").num_chunks == 1
+    assert statistics.morsel_merges == 98
+
+
+def test_large_morsels_are_split(monkeypatch):
+    monkeypatch.setattr(morsel_defragment_node, "MORSEL_SIZE_BYTES", 8 * 1000)
+    morsels = [_morsel(0, 10), _morsel(10, 4000), _morsel(4010, 10)]
+    result, statistics = _defragment(morsels)
+
+    # what we've collected is emitted before the split morsel, so the order is kept
+    assert [m.num_rows for m in result] == [10, 1000, 1000, 1000, 1000, 10]
+    assert pyarrow.concat_tables(result).column("id").to_pylist() == list(range(4020))
+    assert statistics.morsel_splits == 1
+
+
+def test_empty_and_mixed_schema_morsels():
+    empty = _morsel(0, 0)
+    result, _ = _defragment([empty, empty])
+    assert len(result) == 1 and result[0].num_rows == 0
+
+    # empty morsels are dropped when there's data
+    result, _ = _defragment([empty, _morsel(0, 5), empty])
+    assert [m.num_rows for m in result] == [5]
+
+    # morsels with different schemas aren't merged
+    other = pyarrow.table({"id": pyarrow.array([1, 2], type=pyarrow.int32())})
+    result, _ = _defragment([_morsel(0, 5), _morsel(5, 5), other])
+    assert [m.num_rows for m in result] == [10, 2]
+
+
+def test_defragment_planned_after_filters_and_joins():
+    statement = "SELECT p.name, s.name FROM $planets AS p INNER JOIN $satellites AS s ON p.id = s.planetId WHERE s.gm > 1"
+    plan = opteryx.query(f"EXPLAIN {statement}").arrow().column("operator").to_pylist()
+    assert "Morsel Defragment" in plan, plan
+
+    planets = {p["id"] for p in opteryx.query("SELECT id FROM $planets").arrow().to_pylist()}
+    satellites = opteryx.query("SELECT planetId, gm FROM $satellites").arrow().to_pylist()
+    expected = sum(1 for s in satellites if s["planetId"] in planets and s["gm"] > 1)
+
+    cur = opteryx.query(statement)
+    assert cur.rowcount == expected
+    assert cur.stats["optimization_defragment_morsels"] >= 1, cur.stats
+
+
+def test_defragment_not_planned_before_limit():
+    plan = (
+        opteryx.query("EXPLAIN SELECT name FROM $satellites WHERE id > 8 LIMIT 3")
+        .arrow()
+        .column("operator")
+        .to_pylist()
+    )
+    assert "Morsel Defragment" not in plan, plan
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
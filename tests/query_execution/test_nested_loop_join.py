@@ -0,0 +1,102 @@
+"""
+Test conditions on CROSS JOINs are evaluated in the join, so only the matching pairs of
+rows are created
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+from types import SimpleNamespace
+
+import numpy
+import pyarrow
+import pytest
+
+import opteryx
+from opteryx.operators import cross_join_node
+
+# fmt:off
+CONDITIONS = [
+    ("p.id < s.planetId", lambda p, s: p["id"] < s["planetId"]),
+    ("p.id < s.planetId AND s.gm > 10", lambda p, s: p["id"] < s["planetId"] and s["gm"] > 10),
+    ("s.radius BETWEEN p.id AND p.id * 10", lambda p, s: p["id"] <= s["radius"] <= p["id"] * 10),
+    ("p.id + s.id < 10", lambda p, s: p["id"] + s["id"] < 10),
+    ("p.name = s.name", lambda p, s: p["name"] == s["name"]),
+]
+# fmt:on
+
+
+@pytest.mark.parametrize("condition, test", CONDITIONS)
+def test_nested_loop_join(condition, test):
+    planets = opteryx.query("SELECT id, name FROM $planets").arrow().to_pylist()
+    satellites = (
+        opteryx.query("SELECT id, planetId, name, gm, radius FROM $satellites").arrow().to_pylist()
+    )
+    expected = sorted((p["id"], s["id"]) for p in planets for s in satellites if test(p, s))
+
+    cur = opteryx.query(
+        f"SELECT p.id, s.id FROM $planets AS p CROSS JOIN $satellites AS s WHERE {condition}"
+    )
+    result = cur.arrow()
+    assert sorted(zip(result.column(0).to_pylist(), result.column(1).to_pylist())) == expected
+    assert cur.stats.get("optimization_fuse_operators_nested_loop_join", 0) >= 1, cur.stats
+
+
+def test_nested_loop_join_no_matches():
+    cur = opteryx.query(
+        "SELECT p.id, s.id FROM $planets AS p CROSS JOIN $satellites AS s WHERE p.id > s.id + 1000"
+    )
+    assert cur.rowcount == 0
+
+
+def test_nested_loop_join_condition_without_columns():
+    # the condition is evaluated for every pair even if it doesn't reference either side
+    cur = opteryx.query(
+        "SELECT COUNT(*) FROM $planets AS p CROSS JOIN $satellites AS s WHERE RANDOM() < 2"
+    )
+    assert cur.fetchall() == [(9 * 177,)]
+    assert cur.stats.get("optimization_fuse_operators_nested_loop_join", 0) >= 1, cur.stats
+
+    cur = opteryx.query(
+        "SELECT COUNT(*) FROM $planets AS p CROSS JOIN $satellites AS s WHERE RANDOM() > 2"
+    )
+    assert cur.fetchall() == [(0,)]
+
+
+class _Producer:
+    def __init__(self, morsels):
+        self.morsels = morsels
+
+    def execute(self):
+        yield from self.morsels
+
+
+def test_cross_join_morsels_are_sized_by_bytes(monkeypatch):
+    monkeypatch.setattr(cross_join_node, "MORSEL_SIZE_BYTES", 64 * 1024)
+    left = pyarrow.table({"left": numpy.arange(300), "padding": ["x" * 100] * 300})
+    right = pyarrow.table({"right": numpy.arange(50)})
+    statistics = SimpleNamespace(time_cross_join=0)
+
+    morsels = list(cross_join_node._cross_join(_Producer([left]), right, statistics))
+    assert sum(morsel.num_rows for morsel in morsels) == 300 * 50
+    assert len(morsels) > 1
+    assert all(morsel.nbytes <= 80 * 1024 for morsel in morsels)
+    # wider rows mean fewer rows in each morsel
+    assert morsels[0].num_rows < 64 * 1024 // 16
+
+
+def test_pair_blocks():
+    blocks = list(cross_join_node._pair_blocks(3, 4, 5))
+    assert [len(left) for left, _ in blocks] == [5, 5, 2]
+    left = numpy.concatenate([left for left, _ in blocks])
+    right = numpy.concatenate([right for _, right in blocks])
+    assert left.tolist() == [0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2]
+    assert right.tolist() == [0, 1, 2, 3] * 3
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
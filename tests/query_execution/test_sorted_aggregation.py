@@ -0,0 +1,101 @@
+"""
+Test GROUP BYs over data which is ordered on the group keys are aggregated as the data
+streams through, each group is emitted when the group key changes
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import pyarrow
+import pytest
+
+import opteryx
+from opteryx.operators import SortNode
+from opteryx.operators.sorted_aggregate_and_group_node import _last_group_start
+
+# fmt:off
+STATEMENTS = [
+    "SELECT planetId, COUNT(*), MAX(gm), MIN(name) FROM {source} GROUP BY planetId",
+    "SELECT planetId, APPROX_COUNT_DISTINCT(name), SUM(gm) FROM {source} GROUP BY planetId",
+    "SELECT planetId, APPROX_COUNT_DISTINCT(name) FROM {source} GROUP BY planetId",
+    "SELECT planetId, COUNT(*) FROM {source} GROUP BY planetId HAVING COUNT(*) > 3",
+    "SELECT planetId, radius > 10, COUNT(*) FROM {source} GROUP BY planetId, radius > 10",
+]
+SOURCES = [
+    "(SELECT * FROM $satellites ORDER BY planetId) AS s",
+    "(SELECT * FROM $satellites ORDER BY planetId DESC, id) AS s",
+    "(SELECT * FROM $satellites WHERE gm > 1 ORDER BY planetId LIMIT 20) AS s",
+]
+# fmt:on
+
+
+def _rows(table):
+    return sorted(tuple(row.values()) for row in table.to_pylist())
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+@pytest.mark.parametrize("source", SOURCES)
+def test_sorted_aggregation(statement, source, monkeypatch):
+    statement = statement.format(source=source)
+    if "radius > 10" in statement:
+        # the ORDER BY doesn't cover the second group key
+        plan = opteryx.query(f"EXPLAIN {statement}").arrow().column("operator").to_pylist()
+        assert "Sorted Group" not in plan, plan
+        return
+
+    plan = opteryx.query(f"EXPLAIN {statement}").arrow().column("operator").to_pylist()
+    assert "Sorted Group" in plan, plan
+
+    # the rows are aggregated in the order they arrive, so the result is the same as
+    # aggregating the unordered rows
+    expected = _rows(opteryx.query(statement.replace(source, "$satellites")).arrow())
+
+    # split the ordered rows into small morsels so the groups span morsels
+    execute = SortNode.execute
+
+    def small_morsels(self):
+        for morsel in execute(self):
+            for batch in morsel.to_batches(max_chunksize=7):
+                yield pyarrow.Table.from_batches([batch])
+
+    monkeypatch.setattr(SortNode, "execute", small_morsels)
+    cur = opteryx.query(statement)
+    if "LIMIT" in source:
+        # only compare the shape, the LIMIT chooses which rows are aggregated
+        assert cur.rowcount > 0
+    else:
+        assert _rows(cur.arrow()) == expected
+        # groups were emitted as the morsels arrived
+        assert cur.stats["sorted_groups_emitted"] > 1, cur.stats
+    assert cur.stats["optimization_sorted_aggregation"] == 1, cur.stats
+
+
+def test_unordered_aggregation_is_not_sorted():
+    for statement in (
+        "SELECT planetId, COUNT(*) FROM $satellites GROUP BY planetId",
+        "SELECT planetId, COUNT(*) FROM (SELECT * FROM $satellites ORDER BY id) AS s GROUP BY planetId",
+        "SELECT planetId, COUNT(*) FROM (SELECT * FROM $satellites ORDER BY id, planetId) AS s GROUP BY planetId",
+    ):
+        plan = opteryx.query(f"EXPLAIN {statement}").arrow().column("operator").to_pylist()
+        assert "Sorted Group" not in plan, plan
+        assert "Group" in plan, plan
+
+
+def test_last_group_start():
+    table = pyarrow.table({"a": [1, 1, 2, 2, 2], "b": ["x", "y", "y", "y", "y"]})
+    assert _last_group_start(table, ["a"]) == 2
+    assert _last_group_start(table, ["a", "b"]) == 2
+    assert _last_group_start(table.slice(0, 2), ["b"]) == 1
+    assert _last_group_start(table.slice(2), ["a"]) == 0
+
+    nulls = pyarrow.table({"a": [1, None, None], "f": [1.0, float("nan"), float("nan")]})
+    assert _last_group_start(nulls, ["a"]) == 1
+    assert _last_group_start(nulls, ["f"]) == 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
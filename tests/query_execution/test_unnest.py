@@ -0,0 +1,75 @@
+"""
+Test unnesting list columns from the list offsets
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import pyarrow
+import pytest
+
+import opteryx
+from opteryx.compiled.cross_join import build_rows_indices
+from opteryx.operators.cross_join_node import _unnest_list_column
+
+LISTS = [["a", "b"], [], ["c"], ["d", "e", "f"], ["a"]]
+
+
+@pytest.mark.parametrize(
+    "list_type",
+    [pyarrow.list_(pyarrow.string()), pyarrow.large_list(pyarrow.string())],
+)
+def test_unnest_list_column(list_type):
+    column = pyarrow.array(LISTS, type=list_type)
+    indices, values = _unnest_list_column(column)
+    assert indices.tolist() == [0, 0, 2, 3, 3, 3, 4]
+    assert values.to_pylist() == ["a", "b", "c", "d", "e", "f", "a"]
+
+    # sliced columns share their parent's offsets and values
+    indices, values = _unnest_list_column(column.slice(2, 2))
+    assert indices.tolist() == [0, 1, 1, 1]
+    assert values.to_pylist() == ["c", "d", "e", "f"]
+
+
+def test_unnest_list_column_with_value_set():
+    column = pyarrow.array(LISTS)
+    indices, values = _unnest_list_column(column, pyarrow.array(["a", "e"]))
+    assert indices.tolist() == [0, 3, 4]
+    assert values.to_pylist() == ["a", "e", "a"]
+
+
+def test_unnest_fixed_size_list_column():
+    column = pyarrow.array([[1, 2], [3, 4]], type=pyarrow.list_(pyarrow.int64(), 2))
+    indices, values = _unnest_list_column(column)
+    assert indices.tolist() == [0, 0, 1, 1]
+    assert values.to_pylist() == [1, 2, 3, 4]
+
+
+def test_build_rows_indices():
+    assert build_rows_indices(pyarrow.array([3, 5, 5, 6], pyarrow.int32()).to_numpy()).tolist() == [
+        0,
+        0,
+        2,
+    ]
+    assert build_rows_indices(pyarrow.array([0], pyarrow.int64()).to_numpy()).tolist() == []
+
+
+def test_unnest_with_nulls_and_filters():
+    cur = opteryx.query(
+        "SELECT name, tag FROM $astronauts CROSS JOIN UNNEST(missions) AS tag "
+        "WHERE tag IN ('Apollo 11', 'Gemini 8')"
+    )
+    expected = opteryx.query(
+        "SELECT name, tag FROM $astronauts CROSS JOIN UNNEST(missions) AS tag"
+    ).arrow()
+    expected = [row for row in expected.to_pylist() if row["tag"] in ("Apollo 11", "Gemini 8")]
+    assert sorted(cur.arrow().to_pylist(), key=str) == sorted(expected, key=str)
+    assert cur.rowcount > 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
@@ -1120,6 +1120,13 @@ STATEMENTS = [
 
         ("SELECT APPROXIMATE_MEDIAN(radius) AS AM FROM $satellites GROUP BY planetId HAVING APPROXIMATE_MEDIAN(radius) > 5;", 5, 1, None),
         ("SELECT APPROXIMATE_MEDIAN(radius) AS AM FROM $satellites GROUP BY planetId HAVING AM > 5;", 5, 1, None),
+        ("SELECT APPROX_COUNT_DISTINCT(name), APPROX_PERCENTILE(radius, 0.9), APPROX_TOP_K(planetId, 2), APPROX_MOST_FREQUENT(planetId) FROM $satellites", 1, 4, None),
+        ("SELECT planetId, APPROX_COUNT_DISTINCT(name), APPROX_PERCENTILE(radius, 0.5), COUNT(*) FROM $satellites GROUP BY planetId", 7, 4, None),
+        ("SELECT APPROX_PERCENTILE(radius, 0.5) AS AP FROM $satellites GROUP BY planetId HAVING AP > 5", 5, 1, None),
+        ("SELECT APPROX_PERCENTILE(radius, 2) FROM $satellites", None, None, InvalidFunctionParameterError),
+        ("SELECT APPROX_PERCENTILE(radius) FROM $satellites", None, None, InvalidFunctionParameterError),
+        ("SELECT APPROX_TOP_K(name, 0) FROM $satellites", None, None, InvalidFunctionParameterError),
+        ("SELECT APPROX_PERCENTILE(name, 0.5) FROM $satellites", None, None, IncorrectTypeError),
         ("SELECT COUNT(planetId) FROM $satellites", 1, 1, None),
         ("SELECT COUNT_DISTINCT(planetId) FROM $satellites", 1, 1, None),
         ("SELECT LIST(name), planetId FROM $satellites GROUP BY planetId", 7, 2, None),
@@ -0,0 +1,72 @@
+"""
+Test local files are read concurrently, off the event loop
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import asyncio
+import threading
+import time
+
+import pyarrow
+
+from opteryx.connectors import DiskConnector
+from opteryx.connectors import disk_connector
+from opteryx.models import QueryStatistics
+from opteryx.shared import AsyncMemoryPool
+from opteryx.shared import MemoryPool
+
+FILES = [
+    "testdata/flat/planets/parquet/planets.parquet",
+    "testdata/flat/formats/psv/lineitem.psv",
+] * 4
+
+
+def test_local_reads_are_concurrent():
+    read_threads = set()
+    real_read = disk_connector.read_local_file
+
+    def slow_read(file_name, **kwargs):
+        read_threads.add(threading.current_thread().name)
+        time.sleep(0.2)
+        return real_read(file_name, **kwargs)
+
+    statistics = QueryStatistics()
+    connector = DiskConnector(dataset="testdata.flat", statistics=statistics)
+    pool = MemoryPool(16 * 1024 * 1024)
+
+    async def _read_all():
+        async_pool = AsyncMemoryPool(pool)
+        return await asyncio.gather(
+            *(
+                connector.async_read_blob(blob_name=file, pool=async_pool, statistics=statistics)
+                for file in FILES
+            )
+        )
+
+    disk_connector.read_local_file = slow_read
+    try:
+        start = time.monotonic()
+        references = asyncio.run(_read_all())
+        elapsed = time.monotonic() - start
+    finally:
+        disk_connector.read_local_file = real_read
+
+    # eight reads of 0.2 seconds each, read in parallel
+    assert elapsed < 1.0, elapsed
+    assert all(name.startswith("opteryx-local-read") for name in read_threads), read_threads
+
+    for file, reference in zip(FILES, references):
+        if isinstance(reference, pyarrow.Buffer):
+            assert len(reference) == os.path.getsize(file)
+        else:
+            assert len(pool.read_and_release(reference)) == os.path.getsize(file)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
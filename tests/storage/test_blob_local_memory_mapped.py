@@ -0,0 +1,141 @@
+"""
+Test local Parquet and Arrow files are memory mapped and decoded in place
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import shutil
+import tempfile
+
+import pyarrow
+import pyarrow.feather
+import pyarrow.ipc
+
+import opteryx
+from opteryx.connectors.disk_connector import read_local_file
+from opteryx.utils.file_decoders import arrow_decoder
+from opteryx.utils.file_decoders import ipc_decoder
+
+
+def _address_range(buffer: pyarrow.Buffer) -> range:
+    return range(buffer.address, buffer.address + buffer.size)
+
+
+def test_read_local_file():
+    mapped = read_local_file("testdata/flat/planets/parquet/planets.parquet")
+    assert isinstance(mapped, pyarrow.Buffer)
+    assert len(mapped) == os.path.getsize("testdata/flat/planets/parquet/planets.parquet")
+
+    # formats which aren't decoded in place are read
+    read = read_local_file("testdata/flat/formats/psv/lineitem.psv")
+    assert isinstance(read, bytes)
+
+
+def test_parquet_files_are_not_read_ahead():
+    from unittest import mock
+
+    if not hasattr(os, "posix_fadvise"):  # pragma: no cover
+        return
+
+    folder = tempfile.mkdtemp()
+    feather_file = os.path.join(folder, "table.arrow")
+    pyarrow.feather.write_feather(pyarrow.table({"id": [1, 2, 3]}), feather_file)
+
+    with mock.patch("os.posix_fadvise") as fadvise:
+        # only the column chunks which are decoded are read from parquet files
+        read_local_file("testdata/flat/planets/parquet/planets.parquet", will_need=True)
+        assert fadvise.call_count == 0
+        read_local_file(feather_file, will_need=True)
+        assert fadvise.call_count == 1
+
+    shutil.rmtree(folder)
+
+
+def test_arrow_files_are_decoded_in_place():
+    folder = tempfile.mkdtemp()
+    table = pyarrow.table({"id": list(range(1000)), "name": [str(i) for i in range(1000)]})
+    feather_file = os.path.join(folder, "table.arrow")
+    pyarrow.feather.write_feather(table, feather_file, compression="uncompressed")
+    ipc_file = os.path.join(folder, "table.ipc")
+    with pyarrow.ipc.new_stream(ipc_file, table.schema) as writer:
+        writer.write_table(table)
+
+    for file_name, decoder in ((feather_file, arrow_decoder), (ipc_file, ipc_decoder)):
+        mapped = read_local_file(file_name)
+        num_rows, _, decoded = decoder(mapped)
+        assert num_rows == 1000
+        assert decoded.equals(table)
+        # the values are read from the mapped file, not copied
+        values = decoded.column("id").chunk(0).buffers()[1]
+        assert values.address in _address_range(mapped)
+
+    shutil.rmtree(folder)
+
+
+def test_memory_mapped_reads_are_not_copied_without_a_remote_cache():
+    import asyncio
+    import tracemalloc
+
+    from opteryx.config import MAX_CACHEABLE_ITEM_SIZE
+    from opteryx.connectors.capabilities.cacheable import async_read_thru_cache
+    from opteryx.models import QueryStatistics
+
+    folder = tempfile.mkdtemp()
+    table = pyarrow.table({"id": list(range(100_000))})
+    feather_file = os.path.join(folder, "table.arrow")
+    pyarrow.feather.write_feather(table, feather_file, compression="uncompressed")
+    file_size = os.path.getsize(feather_file)
+    # files this small would be copied to the remote cache if there was one
+    assert file_size < MAX_CACHEABLE_ITEM_SIZE
+
+    async def reader(*, blob_name, **kwargs):
+        return read_local_file(blob_name)
+
+    # no remote cache is configured, so there's nothing to copy the file for
+    cached_reader = async_read_thru_cache(reader)
+    statistics = QueryStatistics("memory-mapped-no-copy")
+
+    tracemalloc.start()
+    try:
+        mapped = asyncio.run(
+            cached_reader(blob_name=feather_file, statistics=statistics, pool=None)
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert isinstance(mapped, pyarrow.Buffer)
+    assert len(mapped) == file_size
+    # copying the mapped file would read every page of it
+    assert peak < file_size // 10, (peak, file_size)
+
+    del mapped
+    shutil.rmtree(folder)
+
+
+def test_memory_mapped_queries():
+    cur = opteryx.query("SELECT name FROM testdata.flat.planets.parquet WHERE id > 4")
+    assert sorted(row[0] for row in cur.fetchall()) == [
+        "Jupiter",
+        "Neptune",
+        "Pluto",
+        "Saturn",
+        "Uranus",
+    ]
+
+    # mapped files are in the OS page cache, they aren't copied to the buffer pool
+    cur = opteryx.query("SELECT name FROM testdata.flat.planets.parquet WHERE id > 4")
+    assert cur.arrow().num_rows == 5
+    assert "bufferpool_hits" not in cur.stats, cur.stats
+
+    cur = opteryx.query("SELECT COUNT(*) FROM 'testdata/flat/planets/parquet/planets.parquet'")
+    assert cur.fetchall() == [(9,)]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
@@ -0,0 +1,105 @@
+"""
+Test projections and predicates are pushed to MongoDB, using mongomock in place of a
+MongoDB server
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import datetime
+
+import mongomock
+import pyarrow
+
+import opteryx
+from opteryx.connectors import MongoDbConnector
+from opteryx.connectors.base.base_connector import BaseConnector
+from opteryx.models import QueryStatistics
+
+MONGO_CONNECTION = "mongodb://mongo.example.com:27017"
+
+
+def _populate():
+    import pymongo
+
+    collection = pymongo.MongoClient(MONGO_CONNECTION)["space"]["planets"]
+    collection.drop()
+    collection.insert_many(
+        [
+            {
+                "name": name,
+                "moons": moons,
+                "gravity": gravity,
+                "visited": datetime.datetime(2000 + i, 1, 1),
+            }
+            for i, (name, moons, gravity) in enumerate(
+                [
+                    ("Mercury", 0, 3.7),
+                    ("Venus", 0, 8.9),
+                    ("Earth", 1, 9.8),
+                    ("Mars", 2, 3.7),
+                    ("Jupiter", 79, 23.1),
+                    ("Saturn", 62, 9.0),
+                    ("Uranus", 27, 8.7),
+                    ("Neptune", 14, 11.0),
+                ]
+            )
+        ]
+    )
+    # documents don't all have the same fields
+    collection.insert_one({"name": "Pluto", "moons": None})
+
+
+@mongomock.patch(servers=(("mongo.example.com", 27017),))
+def test_mongo_projection_and_predicate_pushdown():
+    _populate()
+    opteryx.register_store(
+        "space", MongoDbConnector, database="space", connection=MONGO_CONNECTION, remove_prefix=True
+    )
+
+    cur = opteryx.query("SELECT name FROM space.planets WHERE moons > 10")
+    assert sorted(cur.arrow().column("name").to_pylist()) == [
+        "Jupiter",
+        "Neptune",
+        "Saturn",
+        "Uranus",
+    ]
+    assert cur.stats["columns_read"] == 1, cur.stats
+    assert cur.stats["rows_read"] == 4, cur.stats
+
+    # != doesn't match nulls or missing values, as in SQL
+    cur = opteryx.query("SELECT name FROM space.planets WHERE moons != 0 AND 20 > moons")
+    assert sorted(cur.arrow().column("name").to_pylist()) == ["Earth", "Mars", "Neptune"]
+    assert cur.stats["rows_read"] == 3, cur.stats
+
+    cur = opteryx.query("SELECT COUNT(*) FROM space.planets WHERE gravity = 3.7")
+    assert cur.fetchall() == [(2,)]
+
+    # 'id' is derived from '_id' so isn't pushed
+    cur = opteryx.query("SELECT name, id FROM space.planets WHERE id != 'x'")
+    assert cur.arrow().num_rows == 9
+    assert cur.stats["rows_read"] == 9, cur.stats
+
+
+def test_chunk_dictset_builds_columns():
+    connector = BaseConnector(dataset="test", statistics=QueryStatistics())
+    documents = [{"_id": i, "a": i, "b": str(i)} for i in range(1200)]
+    # a document without 'b' and with a new field
+    documents.append({"_id": 1200, "a": None, "c": True})
+
+    morsels = list(connector.chunk_dictset(documents, initial_chunk_size=500))
+    table = pyarrow.concat_tables(morsels, promote_options="permissive")
+    assert table.num_rows == 1201
+    assert set(table.column_names) == {"a", "b", "c", "id"}
+    # the types of the first morsel are used for the rest
+    assert all(morsel.schema.field("a").type == pyarrow.int64() for morsel in morsels)
+    assert table.column("id").to_pylist()[-1] == "1200"
+    assert table.column("b").to_pylist()[-1] is None
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
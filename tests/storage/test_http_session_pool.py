@@ -0,0 +1,189 @@
+"""
+Test the async readers share HTTP connections between scans, using a local HTTP server
+in place of a remote store
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from opteryx.connectors.aws_s3_connector import get_minio_client
+from opteryx.models import QueryStatistics
+from opteryx.operators.async_read_node import AdaptiveConcurrency
+from opteryx.operators.async_read_node import fetch_data
+from opteryx.shared import AsyncMemoryPool
+from opteryx.shared import HttpSessionPool
+from opteryx.shared import MemoryPool
+
+PAYLOAD = b"x" * 1024
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # keep-alive needs HTTP/1.1
+    protocol_version = "HTTP/1.1"
+    client_ports: list = []
+
+    def do_GET(self):
+        self.client_ports.append(self.client_address[1])
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _scan(qid, url, blobs, maximum_in_flight=4):
+    """read the blobs the way the AsyncReaderNode does"""
+    statistics = QueryStatistics(qid)
+    memory_pool = MemoryPool(1024 * 1024)
+    reply_queue: queue.Queue = queue.Queue()
+
+    async def reader(*, blob_name, pool, session, statistics):
+        async with session.get(f"{url}/{blob_name}") as response:
+            data = await response.read()
+        statistics.bytes_read += len(data)
+        return await pool.commit(data)
+
+    concurrency = AdaptiveConcurrency(
+        statistics, reply_queue.qsize, initial=maximum_in_flight, maximum=maximum_in_flight
+    )
+    future = HttpSessionPool().run(
+        fetch_data(
+            blobs,
+            AsyncMemoryPool(memory_pool),
+            reader,
+            reply_queue,
+            statistics,
+            concurrency=concurrency,
+        )
+    )
+    future.result(timeout=30)
+
+    references = []
+    while (item := reply_queue.get()) is not None:
+        references.append(item)
+    assert len(references) == len(blobs)
+    assert all(
+        bytes(memory_pool.read_and_release(ref, zero_copy=False)) == PAYLOAD
+        for _, ref in references
+    )
+    return statistics
+
+
+def test_connections_are_reused_between_scans():
+    HttpSessionPool.reset()
+    server = _start_stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    _StubHandler.client_ports = []
+
+    try:
+        statistics = _scan("http-first-scan", url, [f"blob_{i}" for i in range(20)])
+        assert statistics.bytes_read == 20 * len(PAYLOAD)
+        first_scan = set(_StubHandler.client_ports)
+        # no more connections than reads in flight
+        assert 0 < len(first_scan) <= 4, first_scan
+
+        _StubHandler.client_ports = []
+        _scan("http-second-scan", url, [f"blob_{i}" for i in range(20)])
+        # the second scan (and query) reuses the connections opened by the first
+        assert set(_StubHandler.client_ports) <= first_scan, (
+            first_scan,
+            set(_StubHandler.client_ports),
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_scans_share_the_session_and_loop():
+    pool = HttpSessionPool()
+    assert pool is HttpSessionPool()
+
+    async def _get_session():
+        return pool.session, threading.current_thread().name
+
+    first_session, thread_name = pool.run(_get_session()).result()
+    second_session, _ = pool.run(_get_session()).result()
+    assert first_session is second_session
+    assert not first_session.closed
+    assert thread_name == "opteryx-async-io"
+
+    # after a reset the old session is closed and a new one is created
+    HttpSessionPool.reset()
+    assert first_session.closed
+    new_session, _ = HttpSessionPool().run(_get_session()).result()
+    assert new_session is not first_session
+
+
+def test_slow_caches_do_not_block_the_shared_loop():
+    import asyncio
+    import time
+
+    import opteryx
+    from opteryx.connectors.capabilities.cacheable import async_read_thru_cache
+    from opteryx.managers.cache.cache_manager import CacheManager
+    from opteryx.managers.kvstores import BaseKeyValueStore
+
+    class SlowCache(BaseKeyValueStore):
+        def get(self, key):
+            time.sleep(0.5)
+            return None
+
+        def set(self, key, value):
+            time.sleep(0.5)
+
+        def touch(self, key):
+            pass
+
+    async def reader(*, blob_name, pool, statistics, **kwargs):
+        return await pool.commit(PAYLOAD)
+
+    async def ticks(until):
+        count = 0
+        while not until.done():
+            count += 1
+            await asyncio.sleep(0.01)
+        return count
+
+    opteryx.set_cache_manager(CacheManager(cache_backend=SlowCache(location=None)))
+    try:
+        cached_reader = async_read_thru_cache(reader)
+        pool = HttpSessionPool()
+        read = pool.run(
+            cached_reader(
+                blob_name="slow_blob",
+                statistics=QueryStatistics("slow-cache"),
+                pool=AsyncMemoryPool(MemoryPool(1024 * 1024)),
+            )
+        )
+        # another scan's work on the same loop keeps running while the cache is waited on
+        assert pool.run(ticks(read)).result(timeout=30) > 20
+        assert read.result(timeout=30) is not None
+    finally:
+        opteryx.set_cache_manager(CacheManager(cache_backend=None))
+
+
+def test_minio_clients_are_shared():
+    client = get_minio_client("s3.example.com", "access", "secret", True)
+    assert client is get_minio_client("s3.example.com", "access", "secret", True)
+    assert client is not get_minio_client("s3.example.com", "other", "secret", True)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()
@@ -82,6 +82,47 @@ def test_duckdb_battery():
     print()
 
 
+def test_duckdb_pushed_aggregates_have_bound_types():
+    import decimal
+
+    from orso.schema import FlatColumn
+    from orso.schema import RelationSchema
+    from orso.types import OrsoTypes
+
+    from opteryx.connectors.sql_connector import _cast_to_schema
+    from opteryx.connectors.sql_connector import _rows_to_arrow
+
+    for i in range(5):
+        if create_duck_db() is None:
+            break
+
+    opteryx.register_store(
+        "duckdb",
+        SqlConnector,
+        remove_prefix=True,
+        connection="duckdb:///planets.duckdb",
+    )
+
+    # DuckDB returns SUMs of integers as decimals, they're cast to the types we expect
+    results = opteryx.query("SELECT SUM(id) + 0.5, SUM(id) / 2 FROM duckdb.planets")
+    assert results.stats["optimization_aggregate_pushdown"] == 1, results.stats
+    assert results.fetchall() == [(45.5, 22.5)]
+
+    results = opteryx.query(
+        "SELECT planetId, SUM(id) + 0.5 FROM duckdb.satellites GROUP BY planetId ORDER BY planetId"
+    )
+    expected = opteryx.query(
+        "SELECT planetId, SUM(id) + 0.5 FROM $satellites GROUP BY planetId ORDER BY planetId"
+    )
+    assert results.fetchall() == expected.fetchall()
+
+    # drivers which return rows (e.g. Postgres) return decimals for numeric SUMs
+    schema = RelationSchema(name="sums", columns=[FlatColumn(name="sum", type=OrsoTypes.INTEGER)])
+    morsel = _cast_to_schema(_rows_to_arrow([(decimal.Decimal(45),)], schema), schema)
+    assert morsel.column("sum").type == "int64"
+    assert morsel.to_pylist() == [{"sum": 45}]
+
+
 if __name__ == "__main__":  # pragma: no cover
     from tests.tools import run_tests
 
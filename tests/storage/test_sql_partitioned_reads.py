@@ -0,0 +1,99 @@
+"""
+Test reading SQL datasets in partitions over concurrent connections
+"""
+
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], "../.."))
+
+import datetime
+import sqlite3
+import tempfile
+
+import opteryx
+from opteryx.connectors import SqlConnector
+from opteryx.connectors.sql_connector import _partition_bounds
+
+
+def _create_database():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "partitioned.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, sensor INTEGER, value DOUBLE)")
+    conn.executemany(
+        "INSERT INTO readings VALUES (?, ?, ?)",
+        [(i, None if i % 100 == 0 else i % 7, i / 10) for i in range(1, 10001)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_partition_bounds():
+    assert _partition_bounds(1, 100, 4) == [1, 25, 50, 75, 100]
+    assert _partition_bounds(0, 1, 4) == [0, 1]
+    assert _partition_bounds(0.0, 1.0, 2) == [0.0, 0.5, 1.0]
+    assert _partition_bounds(datetime.date(2024, 1, 1), datetime.date(2024, 1, 5), 2) == [
+        datetime.date(2024, 1, 1),
+        datetime.date(2024, 1, 3),
+        datetime.date(2024, 1, 5),
+    ]
+    # these can't be partitioned
+    assert _partition_bounds("a", "z", 4) == []
+    assert _partition_bounds(None, None, 4) == []
+    assert _partition_bounds(1, 100, 1) == []
+
+
+def test_partitioned_read_on_primary_key():
+    path = _create_database()
+    opteryx.register_store(
+        "sqlite_partitioned",
+        SqlConnector,
+        remove_prefix=True,
+        connection=f"sqlite:///{path}",
+        partitions=4,
+    )
+
+    results = opteryx.query("SELECT id FROM sqlite_partitioned.readings")
+    assert results.stats["sql_partitions_read"] == 4, results.stats
+    ids = [row[0] for row in results.fetchall()]
+    assert sorted(ids) == list(range(1, 10001))
+
+    # predicates are pushed to each of the partitions
+    results = opteryx.query("SELECT value FROM sqlite_partitioned.readings WHERE id > 5000")
+    assert results.stats["sql_partitions_read"] == 4, results.stats
+    values = [row[0] for row in results.fetchall()]
+    assert sorted(values) == [i / 10 for i in range(5001, 10001)]
+
+    # aggregates pushed to the database aren't partitioned
+    results = opteryx.query("SELECT SUM(value) FROM sqlite_partitioned.readings WHERE id > 5000")
+    assert "sql_partitions_read" not in results.stats, results.stats
+    assert round(results.fetchall()[0][0], 1) == round(sum(i / 10 for i in range(5001, 10001)), 1)
+
+
+def test_partitioned_read_includes_nulls():
+    path = _create_database()
+    opteryx.register_store(
+        "sqlite_sensors",
+        SqlConnector,
+        remove_prefix=True,
+        connection=f"sqlite:///{path}",
+        partitions=3,
+        partition_column="sensor",
+    )
+
+    results = opteryx.query("SELECT id, sensor FROM sqlite_sensors.readings")
+    assert results.stats["sql_partitions_read"] == 3, results.stats
+    rows = results.fetchall()
+    assert sorted(row[0] for row in rows) == list(range(1, 10001))
+    assert sum(1 for row in rows if row[1] is None) == 100
+
+    results = opteryx.query("SELECT COUNT(*) FROM sqlite_sensors.readings WHERE sensor IS NULL")
+    assert results.fetchall() == [(100,)]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from tests.tools import run_tests
+
+    run_tests()